@@ -0,0 +1,75 @@
+"""
+Loading a schedule of flights.
+
+Inserts flights into a database file through the connection pool, one FlightService.add_flight
+(and so one commit) per flight against FlightService.add_flights, which writes them with
+executemany in a single transaction, for both flight time storages. The bulk load is then sent
+again through FlightService.upsert_flights, as an unchanged schedule feed would be, counting the
+rows it writes.
+
+    python -m benchmarks.bench_bulk_writes
+"""
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from flightmanagement.db.db import ConnectionPool
+from flightmanagement.db.migrations import migrate, convert_flight_times
+from flightmanagement.db.synthetic_data import generate_database_data
+from flightmanagement.models.flight import Flight
+from flightmanagement.services.flight_service import FlightService
+
+ROW_BY_ROW = 2_000
+BULK = 200_000
+
+def schedule(count: int, first: int = 0) -> list[Flight]:
+    start = datetime(2027, 1, 1)
+    return [
+        Flight(
+            flight_number=f"ZMY{n % 5000}",
+            aircraft_id=1 + n % 50,
+            origin_id=1 + n % 100,
+            destination_id=1 + (n + 1) % 100,
+            pilot_id=1 + n % 500,
+            copilot_id=1 + (n + 1) % 500,
+            departure_time_scheduled=start + timedelta(minutes=5 * n),
+            arrival_time_scheduled=start + timedelta(minutes=5 * n + 90),
+            status="Scheduled"
+        )
+        for n in range(first, first + count)
+    ]
+
+def main():
+    print(f"{'Storage':<15}{'Row by row':>16}{'Bulk':>16}{'Speed-up':>10}{'Re-import':>16}{'Writes':>8}")
+
+    with tempfile.TemporaryDirectory() as directory:
+        for storage in ("text", "epoch_minutes"):
+            pool = ConnectionPool(Path(directory) / f"{storage}.db")
+            migrate(pool.writer)
+            convert_flight_times(pool.writer, storage)
+            generate_database_data(pool.writer, flights=0, airports=100, aircraft=50, pilots=500)
+            service = FlightService(pool)
+
+            flights = schedule(ROW_BY_ROW)
+            start = time.perf_counter()
+            for flight in flights:
+                service.add_flight(flight)
+            row_by_row = ROW_BY_ROW / (time.perf_counter() - start)
+
+            flights = schedule(BULK, first=ROW_BY_ROW)
+            start = time.perf_counter()
+            results = service.add_flights(flights)
+            bulk = BULK / (time.perf_counter() - start)
+            assert all(result.ok for result in results)
+
+            changes = pool.total_changes
+            start = time.perf_counter()
+            service.upsert_flights(flights)
+            reimport = BULK / (time.perf_counter() - start)
+            writes = pool.total_changes - changes
+
+            print(f"{storage:<15}{row_by_row:>10,.0f} row/s{bulk:>10,.0f} row/s{bulk / row_by_row:>9.0f}x{reimport:>10,.0f} row/s{writes:>8,}")
+            pool.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Reading every flight for analysis.
+
+Generates growing numbers of flights in a database file and times a typical report, the mean
+departure delay by origin airport, computed over FlightRepository.get_flight_list against
+FlightRepository.get_flight_columns with NumPy, for both flight time storages. The time of the
+read alone is shown for each, and the peak memory of the report is measured separately with
+tracemalloc, which slows down allocations too much to be timed along with it.
+
+    python -m benchmarks.bench_columnar
+"""
+import tempfile
+import time
+import tracemalloc
+from collections import defaultdict
+from datetime import datetime
+from pathlib import Path
+import numpy as np
+from flightmanagement.db.db import ConnectionPool
+from flightmanagement.db.migrations import migrate, convert_flight_times
+from flightmanagement.db.synthetic_data import generate_database_data
+from flightmanagement.repositories.flight_repository import FlightRepository
+
+SIZES = (100_000, 400_000)
+
+def delays_from_list(flights) -> dict:
+    totals = defaultdict(lambda: [0.0, 0])
+    for flight in flights:
+        if flight.departure_time_actual and flight.departure_time_scheduled:
+            total = totals[flight.origin_id]
+            total[0] += (flight.departure_time_actual - flight.departure_time_scheduled).total_seconds() / 60
+            total[1] += 1
+    return {origin_id: total / count for origin_id, (total, count) in totals.items()}
+
+def delays_from_columns(columns) -> dict:
+    actual, scheduled = columns["departure_time_actual"], columns["departure_time_scheduled"]
+    flown = ~(np.isnat(actual) | np.isnat(scheduled))
+    origins = columns["origin_id"][flown]
+    delays = (actual[flown] - scheduled[flown]).astype(np.int64)
+
+    counts = np.bincount(origins)
+    totals = np.bincount(origins, weights=delays)
+    return {int(origin_id): totals[origin_id] / counts[origin_id] for origin_id in np.flatnonzero(counts)}
+
+def timed(function) -> tuple[float, object]:
+    start = time.perf_counter()
+    result = function()
+    return time.perf_counter() - start, result
+
+def peak(function) -> float:
+    tracemalloc.start()
+    function()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak / 2 ** 20
+
+def main():
+    print(f"{'Storage':<15}{'Flights':>10}{'List read':>12}{'Report':>10}{'Peak':>10}"
+          f"{'Column read':>14}{'Report':>10}{'Peak':>10}")
+
+    with tempfile.TemporaryDirectory() as directory:
+        for storage in ("text", "epoch_minutes"):
+            for size in SIZES:
+                pool = ConnectionPool(Path(directory) / f"{storage}-{size}.db", pool_size=1)
+                migrate(pool.writer)
+                generate_database_data(pool.writer, flights=size, airports=100, aircraft=100, pilots=1000, now=datetime(2026, 1, 1))
+                convert_flight_times(pool.writer, storage)
+                repository = FlightRepository(pool)
+
+                list_read, _ = timed(repository.get_flight_list)
+                list_report, expected = timed(lambda: delays_from_list(repository.get_flight_list()))
+                list_peak = peak(lambda: delays_from_list(repository.get_flight_list()))
+                column_read, _ = timed(repository.get_flight_columns)
+                column_report, delays = timed(lambda: delays_from_columns(repository.get_flight_columns()))
+                column_peak = peak(lambda: delays_from_columns(repository.get_flight_columns()))
+                assert delays.keys() == expected.keys()
+                assert all(abs(delays[origin_id] - expected[origin_id]) < 1e-6 for origin_id in expected)
+
+                print(f"{storage:<15}{size:>10,}{list_read * 1000:>9,.0f} ms{list_report * 1000:>7,.0f} ms{list_peak:>7,.0f} MB"
+                      f"{column_read * 1000:>11,.0f} ms{column_report * 1000:>7,.0f} ms{column_peak:>7,.0f} MB")
+                pool.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+Read throughput while a write transaction is open.
+
+Compares the previous setup (default rollback journal, one connection per
+session) with the WAL connection pool. A writer thread keeps a transaction
+open, inserting flights and committing in batches, while reader threads run
+the flight listing query for a fixed duration.
+
+    python -m benchmarks.bench_connection_pool
+"""
+import sqlite3
+import tempfile
+import threading
+import time
+from contextlib import closing
+from pathlib import Path
+from flightmanagement.db.db import ConnectionPool, get_connection, initialise_schema, seed_database_data
+
+DURATION = 3.0
+READERS = 4
+WRITE_BATCH = 2000
+READ_SQL = "SELECT * FROM flight ORDER BY departure_time_scheduled DESC LIMIT 50"
+
+def insert_batch(conn, start: int):
+    conn.executemany(
+        """
+        INSERT INTO flight (flight_number, aircraft_id, origin_id, destination_id, departure_time_scheduled, arrival_time_scheduled, status)
+        VALUES (?, 1, 1, 2, ?, ?, 'Scheduled')
+        """,
+        [
+            (f"ZMY{n}", f"2030-01-01 {n % 24:02d}:{n % 60:02d}", f"2030-01-02 {n % 24:02d}:{n % 60:02d}")
+            for n in range(start, start + WRITE_BATCH)
+        ]
+    )
+
+def run(open_writer, open_reader) -> tuple[int, int]:
+    stop = threading.Event()
+    reads = [0] * READERS
+    busy = [0] * READERS
+
+    def writer():
+        conn = open_writer()
+        n = 0
+        while not stop.is_set():
+            conn.execute("BEGIN IMMEDIATE")
+            insert_batch(conn, n)
+            n += WRITE_BATCH
+            # Keep the transaction open for a while before committing
+            time.sleep(0.05)
+            conn.commit()
+
+    def reader(i: int):
+        with open_reader() as conn:
+            while not stop.is_set():
+                try:
+                    conn.execute(READ_SQL).fetchall()
+                    reads[i] += 1
+                except sqlite3.OperationalError:
+                    busy[i] += 1
+
+    threads = [threading.Thread(target=writer)] + [threading.Thread(target=reader, args=(i, )) for i in range(READERS)]
+    for thread in threads:
+        thread.start()
+    time.sleep(DURATION)
+    stop.set()
+    for thread in threads:
+        thread.join()
+
+    return sum(reads), sum(busy)
+
+def seed(db_path: Path):
+    conn = get_connection(db_path)
+    initialise_schema(conn)
+    seed_database_data(conn)
+    conn.close()
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        # Baseline: default journal mode, independent connections
+        baseline_path = Path(tmp) / "baseline.db"
+        seed(baseline_path)
+
+        def open_baseline():
+            conn = sqlite3.connect(baseline_path, timeout=0.1, check_same_thread=False, isolation_level=None)
+            return conn
+
+        reads, busy = run(open_baseline, lambda: closing(open_baseline()))
+        print(f"rollback journal : {reads / DURATION:10.0f} reads/s ({busy} busy errors)")
+
+        # Connection pool: WAL, dedicated writer, read-only readers
+        pool_path = Path(tmp) / "pool.db"
+        seed(pool_path)
+        pool = ConnectionPool(pool_path, pool_size=READERS, busy_timeout=100)
+        pool.writer.isolation_level = None
+
+        reads, busy = run(lambda: pool.writer, pool.reader)
+        print(f"WAL pool         : {reads / DURATION:10.0f} reads/s ({busy} busy errors)")
+        pool.close()
+
+if __name__ == "__main__":
+    main()
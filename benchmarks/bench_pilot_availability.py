@@ -0,0 +1,74 @@
+"""
+Listing the pilots available for a flight.
+
+Generates flights in a database file and times FlightRepository.get_available_pilots for the
+windows of random existing flights, as the flight update menu asks when assigning pilots, read
+with SQL through a bare connection against the connection pool's in-memory availability index.
+The index is then kept up to date through single flight updates, which are timed with and
+without it.
+
+    python -m benchmarks.bench_pilot_availability
+"""
+import random
+import tempfile
+import time
+from dataclasses import replace
+from datetime import datetime
+from pathlib import Path
+from flightmanagement.db.db import ConnectionPool, transaction
+from flightmanagement.db.migrations import migrate
+from flightmanagement.db.synthetic_data import generate_database_data
+from flightmanagement.repositories.flight_repository import FlightRepository
+from flightmanagement.repositories.pilot_availability import get_pilot_availability
+
+SIZES = (25_000, 100_000, 400_000)
+CHECKS = 50
+UPDATES = 200
+
+def check_all(repository, flights) -> list:
+    return [
+        repository.get_available_pilots(flight.departure_time_scheduled, flight.arrival_time_scheduled, flight.id)
+        for flight in flights
+    ]
+
+def update_all(pool, repository, flights, rng) -> None:
+    for flight in flights:
+        with transaction(pool):
+            repository.update_item(replace(flight, pilot_id=rng.choice([n for n in range(1, 1001) if n != flight.copilot_id])))
+
+def timed(function) -> tuple[float, object]:
+    start = time.perf_counter()
+    result = function()
+    return time.perf_counter() - start, result
+
+def main():
+    print(f"{'Flights':>10}{'SQL':>12}{'Index load':>13}{'Index':>12}{'Update':>12}{'Indexed update':>17}")
+
+    with tempfile.TemporaryDirectory() as directory:
+        for size in SIZES:
+            pool = ConnectionPool(Path(directory) / f"{size}.db", pool_size=1)
+            migrate(pool.writer)
+            generate_database_data(pool.writer, flights=size, airports=100, aircraft=200, pilots=1000, now=datetime(2026, 1, 1))
+            rng = random.Random(0)
+            flights = rng.sample(FlightRepository(pool).get_flight_list(), CHECKS + 2 * UPDATES)
+
+            queried, indexed = FlightRepository(pool.writer), FlightRepository(pool)
+            sql_time, expected = timed(lambda: check_all(queried, flights[:CHECKS]))
+            load_time, _ = timed(lambda: check_all(indexed, flights[:1]))
+            index_time, available = timed(lambda: check_all(indexed, flights[:CHECKS]))
+            assert available == expected
+
+            # Without the index loaded, updates don't touch it
+            get_pilot_availability(pool).invalidate()
+            update_time, _ = timed(lambda: update_all(pool, queried, flights[CHECKS:CHECKS + UPDATES], rng))
+            check_all(indexed, flights[:1])
+            indexed_update_time, _ = timed(lambda: update_all(pool, indexed, flights[CHECKS + UPDATES:], rng))
+            assert check_all(indexed, flights[:CHECKS]) == check_all(queried, flights[:CHECKS])
+            assert get_pilot_availability(pool).load_count == 2
+
+            print(f"{size:>10,}{sql_time / CHECKS * 1000:>9,.1f} ms{load_time * 1000:>10,.0f} ms{index_time / CHECKS * 1000:>9,.1f} ms"
+                  f"{update_time / UPDATES * 1000:>9,.2f} ms{indexed_update_time / UPDATES * 1000:>14,.2f} ms")
+            pool.close()
+
+if __name__ == "__main__":
+    main()
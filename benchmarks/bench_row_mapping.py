@@ -0,0 +1,75 @@
+"""
+Materialising flights into Flight objects.
+
+Generates 100,000 flights and times FlightRepository.get_flight_list, which maps rows with a
+compiled positional mapper, against the previous hand-written mapping (rows indexed by name,
+times parsed with strptime and every Flight validated by its constructor), for both flight
+time storages.
+
+    python -m benchmarks.bench_row_mapping
+"""
+import sqlite3
+import time
+from datetime import datetime, timedelta
+from flightmanagement.db.flight_times import EPOCH, TEXT_FORMAT
+from flightmanagement.db.migrations import migrate, convert_flight_times
+from flightmanagement.db.synthetic_data import generate_database_data
+from flightmanagement.models.flight import Flight
+from flightmanagement.repositories.flight_repository import FlightRepository
+
+FLIGHTS = 100_000
+REPEATS = 5
+
+def hand_written_flight_list(conn, storage: str) -> list[Flight]:
+    if storage == "text":
+        decode = lambda value: datetime.strptime(value, TEXT_FORMAT) if value else None
+    else:
+        decode = lambda value: EPOCH + timedelta(minutes=value) if value is not None else None
+
+    rows = conn.execute("SELECT * FROM flight ORDER BY departure_time_scheduled DESC").fetchall()
+    return [
+        Flight(
+            id=row["id"],
+            flight_number=row["flight_number"],
+            aircraft_id=row["aircraft_id"],
+            origin_id=row["origin_id"],
+            destination_id=row["destination_id"],
+            pilot_id=row["pilot_id"],
+            copilot_id=row["copilot_id"],
+            departure_time_scheduled=decode(row["departure_time_scheduled"]),
+            arrival_time_scheduled=decode(row["arrival_time_scheduled"]),
+            departure_time_actual=decode(row["departure_time_actual"]),
+            arrival_time_actual=decode(row["arrival_time_actual"]),
+            status=row["status"]
+        )
+        for row in rows
+    ]
+
+def best_of(function) -> tuple[float, list]:
+    timings = []
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        result = function()
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
+
+def main():
+    print(f"{'Storage':<15}{'Hand-written':>14}{'Compiled':>12}{'Speed-up':>10}")
+
+    for storage in ("text", "epoch_minutes"):
+        conn = sqlite3.connect(":memory:")
+        conn.row_factory = sqlite3.Row
+        migrate(conn)
+        convert_flight_times(conn, storage)
+        generate_database_data(conn, flights=FLIGHTS, airports=100, aircraft=50, pilots=500, now=datetime(2026, 1, 1))
+
+        repository = FlightRepository(conn)
+        before, expected = best_of(lambda: hand_written_flight_list(conn, storage))
+        after, flights = best_of(repository.get_flight_list)
+        assert flights == expected
+
+        print(f"{storage:<15}{before * 1000:>11,.0f} ms{after * 1000:>9,.0f} ms{before / after:>9.1f}x")
+        conn.close()
+
+if __name__ == "__main__":
+    main()
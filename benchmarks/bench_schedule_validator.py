@@ -0,0 +1,85 @@
+"""
+Checking a whole schedule for double bookings.
+
+Generates flights in a database file, double books a few aircraft and pilots by moving random
+flights onto others' times, and times ScheduleValidator.validate against the per-flight check
+it replaces: asking, for each flight, whether its aircraft and pilots are on another flight at
+the same time. The per-flight check is timed over a sample and scaled to the whole schedule.
+
+    python -m benchmarks.bench_schedule_validator
+"""
+import random
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from flightmanagement.db.db import ConnectionPool
+from flightmanagement.db.migrations import migrate
+from flightmanagement.db.synthetic_data import generate_database_data
+from flightmanagement.repositories.flight_repository import FlightRepository
+from flightmanagement.services.schedule_validator import ScheduleValidator
+
+SIZES = (100_000, 1_000_000)
+DOUBLE_BOOKINGS = 100
+SAMPLE = 200
+
+def double_book(conn, size: int, rng: random.Random) -> None:
+    # Each moved flight takes the times of another flown by the same aircraft or pilot
+    for _ in range(DOUBLE_BOOKINGS):
+        flight_id = rng.randrange(1, size)
+        conn.execute(
+            """
+            UPDATE flight
+            SET (departure_time_scheduled, arrival_time_scheduled) = (
+                SELECT departure_time_scheduled, arrival_time_scheduled FROM flight WHERE id = ?
+            )
+            WHERE id = ?
+            """,
+            (flight_id, flight_id + 1)
+        )
+    conn.commit()
+
+def per_flight_check(conn, flight_ids) -> int:
+    conflicts = 0
+    for flight_id in flight_ids:
+        conflicts += conn.execute(
+            """
+            SELECT COUNT(*)
+            FROM flight f, flight o
+            WHERE f.id = ?
+            AND o.id <> f.id
+            AND o.arrival_time_scheduled > f.departure_time_scheduled
+            AND o.departure_time_scheduled < f.arrival_time_scheduled
+            AND (o.aircraft_id = f.aircraft_id OR o.pilot_id IN (f.pilot_id, f.copilot_id) OR o.copilot_id IN (f.pilot_id, f.copilot_id))
+            """,
+            (flight_id, )
+        ).fetchone()[0]
+    return conflicts
+
+def timed(function) -> tuple[float, object]:
+    start = time.perf_counter()
+    result = function()
+    return time.perf_counter() - start, result
+
+def main():
+    print(f"{'Flights':>10}{'Conflicts':>11}{'Validator':>12}{'Per flight':>13}{'Per flight (all)':>19}")
+
+    with tempfile.TemporaryDirectory() as directory:
+        for size in SIZES:
+            pool = ConnectionPool(Path(directory) / f"{size}.db", pool_size=1)
+            migrate(pool.writer)
+            generate_database_data(pool.writer, flights=size, airports=100, aircraft=max(5, size // 2000),
+                                   pilots=max(20, size // 200), now=datetime(2026, 1, 1))
+            rng = random.Random(0)
+            double_book(pool.writer, size, rng)
+
+            validate_time, conflicts = timed(lambda: ScheduleValidator(pool).validate())
+            sample = rng.sample(range(1, size + 1), SAMPLE)
+            check_time, _ = timed(lambda: per_flight_check(pool.writer, sample))
+
+            print(f"{size:>10,}{len(conflicts):>11,}{validate_time:>10.2f} s{check_time / SAMPLE * 1000:>10.1f} ms"
+                  f"{check_time / SAMPLE * size:>17,.0f} s")
+            pool.close()
+
+if __name__ == "__main__":
+    main()
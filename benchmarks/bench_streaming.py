@@ -0,0 +1,54 @@
+"""
+Peak memory of a pass over every flight.
+
+Generates growing numbers of flights in a database file and measures, with tracemalloc, the peak
+memory allocated while counting the delayed flights read through FlightRepository.get_flight_list
+against FlightRepository.iter_flights, which maps one batch of rows at a time. Past one batch,
+the stream's peak is the flight time decoders' caches filling up, which stop growing at
+DECODE_CACHE_SIZE times each.
+
+    python -m benchmarks.bench_streaming
+"""
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+from flightmanagement.db.db import ConnectionPool
+from flightmanagement.db.migrations import migrate
+from flightmanagement.db.synthetic_data import generate_database_data
+from flightmanagement.repositories.flight_repository import FlightRepository
+
+SIZES = (25_000, 100_000, 400_000)
+
+def count_delayed(flights) -> int:
+    return sum(1 for flight in flights if flight.departure_time_actual and flight.departure_time_actual > flight.departure_time_scheduled)
+
+def measure(function) -> tuple[float, float, int]:
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = function()
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak / 2 ** 20, elapsed, result
+
+def main():
+    print(f"{'Flights':>10}{'List peak':>12}{'Stream peak':>14}{'List time':>12}{'Stream time':>14}")
+
+    with tempfile.TemporaryDirectory() as directory:
+        for size in SIZES:
+            pool = ConnectionPool(Path(directory) / f"{size}.db", pool_size=1)
+            migrate(pool.writer)
+            generate_database_data(pool.writer, flights=size, airports=100, aircraft=100, pilots=1000, now=datetime(2026, 1, 1))
+            repository = FlightRepository(pool)
+
+            list_peak, list_time, expected = measure(lambda: count_delayed(repository.get_flight_list()))
+            stream_peak, stream_time, delayed = measure(lambda: count_delayed(repository.iter_flights()))
+            assert delayed == expected
+
+            print(f"{size:>10,}{list_peak:>9,.1f} MB{stream_peak:>11,.1f} MB{list_time * 1000:>9,.0f} ms{stream_time * 1000:>11,.0f} ms")
+            pool.close()
+
+if __name__ == "__main__":
+    main()
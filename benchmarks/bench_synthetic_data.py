@@ -0,0 +1,36 @@
+"""
+Synthetic data generation at production volume.
+
+Generates a database of one million flights (1,000 airports, 500 aircraft
+and 5,000 pilots) into a temporary file and reports the load rate. Pass a
+different flight count as the first argument.
+
+    python -m benchmarks.bench_synthetic_data [flights]
+"""
+import sys
+import tempfile
+import time
+from contextlib import closing
+from pathlib import Path
+from flightmanagement.db.db import get_connection
+from flightmanagement.db.migrations import migrate
+from flightmanagement.db.synthetic_data import generate_database_data
+
+def main():
+    flights = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+
+    with tempfile.TemporaryDirectory() as directory:
+        db_path = Path(directory) / "synthetic.db"
+        with closing(get_connection(db_path)) as conn:
+            conn.execute("PRAGMA journal_mode = WAL;")
+            migrate(conn)
+
+            start = time.perf_counter()
+            counts = generate_database_data(conn, flights=flights, airports=1000, aircraft=500, pilots=5000)
+            elapsed = time.perf_counter() - start
+
+        size = db_path.stat().st_size / 1024 / 1024
+        print(f"Generated {counts['flights']:,} flights in {elapsed:.1f}s ({counts['flights'] / elapsed:,.0f} flights/s, {size:.0f} MB)")
+
+if __name__ == "__main__":
+    main()
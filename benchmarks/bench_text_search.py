@@ -0,0 +1,70 @@
+"""
+Text search latency against a large reference data set.
+
+Loads 100,000 airports, pilots and aircraft into a temporary database and
+times ranked searches through the repositories, including partial and
+misspelt terms that fall back to fuzzy matching.
+
+    python -m benchmarks.bench_text_search
+"""
+import random
+import sqlite3
+import time
+from flightmanagement.db.migrations import migrate
+from flightmanagement.repositories.aircraft_repository import AircraftRepository
+from flightmanagement.repositories.airport_repository import AirportRepository
+from flightmanagement.repositories.pilot_repository import PilotRepository
+
+ROWS = 100_000
+REPEATS = 50
+SYLLABLES = ["an", "ber", "cor", "dal", "el", "fen", "gar", "hol", "ing", "jor", "kel", "lin", "mor", "nor", "or", "par", "ris", "son", "ton", "wick"]
+
+def word(rng: random.Random, parts: int) -> str:
+    return "".join(rng.choice(SYLLABLES) for _ in range(parts)).capitalize()
+
+def load(conn, rng: random.Random):
+    conn.executemany(
+        "INSERT INTO airport (code, name, city, country, region) VALUES (?, ?, ?, ?, 'Europe')",
+        [(f"A{n:05d}", f"{word(rng, 3)} International", word(rng, 2), word(rng, 2)) for n in range(ROWS)]
+    )
+    conn.executemany(
+        "INSERT INTO pilot (first_name, family_name) VALUES (?, ?)",
+        [(word(rng, 2), word(rng, 3)) for _ in range(ROWS)]
+    )
+    conn.executemany(
+        "INSERT INTO aircraft (registration, manufacturer, model, status) VALUES (?, ?, ?, 'Active')",
+        [(f"G-{n:06X}", rng.choice(["Airbus", "Boeing", "Embraer"]), f"A{rng.randint(100, 999)}") for n in range(ROWS)]
+    )
+    conn.executemany("INSERT INTO airport (code, name, city, country, region) VALUES ('LHR', 'London Heathrow', 'London', 'United Kingdom', 'Europe')", [()])
+    conn.executemany("INSERT INTO pilot (first_name, family_name) VALUES ('Alex', 'Morrison')", [()])
+    conn.commit()
+
+def time_search(search, query: str) -> tuple[float, int]:
+    start = time.perf_counter()
+    for _ in range(REPEATS):
+        result = search(query)
+    return (time.perf_counter() - start) / REPEATS * 1000, len(result)
+
+def main():
+    conn = sqlite3.connect(":memory:")
+    conn.row_factory = sqlite3.Row
+    migrate(conn)
+
+    start = time.perf_counter()
+    load(conn, random.Random(42))
+    print(f"Loaded {ROWS * 3:,} rows (with index triggers) in {time.perf_counter() - start:.1f}s\n")
+
+    cases = [
+        ("airport", AirportRepository(conn).search_text, "Heathrow"),
+        ("aircraft", AircraftRepository(conn).search_text, "G-00A"),
+        ("pilot", PilotRepository(conn).search_text, "Morison"),
+        ("pilot", PilotRepository(conn).search_text, "Morrison")
+    ]
+    for entity, search, query in cases:
+        elapsed, found = time_search(search, query)
+        print(f"{entity:<10}{query!r:<14}{elapsed:8.2f} ms  ({found} results)")
+
+    conn.close()
+
+if __name__ == "__main__":
+    main()
@@ -2,10 +2,23 @@ from pathlib import Path
 from prompt_toolkit import PromptSession
 from prompt_toolkit.key_binding import KeyBindings
 from flightmanagement.ui.main_menu import MainMenu
-from flightmanagement.db.db import get_connection
+from flightmanagement.db.db import get_connection_pool
+from flightmanagement.db.archive import attach_archive
+from flightmanagement.db.db_url import MEMORY, PROJECT_ROOT, parse_db_url
+from flightmanagement.db.migrations import migrate, convert_flight_times
+from flightmanagement.db.tracing import QueryTracer
+from flightmanagement.db.materialised_flights import set_materialised_flights
+from flightmanagement.config import settings
 
-PROJECT_ROOT = Path(__file__).resolve().parents[1]
-DB_PATH = PROJECT_ROOT / "data" / "FlightManagement.db"
+DATABASE = parse_db_url(settings.db_url)
+
+# Other files live next to the database; a purely in-memory database keeps its archive in memory too
+DATA_DIR = DATABASE.path.parent if DATABASE.path else PROJECT_ROOT / "data"
+if settings.archive_db_path:
+    ARCHIVE_DB_PATH = Path(settings.archive_db_path)
+else:
+    ARCHIVE_DB_PATH = MEMORY if DATABASE.mode == "memory" else DATA_DIR / "FlightManagementArchive.db"
+SLOW_QUERY_LOG_PATH = Path(settings.slow_query_log) if settings.slow_query_log else DATA_DIR / "slow_queries.log"
 
 def main():
 
@@ -22,11 +35,19 @@ def main():
         # Print the welcome screen
         print_welcome()
     
-        # Initialise the database connection
-        conn = get_connection(DB_PATH)
+        # Initialise the database connection pool from settings.db_url (on disk: WAL, pooled readers, single writer)
+        tracer = QueryTracer(settings.slow_query_ms, SLOW_QUERY_LOG_PATH) if settings.sql_trace else None
+        pool = get_connection_pool(tracer=tracer)
 
-        # Load the main menu
-        MainMenu(session, bindings, conn).load()
+        # Bring the schema up to date before anything reads from it, then load the main menu
+        try:
+            migrate(pool)
+            convert_flight_times(pool, settings.flight_time_storage)
+            set_materialised_flights(pool, settings.materialise_flights)
+            attach_archive(pool, ARCHIVE_DB_PATH)
+            MainMenu(session, bindings, pool).load()
+        finally:
+            pool.close()
 
     except RuntimeError as e:
         print(e)
@@ -1,6 +1,40 @@
 import os
 
 class Settings:
+    # sqlite:///path (relative to the project root), sqlite:////absolute/path, sqlite:///:memory:,
+    # or sqlite:///path?mode=memory&snapshot_interval=60 to run in memory with periodic snapshots to path
     db_url: str = os.getenv("DB_URL", "sqlite:///data/FlightManagement.db")
 
-settings = Settings()
\ No newline at end of file
+    # Connection pool settings
+    db_pool_size: int = int(os.getenv("DB_POOL_SIZE", "4"))
+    db_busy_timeout: int = int(os.getenv("DB_BUSY_TIMEOUT", "5000"))
+    db_synchronous: str = os.getenv("DB_SYNCHRONOUS", "NORMAL")
+
+    # Page cache per connection, in KiB. Bulk writes touch pages all over the flight indexes, and
+    # SQLite's default of 2 MiB makes them spill to disk long before the transaction ends.
+    db_cache_size: int = int(os.getenv("DB_CACHE_SIZE", "32768"))
+
+    # Flight time column storage: "text" ('YYYY-MM-DD HH:MM') or "epoch_minutes" (integer minutes since 1970)
+    flight_time_storage: str = os.getenv("FLIGHT_TIME_STORAGE", "text")
+
+    # Keep a trigger-maintained copy of vw_denormalised_flights for listings and searches
+    materialise_flights: bool = os.getenv("MATERIALISE_FLIGHTS", "0") == "1"
+
+    # Arrived flights older than the cutoff are moved to a separate, attached archive database.
+    # An empty path keeps the archive next to the main database.
+    archive_db_path: str = os.getenv("ARCHIVE_DB_PATH", "")
+    archive_after_days: int = int(os.getenv("ARCHIVE_AFTER_DAYS", "90"))
+
+    # Time every statement run through the connection pool, logging those over the threshold.
+    # An empty log path keeps the slow-query log next to the main database.
+    sql_trace: bool = os.getenv("SQL_TRACE", "0") == "1"
+    slow_query_ms: float = float(os.getenv("SLOW_QUERY_MS", "50"))
+    slow_query_log: str = os.getenv("SLOW_QUERY_LOG", "")
+
+    # Rows per page in the "Show all" listings
+    page_size: int = int(os.getenv("PAGE_SIZE", "50"))
+
+    # Rows written per executemany by the repositories' insert_many, update_many and delete_many
+    bulk_chunk_size: int = int(os.getenv("BULK_CHUNK_SIZE", "5000"))
+
+settings = Settings()
@@ -0,0 +1,128 @@
+from datetime import datetime, timedelta
+from flightmanagement.db.flight_times import FLIGHT_TIME_COLUMNS, get_flight_times
+from flightmanagement.db.migrations import flight_dependent
+
+ARCHIVE_SCHEMA = "archive"
+
+# Pilot flight-hour limits look back over the last 28 days, so those flights must stay in the hot table
+MIN_ARCHIVE_AGE_DAYS = 28
+
+def is_archive_attached(conn) -> bool:
+    return any(row[1] == ARCHIVE_SCHEMA for row in conn.execute("PRAGMA database_list").fetchall())
+
+def attach_archive(conn, path) -> None:
+    # A connection pool attaches the archive on every connection, including its readers
+    if not is_archive_attached(conn):
+        if hasattr(conn, "attach"):
+            conn.attach(path, ARCHIVE_SCHEMA)
+        else:
+            if conn.in_transaction:
+                conn.commit()
+            conn.execute(f"ATTACH DATABASE ? AS {ARCHIVE_SCHEMA}", (str(path), ))
+
+    create_archive_schema(conn)
+    conn.commit()
+
+def create_archive_schema(conn) -> None:
+    flight_times = get_flight_times(conn)
+    archived_columns = _get_columns(conn, ARCHIVE_SCHEMA)
+
+    if len(archived_columns) == 0:
+        _create_archive_table(conn, "flight")
+    else:
+        # Bring an archive written by an older schema in line with the hot table
+        for name, definition in _get_columns(conn, "main").items():
+            if name not in archived_columns:
+                conn.execute(f"ALTER TABLE {ARCHIVE_SCHEMA}.flight ADD COLUMN {name} {definition}")
+        convert_archive_flight_times(conn, flight_times)
+
+@flight_dependent
+def convert_archive_flight_times(conn, flight_times) -> None:
+    # Keeps the archive in the same time storage as the hot table so the two can be unioned
+    if not is_archive_attached(conn):
+        return
+
+    source = get_flight_times(conn, ARCHIVE_SCHEMA)
+    if source.storage == flight_times.storage:
+        return
+
+    columns = list(_get_columns(conn, ARCHIVE_SCHEMA))
+    select_list = [
+        flight_times.sql_from_minutes(source.sql_minutes(column)) if column in FLIGHT_TIME_COLUMNS else column
+        for column in columns
+    ]
+
+    conn.execute(f"DROP TABLE IF EXISTS {ARCHIVE_SCHEMA}.flight_new")
+    _create_archive_table(conn, "flight_new", with_indexes=False)
+    conn.execute(
+        f"""
+        INSERT INTO {ARCHIVE_SCHEMA}.flight_new ({", ".join(columns)})
+        SELECT {", ".join(select_list)} FROM {ARCHIVE_SCHEMA}.flight
+        """
+    )
+    conn.execute(f"DROP TABLE {ARCHIVE_SCHEMA}.flight")
+    conn.execute(f"ALTER TABLE {ARCHIVE_SCHEMA}.flight_new RENAME TO flight")
+    _create_archive_indexes(conn)
+
+def archive_flights(conn, older_than_days: int, now: datetime | None = None) -> int:
+    # Moves arrived flights that landed before the cutoff into the archive; returns how many moved
+    if older_than_days < MIN_ARCHIVE_AGE_DAYS:
+        raise ValueError(f"Flights must be at least {MIN_ARCHIVE_AGE_DAYS} days old to archive")
+
+    if not is_archive_attached(conn):
+        raise RuntimeError("Archive database is not attached")
+
+    flight_times = get_flight_times(conn)
+    cutoff = flight_times.encode((now or datetime.now()) - timedelta(days=older_than_days))
+    columns = ", ".join(_get_columns(conn, ARCHIVE_SCHEMA))
+
+    conn.execute(
+        f"""
+        INSERT INTO {ARCHIVE_SCHEMA}.flight ({columns})
+        SELECT {columns}
+        FROM main.flight
+        WHERE arrival_time_scheduled < ?
+        AND status = 'Arrived'
+        """,
+        (cutoff, )
+    )
+    cursor = conn.execute(
+        """
+        DELETE FROM main.flight
+        WHERE arrival_time_scheduled < ?
+        AND status = 'Arrived'
+        """,
+        (cutoff, )
+    )
+    return cursor.rowcount
+
+def flight_history_source(conn) -> str:
+    # A FROM clause covering the hot table and, when attached, the archive; the explicit column
+    # list keeps the union aligned even if the archive's columns were added in a different order
+    if not is_archive_attached(conn):
+        return "main.flight"
+
+    columns = ", ".join(_get_columns(conn, "main"))
+    return f"(SELECT {columns} FROM main.flight UNION ALL SELECT {columns} FROM {ARCHIVE_SCHEMA}.flight)"
+
+def clear_archive(conn) -> None:
+    if is_archive_attached(conn):
+        conn.execute(f"DELETE FROM {ARCHIVE_SCHEMA}.flight")
+
+def _create_archive_table(conn, name: str, with_indexes: bool = True) -> None:
+    # Same columns and types as the hot table, without the foreign keys (which can't cross databases)
+    definitions = [
+        f"{column} INTEGER PRIMARY KEY" if column == "id" else f"{column} {definition}"
+        for column, definition in _get_columns(conn, "main").items()
+    ]
+    conn.execute(f"CREATE TABLE IF NOT EXISTS {ARCHIVE_SCHEMA}.{name} ({', '.join(definitions)})")
+
+    if with_indexes:
+        _create_archive_indexes(conn)
+
+def _create_archive_indexes(conn) -> None:
+    conn.execute(f"CREATE INDEX IF NOT EXISTS {ARCHIVE_SCHEMA}.idx_archive_flight_departure_time_scheduled ON flight (departure_time_scheduled)")
+    conn.execute(f"CREATE INDEX IF NOT EXISTS {ARCHIVE_SCHEMA}.idx_archive_flight_number ON flight (flight_number)")
+
+def _get_columns(conn, schema: str) -> dict:
+    return {row[1]: row[2] for row in conn.execute(f"PRAGMA {schema}.table_info(flight)").fetchall()}
@@ -1,10 +1,23 @@
+import atexit
+import queue
+import re
 import sqlite3
+import threading
 from pathlib import Path
-from contextlib import contextmanager
+from contextlib import contextmanager, nullcontext
 from typing import Optional
 from flightmanagement.config import settings
+from flightmanagement.db.db_url import MEMORY, parse_db_url
+from flightmanagement.db.snapshots import MemorySnapshot
+from flightmanagement.db.migrations import migrate
     
-def get_connection(db_path) -> sqlite3.Connection:
+def get_connection(db_path=None) -> sqlite3.Connection:
+    # Without a path, connect to the database in settings.db_url. A hybrid database is opened
+    # directly on disk here; only a connection pool keeps it in memory.
+    if db_path is None:
+        database = parse_db_url(settings.db_url)
+        db_path = MEMORY if database.mode == "memory" else database.path
+
     conn = sqlite3.connect(db_path)
 
     # Set the connection to return rows as dictionaries rather than lists
@@ -15,6 +28,257 @@ def get_connection(db_path) -> sqlite3.Connection:
 
     return conn
 
+class ConnectionPool:
+
+    SYNCHRONOUS_LEVELS = {"OFF", "NORMAL", "FULL", "EXTRA"}
+    READ_STATEMENTS = ("SELECT", "WITH", "EXPLAIN", "VALUES")
+
+    def __init__(self, db_path, pool_size: int | None = None, busy_timeout: int | None = None, synchronous: str | None = None,
+                 cache_size: int | None = None, tracer=None):
+        # An in-memory pool has no readers: every statement runs on the one connection
+        self.memory = str(db_path) == MEMORY
+        self.db_path = None if self.memory else Path(db_path).resolve()
+        self.pool_size = settings.db_pool_size if pool_size is None else pool_size
+        self.busy_timeout = settings.db_busy_timeout if busy_timeout is None else busy_timeout
+        self.synchronous = (settings.db_synchronous if synchronous is None else synchronous).upper()
+        self.cache_size = settings.db_cache_size if cache_size is None else cache_size
+
+        if self.pool_size < 1:
+            raise ValueError(f"Invalid pool size: {self.pool_size}")
+
+        if self.synchronous not in self.SYNCHRONOUS_LEVELS:
+            raise ValueError(f"Invalid synchronous level: {self.synchronous}")
+
+        # Optional QueryTracer timing every statement run through the pool
+        self.tracer = tracer
+
+        # Optional MemorySnapshot writing an in-memory database back to disk
+        self.snapshot = None
+
+        # Identity maps of reference entities, by table, shared by every repository using this pool
+        self.identity_maps = {}
+
+        # PilotAvailability index of every pilot's flights, built by the flight repositories on first use
+        self.pilot_availability = None
+
+        # All writes go through a single connection, which also owns the journal mode. The write
+        # lock lets a snapshot copy the database between statements.
+        self.write_lock = threading.RLock()
+        self.__writer = self.__connect(read_only=False)
+        if not self.memory:
+            self.__writer.execute("PRAGMA journal_mode = WAL;")
+
+        # Readers are opened lazily, up to the pool size, and reused
+        self.__readers = queue.LifoQueue()
+        self.__reader_count = 0
+        self.__lock = threading.Lock()
+
+        # Databases attached to every connection, and the ones each reader has attached so far
+        self.__attachments = {}
+        self.__reader_attachments = {}
+
+    def __connect(self, read_only: bool) -> sqlite3.Connection:
+        if self.memory:
+            conn = sqlite3.connect(MEMORY, check_same_thread=False)
+        elif read_only:
+            conn = sqlite3.connect(f"{self.db_path.as_uri()}?mode=ro", uri=True, check_same_thread=False)
+        else:
+            conn = sqlite3.connect(self.db_path, check_same_thread=False)
+
+        conn.row_factory = sqlite3.Row
+        conn.execute(f"PRAGMA busy_timeout = {int(self.busy_timeout)};")
+        conn.execute(f"PRAGMA synchronous = {self.synchronous};")
+        conn.execute(f"PRAGMA cache_size = {-int(self.cache_size)};")
+        conn.execute("PRAGMA foreign_keys = ON;")
+
+        if self.tracer is not None:
+            self.tracer.attach(conn)
+
+        return conn
+
+    @contextmanager
+    def reader(self):
+        # The in-memory writer is shared, so it's held under the write lock like any other use of it
+        if self.memory:
+            with self.write_lock:
+                yield self.__writer
+            return
+
+        conn = None
+        with self.__lock:
+            if self.__readers.empty() and self.__reader_count < self.pool_size:
+                conn = self.__connect(read_only=True)
+                self.__reader_count += 1
+
+        if conn is None:
+            conn = self.__readers.get()
+
+        # Readers opened, or idle, before a database was attached pick it up on their next use
+        attached = self.__reader_attachments.setdefault(conn, set())
+        for schema, path in self.__attachments.items():
+            if schema not in attached:
+                conn.execute(f"ATTACH DATABASE ? AS {schema}", (f"{path.as_uri()}?mode=ro", ))
+                attached.add(schema)
+
+        try:
+            yield conn
+        finally:
+            self.__readers.put(conn)
+
+    def attach(self, path, schema: str) -> None:
+        if not re.fullmatch(r"[A-Za-z_]\w*", schema):
+            raise ValueError(f"Invalid schema name: {schema}")
+
+        # Each reader would get its own, empty, in-memory database
+        if str(path) == MEMORY and not self.memory:
+            raise ValueError("An in-memory database can only be attached to an in-memory pool")
+
+        # ATTACH can't run inside a transaction; the writer creates the file if it doesn't exist
+        if self.__writer.in_transaction:
+            self.__writer.commit()
+        path = path if str(path) == MEMORY else Path(path).resolve()
+        self.__writer.execute(f"ATTACH DATABASE ? AS {schema}", (str(path), ))
+        self.__attachments[schema] = path
+
+    @property
+    def attachments(self) -> dict:
+        return dict(self.__attachments)
+
+    @property
+    def writer(self) -> sqlite3.Connection:
+        return self.__writer
+
+    @property
+    def in_transaction(self) -> bool:
+        return self.__writer.in_transaction
+
+    @property
+    def total_changes(self) -> int:
+        return self.__writer.total_changes
+
+    def is_read_statement(self, sql: str) -> bool:
+        return sql.lstrip().upper().startswith(self.READ_STATEMENTS)
+
+    def execute(self, sql: str, parameters=()):
+        # A read's rows are fetched before its connection is given back, so no other thread can step
+        # the cursor's statement. Reads inside an open write transaction must see its uncommitted changes.
+        if self.is_read_statement(sql):
+            if not self.__writer.in_transaction:
+                with self.reader() as conn:
+                    return FetchedRows(self.__execute(conn, sql, parameters))
+            with self.write_lock:
+                return FetchedRows(self.__execute(self.__writer, sql, parameters))
+
+        with self.write_lock:
+            return self.__execute(self.__writer, sql, parameters)
+
+    def stream(self, sql: str, parameters=(), batch_size: int = 1000):
+        # Yields a read's rows in batches, for results too large to fetch at once as execute does.
+        # The connection is held until the rows run out or the generator is closed.
+        if self.is_read_statement(sql) and not self.__writer.in_transaction:
+            connection = self.reader()
+        else:
+            connection = nullcontext(self.__writer)
+
+        with connection as conn:
+            cursor = self.__execute(conn, sql, parameters)
+            try:
+                while rows := cursor.fetchmany(batch_size):
+                    yield rows
+            finally:
+                cursor.close()
+
+    def __execute(self, conn, sql: str, parameters):
+        if self.tracer is not None:
+            return self.tracer.execute(conn, sql, parameters)
+        return conn.execute(sql, parameters)
+
+    def executemany(self, sql: str, seq_of_parameters):
+        with self.write_lock:
+            if self.tracer is not None:
+                return self.tracer.executemany(self.__writer, sql, seq_of_parameters)
+            return self.__writer.executemany(sql, seq_of_parameters)
+
+    def executescript(self, sql_script: str):
+        with self.write_lock:
+            return self.__writer.executescript(sql_script)
+
+    def commit(self):
+        with self.write_lock:
+            self.__writer.commit()
+
+    def rollback(self):
+        with self.write_lock:
+            self.__writer.rollback()
+
+        # Items cached during the transaction may no longer exist
+        for identity_map in self.identity_maps.values():
+            identity_map.clear()
+        if self.pilot_availability is not None:
+            self.pilot_availability.invalidate()
+
+    def close(self):
+        # Take the final snapshot while the database is still open
+        if self.snapshot is not None:
+            self.snapshot.close()
+
+        while not self.__readers.empty():
+            self.__readers.get().close()
+        self.__reader_count = 0
+        self.__reader_attachments.clear()
+        self.__writer.close()
+
+class FetchedRows:
+    # The rows of a read run through a pool, with the cursor methods callers use to read them
+
+    rowcount = -1
+    lastrowid = None
+
+    def __init__(self, cursor):
+        self.description = cursor.description
+        self.__rows = cursor.fetchall()
+        self.__position = 0
+        cursor.close()
+
+    def fetchone(self):
+        rows = self.fetchmany(1)
+        return rows[0] if rows else None
+
+    def fetchmany(self, size: int = 1) -> list:
+        rows = self.__rows[self.__position:self.__position + size]
+        self.__position += len(rows)
+        return rows
+
+    def fetchall(self) -> list:
+        return self.fetchmany(len(self.__rows))
+
+    def __iter__(self):
+        return iter(self.fetchall())
+
+    def close(self):
+        self.__rows = []
+        self.__position = 0
+
+def get_connection_pool(db_path=None, tracer=None) -> ConnectionPool:
+    if db_path is not None:
+        return ConnectionPool(db_path, tracer=tracer)
+
+    # Resolve the database from settings.db_url
+    database = parse_db_url(settings.db_url)
+    if database.mode == "file":
+        return ConnectionPool(database.path, tracer=tracer)
+
+    pool = ConnectionPool(MEMORY, tracer=tracer)
+
+    # Hybrid: load the database into memory, then write it back on a timer and at exit
+    if database.mode == "hybrid":
+        pool.snapshot = MemorySnapshot(pool, database.path, database.snapshot_interval)
+        pool.snapshot.load()
+        pool.snapshot.start()
+        atexit.register(pool.snapshot.close)
+
+    return pool
+
 @contextmanager
 def transaction(conn):
     try:
@@ -24,96 +288,40 @@ def transaction(conn):
         conn.rollback()
         raise
 
-def initialise_schema(conn):
-
-    # Drop the tables if they already exist
-    conn.execute("DROP TABLE IF EXISTS flight")
-    conn.execute("DROP TABLE IF EXISTS aircraft")
-    conn.execute("DROP TABLE IF EXISTS pilot")
-    conn.execute("DROP TABLE IF EXISTS airport")    
+def drop_schema(conn):
 
-    # Create the tables
-    conn.execute("""
-        CREATE TABLE IF NOT EXISTS aircraft (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            registration VARCHAR(20) UNIQUE,
-            manufacturer_serial_no INTEGER UNIQUE,
-            icao_hex VARCHAR(20) UNIQUE,
-            manufacturer VARCHAR(20),
-            model VARCHAR(20),
-            icao_type VARCHAR(20),
-            status VARCHAR(20) CHECK(status IN ('Active', 'Inactive', 'Decommissioned'))
-        )
-    """)
+    # Foreign key enforcement can only be toggled outside a transaction
+    if conn.in_transaction:
+        conn.commit()
+    conn.execute("PRAGMA foreign_keys = OFF;")
 
-    conn.execute("""
-        CREATE TABLE IF NOT EXISTS airport (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            code VARCHAR(20) UNIQUE,
-            name VARCHAR(20),
-            city VARCHAR(20),
-            country VARCHAR(20),
-            region VARCHAR(20)
-        )            
-    """)
+    try:
+        objects = conn.execute("""
+            SELECT type, name, sql
+            FROM sqlite_master
+            WHERE type IN ('view', 'table') AND name NOT LIKE 'sqlite_%'
+        """).fetchall()
 
-    conn.execute("""
-        CREATE TABLE IF NOT EXISTS pilot (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            first_name VARCHAR(20),
-            family_name VARCHAR(20)
-        )
-    """)
+        # Drop views first, then virtual tables (which also drop their shadow tables), then tables
+        for row in objects:
+            if row["type"] == "view":
+                conn.execute(f"DROP VIEW IF EXISTS {row['name']}")
+        for row in objects:
+            if row["type"] == "table" and (row["sql"] or "").upper().startswith("CREATE VIRTUAL TABLE"):
+                conn.execute(f"DROP TABLE IF EXISTS {row['name']}")
+        for row in objects:
+            if row["type"] == "table":
+                conn.execute(f"DROP TABLE IF EXISTS {row['name']}")
 
-    conn.execute("""
-        CREATE TABLE IF NOT EXISTS flight (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            flight_number VARCHAR(20),
-            aircraft_id INTEGER,
-            origin_id INTEGER,
-            destination_id INTEGER,
-            pilot_id INTEGER,
-            copilot_id INTEGER,
-            departure_time_scheduled TEXT,
-            arrival_time_scheduled TEXT,
-            departure_time_actual TEXT,
-            arrival_time_actual TEXT,
-            status VARCHAR(20) CHECK(status IN ('Scheduled', 'On time', 'Delayed', 'Boarding', 'Closed', 'Departed', 'Arrived')),
-            FOREIGN KEY(aircraft_id) REFERENCES aircraft(id),
-            FOREIGN KEY(origin_id) REFERENCES airport(id),
-            FOREIGN KEY(destination_id) REFERENCES airport(id),
-            FOREIGN KEY(pilot_id) REFERENCES pilot(id),
-            FOREIGN KEY(copilot_id) REFERENCES pilot(id),
-            UNIQUE(flight_number, departure_time_scheduled)
-        )
-    """)
+        conn.commit()
+    finally:
+        conn.execute("PRAGMA foreign_keys = ON;")
 
-    # Create views
-    conn.execute("""
-        CREATE VIEW IF NOT EXISTS vw_denormalised_flights AS 
-            SELECT 
-                f.id AS flight_id,
-                f.flight_number,
-                ac.registration AS aircraft_registration,
-                CONCAT(ac.manufacturer, ' ', ac.model) AS aircraft_type,
-                apo.code AS origin,
-                apd.code AS destination,
-                IFNULL(f.departure_time_scheduled, '') AS departure_time_scheduled,
-                IFNULL(f.arrival_time_scheduled, '') AS arrival_time_scheduled,
-                IFNULL(f.departure_time_actual, '') AS departure_time_actual,
-                IFNULL(f.arrival_time_actual, '') AS arrival_time_actual,
-                CONCAT(p.first_name, ' ', p.family_name) AS pilot,
-                CONCAT(cp.first_name, ' ', cp.family_name) AS copilot,
-                f.status AS status
-            FROM flight f
-            LEFT JOIN aircraft ac ON ac.id = f.aircraft_id
-            LEFT JOIN pilot p ON p.id = f.pilot_id
-            LEFT JOIN pilot cp ON cp.id = f.copilot_id
-            LEFT JOIN airport apo ON apo.id = f.origin_id
-            LEFT JOIN airport apd ON apd.id = f.destination_id
-    """)
+def initialise_schema(conn):
 
-    conn.commit()
+    # Rebuild the database from scratch by replaying every migration
+    drop_schema(conn)
+    migrate(conn)
 
 def seed_database_data(conn):
 
@@ -0,0 +1,50 @@
+from pathlib import Path
+from urllib.parse import parse_qs, urlsplit
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+MEMORY = ":memory:"
+DEFAULT_SNAPSHOT_INTERVAL = 60
+
+class DatabaseUrl:
+
+    # mode is "file" (on disk), "memory" (nothing persisted) or "hybrid" (in memory, snapshotted to path)
+    def __init__(self, mode: str, path: Path | None = None, snapshot_interval: float | None = None):
+        self.mode = mode
+        self.path = path
+        self.snapshot_interval = snapshot_interval
+
+    def __repr__(self):
+        return f"DatabaseUrl(mode={self.mode!r}, path={self.path!r}, snapshot_interval={self.snapshot_interval!r})"
+
+def parse_db_url(url: str) -> DatabaseUrl:
+    # sqlite:///relative/path.db (relative to the project root), sqlite:////absolute/path.db,
+    # sqlite:///:memory: and sqlite:///path.db?mode=memory&snapshot_interval=60 for the hybrid mode.
+    # A bare path is treated as a file.
+    if "://" not in url:
+        return DatabaseUrl("memory") if url == MEMORY else DatabaseUrl("file", _resolve(url))
+
+    parts = urlsplit(url)
+    if parts.scheme != "sqlite":
+        raise ValueError(f"Unsupported database URL scheme: {parts.scheme}")
+
+    # urlsplit leaves the separator after the empty host, so sqlite:///data/x.db has path /data/x.db
+    path = parts.path[1:] if parts.path.startswith("/") else parts.path
+    if path in ("", MEMORY):
+        return DatabaseUrl("memory")
+
+    options = {key: values[-1] for key, values in parse_qs(parts.query).items()}
+    mode = options.get("mode", "file")
+
+    if mode == "file":
+        return DatabaseUrl("file", _resolve(path))
+    if mode == "memory":
+        interval = float(options.get("snapshot_interval", DEFAULT_SNAPSHOT_INTERVAL))
+        if interval <= 0:
+            raise ValueError(f"Invalid snapshot interval: {interval}")
+        return DatabaseUrl("hybrid", _resolve(path), interval)
+
+    raise ValueError(f"Unsupported database mode: {mode}")
+
+def _resolve(path: str) -> Path:
+    path = Path(path)
+    return path if path.is_absolute() else PROJECT_ROOT / path
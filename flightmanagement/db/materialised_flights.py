@@ -0,0 +1,104 @@
+# Opt-in materialised copy of vw_denormalised_flights, kept in sync by triggers
+
+MATERIALISED_TABLE = "flight_denormalised"
+
+def is_materialised(conn) -> bool:
+    row = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?",
+        (MATERIALISED_TABLE, )
+    ).fetchone()
+    return row is not None
+
+def create_materialised_flights(conn) -> None:
+
+    # Same columns, in the same order, as vw_denormalised_flights
+    conn.execute(f"""
+        CREATE TABLE IF NOT EXISTS {MATERIALISED_TABLE} (
+            flight_id INTEGER PRIMARY KEY,
+            flight_number VARCHAR(20),
+            aircraft_registration VARCHAR(20),
+            aircraft_type TEXT,
+            origin VARCHAR(20),
+            destination VARCHAR(20),
+            departure_time_scheduled TEXT,
+            arrival_time_scheduled TEXT,
+            departure_time_actual TEXT,
+            arrival_time_actual TEXT,
+            pilot TEXT,
+            copilot TEXT,
+            status VARCHAR(20)
+        )
+    """)
+    conn.execute(f"CREATE INDEX IF NOT EXISTS idx_{MATERIALISED_TABLE}_departure ON {MATERIALISED_TABLE} (departure_time_scheduled)")
+    conn.execute(f"CREATE INDEX IF NOT EXISTS idx_{MATERIALISED_TABLE}_flight_number ON {MATERIALISED_TABLE} (flight_number)")
+
+    # Flight changes refresh the single affected row
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_{MATERIALISED_TABLE}_flight_insert AFTER INSERT ON flight
+        BEGIN
+            INSERT OR REPLACE INTO {MATERIALISED_TABLE} SELECT * FROM vw_denormalised_flights WHERE flight_id = NEW.id;
+        END
+    """)
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_{MATERIALISED_TABLE}_flight_update AFTER UPDATE ON flight
+        BEGIN
+            DELETE FROM {MATERIALISED_TABLE} WHERE flight_id = OLD.id;
+            INSERT OR REPLACE INTO {MATERIALISED_TABLE} SELECT * FROM vw_denormalised_flights WHERE flight_id = NEW.id;
+        END
+    """)
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_{MATERIALISED_TABLE}_flight_delete AFTER DELETE ON flight
+        BEGIN
+            DELETE FROM {MATERIALISED_TABLE} WHERE flight_id = OLD.id;
+        END
+    """)
+
+    # Reference data changes refresh every flight using that row, found through the flight indexes
+    reference_filters = {
+        "aircraft": "SELECT id FROM flight WHERE aircraft_id = {key}",
+        "airport": "SELECT id FROM flight WHERE origin_id = {key} UNION SELECT id FROM flight WHERE destination_id = {key}",
+        "pilot": "SELECT id FROM flight WHERE pilot_id = {key} UNION SELECT id FROM flight WHERE copilot_id = {key}"
+    }
+    for table, flight_filter in reference_filters.items():
+        conn.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS trg_{MATERIALISED_TABLE}_{table}_update AFTER UPDATE ON {table}
+            BEGIN
+                INSERT OR REPLACE INTO {MATERIALISED_TABLE}
+                SELECT * FROM vw_denormalised_flights
+                WHERE flight_id IN ({flight_filter.format(key="OLD.id")} UNION {flight_filter.format(key="NEW.id")});
+            END
+        """)
+        conn.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS trg_{MATERIALISED_TABLE}_{table}_delete AFTER DELETE ON {table}
+            BEGIN
+                INSERT OR REPLACE INTO {MATERIALISED_TABLE}
+                SELECT * FROM vw_denormalised_flights
+                WHERE flight_id IN ({flight_filter.format(key="OLD.id")});
+            END
+        """)
+
+def rebuild_materialised_flights(conn) -> int:
+    conn.execute(f"DELETE FROM {MATERIALISED_TABLE}")
+    conn.execute(f"INSERT INTO {MATERIALISED_TABLE} SELECT * FROM vw_denormalised_flights")
+    return conn.execute(f"SELECT COUNT(*) FROM {MATERIALISED_TABLE}").fetchone()[0]
+
+def drop_materialised_flights(conn) -> None:
+    triggers = conn.execute(
+        "SELECT name FROM sqlite_master WHERE type = 'trigger' AND name LIKE ?",
+        (f"trg_{MATERIALISED_TABLE}_%", )
+    ).fetchall()
+    for row in triggers:
+        conn.execute(f"DROP TRIGGER IF EXISTS {row[0]}")
+    conn.execute(f"DROP TABLE IF EXISTS {MATERIALISED_TABLE}")
+
+def set_materialised_flights(conn, enabled: bool) -> None:
+    # Create (and populate) or drop the materialised table so it matches the setting
+    if enabled == is_materialised(conn):
+        return
+
+    if enabled:
+        create_materialised_flights(conn)
+        rebuild_materialised_flights(conn)
+    else:
+        drop_materialised_flights(conn)
+    conn.commit()
@@ -0,0 +1,531 @@
+import re
+from contextlib import contextmanager
+from typing import Callable
+from flightmanagement.db.flight_times import FLIGHT_TIME_COLUMNS, get_flight_times, get_flight_time_storage
+
+# Registered migrations as (version, description, apply function), kept in version order
+MIGRATIONS: list[tuple[int, str, Callable]] = []
+
+# Views and triggers built from the flight table's time storage, recreated whenever it changes
+FLIGHT_DEPENDENTS: list[Callable] = []
+
+def migration(version: int, description: str):
+    def register(apply: Callable) -> Callable:
+        if any(existing == version for existing, _, _ in MIGRATIONS):
+            raise ValueError(f"Duplicate migration version: {version}")
+        MIGRATIONS.append((version, description, apply))
+        MIGRATIONS.sort(key=lambda item: item[0])
+        return apply
+    return register
+
+def flight_dependent(create: Callable) -> Callable:
+    FLIGHT_DEPENDENTS.append(create)
+    return create
+
+def ensure_version_table(conn) -> None:
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS schema_version (
+            version INTEGER PRIMARY KEY,
+            description TEXT,
+            applied_at TEXT DEFAULT (datetime('now'))
+        )
+    """)
+
+def get_schema_version(conn) -> int:
+    ensure_version_table(conn)
+    result = conn.execute("SELECT MAX(version) FROM schema_version").fetchone()
+    return result[0] or 0
+
+def get_pending_migrations(conn) -> list[tuple[int, str, Callable]]:
+    current = get_schema_version(conn)
+    return [item for item in MIGRATIONS if item[0] > current]
+
+def migrate(conn, target: int | None = None) -> list[int]:
+    # Apply every pending migration up to the target version in a single transaction
+    if conn.in_transaction:
+        conn.commit()
+
+    conn.execute("BEGIN")
+    try:
+        pending = [
+            item for item in get_pending_migrations(conn)
+            if target is None or item[0] <= target
+        ]
+        for version, description, apply in pending:
+            apply(conn)
+            conn.execute(
+                "INSERT INTO schema_version (version, description) VALUES (?, ?)",
+                (version, description)
+            )
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+
+    return [version for version, _, _ in pending]
+
+def column_exists(conn, table: str, column: str) -> bool:
+    columns = conn.execute(f"PRAGMA table_info({table})").fetchall()
+    return any(row[1] == column for row in columns)
+
+def add_column(conn, table: str, column: str, definition: str) -> None:
+    # ADD COLUMN only updates the schema, so existing rows are not rewritten
+    if not column_exists(conn, table, column):
+        conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+
+def create_index(conn, name: str, table: str, columns: list[str], unique: bool = False) -> None:
+    conn.execute(
+        f"CREATE {'UNIQUE ' if unique else ''}INDEX IF NOT EXISTS {name} ON {table} ({', '.join(columns)})"
+    )
+
+@contextmanager
+def deferred_indexes(conn, table: str):
+    # Drops the table's indexes and builds them again at the end, which is several times faster than
+    # maintaining them row by row through a large load. Unique indexes stay, since they enforce
+    # constraints. The drop happens inside the caller's transaction, so other connections never see
+    # the table without its indexes; after an error they come back with the rollback.
+    if not conn.in_transaction:
+        conn.execute("BEGIN")
+
+    indexes = conn.execute(
+        "SELECT name, sql FROM sqlite_master WHERE type = 'index' AND tbl_name = ? AND sql IS NOT NULL",
+        (table, )
+    ).fetchall()
+    indexes = [(name, sql) for name, sql in indexes if not re.match(r"\s*CREATE\s+UNIQUE", sql, flags=re.IGNORECASE)]
+
+    for name, _ in indexes:
+        conn.execute(f"DROP INDEX {name}")
+
+    yield
+
+    for _, sql in indexes:
+        conn.execute(sql)
+
+@migration(1, "Initial schema")
+def create_initial_schema(conn) -> None:
+
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS aircraft (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            registration VARCHAR(20) UNIQUE,
+            manufacturer_serial_no INTEGER UNIQUE,
+            icao_hex VARCHAR(20) UNIQUE,
+            manufacturer VARCHAR(20),
+            model VARCHAR(20),
+            icao_type VARCHAR(20),
+            status VARCHAR(20) CHECK(status IN ('Active', 'Inactive', 'Decommissioned'))
+        )
+    """)
+
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS airport (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            code VARCHAR(20) UNIQUE,
+            name VARCHAR(20),
+            city VARCHAR(20),
+            country VARCHAR(20),
+            region VARCHAR(20)
+        )            
+    """)
+
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS pilot (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            first_name VARCHAR(20),
+            family_name VARCHAR(20)
+        )
+    """)
+
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS flight (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            flight_number VARCHAR(20),
+            aircraft_id INTEGER,
+            origin_id INTEGER,
+            destination_id INTEGER,
+            pilot_id INTEGER,
+            copilot_id INTEGER,
+            departure_time_scheduled TEXT,
+            arrival_time_scheduled TEXT,
+            departure_time_actual TEXT,
+            arrival_time_actual TEXT,
+            status VARCHAR(20) CHECK(status IN ('Scheduled', 'On time', 'Delayed', 'Boarding', 'Closed', 'Departed', 'Arrived')),
+            FOREIGN KEY(aircraft_id) REFERENCES aircraft(id),
+            FOREIGN KEY(origin_id) REFERENCES airport(id),
+            FOREIGN KEY(destination_id) REFERENCES airport(id),
+            FOREIGN KEY(pilot_id) REFERENCES pilot(id),
+            FOREIGN KEY(copilot_id) REFERENCES pilot(id),
+            UNIQUE(flight_number, departure_time_scheduled)
+        )
+    """)
+
+    # Create views
+    conn.execute("""
+        CREATE VIEW IF NOT EXISTS vw_denormalised_flights AS 
+            SELECT 
+                f.id AS flight_id,
+                f.flight_number,
+                ac.registration AS aircraft_registration,
+                CONCAT(ac.manufacturer, ' ', ac.model) AS aircraft_type,
+                apo.code AS origin,
+                apd.code AS destination,
+                IFNULL(f.departure_time_scheduled, '') AS departure_time_scheduled,
+                IFNULL(f.arrival_time_scheduled, '') AS arrival_time_scheduled,
+                IFNULL(f.departure_time_actual, '') AS departure_time_actual,
+                IFNULL(f.arrival_time_actual, '') AS arrival_time_actual,
+                CONCAT(p.first_name, ' ', p.family_name) AS pilot,
+                CONCAT(cp.first_name, ' ', cp.family_name) AS copilot,
+                f.status AS status
+            FROM flight f
+            LEFT JOIN aircraft ac ON ac.id = f.aircraft_id
+            LEFT JOIN pilot p ON p.id = f.pilot_id
+            LEFT JOIN pilot cp ON cp.id = f.copilot_id
+            LEFT JOIN airport apo ON apo.id = f.origin_id
+            LEFT JOIN airport apd ON apd.id = f.destination_id
+    """)
+
+@migration(2, "Indexes for flight access paths")
+def create_flight_indexes(conn) -> None:
+
+    # Listings and range queries on scheduled times
+    create_index(conn, "idx_flight_departure_time_scheduled", "flight", ["departure_time_scheduled"])
+    create_index(conn, "idx_flight_arrival_time_scheduled", "flight", ["arrival_time_scheduled", "departure_time_scheduled"])
+
+    # Resource lookups; the arrival time lets availability checks seek straight to current flights.
+    # These also serve foreign key checks when a parent row is deleted.
+    create_index(conn, "idx_flight_pilot", "flight", ["pilot_id", "arrival_time_scheduled"])
+    create_index(conn, "idx_flight_copilot", "flight", ["copilot_id", "arrival_time_scheduled"])
+    create_index(conn, "idx_flight_aircraft", "flight", ["aircraft_id", "arrival_time_scheduled"])
+    create_index(conn, "idx_flight_route", "flight", ["origin_id", "destination_id"])
+    create_index(conn, "idx_flight_destination", "flight", ["destination_id"])
+
+    # Pilot listings and family name searches
+    create_index(conn, "idx_pilot_name", "pilot", ["first_name", "family_name"])
+    create_index(conn, "idx_pilot_family_name", "pilot", ["family_name"])
+
+@flight_dependent
+def create_flight_views(conn, flight_times) -> None:
+    conn.execute("DROP VIEW IF EXISTS vw_denormalised_flights")
+    conn.execute(f"""
+        CREATE VIEW vw_denormalised_flights AS 
+            SELECT 
+                f.id AS flight_id,
+                f.flight_number,
+                ac.registration AS aircraft_registration,
+                IFNULL(ac.manufacturer, '') || ' ' || IFNULL(ac.model, '') AS aircraft_type,
+                apo.code AS origin,
+                apd.code AS destination,
+                IFNULL({flight_times.sql_text("f.departure_time_scheduled")}, '') AS departure_time_scheduled,
+                IFNULL({flight_times.sql_text("f.arrival_time_scheduled")}, '') AS arrival_time_scheduled,
+                IFNULL({flight_times.sql_text("f.departure_time_actual")}, '') AS departure_time_actual,
+                IFNULL({flight_times.sql_text("f.arrival_time_actual")}, '') AS arrival_time_actual,
+                IFNULL(p.first_name, '') || ' ' || IFNULL(p.family_name, '') AS pilot,
+                IFNULL(cp.first_name, '') || ' ' || IFNULL(cp.family_name, '') AS copilot,
+                f.status AS status
+            FROM flight f
+            LEFT JOIN aircraft ac ON ac.id = f.aircraft_id
+            LEFT JOIN pilot p ON p.id = f.pilot_id
+            LEFT JOIN pilot cp ON cp.id = f.copilot_id
+            LEFT JOIN airport apo ON apo.id = f.origin_id
+            LEFT JOIN airport apd ON apd.id = f.destination_id
+    """)
+
+@migration(3, "Storage-aware denormalised flights view without CONCAT")
+def recreate_flight_views(conn) -> None:
+    # CONCAT needs SQLite 3.44+, and formatting has to follow the flight time storage
+    create_flight_views(conn, get_flight_times(conn))
+
+def convert_flight_times(conn, storage: str) -> bool:
+    # Rewrite the flight time columns to the requested storage; returns False if already there
+    source = get_flight_times(conn)
+    target = get_flight_time_storage(storage)
+    if source.storage == target.storage:
+        return False
+
+    if conn.in_transaction:
+        conn.commit()
+
+    # Rebuilding the table means dropping it, which foreign key enforcement would refuse
+    conn.execute("PRAGMA foreign_keys = OFF;")
+    try:
+        conn.execute("BEGIN")
+        try:
+            table_sql = conn.execute("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'flight'").fetchone()[0]
+            index_sql = [
+                row[0] for row in conn.execute(
+                    "SELECT sql FROM sqlite_master WHERE type = 'index' AND tbl_name = 'flight' AND sql IS NOT NULL"
+                ).fetchall()
+            ]
+            views = conn.execute("SELECT name, sql FROM sqlite_master WHERE type = 'view'").fetchall()
+            triggers = conn.execute("SELECT name, sql FROM sqlite_master WHERE type = 'trigger'").fetchall()
+            sequence = conn.execute("SELECT seq FROM sqlite_sequence WHERE name = 'flight'").fetchone()
+            columns = [row[1] for row in conn.execute("PRAGMA table_info(flight)").fetchall()]
+
+            # Views and triggers referencing flight would block the rename below
+            for trigger in triggers:
+                conn.execute(f"DROP TRIGGER IF EXISTS {trigger[0]}")
+            for view in views:
+                conn.execute(f"DROP VIEW IF EXISTS {view[0]}")
+
+            # Same definition as the current table, with the time columns retyped
+            new_table_sql = re.sub(r"^CREATE TABLE\s+(IF NOT EXISTS\s+)?\"?flight\"?", "CREATE TABLE flight_new", table_sql, flags=re.IGNORECASE)
+            for column in FLIGHT_TIME_COLUMNS:
+                new_table_sql = re.sub(rf"\b{column}\s+\w+", f"{column} {target.column_type}", new_table_sql)
+            conn.execute(new_table_sql)
+
+            select_list = [
+                target.sql_from_minutes(source.sql_minutes(column)) if column in FLIGHT_TIME_COLUMNS else column
+                for column in columns
+            ]
+            conn.execute(f"INSERT INTO flight_new ({', '.join(columns)}) SELECT {', '.join(select_list)} FROM flight")
+            conn.execute("DROP TABLE flight")
+            conn.execute("ALTER TABLE flight_new RENAME TO flight")
+
+            # Keep AUTOINCREMENT from reusing ids of deleted flights
+            if sequence is not None:
+                conn.execute("UPDATE sqlite_sequence SET seq = ? WHERE name = 'flight'", (sequence[0], ))
+
+            for sql in index_sql:
+                conn.execute(sql)
+
+            for create in FLIGHT_DEPENDENTS:
+                create(conn, target)
+
+            # Put back any other views and triggers exactly as they were
+            for object_type, saved in (("view", views), ("trigger", triggers)):
+                for name, sql in saved:
+                    exists = conn.execute("SELECT 1 FROM sqlite_master WHERE type = ? AND name = ?", (object_type, name)).fetchone()
+                    if exists is None:
+                        conn.execute(sql)
+
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+    finally:
+        conn.execute("PRAGMA foreign_keys = ON;")
+
+    return True
+
+# Full-text search over reference data. Rows are keyed as id * 3 + entity offset so the
+# triggers can update an entity's entry by rowid instead of searching for it.
+SEARCH_INDEX_ENTITIES = {
+    "airport": (0, "IFNULL({row}.code, '') || ' ' || IFNULL({row}.name, '') || ' ' || IFNULL({row}.city, '') || ' ' || IFNULL({row}.country, '')"),
+    "pilot": (1, "IFNULL({row}.first_name, '') || ' ' || IFNULL({row}.family_name, '')"),
+    "aircraft": (2, "IFNULL({row}.registration, '') || ' ' || IFNULL({row}.manufacturer, '') || ' ' || IFNULL({row}.model, '')")
+}
+
+@migration(4, "Full-text search index for airports, pilots and aircraft")
+def create_search_index(conn) -> None:
+
+    # The trigram tokenizer matches substrings, which also lets searches tolerate misspellings
+    conn.execute("""
+        CREATE VIRTUAL TABLE IF NOT EXISTS search_index USING fts5(
+            entity UNINDEXED,
+            terms,
+            tokenize = 'trigram'
+        )
+    """)
+
+    for entity, (offset, terms) in SEARCH_INDEX_ENTITIES.items():
+        conn.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS trg_search_index_{entity}_insert AFTER INSERT ON {entity}
+            BEGIN
+                INSERT INTO search_index (rowid, entity, terms) VALUES (NEW.id * 3 + {offset}, '{entity}', {terms.format(row="NEW")});
+            END
+        """)
+        conn.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS trg_search_index_{entity}_update AFTER UPDATE ON {entity}
+            BEGIN
+                DELETE FROM search_index WHERE rowid = OLD.id * 3 + {offset};
+                INSERT INTO search_index (rowid, entity, terms) VALUES (NEW.id * 3 + {offset}, '{entity}', {terms.format(row="NEW")});
+            END
+        """)
+        conn.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS trg_search_index_{entity}_delete AFTER DELETE ON {entity}
+            BEGIN
+                DELETE FROM search_index WHERE rowid = OLD.id * 3 + {offset};
+            END
+        """)
+
+        # Index the rows that already exist
+        conn.execute(f"""
+            INSERT INTO search_index (rowid, entity, terms)
+            SELECT id * 3 + {offset}, '{entity}', {terms.format(row=entity)} FROM {entity}
+        """)
+
+# Minutes flown by each pilot on each day, so duty limits read a few rows per pilot rather than
+# summing their flights. A flight counts in full on the day of its scheduled arrival, once for each
+# seat its pilots fly; days are whole days since 1970, whichever way flight times are stored.
+DUTY_TABLE = "pilot_duty_day"
+DUTY_COLUMNS = ("pilot_id", "copilot_id")
+
+@migration(5, "Pilot duty day ledger")
+def create_pilot_duty_ledger(conn) -> None:
+    conn.execute(f"""
+        CREATE TABLE IF NOT EXISTS {DUTY_TABLE} (
+            pilot_id INTEGER NOT NULL,
+            day INTEGER NOT NULL,
+            minutes INTEGER NOT NULL,
+            flights INTEGER NOT NULL,
+            PRIMARY KEY (pilot_id, day)
+        ) WITHOUT ROWID
+    """)
+    create_pilot_duty_triggers(conn, get_flight_times(conn))
+    rebuild_pilot_duty_ledger(conn)
+
+@flight_dependent
+def create_pilot_duty_triggers(conn, flight_times) -> None:
+    # A flight's day and minutes depend on the time storage, so the triggers are rebuilt with it
+    if conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (DUTY_TABLE, )).fetchone() is None:
+        return
+
+    def add(row: str) -> str:
+        return "\n".join(f"""
+            INSERT INTO {DUTY_TABLE} (pilot_id, day, minutes, flights)
+            SELECT {row}.{column}, {duty_day_sql(flight_times, row)}, {duty_minutes_sql(flight_times, row)}, 1
+            WHERE {row}.{column} IS NOT NULL AND {duty_day_sql(flight_times, row)} IS NOT NULL
+            AND {row}.departure_time_scheduled IS NOT NULL
+            ON CONFLICT (pilot_id, day) DO UPDATE SET minutes = minutes + excluded.minutes, flights = flights + 1;
+        """ for column in DUTY_COLUMNS)
+
+    def remove(row: str) -> str:
+        return "\n".join(f"""
+            UPDATE {DUTY_TABLE} SET minutes = minutes - {duty_minutes_sql(flight_times, row)}, flights = flights - 1
+            WHERE pilot_id = {row}.{column} AND day = {duty_day_sql(flight_times, row)}
+            AND {row}.departure_time_scheduled IS NOT NULL;
+            DELETE FROM {DUTY_TABLE}
+            WHERE pilot_id = {row}.{column} AND day = {duty_day_sql(flight_times, row)} AND flights = 0;
+        """ for column in DUTY_COLUMNS)
+
+    # Only changes to the crew or times move minutes between pilots and days. Upserts set every
+    # column, so the values themselves are compared.
+    watched = (*DUTY_COLUMNS, *FLIGHT_TIME_COLUMNS)
+    changed = f"({', '.join(f'OLD.{column}' for column in watched)}) IS NOT ({', '.join(f'NEW.{column}' for column in watched)})"
+    bodies = {
+        "insert": ("AFTER INSERT ON flight", add("NEW")),
+        "update": (f"AFTER UPDATE OF {', '.join(watched)} ON flight WHEN {changed}", remove("OLD") + add("NEW")),
+        "delete": ("AFTER DELETE ON flight", remove("OLD"))
+    }
+    for event, (timing, body) in bodies.items():
+        conn.execute(f"DROP TRIGGER IF EXISTS trg_{DUTY_TABLE}_flight_{event}")
+        conn.execute(f"""
+            CREATE TRIGGER trg_{DUTY_TABLE}_flight_{event} {timing}
+            BEGIN
+                {body}
+            END
+        """)
+
+@contextmanager
+def deferred_pilot_duty(conn):
+    # Like deferred_indexes for the duty ledger: a large load is written without the triggers and
+    # the ledger is rebuilt from every flight at the end, in the caller's transaction
+    if not conn.in_transaction:
+        conn.execute("BEGIN")
+
+    triggers = conn.execute(
+        "SELECT name FROM sqlite_master WHERE type = 'trigger' AND name LIKE ?",
+        (f"trg_{DUTY_TABLE}_%", )
+    ).fetchall()
+    for row in triggers:
+        conn.execute(f"DROP TRIGGER {row[0]}")
+
+    yield
+
+    if triggers:
+        create_pilot_duty_triggers(conn, get_flight_times(conn))
+        rebuild_pilot_duty_ledger(conn)
+
+def rebuild_pilot_duty_ledger(conn) -> int:
+    # Recomputes the ledger from the flights, after writes made with the triggers dropped
+    flight_times = get_flight_times(conn)
+    conn.execute(f"DELETE FROM {DUTY_TABLE}")
+    conn.execute(f"""
+        INSERT INTO {DUTY_TABLE} (pilot_id, day, minutes, flights)
+        SELECT crew_id, day, SUM(minutes), COUNT(*)
+        FROM (
+            {" UNION ALL ".join(f'''
+                SELECT {column} AS crew_id, {duty_day_sql(flight_times, "flight")} AS day,
+                    {duty_minutes_sql(flight_times, "flight")} AS minutes
+                FROM flight
+                WHERE {column} IS NOT NULL AND departure_time_scheduled IS NOT NULL
+            ''' for column in DUTY_COLUMNS)}
+        )
+        WHERE day IS NOT NULL
+        GROUP BY crew_id, day
+    """)
+    return conn.execute(f"SELECT COUNT(*) FROM {DUTY_TABLE}").fetchone()[0]
+
+def duty_day_sql(flight_times, row: str) -> str:
+    return f"({flight_times.sql_minutes(f'{row}.arrival_time_scheduled')} / 1440)"
+
+def duty_minutes_sql(flight_times, row: str) -> str:
+    # Actual times where logged, as flown; a flight without minutes still counts as a flight
+    m = flight_times.sql_minutes
+    return (
+        f"IFNULL({m(f'IFNULL({row}.arrival_time_actual, {row}.arrival_time_scheduled)')}"
+        f" - {m(f'IFNULL({row}.departure_time_actual, {row}.departure_time_scheduled)')}, 0)"
+    )
+
+# Change data capture: every insert, update and delete of these tables is logged with an
+# increasing sequence number, so downstream systems can poll for what changed since they last
+# looked rather than export everything again
+CHANGE_LOG_TABLE = "change_log"
+CHANGE_LOG_TABLES = ("aircraft", "airport", "pilot", "flight")
+CHANGE_LOG_OPERATIONS = ("insert", "update", "delete")
+
+@migration(6, "Change log for downstream sync")
+def create_change_log(conn) -> None:
+    # AUTOINCREMENT so a sequence number is never reused, even once compaction has removed it.
+    # Writes are serialised, so entries become visible in sequence order too.
+    conn.execute(f"""
+        CREATE TABLE IF NOT EXISTS {CHANGE_LOG_TABLE} (
+            seq INTEGER PRIMARY KEY AUTOINCREMENT,
+            table_name VARCHAR(20) NOT NULL,
+            row_id INTEGER NOT NULL,
+            operation VARCHAR(20) NOT NULL CHECK(operation IN ({", ".join(f"'{operation}'" for operation in CHANGE_LOG_OPERATIONS)})),
+            changed_at TEXT NOT NULL DEFAULT (strftime('%Y-%m-%d %H:%M:%f', 'now'))
+        )
+    """)
+    create_index(conn, f"idx_{CHANGE_LOG_TABLE}_row", CHANGE_LOG_TABLE, ["table_name", "row_id", "seq"])
+
+    for table in CHANGE_LOG_TABLES:
+        for operation in CHANGE_LOG_OPERATIONS:
+            create_change_log_trigger(conn, table, operation)
+
+def create_change_log_trigger(conn, table: str, operation: str) -> None:
+    # The triggers only read the row id, so unlike the duty ledger's they don't depend on the
+    # time storage, and convert_flight_times puts them back as they were
+    row = "OLD" if operation == "delete" else "NEW"
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_{CHANGE_LOG_TABLE}_{table}_{operation} AFTER {operation.upper()} ON {table}
+        BEGIN
+            INSERT INTO {CHANGE_LOG_TABLE} (table_name, row_id, operation) VALUES ('{table}', {row}.id, '{operation}');
+        END
+    """)
+
+@contextmanager
+def deferred_change_log(conn, table: str):
+    # For large inserts: rows are inserted without the insert trigger, then logged with one
+    # statement at the end, in id order. Only ids above the largest before the load are logged,
+    # which covers every inserted row as tables with AUTOINCREMENT ids never reuse a lower one.
+    trigger = f"trg_{CHANGE_LOG_TABLE}_{table}_insert"
+    if not conn.in_transaction:
+        conn.execute("BEGIN")
+
+    exists = conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'trigger' AND name = ?", (trigger, )).fetchone()
+    last_id = conn.execute(f"SELECT IFNULL(MAX(id), 0) FROM {table}").fetchone()[0]
+    if exists:
+        conn.execute(f"DROP TRIGGER {trigger}")
+
+    yield
+
+    if exists:
+        create_change_log_trigger(conn, table, "insert")
+        conn.execute(
+            f"""
+            INSERT INTO {CHANGE_LOG_TABLE} (table_name, row_id, operation)
+            SELECT ?, id, 'insert' FROM {table} WHERE id > ? ORDER BY id
+            """,
+            (table, last_id)
+        )
@@ -0,0 +1,71 @@
+import os
+import sqlite3
+import threading
+from contextlib import closing
+from pathlib import Path
+
+class MemorySnapshot:
+
+    # Copies an in-memory connection pool's database to and from a file with the backup API
+    def __init__(self, pool, path, interval: float):
+        self.pool = pool
+        self.path = Path(path)
+        self.interval = interval
+        self.saved_count = 0
+
+        self.__stopped = threading.Event()
+        self.__thread = None
+
+    def load(self) -> bool:
+        if not self.path.exists():
+            return False
+
+        with closing(sqlite3.connect(self.path)) as disk:
+            # Fold in any write-ahead log left behind by running the database on disk
+            disk.execute("PRAGMA journal_mode = DELETE;")
+            with self.pool.write_lock:
+                disk.backup(self.pool.writer)
+        return True
+
+    def save(self) -> bool:
+        # Only committed data is written, so a snapshot is skipped while a transaction is open
+        snapshot_path = self.path.with_name(self.path.name + ".snapshot")
+
+        with self.pool.write_lock:
+            if self.pool.in_transaction:
+                return False
+
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            snapshot_path.unlink(missing_ok=True)
+            with closing(sqlite3.connect(snapshot_path)) as disk:
+                self.pool.writer.backup(disk)
+
+        # Swap the new file in whole, so a crash mid-write leaves the previous snapshot intact
+        os.replace(snapshot_path, self.path)
+        self.saved_count += 1
+        return True
+
+    def start(self) -> None:
+        self.__thread = threading.Thread(target=self.__run, name="memory-snapshot", daemon=True)
+        self.__thread.start()
+
+    def __run(self) -> None:
+        while not self.__stopped.wait(self.interval):
+            try:
+                self.save()
+            except (sqlite3.Error, OSError):
+                # Try again on the next tick rather than losing the timer
+                continue
+
+    def close(self) -> None:
+        if self.__stopped.is_set():
+            return
+
+        self.__stopped.set()
+        if self.__thread is not None:
+            self.__thread.join()
+
+        # Closing the pool discards an open transaction anyway, so drop it and keep what was committed
+        if self.pool.in_transaction:
+            self.pool.rollback()
+        self.save()
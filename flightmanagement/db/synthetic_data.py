@@ -0,0 +1,267 @@
+import math
+import random
+from datetime import datetime, timedelta
+from flightmanagement.db.flight_times import EPOCH, TEXT_FORMAT, get_flight_times
+from flightmanagement.db.migrations import deferred_change_log, deferred_indexes, deferred_pilot_duty
+
+BATCH_SIZE = 10000
+
+AIRCRAFT_TYPES = [
+    # manufacturer, model, ICAO type, cruise speed (km/h)
+    ("Airbus", "A220-300", "BCS3", 830),
+    ("Airbus", "A320-214", "A320", 830),
+    ("Airbus", "A321neo", "A21N", 840),
+    ("Airbus", "A350-941", "A359", 900),
+    ("Boeing", "737-8 MAX", "B38M", 840),
+    ("Boeing", "787-9 Dreamliner", "B789", 900),
+    ("Embraer", "E190", "E190", 820)
+]
+
+COUNTRIES = [
+    ("United Kingdom", "Europe"), ("France", "Europe"), ("Germany", "Europe"), ("Spain", "Europe"),
+    ("Netherlands", "Europe"), ("Italy", "Europe"), ("United States", "North America"), ("Canada", "North America"),
+    ("United Arab Emirates", "Middle East"), ("Qatar", "Middle East"), ("India", "South Asia"),
+    ("Singapore", "Southeast Asia"), ("Japan", "East Asia"), ("Australia", "Oceania")
+]
+
+FIRST_NAMES = [
+    "Alex", "Emily", "Daniel", "Sophie", "Michael", "Laura", "James", "Priya", "Noah", "Isabella",
+    "Oliver", "Amelia", "Harry", "Mia", "Leo", "Chloe", "Ethan", "Grace", "Lucas", "Hannah",
+    "Omar", "Aisha", "Mateo", "Yuki", "Ravi", "Elena", "Samuel", "Zara", "Tom", "Nadia"
+]
+
+FAMILY_NAMES = [
+    "Morrison", "Carter", "Hughes", "Bennett", "Reed", "Whitaker", "Thornton", "Malhotra", "Feldman", "Russo",
+    "Almond", "Fischer", "Nakamura", "Okafor", "Silva", "Kowalski", "Lindqvist", "Moreau", "Patel", "Costa",
+    "Hayes", "Brennan", "Sato", "Novak", "Ibrahim", "Larsen", "Quinn", "Duarte", "Walsh", "Yilmaz"
+]
+
+SYLLABLES = ["an", "bel", "cor", "dor", "el", "fen", "gar", "hal", "is", "jor", "kel", "lin", "mar", "nor", "or", "pel", "quin", "ros", "sal", "tor", "ul", "ven", "wyn", "zan"]
+
+def generate_database_data(conn, flights: int = 100000, airports: int = 100, aircraft: int = 200, pilots: int = 1000,
+                           seed: int = 0, start: datetime | None = None, now: datetime | None = None) -> dict:
+    # Loads a reproducible synthetic data set into an empty schema inside one transaction
+    if airports < 2:
+        raise ValueError(f"Need at least two airports, not {airports}")
+    if aircraft < 1:
+        raise ValueError(f"Need at least one aircraft, not {aircraft}")
+    if pilots < 0:
+        raise ValueError(f"Invalid pilot count: {pilots}")
+    if flights < 0:
+        raise ValueError(f"Invalid flight count: {flights}")
+
+    rng = random.Random(seed)
+    start = start or datetime(2025, 1, 1)
+    now = now or datetime.now()
+    flight_times = get_flight_times(conn)
+
+    try:
+        airport_ids, locations = _insert_airports(conn, rng, airports)
+        aircraft_ids, speeds = _insert_aircraft(conn, rng, aircraft)
+        pilot_ids = _insert_pilots(conn, rng, pilots)
+
+        # Building the flight indexes, duty ledger and change log once after the load is several times
+        # faster than maintaining them row by row
+        with deferred_indexes(conn, "flight"), deferred_pilot_duty(conn), deferred_change_log(conn, "flight"):
+            flight_count = _insert_flights(conn, rng, flight_times, flights, airport_ids, locations, aircraft_ids, speeds, pilot_ids, start, now)
+
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+
+    return {
+        "airports": len(airport_ids),
+        "aircraft": len(aircraft_ids),
+        "pilots": len(pilot_ids),
+        "flights": flight_count
+    }
+
+def _next_id(conn, table: str) -> int:
+    return conn.execute(f"SELECT IFNULL(MAX(id), 0) + 1 FROM {table}").fetchone()[0]
+
+def _letters(n: int, length: int) -> str:
+    # The n-th combination of upper case letters, used for unique codes and registrations
+    code = ""
+    for _ in range(length):
+        n, remainder = divmod(n, 26)
+        code = chr(65 + remainder) + code
+    return code
+
+def _place_name(rng: random.Random) -> str:
+    return "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 3))).capitalize()
+
+def _insert_airports(conn, rng: random.Random, count: int) -> tuple[list[int], list[tuple]]:
+    first_id = _next_id(conn, "airport")
+    length = 3 if count <= 26 ** 3 else 4
+    codes = rng.sample(range(26 ** length), count)
+
+    rows = []
+    locations = []
+    for n in range(count):
+        city = _place_name(rng)
+        country, region = rng.choice(COUNTRIES)
+        rows.append((first_id + n, _letters(codes[n], length), f"{city} International", city, country, region))
+
+        # Positions on a plane, in km, give each route a plausible distance
+        locations.append((rng.uniform(0, 9000), rng.uniform(0, 5000)))
+
+    conn.executemany("INSERT INTO airport (id, code, name, city, country, region) VALUES (?, ?, ?, ?, ?, ?)", rows)
+    return [row[0] for row in rows], locations
+
+def _insert_aircraft(conn, rng: random.Random, count: int) -> tuple[list[int], list[int]]:
+    first_id = _next_id(conn, "aircraft")
+    registrations = rng.sample(range(26 ** 4), count)
+
+    rows = []
+    speeds = []
+    for n in range(count):
+        manufacturer, model, icao_type, speed = rng.choice(AIRCRAFT_TYPES)
+        rows.append((
+            first_id + n,
+            f"G-{_letters(registrations[n], 4)}",
+            100000 + first_id + n,
+            f"{0x400000 + first_id + n:06X}",
+            manufacturer,
+            model,
+            icao_type,
+            "Active"
+        ))
+        speeds.append(speed)
+
+    conn.executemany(
+        """
+        INSERT INTO aircraft (id, registration, manufacturer_serial_no, icao_hex, manufacturer, model, icao_type, status)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        """,
+        rows
+    )
+    return [row[0] for row in rows], speeds
+
+def _insert_pilots(conn, rng: random.Random, count: int) -> list[int]:
+    first_id = _next_id(conn, "pilot")
+    rows = [(first_id + n, rng.choice(FIRST_NAMES), rng.choice(FAMILY_NAMES)) for n in range(count)]
+
+    conn.executemany("INSERT INTO pilot (id, first_name, family_name) VALUES (?, ?, ?)", rows)
+    return [row[0] for row in rows]
+
+def _minute_encoder(flight_times, first_minute: int, last_minute: int):
+    # Formatting a datetime per column is the bottleneck at a million flights, so text times are
+    # assembled from precomputed day and time-of-day strings instead
+    if flight_times.column_type != "TEXT":
+        return lambda minutes: minutes
+
+    date_format, time_format = TEXT_FORMAT.split(" ")
+    first_day = first_minute // 1440
+    days = [(EPOCH + timedelta(days=day)).strftime(date_format) + " " for day in range(first_day, last_minute // 1440 + 1)]
+    times = [(EPOCH + timedelta(minutes=minute)).strftime(time_format) for minute in range(1440)]
+
+    return lambda minutes: days[minutes // 1440 - first_day] + times[minutes % 1440]
+
+def _insert_flights(conn, rng: random.Random, flight_times, count: int, airport_ids: list[int], locations: list[tuple],
+                    aircraft_ids: list[int], speeds: list[int], pilot_ids: list[int], start: datetime, now: datetime) -> int:
+    start_minutes = int((start - EPOCH).total_seconds()) // 60
+    now_minutes = int((now - EPOCH).total_seconds()) // 60
+
+    # random() is much cheaper than randrange() and choice(), which matters at this volume
+    draw = rng.random
+    turnarounds = tuple(range(40, 125, 5))
+    delays = (-5, 0, 0, 0, 5, 10, 15, 30)
+
+    # Leg durations depend only on the route and the aircraft's speed
+    durations = {}
+    longest = 30 + int(math.hypot(9000, 5000) / min(speeds) * 60) + turnarounds[-1]
+
+    legs_per_aircraft = [count // len(aircraft_ids) + (1 if n < count % len(aircraft_ids) else 0) for n in range(len(aircraft_ids))]
+    encode = _minute_encoder(flight_times, start_minutes, start_minutes + 720 + max(legs_per_aircraft) * longest + 1440)
+
+    # Each aircraft flies out and back from a home base, and has its own crews (pilot and copilot
+    # pairs) taking turns by duty day, so no pilot is ever on two flights at once
+    crews = [(pilot_ids[n], pilot_ids[n + 1]) for n in range(0, len(pilot_ids) - 1, 2)]
+    crews_by_aircraft = [crews[n::len(aircraft_ids)] for n in range(len(aircraft_ids))]
+    flight_numbers = {}
+
+    sql = """
+        INSERT INTO flight (flight_number, aircraft_id, origin_id, destination_id, pilot_id, copilot_id, departure_time_scheduled, arrival_time_scheduled, departure_time_actual, arrival_time_actual, status)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """
+    batch = []
+    inserted = 0
+
+    for index, aircraft_id in enumerate(aircraft_ids):
+        base = int(draw() * len(airport_ids))
+        location = base
+        departure = start_minutes + 5 * int(draw() * 144)
+        speed = speeds[index]
+        aircraft_crews = crews_by_aircraft[index]
+        crew_index = 0
+        duty_day = departure // 1440
+
+        for leg in range(legs_per_aircraft[index]):
+            # Out to a random spoke, then back to base
+            if location == base:
+                destination = int(draw() * (len(airport_ids) - 1))
+                destination += destination >= base
+            else:
+                destination = base
+
+            duration = durations.get((location, destination, speed))
+            if duration is None:
+                (x1, y1), (x2, y2) = locations[location], locations[destination]
+                duration = 30 + int(math.hypot(x2 - x1, y2 - y1) / speed * 60)
+                duration -= duration % 5
+                durations[(location, destination, speed)] = duration
+            arrival = departure + duration
+
+            if aircraft_crews:
+                if departure // 1440 != duty_day:
+                    duty_day = departure // 1440
+                    crew_index = (crew_index + 1) % len(aircraft_crews)
+                pilot_id, copilot_id = aircraft_crews[crew_index]
+            else:
+                pilot_id = copilot_id = None
+
+            route = (aircraft_id, location, destination)
+            flight_number = flight_numbers.get(route)
+            if flight_number is None:
+                flight_number = flight_numbers[route] = f"ZMY{len(flight_numbers) + 1}"
+
+            if arrival <= now_minutes:
+                delay = delays[int(draw() * len(delays))]
+                status = "Arrived"
+                actual = (encode(departure + max(delay, 0)), encode(arrival + delay))
+            elif departure <= now_minutes:
+                status = "Departed"
+                actual = (encode(departure), None)
+            else:
+                status = "Scheduled"
+                actual = (None, None)
+
+            batch.append((
+                flight_number,
+                aircraft_id,
+                airport_ids[location],
+                airport_ids[destination],
+                pilot_id,
+                copilot_id,
+                encode(departure),
+                encode(arrival),
+                actual[0],
+                actual[1],
+                status
+            ))
+
+            if len(batch) >= BATCH_SIZE:
+                conn.executemany(sql, batch)
+                inserted += len(batch)
+                batch = []
+
+            # Turnaround before the next leg
+            location = destination
+            departure = arrival + turnarounds[int(draw() * len(turnarounds))]
+
+    if batch:
+        conn.executemany(sql, batch)
+        inserted += len(batch)
+
+    return inserted
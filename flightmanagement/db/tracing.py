@@ -0,0 +1,151 @@
+import math
+import re
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from pathlib import Path
+
+# Percentiles are taken over the most recent executions of each statement
+MAX_SAMPLES = 10000
+
+def normalise_statement(sql: str) -> str:
+    # Strip comments and literal values so executions of the same statement are grouped together
+    sql = re.sub(r"--[^\n]*", " ", sql)
+    sql = re.sub(r"'(?:[^']|'')*'", "?", sql)
+    sql = re.sub(r"(?<![\w.])\d+(?:\.\d+)?\b", "?", sql)
+    sql = re.sub(r"\(\s*\?(?:\s*,\s*\?)+\s*\)", "(?, ...)", sql)
+    return " ".join(sql.split())
+
+def percentile(values: list[float], fraction: float) -> float:
+    # Nearest-rank percentile of already sorted values
+    if len(values) == 0:
+        return 0.0
+    return values[max(0, math.ceil(fraction * len(values)) - 1)]
+
+class QueryExecution:
+
+    def __init__(self, statement: str, text: str):
+        self.statement = statement
+        self.text = text
+        self.elapsed_ms = 0.0
+        self.logged = False
+
+class QueryStatistics:
+
+    def __init__(self, statement: str):
+        self.statement = statement
+        self.count = 0
+        self.executions = deque(maxlen=MAX_SAMPLES)
+
+    def summary(self) -> dict:
+        values = sorted(execution.elapsed_ms for execution in self.executions)
+        return {
+            "statement": self.statement,
+            "count": self.count,
+            "total_ms": sum(values),
+            "p50_ms": percentile(values, 0.50),
+            "p95_ms": percentile(values, 0.95),
+            "max_ms": values[-1] if values else 0.0
+        }
+
+class TracedCursor:
+
+    # Times fetches as well as the execute, since SQLite does most of a query's work while stepping rows
+    def __init__(self, cursor, tracer, execution: QueryExecution):
+        self.__cursor = cursor
+        self.__tracer = tracer
+        self.__execution = execution
+
+    def __timed(self, fetch, *args):
+        start = time.perf_counter()
+        try:
+            return fetch(*args)
+        finally:
+            self.__tracer.add_time(self.__execution, (time.perf_counter() - start) * 1000)
+
+    def fetchone(self):
+        return self.__timed(self.__cursor.fetchone)
+
+    def fetchmany(self, *args):
+        return self.__timed(self.__cursor.fetchmany, *args)
+
+    def fetchall(self):
+        return self.__timed(self.__cursor.fetchall)
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        return self.__timed(self.__cursor.__next__)
+
+    def __getattr__(self, name):
+        return getattr(self.__cursor, name)
+
+class QueryTracer:
+
+    def __init__(self, slow_query_ms: float | None = None, slow_query_log=None):
+        self.slow_query_ms = slow_query_ms
+        self.slow_query_log = Path(slow_query_log) if slow_query_log else None
+
+        self.__statistics = {}
+        self.__lock = threading.Lock()
+
+        # The trace callback reports the statement as SQLite ran it, with its bound values expanded
+        self.__traced = threading.local()
+
+    def attach(self, conn) -> None:
+        conn.set_trace_callback(self.__on_trace)
+
+    def __on_trace(self, text: str) -> None:
+        # Only keep the first statement of each execute; later ones come from triggers
+        if getattr(self.__traced, "text", "") is None:
+            self.__traced.text = text
+
+    def execute(self, conn, sql: str, parameters=()):
+        return self.__run(conn.execute, sql, parameters)
+
+    def executemany(self, conn, sql: str, seq_of_parameters):
+        return self.__run(conn.executemany, sql, seq_of_parameters)
+
+    def __run(self, execute, sql: str, parameters):
+        self.__traced.text = None
+        start = time.perf_counter()
+        cursor = execute(sql, parameters)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+
+        execution = QueryExecution(normalise_statement(sql), self.__traced.text or sql)
+        with self.__lock:
+            statistics = self.__statistics.get(execution.statement)
+            if statistics is None:
+                statistics = self.__statistics[execution.statement] = QueryStatistics(execution.statement)
+            statistics.count += 1
+            statistics.executions.append(execution)
+
+        self.add_time(execution, elapsed_ms)
+        return TracedCursor(cursor, self, execution)
+
+    def add_time(self, execution: QueryExecution, elapsed_ms: float) -> None:
+        execution.elapsed_ms += elapsed_ms
+
+        if self.slow_query_ms is None or execution.logged or execution.elapsed_ms < self.slow_query_ms:
+            return
+
+        # Log the first time an execution crosses the threshold; fetches can still add to it afterwards
+        execution.logged = True
+        if self.slow_query_log is not None:
+            line = f"{datetime.now():%Y-%m-%d %H:%M:%S}\t{execution.elapsed_ms:.1f} ms\t{' '.join(execution.text.split())}\n"
+            with self.__lock:
+                with open(self.slow_query_log, "a", encoding="utf-8") as log:
+                    log.write(line)
+
+    def top(self, n: int = 10) -> list[dict]:
+        # Statements ordered by the total time spent in them
+        with self.__lock:
+            summaries = [statistics.summary() for statistics in self.__statistics.values()]
+        summaries.sort(key=lambda summary: summary["total_ms"], reverse=True)
+        return summaries[:n]
+
+    def reset(self) -> None:
+        with self.__lock:
+            self.__statistics.clear()
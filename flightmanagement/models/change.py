@@ -0,0 +1,13 @@
+from dataclasses import dataclass
+from datetime import datetime
+
+@dataclass(frozen=True)
+class Change:
+    # A row inserted, updated or deleted, as recorded in the change log
+    seq: int
+    table_name: str
+    row_id: int
+    operation: str
+
+    # UTC
+    changed_at: datetime
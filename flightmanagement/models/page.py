@@ -0,0 +1,14 @@
+from dataclasses import dataclass
+
+@dataclass(frozen=True)
+class Page:
+    items: list
+    has_next: bool = False
+    has_previous: bool = False
+
+    # Sort keys of the first and last items, passed back to move to the previous or next page
+    first_key: tuple | None = None
+    last_key: tuple | None = None
+
+    def __len__(self):
+        return len(self.items)
@@ -0,0 +1,15 @@
+from dataclasses import dataclass
+from datetime import datetime
+from flightmanagement.models.flight import Flight
+
+@dataclass(frozen=True)
+class ScheduleConflict:
+    # Two flights assigned the same aircraft or pilot at overlapping scheduled times
+    resource: str
+    resource_id: int
+    flight: Flight
+    other_flight: Flight
+
+    # The time both flights need the resource: the later departure to the earlier arrival
+    start: datetime
+    end: datetime
@@ -0,0 +1,12 @@
+from dataclasses import dataclass
+
+@dataclass(frozen=True)
+class WriteResult:
+    item: object
+
+    # The constraint the row broke, if it wasn't written
+    error: str | None = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
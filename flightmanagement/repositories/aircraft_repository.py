@@ -1,8 +1,21 @@
+from collections.abc import Iterator
 from flightmanagement.models.aircraft import Aircraft
+from flightmanagement.models.page import Page
+from flightmanagement.repositories.base_repository import DEFAULT_PAGE_SIZE, BaseRepository, UpsertMixin
+from flightmanagement.repositories.text_search import search_rows
 
-class AircraftRepository:
+# The least time, in minutes, an aircraft is given on the ground between flights
+MIN_TURNAROUND_MINUTES = 30
+
+class AircraftRepository(UpsertMixin, BaseRepository):
+
+    model = Aircraft
+    table = "aircraft"
+    cached = True
+    natural_keys = ("registration", )
 
     ALLOWED_SEARCH_FIELDS = {
+        'id',
         'registration',
         'manufacturer_serial_no',
         'icao_hex',
@@ -11,121 +24,85 @@ class AircraftRepository:
         'icao_type',
         'status'
     }
+    default_order = ("registration", )
 
-    def __init__(self, conn):
-        self.conn = conn
+    INSERT_SQL = """
+        INSERT INTO aircraft
+            (registration, manufacturer_serial_no, icao_hex, manufacturer, model, icao_type, status)
+        VALUES
+            (:registration, :manufacturer_serial_no, :icao_hex, :manufacturer, :model, :icao_type, :status)
+    """
 
-    def get_item_by_id(self, aircraft_id: int) -> Aircraft | None:
+    # Inserts the item, or updates the row with the same registration if anything differs
+    UPSERT_SQL = INSERT_SQL + """
+        ON CONFLICT (registration) DO UPDATE SET
+            manufacturer_serial_no = excluded.manufacturer_serial_no,
+            icao_hex = excluded.icao_hex,
+            manufacturer = excluded.manufacturer,
+            model = excluded.model,
+            icao_type = excluded.icao_type,
+            status = excluded.status
+        WHERE (manufacturer_serial_no, icao_hex, manufacturer, model, icao_type, status)
+            IS NOT (excluded.manufacturer_serial_no, excluded.icao_hex, excluded.manufacturer, excluded.model, excluded.icao_type, excluded.status)
+    """
 
-        cursor = self.conn.execute(
+    UPDATE_SQL = """
+        UPDATE aircraft
+        SET
+            registration = ?,
+            manufacturer_serial_no = ?,
+            icao_hex = ?,
+            manufacturer = ?,
+            model = ?,
+            icao_type = ?,
+            status = ?
+        WHERE id = ?
+    """
+
+    def get_item_by_id(self, aircraft_id: int) -> Aircraft | None:
+        return self._fetch_one_cached(
+            "id",
+            aircraft_id,
             """
             SELECT * FROM aircraft WHERE id = ?
-            """,
-            (aircraft_id, )
-        )
-        result = cursor.fetchone()
-        
-        if result is None or len(result) == 0:
-            return None
-        
-        aircraft = Aircraft(
-            id=result["id"],
-            registration=result["registration"],
-            manufacturer_serial_no=result["manufacturer_serial_no"],
-            icao_hex=result["icao_hex"],
-            manufacturer=result["manufacturer"],
-            model=result["model"],
-            icao_type=result["icao_type"],
-            status=result["status"]
+            """
         )
-        return aircraft
 
     def get_item_by_registration(self, registration: str) -> Aircraft | None:
-        cursor = self.conn.execute(
+        return self._fetch_one_cached(
+            "registration",
+            registration,
             """
             SELECT * FROM aircraft WHERE registration = ?
-            """,
-            (registration, )
-        )
-        result = cursor.fetchone()
-        
-        if result is None or len(result) == 0:
-            return None
-        
-        aircraft = Aircraft(
-            id=result["id"],
-            registration=result["registration"],
-            manufacturer_serial_no=result["manufacturer_serial_no"],
-            icao_hex=result["icao_hex"],
-            manufacturer=result["manufacturer"],
-            model=result["model"],
-            icao_type=result["icao_type"],
-            status=result["status"]
+            """
         )
-        return aircraft
 
     def get_aircraft_list(self) -> list[Aircraft]:
-        cursor = self.conn.execute(
+        return self._fetch_all(
             """
             SELECT * FROM aircraft ORDER BY registration
             """
         )
-        results = cursor.fetchall()
-        
-        result_list = []
-        for row in results:
-            result_list.append(
-                Aircraft(
-                    id=row["id"],
-                    registration=row["registration"],
-                    manufacturer_serial_no=row["manufacturer_serial_no"],
-                    icao_hex=row["icao_hex"],
-                    manufacturer=row["manufacturer"],
-                    model=row["model"],
-                    icao_type=row["icao_type"],
-                    status=row["status"]
-                )
-            )
-
-        return result_list
-
-    def insert_item(self, aircraft: Aircraft) -> None:        
-        data = {
-            "registration": aircraft.registration, 
-            "manufacturer_serial_no": aircraft.manufacturer_serial_no,
-            "icao_hex": aircraft.icao_hex, 
-            "manufacturer": aircraft.manufacturer,
-            "model": aircraft.model,
-            "icao_type": aircraft.icao_type,
-            "status": aircraft.status
-        }
 
-        self.conn.execute(
+    def iter_aircraft(self, batch_size: int | None = None) -> Iterator[Aircraft]:
+        return self._iter_all(
             """
-            INSERT INTO aircraft
-                (registration, manufacturer_serial_no, icao_hex, manufacturer, model, icao_type, status)
-            VALUES
-                (:registration, :manufacturer_serial_no, :icao_hex, :manufacturer, :model, :icao_type, :status)
+            SELECT * FROM aircraft ORDER BY registration
             """,
-            data
+            batch_size=batch_size
         )
 
+    def get_aircraft_page(self, after: tuple | None = None, limit: int = DEFAULT_PAGE_SIZE, direction: str = "next") -> Page:
+        # In registration order, like get_aircraft_list; after is a (registration, id) key
+        return self._fetch_page("aircraft", ("registration", "id"), after, limit, direction)
+    
+    def insert_item(self, aircraft: Aircraft) -> None:
+        self.conn.execute(self.INSERT_SQL, self._insert_parameters(aircraft))
+        self._invalidate(aircraft)
+
     def update_item(self, aircraft: Aircraft):
-        self.conn.execute(
-            """
-            UPDATE aircraft
-            SET
-                registration = ?,
-                manufacturer_serial_no = ?,
-                icao_hex = ?,
-                manufacturer = ?,
-                model = ?,
-                icao_type = ?,
-                status = ?
-            WHERE id = ?
-            """,
-            (aircraft.registration, aircraft.manufacturer_serial_no, aircraft.icao_hex, aircraft.manufacturer, aircraft.model, aircraft.icao_type, aircraft.status, aircraft.id)
-        )
+        self.conn.execute(self.UPDATE_SQL, self._update_parameters(aircraft))
+        self._invalidate(aircraft)
     
     def delete_item(self, aircraft: Aircraft):
         self.conn.execute(
@@ -135,35 +112,21 @@ class AircraftRepository:
             """,
             (aircraft.id, )
         )
+        self._invalidate(aircraft)
     
-    def search_on_field(self, field_name: str, value) -> list[Aircraft]:
-        
-        if field_name not in self.ALLOWED_SEARCH_FIELDS:
-            raise ValueError(f"Invalid search field: {field_name}")
+    def _insert_parameters(self, aircraft: Aircraft) -> dict:
+        return {
+            "registration": aircraft.registration,
+            "manufacturer_serial_no": aircraft.manufacturer_serial_no,
+            "icao_hex": aircraft.icao_hex,
+            "manufacturer": aircraft.manufacturer,
+            "model": aircraft.model,
+            "icao_type": aircraft.icao_type,
+            "status": aircraft.status
+        }
 
-        sql = f"""
-            SELECT *
-            FROM aircraft
-            WHERE {field_name} = ?
-            ORDER BY registration
-        """
-        cursor = self.conn.execute(sql, (value, ))
-        results = cursor.fetchall()
-        
-        result_list = []
-        for row in results:
-            result_list.append(
-                Aircraft(
-                    id=row["id"],
-                    registration=row["registration"],
-                    manufacturer_serial_no=row["manufacturer_serial_no"],
-                    icao_hex=row["icao_hex"],
-                    manufacturer=row["manufacturer"],
-                    model=row["model"],
-                    icao_type=row["icao_type"],
-                    status=row["status"]
-                )
-            )
+    def _update_parameters(self, aircraft: Aircraft) -> tuple:
+        return (aircraft.registration, aircraft.manufacturer_serial_no, aircraft.icao_hex, aircraft.manufacturer, aircraft.model, aircraft.icao_type, aircraft.status, aircraft.id)
 
-        return result_list
-    
\ No newline at end of file
+    def search_text(self, query: str, limit: int = 20) -> list[Aircraft]:
+        return self._map_rows(search_rows(self.conn, "aircraft", query, limit))
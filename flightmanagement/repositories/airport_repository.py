@@ -1,110 +1,99 @@
+from collections.abc import Iterator
 from flightmanagement.models.airport import Airport
+from flightmanagement.models.page import Page
+from flightmanagement.repositories.base_repository import DEFAULT_PAGE_SIZE, BaseRepository, UpsertMixin
+from flightmanagement.repositories.text_search import search_rows
 
-class AirportRepository:
+class AirportRepository(UpsertMixin, BaseRepository):
 
-    def __init__(self, conn):
-        self.conn = conn
+    model = Airport
+    table = "airport"
+    cached = True
+    natural_keys = ("code", )
 
-    def get_item_by_id(self, airport_id: int) -> Airport | None:        
-        cursor = self.conn.execute(
+    ALLOWED_SEARCH_FIELDS = {
+        'id',
+        'code',
+        'name',
+        'city',
+        'country',
+        'region'
+    }
+    default_order = ("code", )
+
+    INSERT_SQL = """
+        INSERT INTO airport
+            (code, name, city, country, region)
+        VALUES
+            (:code, :name, :city, :country, :region)
+    """
+
+    # Inserts the item, or updates the row with the same code if anything differs
+    UPSERT_SQL = INSERT_SQL + """
+        ON CONFLICT (code) DO UPDATE SET
+            name = excluded.name,
+            city = excluded.city,
+            country = excluded.country,
+            region = excluded.region
+        WHERE (name, city, country, region)
+            IS NOT (excluded.name, excluded.city, excluded.country, excluded.region)
+    """
+
+    UPDATE_SQL = """
+        UPDATE airport
+        SET
+            code = ?,
+            name = ?,
+            city = ?,
+            country = ?,
+            region = ?
+        WHERE id = ?
+    """
+
+    def get_item_by_id(self, airport_id: int) -> Airport | None:
+        return self._fetch_one_cached(
+            "id",
+            airport_id,
             """
             SELECT * FROM airport WHERE id = ?
-            """,
-            (airport_id, )
-        )
-        result = cursor.fetchone()
-        
-        if result is None or len(result) == 0:
-            return None
-
-        airport = Airport(
-            id=result["id"],
-            code=result["code"],
-            name=result["name"],
-            city=result["city"],
-            country=result["country"],
-            region=result["region"]
+            """
         )
-        return airport
 
     def get_item_by_code(self, code: str) -> Airport | None:
-        cursor = self.conn.execute(
+        return self._fetch_one_cached(
+            "code",
+            code,
             """
             SELECT * FROM airport WHERE code = ?
-            """,
-            (code, )
-        )
-        result = cursor.fetchone()
-        
-        if result is None or len(result) == 0:
-            return None
-        
-        airport = Airport(
-            id=result["id"],
-            code=result["code"],
-            name=result["name"],
-            city=result["city"],
-            country=result["country"],
-            region=result["region"]
+            """
         )
-        return airport
 
     def get_airport_list(self) -> list[Airport]:
-        cursor = self.conn.execute(
+        return self._fetch_all(
             """
             SELECT * FROM airport ORDER BY code
             """
         )
-        results = cursor.fetchall()
-
-        result_list = []
-        for row in results:
-            result_list.append(
-                Airport(
-                    id=row["id"],
-                    code=row["code"],
-                    name=row["name"],
-                    city=row["city"],
-                    country=row["country"],
-                    region=row["region"]
-                )
-            )
-
-        return result_list
-
-    def insert_item(self, airport: Airport) -> None:        
-        data = {
-            "code": airport.code, 
-            "name": airport.name,
-            "city": airport.city, 
-            "country": airport.country,
-            "region": airport.region
-        }
 
-        self.conn.execute(
+    def iter_airports(self, batch_size: int | None = None) -> Iterator[Airport]:
+        return self._iter_all(
             """
-            INSERT INTO airport
-                (code, name, city, country, region)
-            VALUES
-                (:code, :name, :city, :country, :region)
+            SELECT * FROM airport ORDER BY code
             """,
-            data
+            batch_size=batch_size
         )
 
+    def get_airport_page(self, after: tuple | None = None, limit: int = DEFAULT_PAGE_SIZE, direction: str = "next") -> Page:
+        # In code order, like get_airport_list; after is a (code, id) key
+        return self._fetch_page("airport", ("code", "id"), after, limit, direction)
+    
+    def insert_item(self, airport: Airport) -> None:
+        self.conn.execute(self.INSERT_SQL, self._insert_parameters(airport))
+        self._invalidate(airport)
+
     def update_item(self, airport: Airport):
-        self.conn.execute(
-            """
-            UPDATE airport
-            SET
-                code = ?,
-                name = ?,
-                city = ?,
-                country = ?,
-                region = ?
-            WHERE id = ?
-            """,
-            (airport.code, airport.name, airport.city, airport.country, airport.region, airport.id)
-        )
+        self.conn.execute(self.UPDATE_SQL, self._update_parameters(airport))
+        self._invalidate(airport)
     
     def delete_item(self, airport: Airport):
         self.conn.execute(
@@ -114,29 +103,19 @@ class AirportRepository:
             """,
             (airport.id, )
         )
+        self._invalidate(airport)
     
-    def search_on_field(self, field_name: str, value) -> list[Airport]:
-        sql = f"""
-            SELECT *
-            FROM airport
-            WHERE {field_name} = ?
-            ORDER BY code
-        """
-        cursor = self.conn.execute(sql, (value, ))
-        results = cursor.fetchall()
-        
-        result_list = []
-        for row in results:
-            result_list.append(
-                Airport(
-                    id=row["id"],
-                    code=row["code"],
-                    name=row["name"],
-                    city=row["city"],
-                    country=row["country"],
-                    region=row["region"]
-                )
-            )
+    def _insert_parameters(self, airport: Airport) -> dict:
+        return {
+            "code": airport.code,
+            "name": airport.name,
+            "city": airport.city,
+            "country": airport.country,
+            "region": airport.region
+        }
+
+    def _update_parameters(self, airport: Airport) -> tuple:
+        return (airport.code, airport.name, airport.city, airport.country, airport.region, airport.id)
 
-        return result_list
-    
\ No newline at end of file
+    def search_text(self, query: str, limit: int = 20) -> list[Airport]:
+        return self._map_rows(search_rows(self.conn, "airport", query, limit))
@@ -0,0 +1,348 @@
+import sqlite3
+from abc import ABC, abstractmethod
+from dataclasses import MISSING, fields
+from flightmanagement.config import settings
+from flightmanagement.models.page import Page
+from flightmanagement.models.write_result import WriteResult
+from flightmanagement.repositories.identity_map import get_identity_map
+from flightmanagement.repositories.query import Query, compile_query, equals
+
+# Ids bound per IN (...) query, well under SQLite's bound variable limit (999 before 3.32)
+MAX_BOUND_IDS = 500
+
+DEFAULT_PAGE_SIZE = 50
+PAGE_DIRECTIONS = ("next", "previous")
+
+# Rows fetched at a time by the iter_* methods
+STREAM_BATCH_SIZE = 1000
+
+class BaseRepository(ABC):
+
+    # The dataclass rows of this repository's table are mapped to, and the table
+    model = None
+    table = None
+
+    # Reference entities that change rarely are cached in an identity map, by id and natural keys
+    cached = False
+    natural_keys = ()
+
+    # Fields queries may filter and order on, and the order of results when a query gives none
+    ALLOWED_SEARCH_FIELDS = set()
+    default_order = ()
+
+    # Statements writing one item, with parameters from _insert_parameters and _update_parameters
+    INSERT_SQL = None
+    UPDATE_SQL = None
+
+    def __init__(self, conn):
+        self.conn = conn
+        self.identity_map = get_identity_map(conn, self.table, self.natural_keys) if self.cached else None
+
+        # Compiled row mappers, by model and the column names of the result they were built for
+        self.__mappers = {}
+
+    def _decoders(self) -> dict:
+        # Functions converting stored values to model values, by column name
+        return {}
+
+    def find(self, query: Query) -> list:
+        return self._fetch_all(*self._compile_query(query, self.table))
+
+    def iter_find(self, query: Query, batch_size: int | None = None):
+        return self._iter_all(*self._compile_query(query, self.table), batch_size=batch_size)
+
+    def search_on_field(self, field_name: str, value) -> list:
+        return self.find(Query(equals(field_name, value)))
+
+    def insert_many(self, items, chunk_size: int | None = None) -> list[WriteResult]:
+        return self._write_many(self.INSERT_SQL, self._insert_parameters, items, chunk_size)
+
+    def update_many(self, items, chunk_size: int | None = None) -> list[WriteResult]:
+        return self._write_many(self.UPDATE_SQL, self._update_parameters, items, chunk_size)
+
+    def delete_many(self, items, chunk_size: int | None = None) -> list[WriteResult]:
+        return self._write_many(f"DELETE FROM {self.table} WHERE id = ?", lambda item: (item.id, ), items, chunk_size)
+
+    def get_items_by_ids(self, ids) -> dict:
+        # Items by id, read with one query per chunk of ids rather than one per id. Ids without a
+        # row are left out, and repeated or None ids are only looked up once.
+        unique_ids = list(dict.fromkeys(item_id for item_id in ids if item_id is not None))
+
+        items = {}
+        if self.identity_map is not None:
+            for item_id in unique_ids:
+                item = self.identity_map.get(item_id)
+                if item is not None:
+                    items[item_id] = item
+            unique_ids = [item_id for item_id in unique_ids if item_id not in items]
+
+        for chunk in chunked(unique_ids):
+            sql = f"SELECT * FROM {self.table} WHERE id IN ({', '.join('?' for _ in chunk)})"
+            for item in self._fetch_all(sql, chunk):
+                items[item.id] = item
+        return items
+
+    def _encoders(self) -> dict:
+        # Functions converting model values to stored values, by column name, for page keys and queries
+        return {}
+
+    def _fetch_page(self, source: str, order: tuple, after: tuple | None = None, limit: int = DEFAULT_PAGE_SIZE,
+                    direction: str = "next", descending: bool = False) -> Page:
+        # Keyset pagination: seeks the index on the sort columns (which end with id, so every key is
+        # unique) to the key of the last item seen, so every page costs the same however deep it is.
+        # SQLite sorts NULLs first, so rows with no value in the first sort column are read as a
+        # separate segment before (or, descending, after) the rest.
+        if limit < 1:
+            raise ValueError(f"Invalid page size: {limit}")
+        if direction not in PAGE_DIRECTIONS:
+            raise ValueError(f"Invalid page direction: {direction}")
+        if after is not None and len(after) != len(order):
+            raise ValueError(f"Page key must have a value for each of {', '.join(order)}")
+
+        # Segments in the order they are read: the list order going forward, reversed going back
+        ascending = (direction == "next") != descending
+        segments = ["null", "value"] if len(order) > 1 else ["value"]
+        if not ascending:
+            segments.reverse()
+
+        if after is None:
+            start = 0
+        else:
+            start = segments.index("null" if after[0] is None and len(order) > 1 else "value")
+
+        items = []
+        for segment in segments[start:]:
+            columns = order if segment == "value" else order[1:]
+            conditions = [f"{order[0]} IS NOT NULL" if segment == "value" else f"{order[0]} IS NULL"] if len(order) > 1 else []
+            parameters = []
+
+            # Only the segment holding the key continues from it; the ones after are read from the start
+            if after is not None and segment == segments[start]:
+                encoders = self._encoders()
+                conditions.append(f"({', '.join(columns)}) {'>' if ascending else '<'} ({', '.join('?' for _ in columns)})")
+                keys = after if segment == "value" else after[1:]
+                parameters = [
+                    encoders[column](value) if column in encoders else value
+                    for column, value in zip(columns, keys)
+                ]
+
+            sql = f"""
+                SELECT *
+                FROM {source}
+                {"WHERE " + " AND ".join(conditions) if conditions else ""}
+                ORDER BY {", ".join(f"{column} {'ASC' if ascending else 'DESC'}" for column in columns)}
+                LIMIT ?
+            """
+            items += self._fetch_all(sql, (*parameters, limit + 1 - len(items)))
+            if len(items) > limit:
+                break
+
+        has_more = len(items) > limit
+        items = items[:limit]
+        if direction == "previous":
+            items.reverse()
+
+        return Page(
+            items=items,
+            has_next=has_more if direction == "next" else after is not None,
+            has_previous=has_more if direction == "previous" else after is not None,
+            first_key=tuple(getattr(items[0], column) for column in order) if items else None,
+            last_key=tuple(getattr(items[-1], column) for column in order) if items else None
+        )
+
+    # Every repository writes its items, so a subclass missing either hook can't be created
+    @abstractmethod
+    def _insert_parameters(self, item):
+        raise NotImplementedError
+
+    @abstractmethod
+    def _update_parameters(self, item):
+        raise NotImplementedError
+
+    def _write_many(self, sql: str, parameters, items, chunk_size: int | None) -> list[WriteResult]:
+        # Writes each chunk of items with one executemany, inside the caller's transaction, and
+        # reports the result of each item in order. A chunk with a row breaking a constraint is
+        # rolled back to its savepoint and written again a row at a time, so only the rows at
+        # fault are left out.
+        items = list(items)
+        chunk_size = settings.bulk_chunk_size if chunk_size is None else chunk_size
+        if chunk_size < 1:
+            raise ValueError(f"Invalid chunk size: {chunk_size}")
+
+        # Released savepoints only stay part of a transaction opened before them
+        if not self.conn.in_transaction:
+            self.conn.execute("BEGIN")
+
+        results = []
+        for chunk in chunked(items, chunk_size):
+            rows = [parameters(item) for item in chunk]
+
+            self.conn.execute("SAVEPOINT write_many")
+            try:
+                self.conn.executemany(sql, rows)
+                errors = [None] * len(rows)
+            except sqlite3.IntegrityError:
+                self.conn.execute("ROLLBACK TO write_many")
+                errors = [self.__write_row(sql, row) for row in rows]
+            self.conn.execute("RELEASE write_many")
+
+            results += map(WriteResult, chunk, errors)
+            if self.identity_map is not None:
+                for item in chunk:
+                    self.identity_map.invalidate(item)
+        return results
+
+    def __write_row(self, sql: str, row) -> str | None:
+        # SQLite undoes just the failing statement, so the rows before it stay written
+        try:
+            self.conn.execute(sql, row)
+        except sqlite3.IntegrityError as error:
+            return str(error)
+        return None
+
+    def _compile_query(self, query: Query, source: str, columns: str = "*") -> tuple[str, list]:
+        return compile_query(query, source, self.ALLOWED_SEARCH_FIELDS, self._encoders(), self.default_order, columns)
+
+    def _fetch_one_cached(self, key: str, value, sql: str):
+        # Reads the item whose key has this value through the identity map, querying on a miss
+        if self.identity_map is None:
+            return self._fetch_one(sql, (value, ))
+
+        item = self.identity_map.get(value) if key == "id" else self.identity_map.get_by(key, value)
+        if item is None:
+            item = self._fetch_one(sql, (value, ))
+            self.identity_map.put(item)
+        return item
+
+    def _invalidate(self, item) -> None:
+        if self.identity_map is not None:
+            self.identity_map.invalidate(item)
+
+    def _fetch_one(self, sql: str, parameters=(), model=None):
+        cursor = self.conn.execute(sql, parameters)
+        row = cursor.fetchone()
+        if row is None:
+            return None
+        return self._mapper(_column_names(cursor), model)(row)
+
+    def _fetch_all(self, sql: str, parameters=(), model=None) -> list:
+        cursor = self.conn.execute(sql, parameters)
+        items = self._map_rows(cursor.fetchall(), model, _column_names(cursor))
+
+        # Lists read for choices and searches warm the identity map for the lookups that follow
+        if self.identity_map is not None and (model or self.model) is self.model:
+            for item in items:
+                self.identity_map.put(item)
+        return items
+
+    def _iter_all(self, sql: str, parameters=(), model=None, batch_size: int | None = None):
+        # Yields items a batch of rows at a time, so a pass over a whole table holds one batch in
+        # memory rather than every row. Items aren't put in the identity map, which a full pass
+        # would only churn.
+        batches = self._iter_batches(sql, parameters, batch_size)
+        try:
+            mapper = None
+            for rows in batches:
+                if mapper is None:
+                    mapper = self._mapper(tuple(rows[0].keys()), model)
+                yield from map(mapper, rows)
+        finally:
+            # Stopping early releases the cursor, and the pool's reader, straight away
+            batches.close()
+
+    def _iter_batches(self, sql: str, parameters=(), batch_size: int | None = None):
+        # Yields the raw rows a batch at a time
+        batch_size = STREAM_BATCH_SIZE if batch_size is None else batch_size
+        if batch_size < 1:
+            raise ValueError(f"Invalid batch size: {batch_size}")
+
+        # A connection pool holds one reader for the whole pass; a bare connection is used as is
+        if hasattr(self.conn, "stream"):
+            return self.conn.stream(sql, parameters, batch_size)
+        return _stream(self.conn, sql, parameters, batch_size)
+
+    def _map_rows(self, rows, model=None, columns: tuple | None = None) -> list:
+        # Without the cursor, the column names come from the rows themselves (sqlite3.Row)
+        if not rows:
+            return []
+        return list(map(self._mapper(columns or tuple(rows[0].keys()), model), rows))
+
+    def _mapper(self, columns: tuple, model=None):
+        model = model or self.model
+
+        mapper = self.__mappers.get((model, columns))
+        if mapper is None:
+            mapper = self.__mappers[(model, columns)] = compile_row_mapper(model, columns, self._decoders())
+        return mapper
+
+class UpsertMixin:
+    # Upserts for the repositories whose table has a natural key, listed before BaseRepository
+
+    # INSERT ... ON CONFLICT DO UPDATE on the natural key, with parameters from _insert_parameters
+    UPSERT_SQL = None
+
+    def upsert(self, item) -> bool:
+        # Whether a row was written; False when the stored row already matched the item
+        cursor = self.conn.execute(self.UPSERT_SQL, self._insert_parameters(item))
+        self._invalidate(item)
+        return cursor.rowcount > 0
+
+    def upsert_many(self, items, chunk_size: int | None = None) -> list[WriteResult]:
+        return self._write_many(self.UPSERT_SQL, self._insert_parameters, items, chunk_size)
+
+def chunked(values: list, size: int | None = None):
+    size = size or MAX_BOUND_IDS
+    for start in range(0, len(values), size):
+        yield values[start:start + size]
+
+def compile_row_mapper(model, columns: tuple, decoders: dict | None = None):
+    # Builds a function creating the model from a row by column position. Rows were validated by
+    # the model when they were written, so instances are filled in directly rather than through
+    # __init__ and __post_init__, which cost more than the rest of the mapping put together.
+    # Columns the model doesn't have are ignored and fields the result doesn't have get their defaults.
+    decoders = decoders or {}
+    model_fields = {field.name: field for field in fields(model)}
+    namespace = {"model": model, "new": object.__new__}
+
+    values = []
+    for index, column in enumerate(columns):
+        if column not in model_fields:
+            continue
+        if column in decoders:
+            namespace[f"decode_{index}"] = decoders[column]
+            values.append(f"{column!r}: decode_{index}(value_{index})")
+        else:
+            values.append(f"{column!r}: value_{index}")
+
+    for name, field in model_fields.items():
+        if name in columns:
+            continue
+        if field.default is not MISSING:
+            namespace[f"default_{name}"] = field.default
+            values.append(f"{name!r}: default_{name}")
+        elif field.default_factory is not MISSING:
+            namespace[f"default_{name}"] = field.default_factory
+            values.append(f"{name!r}: default_{name}()")
+        else:
+            raise ValueError(f"No {name} column to map to {model.__name__}")
+
+    source = (
+        "def map_row(row):\n"
+        f"    {', '.join(f'value_{index}' for index in range(len(columns)))}, = row\n"
+        "    instance = new(model)\n"
+        f"    instance.__dict__.update({{{', '.join(values)}}})\n"
+        "    return instance\n"
+    )
+    exec(compile(source, f"<{model.__name__} row mapper>", "exec"), namespace)
+    return namespace["map_row"]
+
+def _stream(conn, sql: str, parameters, batch_size: int):
+    cursor = conn.execute(sql, parameters)
+    try:
+        while rows := cursor.fetchmany(batch_size):
+            yield rows
+    finally:
+        cursor.close()
+
+def _column_names(cursor) -> tuple:
+    return tuple(column[0] for column in cursor.description)
@@ -0,0 +1,59 @@
+from datetime import datetime
+from flightmanagement.db.migrations import CHANGE_LOG_TABLE
+from flightmanagement.models.change import Change
+from flightmanagement.repositories.base_repository import compile_row_mapper
+
+# Changes returned by one changes_since call when the caller gives no limit
+DEFAULT_CHANGE_LIMIT = 1000
+
+class ChangeLogRepository:
+
+    # Read side of the change log the triggers write. A consumer keeps the seq of the last change
+    # it has applied and polls changes_since with it, reading each changed row by id, so only
+    # what changed is moved. Operations say what last happened to a row: a consumer should treat
+    # an insert or update of a row it doesn't have as an insert, and a delete of one it doesn't
+    # have as nothing, as compaction can leave only a row's latest change. Only the triggers write
+    # the log, so unlike the other repositories this one has no insert, update or delete methods.
+
+    def __init__(self, conn):
+        self.conn = conn
+
+        # Row mapper compiled on the first read, for the columns of the log
+        self.__mapper = None
+
+    def changes_since(self, seq: int = 0, limit: int = DEFAULT_CHANGE_LIMIT) -> list[Change]:
+        # The changes after seq, oldest first; fewer than limit means the consumer has caught up
+        cursor = self.conn.execute(
+            f"SELECT * FROM {CHANGE_LOG_TABLE} WHERE seq > ? ORDER BY seq LIMIT ?",
+            (seq, limit)
+        )
+        rows = cursor.fetchall()
+
+        if self.__mapper is None:
+            columns = tuple(column[0] for column in cursor.description)
+            self.__mapper = compile_row_mapper(Change, columns, {"changed_at": datetime.fromisoformat})
+        return list(map(self.__mapper, rows))
+
+    def get_latest_seq(self) -> int:
+        # A consumer starting from a full export takes this first, then polls from it. A consumer
+        # ahead of it has seen a log that has since been reset, and must export everything again.
+        return self.conn.execute(f"SELECT IFNULL(MAX(seq), 0) FROM {CHANGE_LOG_TABLE}").fetchone()[0]
+
+    def compact(self, up_to: int | None = None) -> int:
+        # Removes each change up to seq up_to (by default all of them) that a later change to the
+        # same row supersedes, so the log holds at most one change per row; returns how many went.
+        # Any consumer still gets every row changed since its seq, with its latest operation.
+        cursor = self.conn.execute(
+            f"""
+            DELETE FROM {CHANGE_LOG_TABLE}
+            WHERE seq <= ?
+            AND seq < (
+                SELECT MAX(later.seq)
+                FROM {CHANGE_LOG_TABLE} later
+                WHERE later.table_name = {CHANGE_LOG_TABLE}.table_name
+                AND later.row_id = {CHANGE_LOG_TABLE}.row_id
+            )
+            """,
+            (self.get_latest_seq() if up_to is None else up_to, )
+        )
+        return cursor.rowcount
@@ -0,0 +1,60 @@
+import numpy as np
+
+# Integer columns can't hold NULL, so a missing id reads as NO_ID; ids start at 1
+NO_ID = 0
+
+# Missing times read as NaT, which is the smallest int64 viewed as datetime64
+NAT = np.iinfo(np.int64).min
+
+# Column kinds: "int" (int64), "datetime" (datetime64[m]), "category" (strings with few distinct
+# values, categorical in a DataFrame) and "text"
+KINDS = ("int", "datetime", "category", "text")
+
+def column_sql(expression: str, kind: str, flight_times=None) -> str:
+    # Selects a column so every value already has the array's type; times are read as minutes
+    # since 1970 whichever way they are stored
+    if kind == "int":
+        return f"IFNULL({expression}, {NO_ID})"
+    if kind == "datetime":
+        return f"IFNULL({flight_times.sql_minutes(expression)}, {NAT})"
+    if kind in ("category", "text"):
+        return f"IFNULL({expression}, '')"
+    raise ValueError(f"Invalid column kind: {kind}")
+
+def fetch_columns(batches, kinds: dict) -> dict:
+    # Builds one array per column from batches of rows, transposing each batch in C rather than
+    # creating an object per row
+    parts = {name: [] for name in kinds}
+    for rows in batches:
+        for (name, kind), values in zip(kinds.items(), zip(*rows)):
+            parts[name].append(_to_array(values, kind))
+
+    return {
+        name: np.concatenate(parts[name]) if parts[name] else _to_array((), kind)
+        for name, kind in kinds.items()
+    }
+
+def lookup(values, ids: np.ndarray) -> np.ndarray:
+    # The value for each id from (id, value) rows, or "" for NO_ID and ids without a row
+    size = max((row[0] for row in values), default=0)
+    size = max(size, int(ids.max(initial=0))) + 1
+    table = np.full(size, "", dtype=object)
+    for id_, value in values:
+        table[id_] = value or ""
+    return table.astype(str)[ids]
+
+def to_frame(columns: dict, kinds: dict):
+    # pandas takes a while to import, and only analysis code needs it
+    import pandas as pd
+
+    return pd.DataFrame({
+        name: pd.Categorical(values) if kinds[name] == "category" else values
+        for name, values in columns.items()
+    })
+
+def _to_array(values, kind: str) -> np.ndarray:
+    if kind == "int":
+        return np.array(values, dtype=np.int64)
+    if kind == "datetime":
+        return np.array(values, dtype=np.int64).view("datetime64[m]")
+    return np.array(values, dtype=str)
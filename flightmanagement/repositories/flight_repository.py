@@ -1,161 +1,268 @@
-from datetime import datetime
+from collections.abc import Iterator
+from datetime import datetime, timedelta
+from flightmanagement.db.archive import flight_history_source
+from flightmanagement.db.flight_times import FLIGHT_TIME_COLUMNS, epoch_minutes, get_flight_times
+from flightmanagement.db.materialised_flights import MATERIALISED_TABLE, is_materialised
+from flightmanagement.db.migrations import DUTY_TABLE, deferred_change_log, deferred_indexes, deferred_pilot_duty, duty_minutes_sql
+from flightmanagement.models.aircraft import Aircraft
 from flightmanagement.models.flight import Flight
+from flightmanagement.models.page import Page
 from flightmanagement.models.pilot import Pilot
+from flightmanagement.models.write_result import WriteResult
+from flightmanagement.repositories.aircraft_repository import MIN_TURNAROUND_MINUTES
+from flightmanagement.repositories.base_repository import DEFAULT_PAGE_SIZE, BaseRepository, UpsertMixin, chunked
+from flightmanagement.repositories.pilot_repository import DUTY_LIMIT_MINUTES, duty_days
+from flightmanagement.repositories.pilot_availability import PilotAvailability, get_pilot_availability
+from flightmanagement.repositories.columnar import column_sql, fetch_columns, lookup, to_frame
+from flightmanagement.repositories.query import Query, equals
 
-class FlightRepository:
+# Inserts smaller than this always maintain the indexes as they go
+REINDEX_MIN_ROWS = 10000
+
+# The columns of get_flight_columns by kind (see columnar), and the reference data added with_references,
+# each a text column of a table looked up by one of the flight's ids
+FLIGHT_COLUMNS = {
+    "id": "int",
+    "flight_number": "text",
+    "aircraft_id": "int",
+    "origin_id": "int",
+    "destination_id": "int",
+    "pilot_id": "int",
+    "copilot_id": "int",
+    "departure_time_scheduled": "datetime",
+    "arrival_time_scheduled": "datetime",
+    "departure_time_actual": "datetime",
+    "arrival_time_actual": "datetime",
+    "status": "category"
+}
+REFERENCE_COLUMNS = {
+    "aircraft_registration": ("aircraft", "aircraft_id", "registration"),
+    "aircraft_type": ("aircraft", "aircraft_id", "icao_type"),
+    "origin_code": ("airport", "origin_id", "code"),
+    "destination_code": ("airport", "destination_id", "code")
+}
+
+# Rows converted to arrays at a time; larger batches mean fewer, larger arrays to join
+COLUMN_BATCH_SIZE = 50000
+
+class FlightRepository(UpsertMixin, BaseRepository):
+
+    model = Flight
+    table = "flight"
+
+    ALLOWED_SEARCH_FIELDS = {
+        'id',
+        'flight_number',
+        'aircraft_id',
+        'origin_id',
+        'destination_id',
+        'pilot_id',
+        'copilot_id',
+        'departure_time_scheduled',
+        'arrival_time_scheduled',
+        'departure_time_actual',
+        'arrival_time_actual',
+        'status'
+    }
+    default_order = ("-departure_time_scheduled", )
+
+    INSERT_SQL = """
+        INSERT INTO flight
+            (flight_number, aircraft_id, origin_id, destination_id, pilot_id, copilot_id, departure_time_scheduled, arrival_time_scheduled, departure_time_actual, arrival_time_actual, status)
+        VALUES
+            (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """
+
+    # Inserts the item, or updates the row with the same flight_number and departure_time_scheduled if anything differs
+    UPSERT_SQL = INSERT_SQL + """
+        ON CONFLICT (flight_number, departure_time_scheduled) DO UPDATE SET
+            aircraft_id = excluded.aircraft_id,
+            origin_id = excluded.origin_id,
+            destination_id = excluded.destination_id,
+            pilot_id = excluded.pilot_id,
+            copilot_id = excluded.copilot_id,
+            arrival_time_scheduled = excluded.arrival_time_scheduled,
+            departure_time_actual = excluded.departure_time_actual,
+            arrival_time_actual = excluded.arrival_time_actual,
+            status = excluded.status
+        WHERE (aircraft_id, origin_id, destination_id, pilot_id, copilot_id, arrival_time_scheduled, departure_time_actual, arrival_time_actual, status)
+            IS NOT (excluded.aircraft_id, excluded.origin_id, excluded.destination_id, excluded.pilot_id, excluded.copilot_id, excluded.arrival_time_scheduled, excluded.departure_time_actual, excluded.arrival_time_actual, excluded.status)
+    """
+
+    UPDATE_SQL = """
+        UPDATE flight
+        SET
+            flight_number = ?,
+            aircraft_id = ?,
+            origin_id = ?,
+            destination_id = ?,
+            pilot_id = ?,
+            copilot_id = ?,
+            departure_time_scheduled = ?,
+            arrival_time_scheduled = ?,
+            departure_time_actual = ?,
+            arrival_time_actual = ?,
+            status = ?
+        WHERE id = ?
+    """
 
     def __init__(self, conn):
-        self.conn = conn
+        super().__init__(conn)
+
+        # Converts flight times between datetimes and however this database stores them
+        self.flight_times = get_flight_times(conn)
     
     def get_item_by_id(self, flight_id: int) -> Flight | None:
-        cursor = self.conn.execute(
+        return self._fetch_one(
             """
             SELECT * FROM flight WHERE id = ?
             """,
             (flight_id, )
         )
-        result = cursor.fetchone()
 
-        if result is None or len(result) == 0:
-            return None
+    def find(self, query: Query, include_history: bool = False) -> list[Flight]:
+        return self._fetch_all(*self._compile_query(query, self.__flight_source(include_history)))
 
-        flight = Flight(
-            id=result["id"],
-            flight_number=result["flight_number"],
-            aircraft_id=result["aircraft_id"],
-            origin_id=result["origin_id"],
-            destination_id=result["destination_id"],
-            pilot_id=result["pilot_id"],
-            copilot_id=result["copilot_id"],
-            departure_time_scheduled=datetime.strptime(result["departure_time_scheduled"], '%Y-%m-%d %H:%M'),
-            arrival_time_scheduled=datetime.strptime(result["arrival_time_scheduled"], '%Y-%m-%d %H:%M'),
-            departure_time_actual=datetime.strptime(result["departure_time_actual"], '%Y-%m-%d %H:%M') if result["departure_time_actual"] else None,
-            arrival_time_actual=datetime.strptime(result["arrival_time_actual"], '%Y-%m-%d %H:%M') if result["arrival_time_actual"] else None,
-            status=result["status"]
+    def iter_find(self, query: Query, include_history: bool = False, batch_size: int | None = None) -> Iterator[Flight]:
+        return self._iter_all(*self._compile_query(query, self.__flight_source(include_history)), batch_size=batch_size)
+
+    def search_on_field(self, field_name: str, value, include_history: bool = False) -> list[Flight]:
+        return self.find(Query(equals(field_name, value)), include_history)
+
+    def iter_search_on_field(self, field_name: str, value, include_history: bool = False,
+                             batch_size: int | None = None) -> Iterator[Flight]:
+        return self.iter_find(Query(equals(field_name, value)), include_history, batch_size)
+
+    def get_flight_list(self, include_history: bool = False) -> list[Flight]:
+        return self._fetch_all(self.__list_sql(include_history))
+
+    def iter_flights(self, include_history: bool = False, batch_size: int | None = None) -> Iterator[Flight]:
+        # The flights of get_flight_list, read a batch at a time for exports and reports over every flight
+        return self._iter_all(self.__list_sql(include_history), batch_size=batch_size)
+
+    def get_flight_page(self, after: tuple | None = None, limit: int = DEFAULT_PAGE_SIZE, direction: str = "next",
+                        include_history: bool = False) -> Page:
+        # Latest departures first, like get_flight_list; after is a (departure_time_scheduled, id) key.
+        # With history, SQLite merges index scans of the hot and archive tables.
+        return self._fetch_page(
+            self.__flight_source(include_history),
+            ("departure_time_scheduled", "id"),
+            after,
+            limit,
+            direction,
+            descending=True
         )
-        return flight
 
-    def search_on_field(self, field_name: str, value) -> list[Flight]:
-        sql = f"""
-            SELECT *
-            FROM flight
-            WHERE {field_name} = ?
-            ORDER BY departure_time_scheduled DESC
-        """
-        cursor = self.conn.execute(sql, (value, ))
-        results = cursor.fetchall()
-        
-        result_list = []
-        for row in results:
-            result_list.append(
-                Flight(
-                    id=row["id"],
-                    flight_number=row["flight_number"],
-                    aircraft_id=row["aircraft_id"],
-                    origin_id=row["origin_id"],
-                    destination_id=row["destination_id"],
-                    pilot_id=row["pilot_id"],
-                    copilot_id=row["copilot_id"],
-                    departure_time_scheduled=datetime.strptime(row["departure_time_scheduled"], "%Y-%m-%d %H:%M"),
-                    arrival_time_scheduled=datetime.strptime(row["arrival_time_scheduled"], "%Y-%m-%d %H:%M"),
-                    departure_time_actual=datetime.strptime(row["departure_time_actual"], "%Y-%m-%d %H:%M") if row["departure_time_actual"] else None,
-                    arrival_time_actual=datetime.strptime(row["arrival_time_actual"], "%Y-%m-%d %H:%M") if row["arrival_time_actual"] else None,
-                    status=row["status"]
-                )
-            )
+    def get_flight_columns(self, query: Query | None = None, include_history: bool = False,
+                           with_references: bool = False, names=None) -> dict:
+        # The flights matching the query as a NumPy array per column, in the query's order, for
+        # vectorised analysis without creating a Flight per row. Missing ids read as NO_ID, missing
+        # times as NaT and missing text as "". names limits the read to some of FLIGHT_COLUMNS.
+        if names is None:
+            kinds = FLIGHT_COLUMNS
+        elif set(names) <= FLIGHT_COLUMNS.keys():
+            kinds = {name: FLIGHT_COLUMNS[name] for name in names}
+        else:
+            raise ValueError(f"Invalid flight columns: {', '.join(sorted(set(names) - FLIGHT_COLUMNS.keys()))}")
+
+        sql, parameters = self._compile_query(
+            query or Query(),
+            self.__flight_source(include_history),
+            ", ".join(column_sql(name, kind, self.flight_times) for name, kind in kinds.items())
+        )
+        columns = fetch_columns(self._iter_batches(sql, parameters, COLUMN_BATCH_SIZE), kinds)
+
+        if with_references:
+            # The reference tables are small, so each code is read once and indexed by id rather
+            # than joined to every flight
+            for name, (table, id_column, column) in REFERENCE_COLUMNS.items():
+                values = self.conn.execute(f"SELECT id, {column} FROM {table}").fetchall()
+                columns[name] = lookup(values, columns[id_column])
+
+        return columns
 
-        return result_list
+    def get_flight_frame(self, query: Query | None = None, include_history: bool = False,
+                         with_references: bool = False):
+        # get_flight_columns as a pandas DataFrame, with status and the reference codes as categoricals
+        return to_frame(
+            self.get_flight_columns(query, include_history, with_references),
+            FLIGHT_COLUMNS | (dict.fromkeys(REFERENCE_COLUMNS, "category") if with_references else {})
+        )
 
-    def get_flight_list(self) -> list[Flight]:
+    def get_denormalised_flight_list(self) -> list:
         cursor = self.conn.execute(
-            """
+            f"""
             SELECT *
-            FROM flight
+            FROM {self.__denormalised_source()}
             ORDER BY departure_time_scheduled DESC
             """
         )
-        results = cursor.fetchall()
-        
-        result_list = []
-        for row in results:
-            result_list.append(
-                Flight(
-                    id=row["id"],
-                    flight_number=row["flight_number"],
-                    aircraft_id=row["aircraft_id"],
-                    origin_id=row["origin_id"],
-                    destination_id=row["destination_id"],
-                    pilot_id=row["pilot_id"],
-                    copilot_id=row["copilot_id"],
-                    departure_time_scheduled=datetime.strptime(row["departure_time_scheduled"], "%Y-%m-%d %H:%M"),
-                    arrival_time_scheduled=datetime.strptime(row["arrival_time_scheduled"], "%Y-%m-%d %H:%M"),
-                    departure_time_actual=datetime.strptime(row["departure_time_actual"], "%Y-%m-%d %H:%M") if row["departure_time_actual"] else None,
-                    arrival_time_actual=datetime.strptime(row["arrival_time_actual"], "%Y-%m-%d %H:%M") if row["arrival_time_actual"] else None,
-                    status=row["status"]
-                )
+        return cursor.fetchall()
+
+    def get_denormalised_flights(self, flight_ids: list[int]) -> dict:
+        if not flight_ids:
+            return {}
+
+        source = self.__denormalised_source()
+        results = {}
+
+        for chunk in chunked(flight_ids):
+            cursor = self.conn.execute(
+                f"""
+                SELECT *
+                FROM {source}
+                WHERE flight_id IN ({", ".join("?" for _ in chunk)})
+                """,
+                chunk
             )
+            for row in cursor.fetchall():
+                results[row["flight_id"]] = row
 
-        return result_list
-
-    def insert_item(self, flight: Flight) -> None:        
-        data = {
-            "flight_number": flight.flight_number, 
-            "aircraft_id": flight.aircraft_id,
-            "origin_id": flight.origin_id, 
-            "destination_id": flight.destination_id,
-            "pilot_id": flight.pilot_id,
-            "copilot_id": flight.copilot_id,
-            "departure_time_scheduled": datetime.strftime(flight.departure_time_scheduled, "%Y-%m-%d %H:%M") if flight.departure_time_scheduled else None,
-            "arrival_time_scheduled": datetime.strftime(flight.arrival_time_scheduled, "%Y-%m-%d %H:%M") if flight.arrival_time_scheduled else None,
-            "departure_time_actual": datetime.strftime(flight.departure_time_actual, "%Y-%m-%d %H:%M") if flight.departure_time_actual else None,
-            "arrival_time_actual": datetime.strftime(flight.arrival_time_actual, "%Y-%m-%d %H:%M") if flight.arrival_time_actual else None,
-            "status": flight.status
-        }
-        self.conn.execute(
-            """
-            INSERT INTO flight
-                (flight_number, aircraft_id, origin_id, destination_id, pilot_id, copilot_id, departure_time_scheduled, arrival_time_scheduled, departure_time_actual, arrival_time_actual, status)
-            VALUES
-                (:flight_number, :aircraft_id, :origin_id, :destination_id, :pilot_id, :copilot_id, :departure_time_scheduled, :arrival_time_scheduled, :departure_time_actual, :arrival_time_actual, :status)
-            """,
-            data
-        )
+        return results
+
+    def _decoders(self) -> dict:
+        return {column: self.flight_times.decode for column in FLIGHT_TIME_COLUMNS}
+
+    def _encoders(self) -> dict:
+        return {column: self.flight_times.encode for column in FLIGHT_TIME_COLUMNS}
+
+    def __list_sql(self, include_history: bool) -> str:
+        return f"""
+            SELECT *
+            FROM {self.__flight_source(include_history)}
+            ORDER BY departure_time_scheduled DESC
+        """
+
+    def __flight_source(self, include_history: bool) -> str:
+        # Archived flights are only read when history is asked for
+        return flight_history_source(self.conn) if include_history else "flight"
+
+    def __denormalised_source(self) -> str:
+        # The materialised table has the same columns as the view, so either can be read
+        return MATERIALISED_TABLE if is_materialised(self.conn) else "vw_denormalised_flights"
+
+    def insert_item(self, flight: Flight) -> None:
+        # Single flight writes keep the availability index up to date; other writes have it loaded again
+        availability = self.__indexed_availability()
+        cursor = self.conn.execute(self.INSERT_SQL, self._insert_parameters(flight))
+        self.__index_write(availability, cursor.lastrowid, flight)
     
     def update_item(self, flight: Flight):
-        self.conn.execute(
-            """
-            UPDATE flight
-            SET
-                flight_number = ?,
-                aircraft_id = ?,
-                origin_id = ?,
-                destination_id = ?,
-                pilot_id = ?,
-                copilot_id = ?,
-                departure_time_scheduled = ?,
-                arrival_time_scheduled = ?,
-                departure_time_actual = ?,
-                arrival_time_actual = ?,
-                status = ?
-            WHERE id = ?
-            """,
-            (
-                flight.flight_number,
-                flight.aircraft_id,
-                flight.origin_id,
-                flight.destination_id,
-                flight.pilot_id,
-                flight.copilot_id,
-                datetime.strftime(flight.departure_time_scheduled, "%Y-%m-%d %H:%M") if flight.departure_time_scheduled else None,
-                datetime.strftime(flight.arrival_time_scheduled, "%Y-%m-%d %H:%M") if flight.arrival_time_scheduled else None,
-                datetime.strftime(flight.departure_time_actual, "%Y-%m-%d %H:%M") if flight.departure_time_actual else None,
-                datetime.strftime(flight.arrival_time_actual, "%Y-%m-%d %H:%M") if flight.arrival_time_actual else None,
-                flight.status,
-                flight.id
-            )
-        )
+        availability = self.__indexed_availability()
+        cursor = self.conn.execute(self.UPDATE_SQL, self._update_parameters(flight))
+        self.__index_write(availability, flight.id, flight if cursor.rowcount else None)
+
+    def insert_many(self, flights, chunk_size: int | None = None) -> list[WriteResult]:
+        # A load at least as large as the table is faster with the indexes, duty ledger and change
+        # log written afterwards
+        flights = list(flights)
+        if len(flights) >= REINDEX_MIN_ROWS and len(flights) >= self.conn.execute("SELECT COUNT(*) FROM flight").fetchone()[0]:
+            with deferred_indexes(self.conn, "flight"), deferred_pilot_duty(self.conn), deferred_change_log(self.conn, "flight"):
+                return super().insert_many(flights, chunk_size)
+        return super().insert_many(flights, chunk_size)
 
     def delete_item(self, flight: Flight):
+        availability = self.__indexed_availability()
         self.conn.execute(
             """
             DELETE FROM flight
@@ -163,79 +270,177 @@ class FlightRepository:
             """,
             (flight.id, )
         )
+        self.__index_write(availability, flight.id, None)
     
+    def _insert_parameters(self, flight: Flight) -> tuple:
+        encode = self.flight_times.encode
+        return (
+            flight.flight_number,
+            flight.aircraft_id,
+            flight.origin_id,
+            flight.destination_id,
+            flight.pilot_id,
+            flight.copilot_id,
+            encode(flight.departure_time_scheduled),
+            encode(flight.arrival_time_scheduled),
+            encode(flight.departure_time_actual),
+            encode(flight.arrival_time_actual),
+            flight.status
+        )
+
+    def _update_parameters(self, flight: Flight) -> tuple:
+        return (*self._insert_parameters(flight), flight.id)
+
     def get_available_pilots(self, departure_time: datetime, arrival_time: datetime, flight_id: int) -> list[Pilot] | None:
-        cursor = self.conn.execute(
-            """
-            WITH flight_pilot AS (
-                SELECT id AS flight_id,
-                    pilot_id AS pilot_id,
-                    departure_time_scheduled,
-                    arrival_time_scheduled,
-                    departure_time_actual,
-                    arrival_time_actual
+        if departure_time is None or arrival_time is None:
+            return []
+
+        # A pilot is unavailable if they are on a flight overlapping the window, or if their
+        # minutes in the duty window ending on the day of departure plus this flight would reach
+        # the duty limit
+        max_duty = DUTY_LIMIT_MINUTES - (arrival_time - departure_time).total_seconds() / 60
+        first_day, last_day = duty_days(departure_time)
+
+        availability = self.__pilot_availability()
+        if availability is None:
+            return self.__query_available_pilots(departure_time, arrival_time, flight_id, first_day, last_day, max_duty)
+
+        departure, arrival = epoch_minutes(departure_time), epoch_minutes(arrival_time)
+        pilots = self._fetch_all("SELECT * FROM pilot ORDER BY first_name, family_name, id", model=Pilot)
+        return [
+            pilot for pilot in pilots
+            if availability.is_available(pilot.id, departure, arrival, flight_id, first_day, last_day, max_duty)
+        ]
+
+    def __query_available_pilots(self, departure_time: datetime, arrival_time: datetime, flight_id: int,
+                                 first_day: int, last_day: int, max_duty: float) -> list[Pilot]:
+        params = {
+            "departure": self.flight_times.encode(departure_time),
+            "arrival": self.flight_times.encode(arrival_time),
+            "first_day": first_day,
+            "last_day": last_day,
+            "max_duty": max_duty,
+            "flight_id": flight_id
+        }
+
+        return self._fetch_all(
+            f"""
+            WITH busy_pilots AS (
+                -- The unary + keeps the planner on the arrival time index, which only covers
+                -- flights still in the air at departure rather than the whole history
+                SELECT pilot_id
                 FROM flight
-                UNION ALL
-                SELECT  id AS flight_id,
-                    copilot_id,
-                    departure_time_scheduled,
-                    arrival_time_scheduled,
-                    departure_time_actual,
-                    arrival_time_actual
+                WHERE arrival_time_scheduled > :departure
+                AND +departure_time_scheduled < :arrival
+                AND id <> :flight_id
+                UNION
+                SELECT copilot_id
                 FROM flight
-            ),
-            conflicting_flights AS (
-                SELECT DISTINCT pilot_id
-                FROM flight_pilot
-                WHERE
-                    (
-                        (departure_time_scheduled <= ? AND arrival_time_scheduled >= ?)
-                        OR (departure_time_scheduled <= ? AND arrival_time_scheduled >= ?)
-                    ) AND flight_id <> ?
-            ),
-            flight_hours AS (
-                SELECT
-                    pilot_id,
-                    ROUND(SUM(
-                        (UNIXEPOCH(IFNULL(arrival_time_actual, arrival_time_scheduled))
-                    - UNIXEPOCH(IFNULL(departure_time_actual, departure_time_scheduled))
-                    ) / 3600.0), 2) AS hours
-                FROM flight_pilot
-                WHERE arrival_time_scheduled IS NOT NULL
-                AND departure_time_scheduled IS NOT NULL
-                AND arrival_time_scheduled > datetime(?, '-28 days')
-                GROUP BY pilot_id
+                WHERE arrival_time_scheduled > :departure
+                AND +departure_time_scheduled < :arrival
+                AND id <> :flight_id
             )
             SELECT p.*
             FROM pilot p
-            LEFT JOIN conflicting_flights c ON c.pilot_id = p.id
-            LEFT JOIN flight_hours h ON h.pilot_id = p.id
-            WHERE c.pilot_id IS NULL
-            AND IFNULL(h.hours, 0.0)
-                < (100 - ((unixepoch(?)
-                        - unixepoch(?)) / 3600.0))
+            WHERE p.id NOT IN (SELECT pilot_id FROM busy_pilots WHERE pilot_id IS NOT NULL)
+            -- At most one ledger row a day for each pilot
+            AND IFNULL((
+                SELECT SUM(d.minutes)
+                FROM {DUTY_TABLE} d
+                WHERE d.pilot_id = p.id
+                AND d.day BETWEEN :first_day AND :last_day
+            ), 0) < :max_duty
+            ORDER BY p.first_name, p.family_name, p.id
             """,
-            (
-                departure_time,
-                departure_time,
-                arrival_time,
-                arrival_time,
-                flight_id,
-                departure_time,
-                arrival_time,
-                departure_time
+            params,
+            model=Pilot
+        )
+
+    def get_available_aircraft(self, departure_time: datetime, arrival_time: datetime, flight_id: int,
+                               min_turnaround: int = MIN_TURNAROUND_MINUTES) -> list[Aircraft]:
+        if departure_time is None or arrival_time is None:
+            return []
+
+        # An aircraft is unavailable if it isn't active, or if another of its flights is in the air
+        # within min_turnaround minutes either side of the window
+        turnaround = timedelta(minutes=min_turnaround)
+        params = {
+            "after": self.flight_times.encode(departure_time - turnaround),
+            "before": self.flight_times.encode(arrival_time + turnaround),
+            "flight_id": flight_id
+        }
+
+        return self._fetch_all(
+            """
+            SELECT a.*
+            FROM aircraft a
+            WHERE a.status = 'Active'
+            AND NOT EXISTS (
+                -- Each aircraft is a search of its own flights arriving after the window opens,
+                -- so past flights are never read; the unary + keeps the planner on that index
+                SELECT 1
+                FROM flight f
+                WHERE f.aircraft_id = a.id
+                AND f.arrival_time_scheduled > :after
+                AND +f.departure_time_scheduled < :before
+                AND f.id <> :flight_id
             )
+            ORDER BY a.registration
+            """,
+            params,
+            model=Aircraft
         )
-        results = cursor.fetchall()
-
-        result_list = []
-        for row in results:
-            result_list.append(
-                Pilot(
-                    id=row["id"],
-                    first_name=row["first_name"],
-                    family_name=row["family_name"]
-                )
+
+    def __pilot_availability(self) -> PilotAvailability | None:
+        # The pool's availability index, loaded again if the flights have changed in ways it
+        # couldn't follow
+        availability = get_pilot_availability(self.conn)
+        if availability is None:
+            return None
+
+        version = self.__data_version()
+        if availability.version != version:
+            m = self.flight_times.sql_minutes
+            rows = self.conn.execute(
+                f"""
+                SELECT id, pilot_id, copilot_id, {m("departure_time_scheduled")}, {m("arrival_time_scheduled")},
+                    {duty_minutes_sql(self.flight_times, "flight")}
+                FROM flight
+                WHERE (pilot_id IS NOT NULL OR copilot_id IS NOT NULL)
+                AND departure_time_scheduled IS NOT NULL
+                AND arrival_time_scheduled IS NOT NULL
+                """
+            ).fetchall()
+            availability.load(rows, version)
+        return availability
+
+    def __indexed_availability(self) -> PilotAvailability | None:
+        # The availability index, if it's up to date and so can follow a write about to be made
+        availability = get_pilot_availability(self.conn)
+        if availability is None or availability.version is None or availability.version != self.__data_version():
+            return None
+        return availability
+
+    def __index_write(self, availability: PilotAvailability | None, flight_id: int, flight: Flight | None) -> None:
+        # Applies a single flight written, or removed without a flight, to an up to date index
+        if availability is None:
+            return
+
+        if flight is None:
+            availability.remove(flight_id)
+        else:
+            departure = flight.departure_time_actual or flight.departure_time_scheduled
+            arrival = flight.arrival_time_actual or flight.arrival_time_scheduled
+            availability.put(
+                flight_id,
+                flight.pilot_id,
+                flight.copilot_id,
+                epoch_minutes(flight.departure_time_scheduled),
+                epoch_minutes(flight.arrival_time_scheduled),
+                epoch_minutes(arrival) - epoch_minutes(departure) if arrival and departure else None
             )
+        availability.version = self.__data_version()
 
-        return result_list
\ No newline at end of file
+    def __data_version(self) -> tuple:
+        # Changes with every write through this connection and every commit made by another
+        return self.conn.total_changes, self.conn.execute("PRAGMA data_version").fetchone()[0]
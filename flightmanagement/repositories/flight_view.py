@@ -0,0 +1,89 @@
+from flightmanagement.models.aircraft import Aircraft
+from flightmanagement.models.airport import Airport
+from flightmanagement.models.flight import Flight
+from flightmanagement.models.pilot import Pilot
+from flightmanagement.repositories.aircraft_repository import AircraftRepository
+from flightmanagement.repositories.airport_repository import AirportRepository
+from flightmanagement.repositories.pilot_repository import PilotRepository
+
+# Each relationship of a flight: the table it refers to, and the flight column holding the id
+RELATIONSHIPS = {
+    "aircraft": ("aircraft", "aircraft_id"),
+    "origin": ("airport", "origin_id"),
+    "destination": ("airport", "destination_id"),
+    "pilot": ("pilot", "pilot_id"),
+    "copilot": ("pilot", "copilot_id")
+}
+
+class FlightLoader:
+
+    # Reads the items a set of flights refer to. The first time any flight asks for one from a
+    # table, every flight's ids for that table are read in one batched query, so a result set
+    # takes at most one query per table however many flights it has.
+    def __init__(self, flights: list[Flight], repositories: dict):
+        self.__flights = flights
+        self.__repositories = repositories
+        self.__items = {}
+
+    def get(self, flight: Flight, relationship: str):
+        table, column = RELATIONSHIPS[relationship]
+        item_id = getattr(flight, column)
+        if item_id is None:
+            return None
+
+        items = self.__items.get(table)
+        if items is None:
+            # An origin is read along with the destinations, and a pilot with the copilots
+            columns = [other_column for other_table, other_column in RELATIONSHIPS.values() if other_table == table]
+            items = self.__items[table] = self.__repositories[table].get_items_by_ids(
+                [getattr(other, other_column) for other_column in columns for other in self.__flights]
+            )
+        return items.get(item_id)
+
+class FlightView:
+
+    # A flight with its aircraft, airports and pilots, read from the loader it shares with the
+    # rest of its result set when first used. Flight fields are read through from the flight.
+    def __init__(self, flight: Flight, loader: FlightLoader):
+        self.flight = flight
+        self.__loader = loader
+
+    def __getattr__(self, name):
+        # Only called for names the view lacks; a view without its flight yet (while being copied)
+        # has none to read through to
+        if name == "flight":
+            raise AttributeError(name)
+        return getattr(self.flight, name)
+
+    def __str__(self):
+        return str(self.flight)
+
+    @property
+    def aircraft(self) -> Aircraft | None:
+        return self.__loader.get(self.flight, "aircraft")
+
+    @property
+    def origin(self) -> Airport | None:
+        return self.__loader.get(self.flight, "origin")
+
+    @property
+    def destination(self) -> Airport | None:
+        return self.__loader.get(self.flight, "destination")
+
+    @property
+    def pilot(self) -> Pilot | None:
+        return self.__loader.get(self.flight, "pilot")
+
+    @property
+    def copilot(self) -> Pilot | None:
+        return self.__loader.get(self.flight, "copilot")
+
+def get_flight_views(conn, flights: list[Flight], aircraft_repository=None, airport_repository=None,
+                     pilot_repository=None) -> list[FlightView]:
+    # Views of the flights sharing one loader; callers with repositories to hand pass them in
+    loader = FlightLoader(flights, {
+        "aircraft": aircraft_repository or AircraftRepository(conn),
+        "airport": airport_repository or AirportRepository(conn),
+        "pilot": pilot_repository or PilotRepository(conn)
+    })
+    return [FlightView(flight, loader) for flight in flights]
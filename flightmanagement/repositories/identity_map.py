@@ -0,0 +1,100 @@
+from collections import OrderedDict
+
+# Items kept per entity; reference data is small, so this holds most of it
+IDENTITY_MAP_SIZE = 2048
+
+class IdentityMap:
+
+    # A bounded, least recently used cache of one entity's items by id, with lookups by natural key
+    def __init__(self, natural_keys: tuple = (), size: int | None = None):
+        self.natural_keys = natural_keys
+        self.size = size or IDENTITY_MAP_SIZE
+        self.hits = 0
+        self.misses = 0
+
+        self.__items = OrderedDict()
+        self.__ids_by_key = {key: {} for key in natural_keys}
+
+    def __len__(self) -> int:
+        return len(self.__items)
+
+    def get(self, item_id):
+        item = self.__items.get(item_id)
+        if item is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self.__items.move_to_end(item_id)
+        return item
+
+    def get_by(self, key: str, value):
+        item_id = self.__ids_by_key[key].get(value)
+        if item_id is None:
+            self.misses += 1
+            return None
+        return self.get(item_id)
+
+    def put(self, item) -> None:
+        if item is None or item.id is None:
+            return
+
+        self.__remove(item.id)
+        self.__items[item.id] = item
+        for key in self.natural_keys:
+            self.__ids_by_key[key][getattr(item, key)] = item.id
+
+        while len(self.__items) > self.size:
+            self.__remove(next(iter(self.__items)))
+
+    def invalidate(self, item) -> None:
+        # Forgets the cached item with this item's id and any cached under the same natural keys
+        if item.id is not None:
+            self.__remove(item.id)
+        for key in self.natural_keys:
+            item_id = self.__ids_by_key[key].get(getattr(item, key))
+            if item_id is not None:
+                self.__remove(item_id)
+
+    def clear(self) -> None:
+        self.__items.clear()
+        for ids in self.__ids_by_key.values():
+            ids.clear()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "items": len(self.__items),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0
+        }
+
+    def __remove(self, item_id) -> None:
+        item = self.__items.pop(item_id, None)
+        if item is None:
+            return
+        for key in self.natural_keys:
+            ids = self.__ids_by_key[key]
+            if ids.get(getattr(item, key)) == item_id:
+                del ids[getattr(item, key)]
+
+def get_identity_map(conn, entity: str, natural_keys: tuple = ()) -> IdentityMap:
+    # A connection pool shares one identity map per entity between all its repositories, so a
+    # write through one repository invalidates what the others see. A bare connection can't hold
+    # one, so its repositories each keep their own.
+    identity_maps = getattr(conn, "identity_maps", None)
+    if not isinstance(identity_maps, dict):
+        return IdentityMap(natural_keys)
+
+    identity_map = identity_maps.get(entity)
+    if identity_map is None:
+        identity_map = identity_maps[entity] = IdentityMap(natural_keys)
+    return identity_map
+
+def clear_identity_maps(conn) -> None:
+    # For writes made outside the repositories, such as reseeding or generating data
+    identity_maps = getattr(conn, "identity_maps", None)
+    if isinstance(identity_maps, dict):
+        for identity_map in identity_maps.values():
+            identity_map.clear()
@@ -0,0 +1,114 @@
+from bisect import bisect_left, bisect_right
+
+MINUTES_PER_DAY = 24 * 60
+
+class PilotAvailability:
+
+    # An in-memory index of each pilot's flights, answering whether a pilot is free for a window and
+    # under the duty limit without scanning the flight table. Times are minutes since 1970. Each
+    # pilot's flights are kept sorted by scheduled arrival, with running totals from the end, so
+    # both checks are a binary search. Writes only mark the pilots they touch, whose index is
+    # rebuilt on their next check.
+    def __init__(self):
+        # The database version the index reflects; None until loaded and after invalidate
+        self.version = None
+        self.load_count = 0
+
+        self.__flights = {}
+        self.__flight_ids = {}
+        self.__indexes = {}
+
+    def load(self, rows, version) -> None:
+        # rows are (flight_id, pilot_id, copilot_id, departure, arrival, duty minutes)
+        self.__flights.clear()
+        self.__flight_ids.clear()
+        self.__indexes.clear()
+        for flight_id, *flight in rows:
+            self.put(flight_id, *flight)
+
+        self.version = version
+        self.load_count += 1
+
+    def put(self, flight_id: int, pilot_id: int | None, copilot_id: int | None, departure: int | None,
+            arrival: int | None, duty: int | None) -> None:
+        # Adds the flight, or replaces it if it's already indexed. Flights without both scheduled
+        # times never count against a pilot, so aren't kept.
+        self.remove(flight_id)
+        if departure is None or arrival is None:
+            return
+
+        flight = (pilot_id, copilot_id, departure, arrival, duty or 0)
+        self.__flights[flight_id] = flight
+        for crew_id in (pilot_id, copilot_id):
+            if crew_id is not None:
+                self.__flight_ids.setdefault(crew_id, set()).add(flight_id)
+                self.__indexes.pop(crew_id, None)
+
+    def remove(self, flight_id: int) -> None:
+        flight = self.__flights.pop(flight_id, None)
+        if flight is None:
+            return
+
+        for crew_id in flight[:2]:
+            if crew_id is not None:
+                self.__flight_ids[crew_id].discard(flight_id)
+                self.__indexes.pop(crew_id, None)
+
+    def invalidate(self) -> None:
+        # For writes the index can't follow, such as a rollback; the next check loads it again
+        self.version = None
+
+    def is_available(self, pilot_id: int, departure: int, arrival: int, flight_id: int, first_day: int,
+                     last_day: int, max_duty: float) -> bool:
+        # Free unless on a flight other than flight_id overlapping the window, and under max_duty
+        # minutes on flights arriving from first_day to last_day, as the duty ledger counts them. A
+        # pilot flying as both pilot and copilot counts the flight twice.
+        arrivals, departures, duties = self.__index(pilot_id)
+
+        first, second = departures[bisect_right(arrivals, departure)]
+        earliest = second if first is not None and first[1] == flight_id else first
+        if earliest is not None and earliest[0] < arrival:
+            return False
+
+        duty = duties[bisect_left(arrivals, first_day * MINUTES_PER_DAY)] - duties[bisect_left(arrivals, (last_day + 1) * MINUTES_PER_DAY)]
+        return duty < max_duty
+
+    def __index(self, pilot_id: int) -> tuple:
+        index = self.__indexes.get(pilot_id)
+        if index is None:
+            index = self.__indexes[pilot_id] = self.__build_index(pilot_id)
+        return index
+
+    def __build_index(self, pilot_id: int) -> tuple:
+        # For the flights from each position in arrival order to the end: the two earliest
+        # departures of different flights, as (departure, flight_id), so the one being edited can
+        # be skipped, and the total duty
+        flights = sorted(
+            (self.__flights[flight_id][3], self.__flights[flight_id][2], flight_id, self.__flights[flight_id][4])
+            for flight_id in self.__flight_ids.get(pilot_id, ())
+            for crew_id in self.__flights[flight_id][:2]
+            if crew_id == pilot_id
+        )
+
+        departures = [(None, None)] * (len(flights) + 1)
+        duties = [0] * (len(flights) + 1)
+        first = second = None
+        for position in range(len(flights) - 1, -1, -1):
+            _, departure, flight_id, duty = flights[position]
+            if (first is None or flight_id != first[1]) and (second is None or flight_id != second[1]):
+                if first is None or departure < first[0]:
+                    first, second = (departure, flight_id), first
+                elif second is None or departure < second[0]:
+                    second = (departure, flight_id)
+            departures[position] = (first, second)
+            duties[position] = duties[position + 1] + duty
+
+        return [flight[0] for flight in flights], departures, duties
+
+def get_pilot_availability(conn) -> PilotAvailability | None:
+    # A connection pool sees every write made in this process, so keeps one index for all its
+    # repositories. A bare connection can't hold one, and availability is read with SQL.
+    availability = getattr(conn, "pilot_availability", False)
+    if availability is None:
+        availability = conn.pilot_availability = PilotAvailability()
+    return availability if isinstance(availability, PilotAvailability) else None
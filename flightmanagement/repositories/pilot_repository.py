@@ -1,75 +1,102 @@
+from collections.abc import Iterator
+from datetime import datetime
+from flightmanagement.db.flight_times import epoch_days
+from flightmanagement.db.migrations import DUTY_TABLE
 from flightmanagement.models.pilot import Pilot
+from flightmanagement.models.page import Page
+from flightmanagement.repositories.base_repository import DEFAULT_PAGE_SIZE, BaseRepository, chunked
+from flightmanagement.repositories.text_search import search_rows
 
-class PilotRepository:
+# Pilots may fly up to 100 hours in the 28 days up to and including the day of a departure
+DUTY_LIMIT_MINUTES = 100 * 60
+DUTY_WINDOW_DAYS = 28
 
-    def __init__(self, conn):
-        self.conn = conn
+def duty_days(as_of: datetime) -> tuple[int, int]:
+    # The first and last days, as the duty ledger keys them, of the duty window ending on as_of's day
+    last_day = epoch_days(as_of)
+    return last_day - DUTY_WINDOW_DAYS + 1, last_day
 
-    def get_item_by_id(self, pilot_id: int) -> Pilot | None:        
-        cursor = self.conn.execute(
+class PilotRepository(BaseRepository):
+
+    model = Pilot
+    table = "pilot"
+    cached = True
+
+    ALLOWED_SEARCH_FIELDS = {
+        'id',
+        'first_name',
+        'family_name'
+    }
+    default_order = ("first_name", "family_name")
+
+    INSERT_SQL = """
+        INSERT INTO pilot
+            (first_name, family_name)
+        VALUES
+            (:first_name, :family_name)
+    """
+    UPDATE_SQL = """
+        UPDATE pilot
+        SET
+            first_name = ?,
+            family_name = ?
+        WHERE id = ?
+    """
+
+    def get_item_by_id(self, pilot_id: int) -> Pilot | None:
+        return self._fetch_one_cached(
+            "id",
+            pilot_id,
             """
             SELECT * FROM pilot WHERE id = ?
-            """,
-            (pilot_id, )
-        )
-        result = cursor.fetchone()
-        
-        if result is None or len(result) == 0:
-            return None
-
-        pilot = Pilot(
-            id=result["id"],
-            first_name=result["first_name"],
-            family_name=result["family_name"]
+            """
         )
-        return pilot
 
     def get_pilot_list(self) -> list[Pilot]:
-        cursor = self.conn.execute(
+        return self._fetch_all(
             """
             SELECT * FROM pilot ORDER BY first_name, family_name
             """
         )
-        results = cursor.fetchall()
-        
-        result_list = []
-        for row in results:
-            result_list.append(
-                Pilot(
-                    id=row["id"],
-                    first_name=row["first_name"],
-                    family_name=row["family_name"]
-                )
-            )
-
-        return result_list
 
-    def insert_item(self, pilot: Pilot) -> None:        
-        data = {
-            "first_name": pilot.first_name,
-            "family_name": pilot.family_name
-        }
-        self.conn.execute(
+    def iter_pilots(self, batch_size: int | None = None) -> Iterator[Pilot]:
+        return self._iter_all(
             """
-            INSERT INTO pilot
-                (first_name, family_name)
-            VALUES
-                (:first_name, :family_name)
+            SELECT * FROM pilot ORDER BY first_name, family_name
             """,
-            data
+            batch_size=batch_size
         )
 
+    def get_duty_minutes(self, pilot_ids: list[int], as_of: datetime) -> dict[int, int]:
+        # Minutes flown by each pilot in the duty window ending on as_of's day, from at most
+        # DUTY_WINDOW_DAYS ledger rows each; pilots without flights in it are left out
+        first_day, last_day = duty_days(as_of)
+        minutes = {}
+        for chunk in chunked(list(dict.fromkeys(pilot_ids))):
+            cursor = self.conn.execute(
+                f"""
+                SELECT pilot_id, SUM(minutes)
+                FROM {DUTY_TABLE}
+                WHERE pilot_id IN ({", ".join("?" for _ in chunk)})
+                AND day BETWEEN ? AND ?
+                GROUP BY pilot_id
+                """,
+                (*chunk, first_day, last_day)
+            )
+            minutes.update(cursor.fetchall())
+        return minutes
+
+    def get_pilot_page(self, after: tuple | None = None, limit: int = DEFAULT_PAGE_SIZE, direction: str = "next") -> Page:
+        # In name order, like get_pilot_list; after is a (first_name, family_name, id) key
+        return self._fetch_page("pilot", ("first_name", "family_name", "id"), after, limit, direction)
+    
+    def insert_item(self, pilot: Pilot) -> None:
+        self.conn.execute(self.INSERT_SQL, self._insert_parameters(pilot))
+        self._invalidate(pilot)
+
     def update_item(self, pilot: Pilot) -> None:
-        self.conn.execute(
-            """
-            UPDATE pilot
-            SET
-                first_name = ?,
-                family_name = ?
-            WHERE id = ?
-            """,
-            (pilot.first_name, pilot.family_name, pilot.id)
-        )
+        self.conn.execute(self.UPDATE_SQL, self._update_parameters(pilot))
+        self._invalidate(pilot)
     
     def delete_item(self, pilot: Pilot) -> None:
         self.conn.execute(
@@ -79,28 +106,16 @@ class PilotRepository:
             """,
             (pilot.id, )
         )
+        self._invalidate(pilot)
     
-    def search_on_field(self, field_name: str, value) -> list[Pilot]:
-        sql = f"""
-            SELECT *
-            FROM pilot
-            WHERE {field_name} = ?
-            ORDER BY first_name, family_name
-        """
-        cursor = self.conn.execute(sql, (value, ))
-        results = cursor.fetchall()
-        
-        result_list = []
-        for row in results:
-            result_list.append(
-                Pilot(
-                    id=row["id"],
-                    first_name=row["first_name"],
-                    family_name=row["family_name"]
-                )
-            )
+    def _insert_parameters(self, pilot: Pilot) -> dict:
+        return {
+            "first_name": pilot.first_name,
+            "family_name": pilot.family_name
+        }
 
-        return result_list
-    
-    
-    
\ No newline at end of file
+    def _update_parameters(self, pilot: Pilot) -> tuple:
+        return (pilot.first_name, pilot.family_name, pilot.id)
+
+    def search_text(self, query: str, limit: int = 20) -> list[Pilot]:
+        return self._map_rows(search_rows(self.conn, "pilot", query, limit))
@@ -0,0 +1,129 @@
+from dataclasses import dataclass, replace
+
+@dataclass(frozen=True)
+class Condition:
+
+    # A test of one field: "=", "IN", "BETWEEN" (either end may be None) or "PREFIX"
+    field: str
+    operator: str
+    values: tuple
+
+@dataclass(frozen=True)
+class Combination:
+
+    # Predicates joined with "AND" or "OR"
+    operator: str
+    predicates: tuple
+
+@dataclass(frozen=True)
+class Query:
+
+    # order_by holds field names, descending when prefixed with "-"; without it a repository
+    # uses its default order
+    where: Condition | Combination | None = None
+    order_by: tuple = ()
+    limit: int | None = None
+
+    def filter(self, *predicates) -> "Query":
+        # A copy of this query that also requires all the predicates
+        return replace(self, where=all_of(*((self.where, ) if self.where else ()), *predicates))
+
+def equals(field: str, value) -> Condition:
+    return Condition(field, "=", (value, ))
+
+def one_of(field: str, values) -> Condition:
+    return Condition(field, "IN", tuple(values))
+
+def between(field: str, low=None, high=None) -> Condition:
+    # Inclusive at both ends
+    if low is None and high is None:
+        raise ValueError(f"A range on {field} needs at least one end")
+    return Condition(field, "BETWEEN", (low, high))
+
+def starts_with(field: str, prefix: str) -> Condition:
+    return Condition(field, "PREFIX", (prefix, ))
+
+def all_of(*predicates) -> Combination | Condition:
+    return predicates[0] if len(predicates) == 1 else Combination("AND", predicates)
+
+def any_of(*predicates) -> Combination | Condition:
+    return predicates[0] if len(predicates) == 1 else Combination("OR", predicates)
+
+def compile_query(query: Query, source: str, fields, encoders: dict | None = None, default_order: tuple = (),
+                  columns: str = "*") -> tuple[str, list]:
+    # Builds one parameterised statement. Field names are the only part of a query written into
+    # the SQL, so each is checked against the fields allowed; values are always bound. Ranges and
+    # prefixes compile to comparisons an index on the field can seek, rather than LIKE or functions.
+    # columns is written as given, so must never come from user input.
+    encoders = encoders or {}
+    parameters = []
+
+    def check(field: str) -> str:
+        if field not in fields:
+            raise ValueError(f"Invalid search field: {field}")
+        return field
+
+    def encode(field: str, value):
+        return encoders[field](value) if value is not None and field in encoders else value
+
+    def compile_predicate(predicate) -> str:
+        if isinstance(predicate, Combination):
+            if not predicate.predicates:
+                # An empty AND matches everything and an empty OR nothing
+                return "1" if predicate.operator == "AND" else "0"
+            return f" {predicate.operator} ".join(f"({compile_predicate(part)})" for part in predicate.predicates)
+
+        field = check(predicate.field)
+        if predicate.operator == "=":
+            if predicate.values[0] is None:
+                return f"{field} IS NULL"
+            parameters.append(encode(field, predicate.values[0]))
+            return f"{field} = ?"
+
+        if predicate.operator == "IN":
+            values = [value for value in predicate.values if value is not None]
+            if not values:
+                return "0"
+            parameters.extend(encode(field, value) for value in values)
+            return f"{field} IN ({', '.join('?' for _ in values)})"
+
+        if predicate.operator == "BETWEEN":
+            conditions = []
+            for value, comparison in zip(predicate.values, (">=", "<=")):
+                if value is not None:
+                    parameters.append(encode(field, value))
+                    conditions.append(f"{field} {comparison} ?")
+            return " AND ".join(conditions)
+
+        if predicate.operator == "PREFIX":
+            # Values starting with the prefix sort from the prefix itself up to, but not including,
+            # the prefix with its last character incremented
+            prefix = predicate.values[0]
+            if prefix == "":
+                return f"{field} IS NOT NULL"
+            if ord(prefix[-1]) == 0x10FFFF:
+                parameters.append(prefix)
+                return f"{field} >= ?"
+            parameters.extend((prefix, prefix[:-1] + chr(ord(prefix[-1]) + 1)))
+            return f"{field} >= ? AND {field} < ?"
+
+        raise ValueError(f"Invalid search operator: {predicate.operator}")
+
+    sql = f"SELECT {columns} FROM {source}"
+    if query.where is not None:
+        sql += f" WHERE {compile_predicate(query.where)}"
+
+    order = [
+        f"{check(field[1:])} DESC" if field.startswith("-") else f"{check(field)} ASC"
+        for field in query.order_by or default_order
+    ]
+    if order:
+        sql += f" ORDER BY {', '.join(order)}"
+
+    if query.limit is not None:
+        if query.limit < 1:
+            raise ValueError(f"Invalid query limit: {query.limit}")
+        sql += " LIMIT ?"
+        parameters.append(query.limit)
+
+    return sql, parameters
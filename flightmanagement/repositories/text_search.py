@@ -0,0 +1,58 @@
+import re
+
+# Entities in search_index; rows are keyed as id * 3 + offset (see migration 4)
+SEARCH_INDEX_OFFSETS = {
+    "airport": 0,
+    "pilot": 1,
+    "aircraft": 2
+}
+
+def build_match_queries(text: str) -> list[str]:
+    # Returns FTS5 queries to try in order: every word as a substring, then any shared fragment.
+    # The trigram tokenizer can't match terms shorter than three characters, so those are dropped.
+    words = [word for word in re.split(r"\s+", text.strip().lower()) if len(word) >= 3]
+    if len(words) == 0:
+        return []
+
+    exact = " AND ".join(_quote(word) for word in words)
+
+    # Fuzzy matching ranks rows by how many fragments of the words they share. Longer words are
+    # split into four character fragments, which are far more selective than single trigrams.
+    fragments = []
+    for word in words:
+        size = 4 if len(word) >= 5 else 3
+        for start in range(len(word) - size + 1):
+            fragment = word[start:start + size]
+            if fragment not in fragments:
+                fragments.append(fragment)
+    fuzzy = " OR ".join(_quote(fragment) for fragment in fragments)
+
+    return [exact, fuzzy] if fuzzy != exact else [exact]
+
+def search_rows(conn, entity: str, text: str, limit: int) -> list:
+    # Ranked rows of the entity's table matching the text; falls back to fuzzy matching if nothing
+    # matches every word exactly
+    if entity not in SEARCH_INDEX_OFFSETS:
+        raise ValueError(f"Invalid search entity: {entity}")
+
+    for query in build_match_queries(text):
+        cursor = conn.execute(
+            f"""
+            SELECT t.*
+            FROM search_index s
+            INNER JOIN {entity} t ON t.id = s.rowid / 3
+            WHERE search_index MATCH ?
+            AND s.entity = ?
+            ORDER BY s.rank
+            LIMIT ?
+            """,
+            (query, entity, limit)
+        )
+        results = cursor.fetchall()
+        if results:
+            return results
+
+    return []
+
+def _quote(term: str) -> str:
+    return '"' + term.replace('"', '""') + '"'
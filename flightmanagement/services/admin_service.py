@@ -1,12 +1,177 @@
-from flightmanagement.db.db import get_connection, initialise_schema, seed_database_data
+from prettytable import PrettyTable, TableStyle, ALL, NONE
+from flightmanagement.config import settings
+from flightmanagement.db.db import initialise_schema, seed_database_data
 from flightmanagement.db.db import transaction
+from flightmanagement.db.migrations import migrate, get_schema_version, convert_flight_times
+from flightmanagement.db.archive import archive_flights, clear_archive, is_archive_attached
+from flightmanagement.db.synthetic_data import generate_database_data
+from flightmanagement.db.materialised_flights import is_materialised, rebuild_materialised_flights, set_materialised_flights
+from flightmanagement.repositories.change_log_repository import ChangeLogRepository
+from flightmanagement.repositories.identity_map import clear_identity_maps
+from flightmanagement.services.schedule_validator import ScheduleValidator
 
 class AdminService:
 
     def __init__(self, conn):
         self.conn = conn
     
-    def initialise_database(self):
+    def initialise_database(self) -> list[int]:
+        return migrate(self.conn)
+
+    def reseed_database(self):
+        # Every cached reference item is replaced
+        clear_identity_maps(self.conn)
+        initialise_schema(self.conn)
+        with transaction(self.conn):
+            clear_archive(self.conn)
+            seed_database_data(self.conn)
+
+        # The sample data is written as text, so convert it if another storage is configured
+        convert_flight_times(self.conn, settings.flight_time_storage)
+        set_materialised_flights(self.conn, settings.materialise_flights)
+
+    def generate_database(self, flights: int, seed: int = 0) -> dict:
+        # Replace all data with a synthetic data set, scaling the reference data with the flights
+        clear_identity_maps(self.conn)
+        initialise_schema(self.conn)
+        with transaction(self.conn):
+            clear_archive(self.conn)
+
+        convert_flight_times(self.conn, settings.flight_time_storage)
+        counts = generate_database_data(
+            self.conn,
+            flights=flights,
+            airports=max(10, min(1000, flights // 1000)),
+            aircraft=max(5, flights // 2000),
+            pilots=max(20, flights // 200),
+            seed=seed
+        )
+        set_materialised_flights(self.conn, settings.materialise_flights)
+        return counts
+
+    def get_schema_version(self) -> int:
+        return get_schema_version(self.conn)
+
+    def set_flight_time_storage(self, storage: str) -> bool:
+        return convert_flight_times(self.conn, storage)
+
+    def rebuild_materialised_flights(self) -> int | None:
+        if not is_materialised(self.conn):
+            return None
         with transaction(self.conn):
-            initialise_schema(self.conn)
-            seed_database_data(self.conn)
\ No newline at end of file
+            return rebuild_materialised_flights(self.conn)
+
+    def archive_flights(self, older_than_days: int | None = None) -> int | None:
+        if not is_archive_attached(self.conn):
+            return None
+        with transaction(self.conn):
+            return archive_flights(self.conn, settings.archive_after_days if older_than_days is None else older_than_days)
+
+    def compact_change_log(self) -> int:
+        with transaction(self.conn):
+            return ChangeLogRepository(self.conn).compact()
+
+    def get_schedule_conflicts(self) -> list:
+        return ScheduleValidator(self.conn).validate()
+
+    def get_schedule_conflicts_table(self, conflicts: list, n: int = 50) -> str:
+        if len(conflicts) == 0:
+            return ""
+
+        # Initialise the table
+        table = PrettyTable(["Resource", "ID", "Flight", "Other flight", "From", "To"])
+
+        # Populate table rows, the first n conflicts in time order
+        for conflict in conflicts[:n]:
+            table.add_row([
+                conflict.resource.capitalize(),
+                conflict.resource_id,
+                f"{conflict.flight.flight_number} (#{conflict.flight.id})" if conflict.flight.id else conflict.flight.flight_number,
+                f"{conflict.other_flight.flight_number} (#{conflict.other_flight.id})" if conflict.other_flight.id else conflict.other_flight.flight_number,
+                conflict.start.strftime("%Y-%m-%d %H:%M"),
+                conflict.end.strftime("%Y-%m-%d %H:%M")
+            ])
+
+        # Set table formatting
+        table.set_style(TableStyle.SINGLE_BORDER)
+        table.align = "l"
+        table.hrules = ALL
+        table.vrules = NONE
+
+        indented_table = ""
+        for row in table.get_string().split("\n"):
+            indented_table += (" " * 5) + row + "\n"
+
+        return str(indented_table)
+
+    def get_query_stats_table(self, n: int = 10) -> str | None:
+        # None if the connection isn't being traced (SQL_TRACE=1 turns tracing on)
+        tracer = getattr(self.conn, "tracer", None)
+        if tracer is None:
+            return None
+
+        statistics = tracer.top(n)
+        if len(statistics) == 0:
+            return ""
+
+        # Initialise the table
+        table = PrettyTable(["Statement", "Count", "Total (ms)", "p50 (ms)", "p95 (ms)", "Max (ms)"])
+
+        # Populate table rows
+        for row in statistics:
+            table.add_row([
+                row["statement"],
+                row["count"],
+                f"{row['total_ms']:.1f}",
+                f"{row['p50_ms']:.2f}",
+                f"{row['p95_ms']:.2f}",
+                f"{row['max_ms']:.2f}"
+            ])
+
+        # Set table formatting
+        table.set_style(TableStyle.SINGLE_BORDER)
+        table.align = "l"
+        table.max_width["Statement"] = 60
+        table.hrules = ALL
+        table.vrules = NONE
+
+        indented_table = ""
+        for row in table.get_string().split("\n"):
+            indented_table += (" " * 5) + row + "\n"
+
+        return str(indented_table)
+
+    def get_cache_stats_table(self) -> str | None:
+        # None if the connection has no identity maps (only a connection pool keeps them)
+        identity_maps = getattr(self.conn, "identity_maps", None)
+        if not isinstance(identity_maps, dict):
+            return None
+
+        if len(identity_maps) == 0:
+            return ""
+
+        # Initialise the table
+        table = PrettyTable(["Entity", "Cached items", "Hits", "Misses", "Hit rate"])
+
+        # Populate table rows
+        for entity, identity_map in sorted(identity_maps.items()):
+            stats = identity_map.stats()
+            table.add_row([
+                entity,
+                stats["items"],
+                stats["hits"],
+                stats["misses"],
+                f"{stats['hit_rate']:.1%}"
+            ])
+
+        # Set table formatting
+        table.set_style(TableStyle.SINGLE_BORDER)
+        table.align = "l"
+        table.hrules = ALL
+        table.vrules = NONE
+
+        indented_table = ""
+        for row in table.get_string().split("\n"):
+            indented_table += (" " * 5) + row + "\n"
+
+        return str(indented_table)
@@ -1,7 +1,9 @@
 from prettytable import PrettyTable, TableStyle, ALL, NONE
 from flightmanagement.repositories.aircraft_repository import AircraftRepository
 from flightmanagement.models.aircraft import Aircraft
+from flightmanagement.models.page import Page
 from flightmanagement.db.db import transaction
+from flightmanagement.config import settings
 
 class AircraftService:
 
@@ -31,7 +33,13 @@ class AircraftService:
     
     def search_aircraft(self, field_name: str, value) -> list[Aircraft]:
         return self.__aircraft_repository.search_on_field(field_name, value)
+
+    def search_text(self, query: str, limit: int = 20) -> list[Aircraft]:
+        return self.__aircraft_repository.search_text(query, limit)
     
+    def get_aircraft_page(self, after: tuple | None = None, direction: str = "next", limit: int | None = None) -> Page:
+        return self.__aircraft_repository.get_aircraft_page(after, settings.page_size if limit is None else limit, direction)
+
     def get_aircraft_choices(self) -> list:
         aircraft_list = self.__aircraft_repository.get_aircraft_list()
         
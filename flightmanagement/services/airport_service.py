@@ -1,7 +1,9 @@
 from prettytable import PrettyTable, TableStyle, ALL, NONE
 from flightmanagement.repositories.airport_repository import AirportRepository
 from flightmanagement.models.airport import Airport
+from flightmanagement.models.page import Page
 from flightmanagement.db.db import transaction
+from flightmanagement.config import settings
 
 class AirportService:
 
@@ -36,6 +38,12 @@ class AirportService:
     def search_airports(self, field_name: str, value) -> list[Airport]:
         return self.__airport_repository.search_on_field(field_name, value)
 
+    def search_text(self, query: str, limit: int = 20) -> list[Airport]:
+        return self.__airport_repository.search_text(query, limit)
+
+    def get_airport_page(self, after: tuple | None = None, direction: str = "next", limit: int | None = None) -> Page:
+        return self.__airport_repository.get_airport_page(after, settings.page_size if limit is None else limit, direction)
+
     def get_airport_choices(self) -> list:
         airports = self.__airport_repository.get_airport_list()
         
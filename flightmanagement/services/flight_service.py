@@ -1,11 +1,19 @@
+from collections.abc import Iterator
 from datetime import datetime
 from prettytable import PrettyTable, TableStyle, ALL, NONE
 from flightmanagement.repositories.aircraft_repository import AircraftRepository
 from flightmanagement.repositories.airport_repository import AirportRepository
 from flightmanagement.repositories.flight_repository import FlightRepository
+from flightmanagement.repositories.flight_view import FlightView, get_flight_views
 from flightmanagement.repositories.pilot_repository import PilotRepository
+from flightmanagement.repositories.query import Query, equals
 from flightmanagement.models.flight import Flight
+from flightmanagement.models.page import Page
+from flightmanagement.models.write_result import WriteResult
 from flightmanagement.db.db import transaction
+from flightmanagement.db.materialised_flights import is_materialised
+from flightmanagement.services.schedule_validator import ScheduleValidator
+from flightmanagement.config import settings
 
 class FlightService:
 
@@ -32,14 +40,55 @@ class FlightService:
         with transaction(self.conn):
             self.__flight_repository.delete_item(flight)
 
-    def get_flight_table(self) -> str:
-        flights = self.__flight_repository.get_flight_list()
+    def add_flights(self, flights: list[Flight], chunk_size: int | None = None) -> list[WriteResult]:
+        # One transaction for the whole batch; rows breaking a constraint are reported rather than raised
+        with transaction(self.conn):
+            return self.__flight_repository.insert_many(flights, chunk_size)
+
+    def get_import_conflicts(self, flights: list[Flight]) -> list:
+        # The double bookings adding or upserting the flights would make, to check before a bulk import
+        return ScheduleValidator(self.conn, self.__flight_repository).validate_flights(flights)
+
+    def upsert_flights(self, flights: list[Flight], chunk_size: int | None = None) -> list[WriteResult]:
+        # For schedule feeds: flights are matched on flight number and scheduled departure, and
+        # ones that haven't changed aren't written again
+        with transaction(self.conn):
+            return self.__flight_repository.upsert_many(flights, chunk_size)
+
+    def update_flights(self, flights: list[Flight], chunk_size: int | None = None) -> list[WriteResult]:
+        with transaction(self.conn):
+            return self.__flight_repository.update_many(flights, chunk_size)
+
+    def delete_flights(self, flights: list[Flight], chunk_size: int | None = None) -> list[WriteResult]:
+        if any(flight.id is None for flight in flights):
+            raise ValueError("Flight to delete lacks an ID")
+        with transaction(self.conn):
+            return self.__flight_repository.delete_many(flights, chunk_size)
+
+    def get_flight_table(self, include_history: bool = False) -> str:
+        # The materialised table only holds flights in the hot table
+        if not include_history and is_materialised(self.conn):
+            return self.get_denormalised_results_view(self.__flight_repository.get_denormalised_flight_list())
+
+        flights = self.__flight_repository.get_flight_list(include_history=include_history)
 
         if flights is None:
             return ""
         
         return self.get_results_view(flights)
 
+    def get_flight_page(self, after: tuple | None = None, direction: str = "next", limit: int | None = None,
+                        include_history: bool = False) -> Page:
+        return self.__flight_repository.get_flight_page(
+            after,
+            settings.page_size if limit is None else limit,
+            direction,
+            include_history=include_history
+        )
+
+    def iter_flights(self, include_history: bool = False, batch_size: int | None = None) -> Iterator[Flight]:
+        return self.__flight_repository.iter_flights(include_history, batch_size)
+
     def get_flight_by_id(self, id: int) -> Flight | None:
         return self.__flight_repository.get_item_by_id(id)
 
@@ -53,27 +102,91 @@ class FlightService:
         if airport:
             return airport.id
     
-    def search_flights(self, field_name: str, value) -> list[Flight]:
-        return self.__flight_repository.search_on_field(field_name, value)
+    def search_flights(self, field_name: str, value, include_history: bool = False) -> list[Flight]:
+        return self.__flight_repository.search_on_field(field_name, value, include_history=include_history)
+
+    def find_flights(self, query: Query, include_history: bool = False) -> list[Flight]:
+        return self.__flight_repository.find(query, include_history=include_history)
 
     def get_flight_choices(self, flight_number: str = "") -> list:
-        flights = self.__flight_repository.get_flight_list()
+        flights = self.__flight_repository.find(Query(equals("flight_number", flight_number)) if flight_number else Query())
         
         flight_choices = []
 
         if flights:
-            for flight in flights:
-                if flight_number == "" or flight.flight_number == flight_number:                    
-                    flight_choices.append((flight.id, self.get_flight_summary(flight)))
+            for flight in self.get_flight_views(flights):
+                flight_choices.append((flight.id, self.get_flight_summary(flight)))
 
         return flight_choices
+
+    def get_flight_views(self, flights: list[Flight]) -> list[FlightView]:
+        # The flights with their aircraft, airports and pilots, each read for all of them on first use
+        return get_flight_views(self.conn, flights, self.__aircraft_repository, self.__airport_repository, self.__pilot_repository)
     
     def get_results_view(self, flights: list[Flight]) -> str:
         if flights is None or len(flights) == 0:
             return ""
+
+        # Read the display rows for these flights in one query rather than looking up each reference
+        if is_materialised(self.conn):
+            rows = self.__flight_repository.get_denormalised_flights([flight.id for flight in flights])
+
+            # Archived flights aren't materialised, so fall back to looking them up below
+            if all(flight.id in rows for flight in flights):
+                return self.get_denormalised_results_view([rows[flight.id] for flight in flights])
         
         # Initialise the table
-        table = PrettyTable([
+        table = self.__new_results_table()
+        
+        # Populate table rows; the views look up the aircraft, airports and pilots in a few batched
+        # queries rather than five per flight
+        for flight in self.get_flight_views(flights):
+            table.add_row([
+                flight.id,
+                flight.flight_number,
+                _aircraft_cell(flight.aircraft.registration, f"{flight.aircraft.manufacturer} {flight.aircraft.model}")
+                if flight.aircraft is not None else "",
+                str(flight.origin).replace(" (", "\n("),
+                str(flight.destination).replace(" (", "\n("),
+                flight.pilot if flight.pilot_id else "",
+                flight.copilot if flight.copilot_id else "",
+                datetime.strftime(flight.departure_time_scheduled, "%Y-%m-%d %H:%M") if flight.departure_time_scheduled else "",
+                datetime.strftime(flight.arrival_time_scheduled, "%Y-%m-%d %H:%M") if flight.arrival_time_scheduled else "",
+                datetime.strftime(flight.departure_time_actual, "%Y-%m-%d %H:%M") if flight.departure_time_actual else "",
+                datetime.strftime(flight.arrival_time_actual, "%Y-%m-%d %H:%M") if flight.arrival_time_actual else "",
+                flight.status
+            ])
+
+        return self.__format_results_table(table)
+
+    def get_denormalised_results_view(self, rows: list) -> str:
+        if rows is None or len(rows) == 0:
+            return ""
+
+        # Initialise the table
+        table = self.__new_results_table()
+
+        # Populate table rows from vw_denormalised_flights columns
+        for row in rows:
+            table.add_row([
+                row["flight_id"],
+                row["flight_number"],
+                _aircraft_cell(row["aircraft_registration"], row["aircraft_type"]) if row["aircraft_registration"] else "",
+                row["origin"] or "",
+                row["destination"] or "",
+                (row["pilot"] or "").strip(),
+                (row["copilot"] or "").strip(),
+                row["departure_time_scheduled"],
+                row["arrival_time_scheduled"],
+                row["departure_time_actual"],
+                row["arrival_time_actual"],
+                row["status"]
+            ])
+
+        return self.__format_results_table(table)
+
+    def __new_results_table(self) -> PrettyTable:
+        return PrettyTable([
             "Flight ID",
             "Flight number",
             "Aircraft",
@@ -87,24 +200,9 @@ class FlightService:
             "Arrival (actual)",
             "Status"
             ],
-        )        
-        
-        # Populate table rows
-        for flight in flights:
-            table.add_row([
-                flight.id,
-                flight.flight_number,
-                str(self.__aircraft_repository.get_item_by_id(flight.aircraft_id)).replace(" (", "\n("),
-                str(self.__airport_repository.get_item_by_id(flight.origin_id)).replace(" (", "\n("),
-                str(self.__airport_repository.get_item_by_id(flight.destination_id)).replace(" (", "\n("),
-                self.__pilot_repository.get_item_by_id(flight.pilot_id) if flight.pilot_id else "",
-                self.__pilot_repository.get_item_by_id(flight.copilot_id) if flight.copilot_id else "",
-                datetime.strftime(flight.departure_time_scheduled, "%Y-%m-%d %H:%M") if flight.departure_time_scheduled else "",
-                datetime.strftime(flight.arrival_time_scheduled, "%Y-%m-%d %H:%M") if flight.arrival_time_scheduled else "",
-                datetime.strftime(flight.departure_time_actual, "%Y-%m-%d %H:%M") if flight.departure_time_actual else "",
-                datetime.strftime(flight.arrival_time_actual, "%Y-%m-%d %H:%M") if flight.arrival_time_actual else "",
-                flight.status
-            ])
+        )
+
+    def __format_results_table(self, table: PrettyTable) -> str:
 
         # Set table formatting
         table.set_style(TableStyle.SINGLE_BORDER)
@@ -119,12 +217,13 @@ class FlightService:
         
         return str(indented_table)
     
-    def get_flight_summary(self, flight: Flight) -> str:
-        origin_airport = self.__airport_repository.get_item_by_id(flight.origin_id)        
-        destination_airport = self.__airport_repository.get_item_by_id(flight.destination_id)
+    def get_flight_summary(self, flight: Flight | FlightView) -> str:
+        # Callers summarising many flights pass views of them, so the airports are read once for all
+        if not isinstance(flight, FlightView):
+            flight = self.get_flight_views([flight])[0]
 
-        origin_code = origin_airport.code if origin_airport is not None else ""
-        destination_code = destination_airport.code if destination_airport is not None else ""
+        origin_code = flight.origin.code if flight.origin is not None else ""
+        destination_code = flight.destination.code if flight.destination is not None else ""
 
         if flight.departure_time_scheduled is None:
             departure = ""
@@ -149,4 +248,13 @@ class FlightService:
                 if pilot.id != pilot_id:
                     pilot_choices.append((pilot.id, str(pilot)))
 
-        return pilot_choices
\ No newline at end of file
+        return pilot_choices
+
+    def get_available_aircraft_choices(self, departure_time: datetime, arrival_time: datetime, flight_id: int | None = None) -> list:
+        aircraft_list = self.__flight_repository.get_available_aircraft(departure_time, arrival_time, flight_id if flight_id else -1)
+
+        return [(aircraft.id, str(aircraft)) for aircraft in aircraft_list]
+
+def _aircraft_cell(registration: str, aircraft_type: str) -> str:
+    # As str(Aircraft), with the manufacturer and model on a second line
+    return f"{registration}\n({aircraft_type})"
@@ -1,7 +1,10 @@
+from datetime import datetime
 from prettytable import PrettyTable, TableStyle, ALL, NONE
 from flightmanagement.repositories.pilot_repository import PilotRepository
 from flightmanagement.models.pilot import Pilot
+from flightmanagement.models.page import Page
 from flightmanagement.db.db import transaction
+from flightmanagement.config import settings
 
 class PilotService:
 
@@ -33,6 +36,9 @@ class PilotService:
         
         return self.get_results_view(pilots)
     
+    def get_pilot_page(self, after: tuple | None = None, direction: str = "next", limit: int | None = None) -> Page:
+        return self.__pilot_repository.get_pilot_page(after, settings.page_size if limit is None else limit, direction)
+
     def get_pilot_choices(self) -> list:
         pilots = self.__pilot_repository.get_pilot_list()
         
@@ -44,9 +50,17 @@ class PilotService:
 
         return pilot_choices
     
+    def get_pilot_duty_hours(self, pilot_ids: list[int], as_of: datetime) -> dict[int, float]:
+        # Hours flown by each pilot in the duty window ending on as_of's day, read in batches
+        minutes = self.__pilot_repository.get_duty_minutes(pilot_ids, as_of)
+        return {pilot_id: minutes.get(pilot_id, 0) / 60 for pilot_id in pilot_ids}
+
     def search_pilots(self, field_name: str, value) -> list[Pilot]:
         return self.__pilot_repository.search_on_field(field_name, value)
 
+    def search_text(self, query: str, limit: int = 20) -> list[Pilot]:
+        return self.__pilot_repository.search_text(query, limit)
+
     def get_pilot_by_id(self, id: int):
         return self.__pilot_repository.get_item_by_id(id)
     
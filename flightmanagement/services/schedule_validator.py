@@ -0,0 +1,145 @@
+import numpy as np
+from flightmanagement.models.flight import Flight
+from flightmanagement.models.schedule_conflict import ScheduleConflict
+from flightmanagement.repositories.columnar import NO_ID, NAT
+from flightmanagement.repositories.flight_repository import FlightRepository
+
+# The resources a flight is assigned, by the flight columns holding them; a pilot is one resource
+# whichever seat they fly in
+RESOURCES = {
+    "aircraft": ("aircraft_id", ),
+    "pilot": ("pilot_id", "copilot_id")
+}
+SCHEDULE_COLUMNS = ("id", "aircraft_id", "pilot_id", "copilot_id", "departure_time_scheduled", "arrival_time_scheduled")
+
+class ScheduleValidator:
+
+    # Finds every aircraft and pilot booked on two flights at once, over the whole schedule or the
+    # schedule as an import would leave it. Flights are read as columns and each resource's
+    # intervals are sorted once, so the check takes seconds at a million flights rather than a
+    # query per flight.
+    def __init__(self, conn, flight_repository=None):
+        self.conn = conn
+        self.__flight_repository = flight_repository or FlightRepository(self.conn)
+
+    def validate(self) -> list[ScheduleConflict]:
+        columns = self.__flight_repository.get_flight_columns(names=SCHEDULE_COLUMNS)
+        conflicts = find_conflicts(columns)
+
+        flight_ids = columns["id"]
+        flights = self.__flight_repository.get_items_by_ids(
+            int(flight_ids[position]) for conflict in conflicts for position in conflict[2:4]
+        )
+        return [
+            ScheduleConflict(resource, resource_id, flights[int(flight_ids[first])], flights[int(flight_ids[second])], start, end)
+            for resource, resource_id, first, second, start, end in conflicts
+        ]
+
+    def validate_flights(self, flights: list[Flight]) -> list[ScheduleConflict]:
+        # The conflicts importing the flights would add, with the current schedule or each other.
+        # As when upserting, a flight replaces the one with its id, or with its flight number and
+        # scheduled departure.
+        columns = self.__flight_repository.get_flight_columns(names=SCHEDULE_COLUMNS + ("flight_number", ))
+        replaced = np.isin(columns["id"], [flight.id for flight in flights if flight.id is not None])
+
+        keys = {(flight.flight_number, flight.departure_time_scheduled) for flight in flights}
+        departures = columns["departure_time_scheduled"]
+        key_departures = np.array([key[1] for key in keys if key[1] is not None], dtype="datetime64[m]")
+        for position in np.flatnonzero(np.isin(departures, key_departures)):
+            replaced[position] |= (str(columns["flight_number"][position]), departures[position].item()) in keys
+
+        existing = {name: values[~replaced] for name, values in columns.items()}
+        imported = _flight_columns(flights)
+        combined = {name: np.concatenate((existing[name], imported[name])) for name in SCHEDULE_COLUMNS}
+
+        # Positions after the existing flights are the imported ones
+        count = len(existing["id"])
+        conflicts = [conflict for conflict in find_conflicts(combined) if conflict[3] >= count]
+        stored = self.__flight_repository.get_items_by_ids(
+            int(existing["id"][conflict[2]]) for conflict in conflicts if conflict[2] < count
+        )
+
+        def flight_at(position: int) -> Flight:
+            return stored[int(existing["id"][position])] if position < count else flights[position - count]
+
+        return [
+            ScheduleConflict(resource, resource_id, flight_at(first), flight_at(second), start, end)
+            for resource, resource_id, first, second, start, end in conflicts
+        ]
+
+def find_conflicts(columns: dict) -> list[tuple]:
+    # (resource, resource_id, position, other position, start, end) for each pair of flights
+    # sharing a resource at overlapping times, by positions in the columns with the first lower,
+    # in order of start. Flights without both times, or arriving before they depart, never conflict.
+    starts = columns["departure_time_scheduled"].astype(np.int64)
+    ends = columns["arrival_time_scheduled"].astype(np.int64)
+    positions = np.arange(len(starts))
+
+    conflicts = []
+    for resource, names in RESOURCES.items():
+        resource_ids = np.concatenate([columns[name] for name in names])
+        seats = len(names)
+        valid = (resource_ids != NO_ID) & np.tile((starts != NAT) & (ends != NAT) & (ends > starts), seats)
+
+        resource_ids = resource_ids[valid]
+        resource_starts = np.tile(starts, seats)[valid]
+        resource_ends = np.tile(ends, seats)[valid]
+        resource_positions = np.tile(positions, seats)[valid]
+
+        firsts, seconds = find_overlaps(resource_ids, resource_starts, resource_ends)
+
+        # A pilot flying both seats of one flight isn't double booked
+        different = resource_positions[firsts] != resource_positions[seconds]
+        firsts, seconds = firsts[different], seconds[different]
+
+        overlap_starts = np.maximum(resource_starts[firsts], resource_starts[seconds]).view("datetime64[m]")
+        overlap_ends = np.minimum(resource_ends[firsts], resource_ends[seconds]).view("datetime64[m]")
+        pairs = np.sort(np.stack((resource_positions[firsts], resource_positions[seconds])), axis=0)
+        conflicts.extend(zip(
+            [resource] * len(firsts),
+            resource_ids[firsts].tolist(),
+            pairs[0].tolist(),
+            pairs[1].tolist(),
+            overlap_starts.tolist(),
+            overlap_ends.tolist()
+        ))
+
+    conflicts.sort(key=lambda conflict: (conflict[4], conflict[0], conflict[1], conflict[2], conflict[3]))
+    return conflicts
+
+def find_overlaps(resource_ids: np.ndarray, starts: np.ndarray, ends: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    # The pairs of indexes of intervals for the same resource that overlap, with one sort. In order
+    # of resource and start, the intervals overlapping one that start no earlier are those after it
+    # starting before it ends: a run found by binary search. Intervals must end after they start.
+    count = len(starts)
+    if count == 0:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+
+    order = np.lexsort((starts, resource_ids))
+    resource_ids, starts, ends = resource_ids[order], starts[order], ends[order]
+
+    # Resource and minute as one sorted key
+    origin = starts.min()
+    span = int(ends.max() - origin) + 1
+    keys = resource_ids * span + (starts - origin)
+    limits = np.searchsorted(keys, resource_ids * span + (ends - origin), side="left")
+
+    # Each interval paired with every one from the next up to its limit
+    counts = limits - np.arange(1, count + 1)
+    firsts = np.repeat(np.arange(count), counts)
+    seconds = firsts + 1 + np.arange(len(firsts)) - np.repeat(np.cumsum(counts) - counts, counts)
+    return order[firsts], order[seconds]
+
+def _flight_columns(flights: list[Flight]) -> dict:
+    # The schedule columns for flights not yet stored, as get_flight_columns reads them
+    def minutes(value):
+        return NAT if value is None else np.datetime64(value, "m").astype(np.int64)
+
+    return {
+        "id": np.array([flight.id or NO_ID for flight in flights], dtype=np.int64),
+        "aircraft_id": np.array([flight.aircraft_id or NO_ID for flight in flights], dtype=np.int64),
+        "pilot_id": np.array([flight.pilot_id or NO_ID for flight in flights], dtype=np.int64),
+        "copilot_id": np.array([flight.copilot_id or NO_ID for flight in flights], dtype=np.int64),
+        "departure_time_scheduled": np.array([minutes(flight.departure_time_scheduled) for flight in flights], dtype=np.int64).view("datetime64[m]"),
+        "arrival_time_scheduled": np.array([minutes(flight.arrival_time_scheduled) for flight in flights], dtype=np.int64).view("datetime64[m]")
+    }
@@ -3,12 +3,21 @@ from prompt_toolkit.key_binding import KeyBindings
 from prompt_toolkit.shortcuts import choice
 from flightmanagement.services.admin_service import AdminService
 from flightmanagement.ui.ui_utils import format_title
+from flightmanagement.ui.user_prompt import UserPrompt
 
 class AdminMenu:
 
     __MENU_NAME = "Admin menu"
     __MENU_OPTIONS = [
-        ("init_db", "Initialise database"),
+        ("init_db", "Migrate database to latest version"),
+        ("reseed_db", "Reset database and reseed sample data"),
+        ("generate_db", "Reset database and generate synthetic data"),
+        ("rebuild_flights", "Rebuild materialised flights table"),
+        ("archive_flights", "Archive completed flights"),
+        ("validate_schedule", "Check the schedule for double bookings"),
+        ("compact_change_log", "Compact the change log"),
+        ("query_stats", "Show slowest queries"),
+        ("cache_stats", "Show reference data cache statistics"),
         ("back", "Back to main menu")
     ]
 
@@ -26,10 +35,137 @@ class AdminMenu:
             )
 
             if __choose_menu == "init_db":
-
-                self.__admin_service.initialise_database()
-                
+                self.__migrate_option()
+            elif __choose_menu == "reseed_db":
+                if not self.__reseed_option():
+                    print("\nReset cancelled.\n")
+                    continue
+            elif __choose_menu == "generate_db":
+                if not self.__generate_option():
+                    print("\nReset cancelled.\n")
+                    continue
+            elif __choose_menu == "rebuild_flights":
+                self.__rebuild_flights_option()
+            elif __choose_menu == "archive_flights":
+                self.__archive_flights_option()
+            elif __choose_menu == "validate_schedule":
+                self.__validate_schedule_option()
+            elif __choose_menu == "compact_change_log":
+                self.__compact_change_log_option()
+            elif __choose_menu == "query_stats":
+                self.__query_stats_option()
+            elif __choose_menu == "cache_stats":
+                self.__cache_stats_option()
             elif __choose_menu == "back":
                 break
             else:
-                print("Invalid Choice")
\ No newline at end of file
+                print("Invalid Choice")
+
+    def __migrate_option(self) -> None:
+        applied = self.__admin_service.initialise_database()
+
+        if len(applied) == 0:
+            print(f"\nDatabase is already up to date (version {self.__admin_service.get_schema_version()}).\n")
+        else:
+            print(f"\nApplied {len(applied)} migration(s); database is now at version {applied[-1]}.\n")
+
+    def __rebuild_flights_option(self) -> None:
+        count = self.__admin_service.rebuild_materialised_flights()
+
+        if count is None:
+            print("\nMaterialised flights are not enabled (set MATERIALISE_FLIGHTS=1).\n")
+        else:
+            print(f"\nRebuilt materialised flights table ({count} flights).\n")
+
+    def __archive_flights_option(self) -> None:
+        count = self.__admin_service.archive_flights()
+
+        if count is None:
+            print("\nThe archive database is not attached.\n")
+        else:
+            print(f"\nArchived {count} completed flight(s).\n")
+
+    def __validate_schedule_option(self) -> None:
+        conflicts = self.__admin_service.get_schedule_conflicts()
+
+        if len(conflicts) == 0:
+            print("\nNo aircraft or pilot is booked on two flights at once.\n")
+        else:
+            print(f"\n>> {len(conflicts)} double booking(s), earliest first\n")
+            print(self.__admin_service.get_schedule_conflicts_table(conflicts))
+
+    def __compact_change_log_option(self) -> None:
+        count = self.__admin_service.compact_change_log()
+        print(f"\nRemoved {count} superseded change(s) from the change log.\n")
+
+    def __query_stats_option(self) -> None:
+        table = self.__admin_service.get_query_stats_table()
+
+        if table is None:
+            print("\nQuery tracing is not enabled (set SQL_TRACE=1).\n")
+        elif table == "":
+            print("\nNo queries have been traced yet.\n")
+        else:
+            print("\n>> Statements by total time\n")
+            print(table)
+
+    def __cache_stats_option(self) -> None:
+        table = self.__admin_service.get_cache_stats_table()
+
+        if table is None:
+            print("\nThis connection does not cache reference data.\n")
+        elif table == "":
+            print("\nNo reference data has been cached yet.\n")
+        else:
+            print("\n>> Reference data cache\n")
+            print(table)
+
+    def __generate_option(self) -> bool:
+        flights = UserPrompt(
+            session=self.__session,
+            prompt_type="integer",
+            prompt="Number of flights to generate: ",
+            allow_blank=False,
+            default_value=100000
+        )
+        if flights.is_cancelled:
+            return False
+
+        confirm = UserPrompt(
+            session=self.__session,
+            prompt_type="choice",
+            prompt="This will delete all data and generate new data. Are you sure?\n",
+            options=[(1, "yes"),(0, "no")],
+            key_bindings=self.__bindings
+        )
+
+        if confirm.is_cancelled or confirm.value == False:
+            return False
+
+        try:
+            counts = self.__admin_service.generate_database(int(flights.value))
+            print(f"\nGenerated {counts['flights']} flights, {counts['aircraft']} aircraft, {counts['airports']} airports and {counts['pilots']} pilots.\n")
+        except:
+            print("\nError generating data.\n")
+
+        return True
+
+    def __reseed_option(self) -> bool:
+        confirm = UserPrompt(
+            session=self.__session,
+            prompt_type="choice",
+            prompt="This will delete all data and reload the sample data. Are you sure?\n",
+            options=[(1, "yes"),(0, "no")],
+            key_bindings=self.__bindings
+        )
+
+        if confirm.is_cancelled or confirm.value == False:
+            return False
+
+        try:
+            self.__admin_service.reseed_database()
+            print("\nDatabase successfully reset.\n")
+        except:
+            print("\nError resetting database.\n")
+
+        return True
@@ -1,7 +1,7 @@
 from prompt_toolkit import PromptSession
 from prompt_toolkit.key_binding import KeyBindings
 from prompt_toolkit.shortcuts import choice
-from flightmanagement.ui.ui_utils import format_title
+from flightmanagement.ui.ui_utils import format_title, show_pages
 from flightmanagement.ui.user_prompt import UserPrompt
 from flightmanagement.services.aircraft_service import AircraftService
 from flightmanagement.models.aircraft import Aircraft
@@ -52,21 +52,21 @@ class AircraftMenu:
 
     def __show_option(self) -> None:
         print("\n>> Displaying all aircraft\n")
-        print(self.__aircraft_service.get_aircraft_table())
+        show_pages(self.__aircraft_service.get_aircraft_page, self.__aircraft_service.get_results_view)
 
     def __search_option(self) -> bool:
         print("\n>> Search for an aircraft (or hit CTRL+C to cancel)\n")
 
-        registration = UserPrompt(
+        query = UserPrompt(
             session=self.__session,
             prompt_type="text",
-            prompt="Enter the aircraft registration: ",
+            prompt="Enter a registration, manufacturer or model: ",
             allow_blank=True
         )        
-        if registration.is_cancelled:
+        if query.is_cancelled:
             return False
 
-        result = self.__aircraft_service.search_aircraft("registration", registration.value)
+        result = self.__aircraft_service.search_text(query.value)
 
         if len(result) == 0:
             print("\n     No matching results.")
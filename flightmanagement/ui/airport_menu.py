@@ -1,7 +1,7 @@
 from prompt_toolkit import PromptSession
 from prompt_toolkit.key_binding import KeyBindings
 from prompt_toolkit.shortcuts import choice
-from flightmanagement.ui.ui_utils import format_title
+from flightmanagement.ui.ui_utils import format_title, show_pages
 from flightmanagement.ui.user_prompt import UserPrompt
 from flightmanagement.services.airport_service import AirportService
 from flightmanagement.models.airport import Airport
@@ -52,21 +52,21 @@ class AirportMenu:
 
     def __show_option(self) -> None:
         print("\n>> Displaying all airports\n")
-        print(self.__airport_service.get_airport_table())
+        show_pages(self.__airport_service.get_airport_page, self.__airport_service.get_results_view)
 
     def __search_option(self) -> bool:
         print("\n>> Search for an airport (or hit CTRL+C to cancel)\n")
 
-        code = UserPrompt(
+        query = UserPrompt(
             session=self.__session,
             prompt_type="text",
-            prompt="Enter an airport code: ",
+            prompt="Enter an airport query, name, city or country: ",
             allow_blank=True
         )        
-        if code.is_cancelled:
+        if query.is_cancelled:
             return False
 
-        result = self.__airport_service.search_airports("code", code)
+        result = self.__airport_service.search_text(query.value)
 
         if len(result) == 0:
             print("\n     No matching results.")
@@ -2,7 +2,7 @@ from datetime import datetime
 from prompt_toolkit import PromptSession
 from prompt_toolkit.key_binding import KeyBindings
 from prompt_toolkit.shortcuts import choice
-from flightmanagement.ui.ui_utils import format_title
+from flightmanagement.ui.ui_utils import format_title, show_pages
 from flightmanagement.ui.user_prompt import UserPrompt
 from flightmanagement.services.flight_service import FlightService
 from flightmanagement.services.aircraft_service import AircraftService
@@ -16,6 +16,7 @@ class FlightMenu:
     __MENU_NAME = "Flights menu"
     __MENU_OPTIONS = [
         ("show", "Show all flights"),
+        ("history", "Show flight history"),
         ("search", "Search flights"),
         ("add", "Add a flight"),
         ("update", "Update a flight"),
@@ -38,6 +39,8 @@ class FlightMenu:
 
             if __choose_menu == "show":
                 self.__show_option()
+            elif __choose_menu == "history":
+                self.__history_option()
             elif __choose_menu == "search":                
                 if not self.__search_option():
                     print("\nSearch cancelled.\n")
@@ -61,7 +64,14 @@ class FlightMenu:
 
     def __show_option(self) -> None:
         print("\n>> Displaying all flights\n")
-        print(self.__flight_service.get_flight_table())
+        show_pages(self.__flight_service.get_flight_page, self.__flight_service.get_results_view)
+
+    def __history_option(self) -> None:
+        print("\n>> Displaying all flights, including archived flights\n")
+        show_pages(
+            lambda after=None, direction="next": self.__flight_service.get_flight_page(after, direction, include_history=True),
+            self.__flight_service.get_results_view
+        )
 
     def __search_option(self) -> bool:
         print("\n>> Search for a flight (or hit CTRL+C to cancel)\n")
@@ -75,7 +85,7 @@ class FlightMenu:
         if flight_number.is_cancelled:
             return False
 
-        result = self.__flight_service.search_flights("flight_number", flight_number.value)
+        result = self.__flight_service.search_flights("flight_number", flight_number.value, include_history=True)
 
         if len(result) == 0:
             print("\n     No matching results.")
@@ -142,17 +152,6 @@ class FlightMenu:
             return None
         print()
 
-        aircraft_id = UserPrompt(
-            session=self.__session,
-            prompt_type="choice",
-            prompt="Select the aircraft:\n",
-            options=self.__aircraft_service.get_aircraft_choices(),
-            key_bindings=self.__bindings
-        )
-        if aircraft_id.is_cancelled:
-            return None
-        print()
-
         origin_id = UserPrompt(
             session=self.__session,
             prompt_type="choice",
@@ -238,6 +237,26 @@ class FlightMenu:
         )        
         if arrival_time.is_cancelled:
             return None
+        print()
+
+        departure_time_scheduled = self.combine_date(departure_date.value, departure_time.value)
+        arrival_time_scheduled = self.combine_date(arrival_date.value, arrival_time.value)
+
+        # Asked once the times are known, so only aircraft free to fly then are offered
+        aircraft_choices = self.__flight_service.get_available_aircraft_choices(departure_time_scheduled, arrival_time_scheduled)
+        if len(aircraft_choices) == 0:
+            print("No aircraft are free to fly at those times.")
+            return None
+
+        aircraft_id = UserPrompt(
+            session=self.__session,
+            prompt_type="choice",
+            prompt="Select the aircraft:\n",
+            options=aircraft_choices,
+            key_bindings=self.__bindings
+        )
+        if aircraft_id.is_cancelled:
+            return None
         
         return Flight(
             flight_number=flight_number.value,
@@ -246,8 +265,8 @@ class FlightMenu:
             destination_id=int(destination_id.value),
             pilot_id=int(pilot_id.value),
             copilot_id=int(copilot_id.value),
-            departure_time_scheduled=self.combine_date(departure_date.value, departure_time.value),
-            arrival_time_scheduled=self.combine_date(arrival_date.value, arrival_time.value)
+            departure_time_scheduled=departure_time_scheduled,
+            arrival_time_scheduled=arrival_time_scheduled
         )
 
     def __prompt_delete_flight(self) -> Flight | None:
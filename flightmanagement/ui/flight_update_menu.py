@@ -415,11 +415,16 @@ class FlightUpdateMenu:
 
     def __prompt_update_aircraft(self, flight: Flight) -> Flight | None:
 
+        aircraft_choices = self.__flight_service.get_available_aircraft_choices(flight.departure_time_scheduled, flight.arrival_time_scheduled, flight.id)
+        if len(aircraft_choices) == 0:
+            print("No aircraft are free to fly at those times.")
+            return None
+
         aircraft_id = UserPrompt(
             session=self.__session,
             prompt_type="choice",
             prompt="Select an aircraft:\n",
-            options=self.__aircraft_service.get_aircraft_choices(),
+            options=aircraft_choices,
             default_value=flight.aircraft_id,
             key_bindings=self.__bindings
         )
@@ -516,18 +521,6 @@ class FlightUpdateMenu:
             return None
         print()
         
-        aircraft_id = UserPrompt(
-            session=self.__session,
-            prompt_type="choice",
-            prompt="Select the aircraft:\n",
-            options=self.__aircraft_service.get_aircraft_choices(),
-            default_value=flight.aircraft_id,
-            key_bindings=self.__bindings
-        )
-        if aircraft_id.is_cancelled:
-            return None
-        print()
-
         origin_id = UserPrompt(
             session=self.__session,
             prompt_type="choice",
@@ -593,6 +586,28 @@ class FlightUpdateMenu:
             return None
         print()
 
+        # Format datetimes, checking against partial values
+        departure_datetime_scheduled_formatted = self.combine_date(departure_date_scheduled.value, departure_time_scheduled.value)
+        arrival_datetime_scheduled_formatted = self.combine_date(arrival_date_scheduled.value, arrival_time_scheduled.value)
+
+        # Asked once the new times are known, so only aircraft free to fly then are offered
+        aircraft_choices = self.__flight_service.get_available_aircraft_choices(departure_datetime_scheduled_formatted, arrival_datetime_scheduled_formatted, flight.id)
+        if len(aircraft_choices) == 0:
+            print("No aircraft are free to fly at those times.")
+            return None
+
+        aircraft_id = UserPrompt(
+            session=self.__session,
+            prompt_type="choice",
+            prompt="Select the aircraft:\n",
+            options=aircraft_choices,
+            default_value=flight.aircraft_id,
+            key_bindings=self.__bindings
+        )
+        if aircraft_id.is_cancelled:
+            return None
+        print()
+
         pilot_id = UserPrompt(
             session=self.__session,
             prompt_type="choice",
@@ -678,9 +693,6 @@ class FlightUpdateMenu:
             return None
         print()
 
-        # Format datetimes, checking against partial values
-        departure_datetime_scheduled_formatted = self.combine_date(departure_date_scheduled.value, departure_time_scheduled.value)
-        arrival_datetime_scheduled_formatted = self.combine_date(arrival_date_scheduled.value, arrival_time_scheduled.value)
         departure_datetime_actual_formatted = self.combine_date(departure_date_actual.value, departure_time_actual.value) if departure_date_actual.value and departure_time_actual.value else None
         arrival_datetime_actual_formatted = self.combine_date(arrival_date_actual.value, arrival_time_actual.value) if arrival_date_actual.value and arrival_time_actual.value else None
 
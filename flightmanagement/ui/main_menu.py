@@ -22,10 +22,10 @@ class MainMenu:
         ("exit", "Exit")
     ]
 
-    def __init__(self, session: PromptSession, bindings: KeyBindings, conn):
+    def __init__(self, session: PromptSession, bindings: KeyBindings, pool):
         self.__session = session
         self.__bindings = bindings
-        self.conn = conn
+        self.pool = pool
 
     def load(self):
 
@@ -37,17 +37,17 @@ class MainMenu:
             )
 
             if __choose_menu == "flights":
-                FlightMenu(self.__session, self.__bindings, self.conn).load()
+                FlightMenu(self.__session, self.__bindings, self.pool).load()
             elif __choose_menu == "pilots":
-                PilotMenu(self.__session, self.__bindings, self.conn).load()
+                PilotMenu(self.__session, self.__bindings, self.pool).load()
             elif __choose_menu == "airports":
-                AirportMenu(self.__session, self.__bindings, self.conn).load()
+                AirportMenu(self.__session, self.__bindings, self.pool).load()
             elif __choose_menu == "aircraft":
-                AircraftMenu(self.__session, self.__bindings, self.conn).load()
+                AircraftMenu(self.__session, self.__bindings, self.pool).load()
             elif __choose_menu == "reports":
-                ReportMenu(self.__session, self.__bindings, self.conn).load()
+                ReportMenu(self.__session, self.__bindings, self.pool).load()
             elif __choose_menu == "admin":
-                AdminMenu(self.__session, self.__bindings, self.conn).load()
+                AdminMenu(self.__session, self.__bindings, self.pool).load()
             elif __choose_menu == "exit":
                 exit(0)
             else:
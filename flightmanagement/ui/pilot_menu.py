@@ -1,7 +1,7 @@
 from prompt_toolkit import PromptSession
 from prompt_toolkit.key_binding import KeyBindings
 from prompt_toolkit.shortcuts import choice
-from flightmanagement.ui.ui_utils import format_title
+from flightmanagement.ui.ui_utils import format_title, show_pages
 from flightmanagement.ui.user_prompt import UserPrompt
 from flightmanagement.services.pilot_service import PilotService
 from flightmanagement.models.pilot import Pilot
@@ -52,21 +52,21 @@ class PilotMenu:
 
     def __show_option(self) -> None:
         print("\n>> Displaying all pilots\n")
-        print(self.__pilot_service.get_pilot_table())
+        show_pages(self.__pilot_service.get_pilot_page, self.__pilot_service.get_results_view)
 
     def __search_option(self) -> bool:
         print("\n>> Search for a pilot (or hit CTRL+C to cancel)\n")
 
-        family_name = UserPrompt(
+        query = UserPrompt(
             session=self.__session,
             prompt_type="text",
-            prompt="Enter a family name: ",
+            prompt="Enter a pilot name: ",
             allow_blank=True
         )        
-        if family_name.is_cancelled:
+        if query.is_cancelled:
             return False
 
-        result = self.__pilot_service.search_pilots("family_name", family_name.value)
+        result = self.__pilot_service.search_text(query.value)
 
         if len(result) == 0:
             print("\n     No matching results.")
@@ -1,4 +1,5 @@
 from datetime import datetime
+from prompt_toolkit.shortcuts import choice
 
 def prompt_or_cancel(session, message: str, cancel_message: str, default_value = None):
     
@@ -70,4 +71,33 @@ def format_title(title: str, asterisks: bool = True) -> str:
     output = f"\n{title}\n"
     if asterisks:
         output += f"{"*" * len(title)}\n"
-    return output
\ No newline at end of file
+    return output
+
+def show_pages(load_page, render) -> None:
+    # Shows a listing one page at a time. load_page(after, direction) returns a Page and render
+    # turns its items into a table, so only one page is ever held in memory.
+    page = load_page()
+    number = 1
+
+    while True:
+        print(render(page.items))
+
+        options = []
+        if page.has_next:
+            options.append(("next", "Next page"))
+        if page.has_previous:
+            options.append(("previous", "Previous page"))
+        if len(options) == 0:
+            return
+        options.append(("back", "Back to menu"))
+
+        selected = choice(message=format_title(f"Page {number}", False), options=options)
+
+        if selected == "next":
+            page = load_page(page.last_key, "next")
+            number += 1
+        elif selected == "previous":
+            page = load_page(page.first_key, "previous")
+            number -= 1
+        else:
+            return
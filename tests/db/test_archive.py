@@ -0,0 +1,165 @@
+import sqlite3
+from datetime import datetime
+import pytest
+from flightmanagement.db.archive import archive_flights, attach_archive, clear_archive, is_archive_attached
+from flightmanagement.db.db import ConnectionPool, seed_database_data, transaction
+from flightmanagement.db.flight_times import get_flight_times
+from flightmanagement.db.migrations import migrate, convert_flight_times
+from flightmanagement.repositories.flight_repository import FlightRepository
+
+# The sample flights run from January to March 2026
+NOW = datetime(2026, 10, 1)
+
+@pytest.fixture
+def db_conn():
+    conn = sqlite3.connect(":memory:")
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA foreign_keys = ON;")
+    migrate(conn)
+    seed_database_data(conn)
+    attach_archive(conn, ":memory:")
+    yield conn
+    conn.close()
+
+def count(conn, table: str) -> int:
+    return conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+
+class TestArchiveFlights:
+
+    def test_attach_creates_archive_table(self, db_conn):
+        assert is_archive_attached(db_conn)
+        assert count(db_conn, "archive.flight") == 0
+
+    def test_moves_old_arrived_flights(self, db_conn):
+        arrived = db_conn.execute("SELECT COUNT(*) FROM flight WHERE status = 'Arrived'").fetchone()[0]
+
+        moved = archive_flights(db_conn, 90, now=NOW)
+
+        assert moved == arrived
+        assert count(db_conn, "archive.flight") == arrived
+        assert count(db_conn, "main.flight") == 12 - arrived
+        assert db_conn.execute("SELECT COUNT(*) FROM main.flight WHERE status = 'Arrived'").fetchone()[0] == 0
+
+    def test_recent_flights_stay(self, db_conn):
+        assert archive_flights(db_conn, 90, now=datetime(2026, 1, 1)) == 0
+
+    def test_rejects_age_inside_flight_hour_window(self, db_conn):
+        with pytest.raises(ValueError):
+            archive_flights(db_conn, 7, now=NOW)
+
+    def test_requires_attached_archive(self):
+        conn = sqlite3.connect(":memory:")
+        migrate(conn)
+
+        with pytest.raises(RuntimeError):
+            archive_flights(conn, 90, now=NOW)
+
+    def test_clear_archive(self, db_conn):
+        archive_flights(db_conn, 90, now=NOW)
+
+        clear_archive(db_conn)
+
+        assert count(db_conn, "archive.flight") == 0
+
+class TestHistory:
+
+    def test_flight_list_defaults_to_hot_table(self, db_conn):
+        archive_flights(db_conn, 90, now=NOW)
+        repository = FlightRepository(db_conn)
+
+        assert len(repository.get_flight_list()) == count(db_conn, "main.flight")
+        assert len(repository.get_flight_list(include_history=True)) == 12
+
+    def test_search_includes_archive_when_asked(self, db_conn):
+        archive_flights(db_conn, 90, now=NOW)
+        repository = FlightRepository(db_conn)
+
+        assert repository.search_on_field("id", 1) == []
+        result = repository.search_on_field("id", 1, include_history=True)
+
+        assert len(result) == 1
+        assert result[0].departure_time_scheduled == datetime(2026, 1, 9, 15, 30)
+
+    def test_history_pages_across_tables(self, db_conn):
+        expected = [flight.id for flight in FlightRepository(db_conn).get_flight_list()]
+        archive_flights(db_conn, 90, now=NOW)
+        repository = FlightRepository(db_conn)
+
+        ids = []
+        page = repository.get_flight_page(limit=5, include_history=True)
+        while True:
+            ids += [flight.id for flight in page.items]
+            if not page.has_next:
+                break
+            page = repository.get_flight_page(page.last_key, limit=5, include_history=True)
+
+        assert ids == expected
+
+    def test_history_without_archive(self):
+        conn = sqlite3.connect(":memory:")
+        conn.row_factory = sqlite3.Row
+        migrate(conn)
+        seed_database_data(conn)
+
+        assert len(FlightRepository(conn).get_flight_list(include_history=True)) == 12
+
+class TestTimeStorage:
+
+    def test_archive_follows_storage_conversion(self, db_conn):
+        archive_flights(db_conn, 90, now=NOW)
+
+        convert_flight_times(db_conn, "epoch_minutes")
+
+        assert get_flight_times(db_conn, "archive").storage == "epoch_minutes"
+        result = FlightRepository(db_conn).search_on_field("id", 1, include_history=True)
+        assert result[0].departure_time_scheduled == datetime(2026, 1, 9, 15, 30)
+
+    def test_attach_converts_existing_archive(self, tmp_path):
+        conn = sqlite3.connect(":memory:")
+        conn.row_factory = sqlite3.Row
+        migrate(conn)
+        seed_database_data(conn)
+        attach_archive(conn, tmp_path / "archive.db")
+        archive_flights(conn, 90, now=NOW)
+        conn.commit()
+        conn.execute("DETACH DATABASE archive")
+
+        convert_flight_times(conn, "epoch_minutes")
+        attach_archive(conn, tmp_path / "archive.db")
+
+        assert get_flight_times(conn, "archive").storage == "epoch_minutes"
+        assert len(FlightRepository(conn).get_flight_list(include_history=True)) == 12
+
+class TestPoolAttachment:
+
+    def test_readers_see_archive(self, tmp_path):
+        pool = ConnectionPool(tmp_path / "test.db", pool_size=2)
+        try:
+            migrate(pool)
+            seed_database_data(pool)
+            pool.commit()
+
+            # A reader opened before the archive was attached picks it up on its next use
+            with pool.reader() as conn:
+                conn.execute("SELECT 1")
+
+            attach_archive(pool, tmp_path / "archive.db")
+            with transaction(pool):
+                archive_flights(pool, 90, now=NOW)
+
+            with pool.reader() as conn:
+                assert conn.execute("SELECT COUNT(*) FROM archive.flight").fetchone()[0] > 0
+                with pytest.raises(sqlite3.OperationalError):
+                    conn.execute("DELETE FROM archive.flight")
+
+            assert len(FlightRepository(pool).get_flight_list(include_history=True)) == 12
+        finally:
+            pool.close()
+
+    def test_invalid_schema_name(self, tmp_path):
+        pool = ConnectionPool(tmp_path / "test.db")
+        try:
+            with pytest.raises(ValueError):
+                pool.attach(tmp_path / "archive.db", "archive; DROP TABLE flight")
+        finally:
+            pool.close()
@@ -0,0 +1,147 @@
+import sqlite3
+import threading
+import pytest
+from flightmanagement.db.db import ConnectionPool, transaction
+
+@pytest.fixture
+def pool(tmp_path):
+    pool = ConnectionPool(tmp_path / "test.db", pool_size=2, busy_timeout=100, synchronous="normal")
+    pool.execute("""
+        CREATE TABLE pilot (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            first_name VARCHAR(20),
+            family_name VARCHAR(20)
+        )
+    """)
+    pool.commit()
+    yield pool
+    pool.close()
+
+class TestConfiguration:
+
+    def test_pool_enables_wal(self, pool):
+        assert pool.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+    def test_pool_applies_busy_timeout(self, pool):
+        with pool.reader() as conn:
+            assert conn.execute("PRAGMA busy_timeout").fetchone()[0] == 100
+
+    def test_pool_applies_synchronous_level(self, pool):
+        # NORMAL is reported as 1
+        assert pool.writer.execute("PRAGMA synchronous").fetchone()[0] == 1
+
+    def test_pool_applies_cache_size(self, tmp_path):
+        pool = ConnectionPool(tmp_path / "test.db", cache_size=1024)
+
+        assert pool.execute("PRAGMA cache_size").fetchone()[0] == -1024
+        assert pool.writer.execute("PRAGMA cache_size").fetchone()[0] == -1024
+        pool.close()
+
+    def test_invalid_synchronous_level_raises_error(self, tmp_path):
+        with pytest.raises(ValueError):
+            ConnectionPool(tmp_path / "test.db", synchronous="sometimes")
+
+    def test_invalid_pool_size_raises_error(self, tmp_path):
+        with pytest.raises(ValueError):
+            ConnectionPool(tmp_path / "test.db", pool_size=0)
+
+class TestRouting:
+
+    def test_reader_connections_are_read_only(self, pool):
+        with pool.reader() as conn:
+            with pytest.raises(sqlite3.OperationalError):
+                conn.execute("INSERT INTO pilot (first_name, family_name) VALUES ('Andrea', 'Almond')")
+
+    def test_readers_are_reused(self, pool):
+        with pool.reader() as first:
+            pass
+        with pool.reader() as second:
+            assert first is second
+
+    def test_writes_are_visible_to_readers_after_commit(self, pool):
+        with transaction(pool):
+            pool.execute("INSERT INTO pilot (first_name, family_name) VALUES ('Andrea', 'Almond')")
+
+        assert pool.execute("SELECT COUNT(*) FROM pilot").fetchone()[0] == 1
+
+    def test_reads_inside_transaction_see_uncommitted_writes(self, pool):
+        pool.execute("INSERT INTO pilot (first_name, family_name) VALUES ('Andrea', 'Almond')")
+
+        assert pool.in_transaction
+        assert pool.execute("SELECT COUNT(*) FROM pilot").fetchone()[0] == 1
+
+        pool.rollback()
+        assert pool.execute("SELECT COUNT(*) FROM pilot").fetchone()[0] == 0
+
+    def test_readers_are_not_blocked_by_open_write_transaction(self, pool):
+        pool.execute("INSERT INTO pilot (first_name, family_name) VALUES ('Andrea', 'Almond')")
+        pool.commit()
+
+        pool.execute("INSERT INTO pilot (first_name, family_name) VALUES ('Bob', 'Brown')")
+
+        with pool.reader() as conn:
+            assert conn.execute("SELECT COUNT(*) FROM pilot").fetchone()[0] == 1
+
+        pool.commit()
+
+    def test_read_rows_are_fetched_before_reader_is_returned(self, pool):
+        with transaction(pool):
+            pool.execute("INSERT INTO pilot (first_name, family_name) VALUES ('Andrea', 'Almond')")
+        result = pool.execute("SELECT first_name FROM pilot")
+
+        # The readers are closed, so rows still to be fetched from them would be lost
+        pool.close()
+
+        assert [row["first_name"] for row in result] == ["Andrea"]
+
+    def test_memory_reader_holds_write_lock(self):
+        pool = ConnectionPool(":memory:")
+        acquired = []
+
+        def try_write_lock():
+            acquired.append(pool.write_lock.acquire(blocking=False))
+
+        with pool.reader():
+            thread = threading.Thread(target=try_write_lock)
+            thread.start()
+            thread.join()
+
+        assert acquired == [False]
+        pool.close()
+
+class TestStreaming:
+
+    @pytest.fixture
+    def pilots(self, pool):
+        with transaction(pool):
+            pool.executemany(
+                "INSERT INTO pilot (first_name, family_name) VALUES (?, ?)",
+                [("Andrea", "Almond"), ("Bob", "Brown"), ("Chris", "Carter")]
+            )
+
+    def test_stream_yields_batches(self, pool, pilots):
+        batches = list(pool.stream("SELECT id FROM pilot ORDER BY id", batch_size=2))
+
+        assert [[row["id"] for row in rows] for rows in batches] == [[1, 2], [3]]
+
+    def test_stream_holds_reader_until_closed(self, pool, pilots):
+        readers = pool._ConnectionPool__readers
+        batches = pool.stream("SELECT id FROM pilot ORDER BY id", batch_size=1)
+
+        next(batches)
+        with pool.reader() as other:
+            pass
+        assert readers.qsize() == 1
+
+        batches.close()
+        with pool.reader() as conn:
+            assert conn is not other
+        assert readers.qsize() == 2
+
+    def test_stream_inside_transaction_sees_uncommitted_writes(self, pool, pilots):
+        pool.execute("INSERT INTO pilot (first_name, family_name) VALUES ('Dana', 'Diaz')")
+
+        rows = [row for rows in pool.stream("SELECT id FROM pilot") for row in rows]
+
+        assert len(rows) == 4
+        pool.rollback()
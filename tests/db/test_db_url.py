@@ -0,0 +1,45 @@
+import pytest
+from flightmanagement.db.db_url import PROJECT_ROOT, parse_db_url
+
+class TestParseDbUrl:
+
+    def test_relative_path_is_resolved_from_project_root(self):
+        database = parse_db_url("sqlite:///data/FlightManagement.db")
+
+        assert database.mode == "file"
+        assert database.path == PROJECT_ROOT / "data" / "FlightManagement.db"
+
+    def test_absolute_path(self, tmp_path):
+        database = parse_db_url(f"sqlite:///{tmp_path}/flights.db")
+
+        assert database.mode == "file"
+        assert database.path == tmp_path / "flights.db"
+
+    def test_bare_path(self, tmp_path):
+        assert parse_db_url(str(tmp_path / "flights.db")).path == tmp_path / "flights.db"
+
+    @pytest.mark.parametrize("url", ["sqlite:///:memory:", "sqlite://", ":memory:"])
+    def test_memory(self, url):
+        database = parse_db_url(url)
+
+        assert database.mode == "memory"
+        assert database.path is None
+
+    def test_hybrid(self):
+        database = parse_db_url("sqlite:///data/FlightManagement.db?mode=memory&snapshot_interval=15")
+
+        assert database.mode == "hybrid"
+        assert database.path == PROJECT_ROOT / "data" / "FlightManagement.db"
+        assert database.snapshot_interval == 15
+
+    def test_hybrid_default_interval(self):
+        assert parse_db_url("sqlite:///data/FlightManagement.db?mode=memory").snapshot_interval == 60
+
+    @pytest.mark.parametrize("url", [
+        "postgresql://localhost/flights",
+        "sqlite:///data/FlightManagement.db?mode=remote",
+        "sqlite:///data/FlightManagement.db?mode=memory&snapshot_interval=0"
+    ])
+    def test_invalid_urls_raise_error(self, url):
+        with pytest.raises(ValueError):
+            parse_db_url(url)
@@ -0,0 +1,140 @@
+import sqlite3
+import pytest
+from datetime import datetime
+from flightmanagement.db.db import seed_database_data
+from flightmanagement.db.flight_times import get_flight_times, get_flight_time_storage
+from flightmanagement.db.migrations import migrate, convert_flight_times
+from flightmanagement.models.flight import Flight
+from flightmanagement.repositories.flight_repository import FlightRepository
+
+@pytest.fixture
+def db_conn():
+    conn = sqlite3.connect(":memory:")
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA foreign_keys = ON;")
+    migrate(conn)
+    seed_database_data(conn)
+    yield conn
+    conn.close()
+
+class TestCodecs:
+
+    @pytest.mark.parametrize("storage", ["text", "epoch_minutes"])
+    def test_encode_decode_round_trip(self, storage):
+        flight_times = get_flight_time_storage(storage)
+        value = datetime(2026, 3, 19, 6, 50)
+
+        assert flight_times.decode(flight_times.encode(value)) == value
+
+    @pytest.mark.parametrize("storage", ["text", "epoch_minutes"])
+    def test_none_round_trip(self, storage):
+        flight_times = get_flight_time_storage(storage)
+
+        assert flight_times.encode(None) is None
+        assert flight_times.decode(None) is None
+
+    def test_epoch_minutes_encoding(self):
+        assert get_flight_time_storage("epoch_minutes").encode(datetime(1970, 1, 2, 0, 1)) == 1441
+
+    def test_unknown_storage_raises_error(self):
+        with pytest.raises(ValueError):
+            get_flight_time_storage("julian")
+
+class TestConversion:
+
+    def test_new_database_uses_text(self, db_conn):
+        assert get_flight_times(db_conn).storage == "text"
+
+    def test_convert_to_epoch_minutes_rewrites_values(self, db_conn):
+        assert convert_flight_times(db_conn, "epoch_minutes") is True
+
+        row = db_conn.execute("SELECT departure_time_scheduled, arrival_time_actual FROM flight WHERE id = 1").fetchone()
+        assert row[0] == get_flight_time_storage("epoch_minutes").encode(datetime(2026, 1, 9, 15, 30))
+        assert db_conn.execute("SELECT typeof(departure_time_scheduled) FROM flight WHERE id = 1").fetchone()[0] == "integer"
+        assert db_conn.execute("SELECT arrival_time_actual FROM flight WHERE id = 5").fetchone()[0] is None
+        assert get_flight_times(db_conn).storage == "epoch_minutes"
+
+    def test_convert_is_a_no_op_when_already_converted(self, db_conn):
+        convert_flight_times(db_conn, "epoch_minutes")
+
+        assert convert_flight_times(db_conn, "epoch_minutes") is False
+
+    def test_convert_keeps_indexes_and_constraints(self, db_conn):
+        indexes_before = {row[0] for row in db_conn.execute("SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = 'flight'")}
+
+        convert_flight_times(db_conn, "epoch_minutes")
+
+        indexes_after = {row[0] for row in db_conn.execute("SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = 'flight'")}
+        assert indexes_after == indexes_before
+        with pytest.raises(sqlite3.IntegrityError):
+            db_conn.execute("UPDATE flight SET status = 'Lost' WHERE id = 1")
+        with pytest.raises(sqlite3.IntegrityError):
+            db_conn.execute("UPDATE flight SET aircraft_id = 999 WHERE id = 1")
+
+    def test_view_formats_times_as_text(self, db_conn):
+        before = db_conn.execute("SELECT * FROM vw_denormalised_flights ORDER BY flight_id").fetchall()
+
+        convert_flight_times(db_conn, "epoch_minutes")
+
+        after = db_conn.execute("SELECT * FROM vw_denormalised_flights ORDER BY flight_id").fetchall()
+        assert [tuple(row) for row in after] == [tuple(row) for row in before]
+
+    def test_convert_back_to_text(self, db_conn):
+        before = db_conn.execute("SELECT * FROM flight ORDER BY id").fetchall()
+
+        convert_flight_times(db_conn, "epoch_minutes")
+        convert_flight_times(db_conn, "text")
+
+        after = db_conn.execute("SELECT * FROM flight ORDER BY id").fetchall()
+        assert [tuple(row) for row in after] == [tuple(row) for row in before]
+
+    def test_convert_keeps_autoincrement_sequence(self, db_conn):
+        db_conn.execute("DELETE FROM flight WHERE id = 12")
+        db_conn.commit()
+
+        convert_flight_times(db_conn, "epoch_minutes")
+        db_conn.execute("""
+            INSERT INTO flight (flight_number, aircraft_id, origin_id, destination_id, departure_time_scheduled, arrival_time_scheduled, status)
+            VALUES ('ZMY999', 1, 1, 2, 0, 60, 'Scheduled')
+        """)
+
+        assert db_conn.execute("SELECT MAX(id) FROM flight").fetchone()[0] == 13
+
+class TestRepository:
+
+    def test_repository_reads_same_flights_in_both_storages(self, db_conn):
+        before = FlightRepository(db_conn).get_flight_list()
+
+        convert_flight_times(db_conn, "epoch_minutes")
+
+        assert FlightRepository(db_conn).get_flight_list() == before
+
+    def test_repository_writes_epoch_minutes(self, db_conn):
+        convert_flight_times(db_conn, "epoch_minutes")
+        repository = FlightRepository(db_conn)
+
+        repository.insert_item(Flight(
+            flight_number="ZMY999",
+            aircraft_id=1,
+            origin_id=1,
+            destination_id=2,
+            departure_time_scheduled=datetime(2027, 1, 1, 10, 0),
+            arrival_time_scheduled=datetime(2027, 1, 1, 12, 30)
+        ))
+
+        row = db_conn.execute("SELECT typeof(departure_time_scheduled), arrival_time_scheduled - departure_time_scheduled FROM flight WHERE flight_number = 'ZMY999'").fetchone()
+        assert row[0] == "integer"
+        assert row[1] == 150
+        assert repository.search_on_field("flight_number", "ZMY999")[0].arrival_time_scheduled == datetime(2027, 1, 1, 12, 30)
+
+    @pytest.mark.parametrize("window", [
+        (datetime(2026, 10, 2, 4, 0), datetime(2026, 10, 2, 18, 0), 11),
+        (datetime(2026, 4, 7, 22, 0), datetime(2026, 4, 8, 2, 0), -1),
+        (datetime(2026, 1, 10, 9, 0), datetime(2026, 1, 10, 14, 0), -1),
+    ])
+    def test_available_pilots_match_in_both_storages(self, db_conn, window):
+        before = FlightRepository(db_conn).get_available_pilots(*window)
+
+        convert_flight_times(db_conn, "epoch_minutes")
+
+        assert FlightRepository(db_conn).get_available_pilots(*window) == before
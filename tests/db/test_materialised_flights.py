@@ -0,0 +1,90 @@
+import sqlite3
+import pytest
+from flightmanagement.db.db import seed_database_data
+from flightmanagement.db.migrations import migrate, convert_flight_times
+from flightmanagement.db.materialised_flights import is_materialised, rebuild_materialised_flights, set_materialised_flights
+
+@pytest.fixture
+def db_conn():
+    conn = sqlite3.connect(":memory:")
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA foreign_keys = ON;")
+    migrate(conn)
+    seed_database_data(conn)
+    set_materialised_flights(conn, True)
+    yield conn
+    conn.close()
+
+def view_rows(conn) -> list[tuple]:
+    return [tuple(row) for row in conn.execute("SELECT * FROM vw_denormalised_flights ORDER BY flight_id")]
+
+def materialised_rows(conn) -> list[tuple]:
+    return [tuple(row) for row in conn.execute("SELECT * FROM flight_denormalised ORDER BY flight_id")]
+
+class TestEnable:
+
+    def test_enable_populates_table(self, db_conn):
+        assert is_materialised(db_conn)
+        assert len(materialised_rows(db_conn)) == 12
+        assert materialised_rows(db_conn) == view_rows(db_conn)
+
+    def test_disable_drops_table_and_triggers(self, db_conn):
+        set_materialised_flights(db_conn, False)
+
+        assert not is_materialised(db_conn)
+        assert db_conn.execute("SELECT COUNT(*) FROM sqlite_master WHERE type = 'trigger' AND name LIKE 'trg_flight_denormalised%'").fetchone()[0] == 0
+        db_conn.execute("UPDATE pilot SET family_name = 'Moore' WHERE id = 1")
+
+    def test_rebuild_restores_drifted_rows(self, db_conn):
+        db_conn.execute("DELETE FROM flight_denormalised WHERE flight_id < 5")
+
+        assert rebuild_materialised_flights(db_conn) == 12
+        assert materialised_rows(db_conn) == view_rows(db_conn)
+
+class TestTriggers:
+
+    def test_flight_insert(self, db_conn):
+        db_conn.execute("""
+            INSERT INTO flight (flight_number, aircraft_id, origin_id, destination_id, pilot_id, copilot_id, departure_time_scheduled, arrival_time_scheduled, status)
+            VALUES ('ZMY999', 3, 2, 1, 5, 6, '2026-12-01 10:00', '2026-12-01 11:30', 'Scheduled')
+        """)
+
+        assert materialised_rows(db_conn) == view_rows(db_conn)
+        row = db_conn.execute("SELECT * FROM flight_denormalised WHERE flight_number = 'ZMY999'").fetchone()
+        assert row["origin"] == "AMS"
+        assert row["pilot"] == "Michael Reed"
+
+    def test_flight_update(self, db_conn):
+        db_conn.execute("UPDATE flight SET status = 'Delayed', pilot_id = NULL, arrival_time_actual = '2026-11-18 17:00' WHERE id = 12")
+
+        assert materialised_rows(db_conn) == view_rows(db_conn)
+
+    def test_flight_delete(self, db_conn):
+        db_conn.execute("DELETE FROM flight WHERE id = 12")
+
+        assert materialised_rows(db_conn) == view_rows(db_conn)
+        assert len(materialised_rows(db_conn)) == 11
+
+    def test_aircraft_update(self, db_conn):
+        db_conn.execute("UPDATE aircraft SET registration = 'G-NEWR', model = 'A321neo' WHERE id = 1")
+
+        assert materialised_rows(db_conn) == view_rows(db_conn)
+
+    def test_airport_update(self, db_conn):
+        db_conn.execute("UPDATE airport SET code = 'LGW' WHERE id = 1")
+
+        assert materialised_rows(db_conn) == view_rows(db_conn)
+
+    def test_pilot_update(self, db_conn):
+        db_conn.execute("UPDATE pilot SET first_name = 'Alexandra' WHERE id = 3")
+
+        assert materialised_rows(db_conn) == view_rows(db_conn)
+
+    def test_triggers_survive_flight_time_conversion(self, db_conn):
+        convert_flight_times(db_conn, "epoch_minutes")
+        db_conn.execute("UPDATE flight SET departure_time_scheduled = departure_time_scheduled + 30 WHERE id = 12")
+        db_conn.execute("UPDATE pilot SET first_name = 'Alexandra' WHERE id = 3")
+
+        assert materialised_rows(db_conn) == view_rows(db_conn)
+        row = db_conn.execute("SELECT departure_time_scheduled FROM flight_denormalised WHERE flight_id = 12").fetchone()
+        assert row[0] == "2026-11-18 15:50"
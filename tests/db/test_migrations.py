@@ -0,0 +1,216 @@
+import sqlite3
+import pytest
+from flightmanagement.db import migrations
+from flightmanagement.db.db import initialise_schema, seed_database_data
+from flightmanagement.db.migrations import (
+    migrate, get_schema_version, add_column, create_index, column_exists, convert_flight_times, deferred_indexes,
+    deferred_pilot_duty, rebuild_pilot_duty_ledger
+)
+
+@pytest.fixture
+def db_conn():
+    conn = sqlite3.connect(":memory:")
+    conn.row_factory = sqlite3.Row
+    yield conn
+    conn.close()
+
+@pytest.fixture
+def extra_migrations(monkeypatch):
+    # Work on a copy of the registry so test migrations don't leak into other tests
+    registry = list(migrations.MIGRATIONS)
+    monkeypatch.setattr(migrations, "MIGRATIONS", registry)
+    return registry
+
+def table_names(conn) -> set[str]:
+    rows = conn.execute("SELECT name FROM sqlite_master WHERE type IN ('table', 'view')").fetchall()
+    return {row[0] for row in rows}
+
+class TestMigrate:
+
+    def test_migrate_creates_schema_and_records_version(self, db_conn):
+        applied = migrate(db_conn)
+
+        assert applied == [version for version, _, _ in migrations.MIGRATIONS]
+        assert get_schema_version(db_conn) == migrations.MIGRATIONS[-1][0]
+        assert {"aircraft", "airport", "pilot", "flight", "vw_denormalised_flights"} <= table_names(db_conn)
+
+    def test_migrate_is_idempotent(self, db_conn):
+        migrate(db_conn)
+
+        assert migrate(db_conn) == []
+
+    def test_migrate_applies_only_pending_in_order(self, db_conn, extra_migrations):
+        migrate(db_conn)
+        latest = get_schema_version(db_conn)
+        calls = []
+
+        extra_migrations.append((latest + 2, "Second", lambda conn: calls.append(latest + 2)))
+        extra_migrations.append((latest + 1, "First", lambda conn: calls.append(latest + 1)))
+        extra_migrations.sort(key=lambda item: item[0])
+
+        applied = migrate(db_conn)
+
+        assert applied == [latest + 1, latest + 2]
+        assert calls == [latest + 1, latest + 2]
+        assert get_schema_version(db_conn) == latest + 2
+
+    def test_migrate_respects_target(self, db_conn):
+        applied = migrate(db_conn, target=1)
+
+        assert applied == [1]
+        assert get_schema_version(db_conn) == 1
+
+    def test_failed_migration_rolls_back_whole_batch(self, db_conn, extra_migrations):
+        migrate(db_conn)
+        latest = get_schema_version(db_conn)
+
+        def add_table(conn):
+            conn.execute("CREATE TABLE crew (id INTEGER PRIMARY KEY)")
+
+        def fail(conn):
+            raise RuntimeError("Migration failed")
+
+        extra_migrations.append((latest + 1, "Add crew", add_table))
+        extra_migrations.append((latest + 2, "Broken", fail))
+
+        with pytest.raises(RuntimeError):
+            migrate(db_conn)
+
+        assert get_schema_version(db_conn) == latest
+        assert "crew" not in table_names(db_conn)
+
+    def test_migrate_adopts_existing_schema_and_keeps_data(self, db_conn):
+        migrate(db_conn, target=1)
+        seed_database_data(db_conn)
+        db_conn.execute("DELETE FROM schema_version")
+        db_conn.commit()
+
+        migrate(db_conn)
+
+        assert db_conn.execute("SELECT COUNT(*) FROM flight").fetchone()[0] == 12
+
+    def test_duplicate_version_raises_error(self, extra_migrations):
+        with pytest.raises(ValueError):
+            migrations.migration(1, "Duplicate")(lambda conn: None)
+
+class TestOnlineChanges:
+
+    def test_add_column_is_idempotent(self, db_conn):
+        migrate(db_conn)
+
+        add_column(db_conn, "pilot", "licence_number", "VARCHAR(20)")
+        add_column(db_conn, "pilot", "licence_number", "VARCHAR(20)")
+
+        assert column_exists(db_conn, "pilot", "licence_number")
+
+    def test_create_index_is_idempotent(self, db_conn):
+        migrate(db_conn)
+
+        create_index(db_conn, "idx_test_pilot_name", "pilot", ["family_name"])
+        create_index(db_conn, "idx_test_pilot_name", "pilot", ["family_name"])
+
+        row = db_conn.execute("SELECT name FROM sqlite_master WHERE type = 'index' AND name = 'idx_test_pilot_name'").fetchone()
+        assert row is not None
+
+class TestDeferredIndexes:
+
+    def index_names(self, conn) -> set[str]:
+        rows = conn.execute("SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = 'flight'").fetchall()
+        return {row[0] for row in rows}
+
+    def test_indexes_are_dropped_then_rebuilt(self, db_conn):
+        migrate(db_conn)
+        indexes = self.index_names(db_conn)
+
+        with deferred_indexes(db_conn, "flight"):
+            assert self.index_names(db_conn) == {"sqlite_autoindex_flight_1"}
+
+        assert self.index_names(db_conn) == indexes
+
+    def test_unique_indexes_stay(self, db_conn):
+        migrate(db_conn)
+        create_index(db_conn, "idx_flight_unique_number", "flight", ["flight_number", "arrival_time_scheduled"], unique=True)
+
+        with deferred_indexes(db_conn, "flight"):
+            assert "idx_flight_unique_number" in self.index_names(db_conn)
+
+    def test_rollback_restores_indexes(self, db_conn):
+        migrate(db_conn)
+        indexes = self.index_names(db_conn)
+
+        with pytest.raises(RuntimeError):
+            with deferred_indexes(db_conn, "flight"):
+                raise RuntimeError("Load failed")
+        db_conn.rollback()
+
+        assert self.index_names(db_conn) == indexes
+
+class TestPilotDutyLedger:
+
+    @pytest.fixture(params=["text", "epoch_minutes"])
+    def seeded_conn(self, db_conn, request):
+        migrate(db_conn)
+        seed_database_data(db_conn)
+        convert_flight_times(db_conn, request.param)
+        return db_conn
+
+    def ledger(self, conn) -> list[tuple]:
+        return [tuple(row) for row in conn.execute("SELECT * FROM pilot_duty_day ORDER BY pilot_id, day")]
+
+    def assert_matches_flights(self, conn):
+        ledger = self.ledger(conn)
+        rebuild_pilot_duty_ledger(conn)
+        assert ledger == self.ledger(conn)
+
+    def test_seeded_flights_are_counted(self, seeded_conn):
+        assert len(self.ledger(seeded_conn)) > 0
+        self.assert_matches_flights(seeded_conn)
+
+    def test_flight_minutes_count_on_arrival_day(self, db_conn):
+        migrate(db_conn)
+        seed_database_data(db_conn)
+        db_conn.execute("DELETE FROM flight")
+        db_conn.execute("""
+            INSERT INTO flight (flight_number, aircraft_id, origin_id, destination_id, pilot_id, copilot_id, departure_time_scheduled, arrival_time_scheduled, arrival_time_actual, status)
+            VALUES ('ZMY123', 1, 1, 2, 1, 2, '1970-01-02 23:00', '1970-01-03 01:00', '1970-01-03 01:30', 'Arrived')
+        """)
+
+        assert self.ledger(db_conn) == [(1, 2, 150, 1), (2, 2, 150, 1)]
+
+    def test_retiming_reassigning_and_logging_move_minutes(self, seeded_conn):
+        seeded_conn.execute("UPDATE flight SET arrival_time_scheduled = departure_time_scheduled WHERE id = 1")
+        seeded_conn.execute("UPDATE flight SET pilot_id = copilot_id, copilot_id = pilot_id WHERE id = 2")
+        seeded_conn.execute("UPDATE flight SET copilot_id = NULL WHERE id = 3")
+        seeded_conn.execute("UPDATE flight SET departure_time_actual = NULL, arrival_time_actual = NULL WHERE id = 4")
+        seeded_conn.execute("UPDATE flight SET departure_time_scheduled = NULL WHERE id = 5")
+        seeded_conn.execute("DELETE FROM flight WHERE id = 6")
+
+        self.assert_matches_flights(seeded_conn)
+
+    def test_other_updates_leave_ledger_alone(self, seeded_conn):
+        changes = seeded_conn.total_changes
+
+        seeded_conn.execute("UPDATE flight SET status = 'Delayed', pilot_id = pilot_id WHERE id = 1")
+
+        # The flight and its change log entry
+        assert seeded_conn.total_changes == changes + 2
+
+    def test_deferred_ledger_is_rebuilt(self, seeded_conn):
+        with deferred_pilot_duty(seeded_conn):
+            assert seeded_conn.execute("SELECT COUNT(*) FROM sqlite_master WHERE name LIKE 'trg_pilot_duty_day_%'").fetchone()[0] == 0
+            seeded_conn.execute("DELETE FROM flight WHERE id < 5")
+        seeded_conn.commit()
+
+        assert seeded_conn.execute("SELECT COUNT(*) FROM sqlite_master WHERE name LIKE 'trg_pilot_duty_day_%'").fetchone()[0] == 3
+        self.assert_matches_flights(seeded_conn)
+
+class TestReseed:
+
+    def test_initialise_schema_drops_data_and_rebuilds(self, db_conn):
+        migrate(db_conn)
+        seed_database_data(db_conn)
+
+        initialise_schema(db_conn)
+
+        assert db_conn.execute("SELECT COUNT(*) FROM flight").fetchone()[0] == 0
+        assert get_schema_version(db_conn) == migrations.MIGRATIONS[-1][0]
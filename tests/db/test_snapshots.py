@@ -0,0 +1,130 @@
+import sqlite3
+from contextlib import closing
+from unittest.mock import patch
+import pytest
+from flightmanagement.db.db import ConnectionPool, get_connection, get_connection_pool, seed_database_data, transaction
+from flightmanagement.db.migrations import migrate
+from flightmanagement.db.snapshots import MemorySnapshot
+
+@pytest.fixture
+def disk_path(tmp_path):
+    path = tmp_path / "flights.db"
+    with closing(get_connection(path)) as conn:
+        migrate(conn)
+        seed_database_data(conn)
+        conn.commit()
+    return path
+
+def count_pilots(path) -> int:
+    with closing(sqlite3.connect(path)) as conn:
+        return conn.execute("SELECT COUNT(*) FROM pilot").fetchone()[0]
+
+class TestMemoryPool:
+
+    def test_reads_and_writes_share_one_database(self):
+        pool = ConnectionPool(":memory:")
+        try:
+            migrate(pool)
+            seed_database_data(pool)
+            pool.commit()
+
+            assert pool.execute("SELECT COUNT(*) FROM pilot").fetchone()[0] == 10
+            with pool.reader() as conn:
+                assert conn is pool.writer
+        finally:
+            pool.close()
+
+    def test_file_pool_rejects_memory_attachment(self, tmp_path):
+        pool = ConnectionPool(tmp_path / "flights.db")
+        try:
+            with pytest.raises(ValueError):
+                pool.attach(":memory:", "archive")
+        finally:
+            pool.close()
+
+class TestMemorySnapshot:
+
+    def test_load_and_save(self, disk_path):
+        pool = ConnectionPool(":memory:")
+        snapshot = MemorySnapshot(pool, disk_path, interval=60)
+
+        assert snapshot.load()
+        with transaction(pool):
+            pool.execute("INSERT INTO pilot (first_name, family_name) VALUES ('Andrea', 'Almond')")
+
+        # Not written back until a snapshot is taken
+        assert count_pilots(disk_path) == 10
+        assert snapshot.save()
+        assert count_pilots(disk_path) == 11
+        pool.close()
+
+    def test_load_without_file(self, tmp_path):
+        pool = ConnectionPool(":memory:")
+
+        assert not MemorySnapshot(pool, tmp_path / "missing.db", interval=60).load()
+        pool.close()
+
+    def test_save_skipped_during_transaction(self, disk_path):
+        pool = ConnectionPool(":memory:")
+        snapshot = MemorySnapshot(pool, disk_path, interval=60)
+        snapshot.load()
+
+        pool.execute("INSERT INTO pilot (first_name, family_name) VALUES ('Andrea', 'Almond')")
+
+        assert not snapshot.save()
+        pool.rollback()
+        pool.close()
+
+    def test_close_saves_committed_data_only(self, disk_path):
+        pool = ConnectionPool(":memory:")
+        pool.snapshot = MemorySnapshot(pool, disk_path, interval=60)
+        pool.snapshot.load()
+        pool.snapshot.start()
+
+        with transaction(pool):
+            pool.execute("INSERT INTO pilot (first_name, family_name) VALUES ('Andrea', 'Almond')")
+        pool.execute("INSERT INTO pilot (first_name, family_name) VALUES ('Uncommitted', 'Pilot')")
+        pool.close()
+
+        assert count_pilots(disk_path) == 11
+
+    def test_timer_saves_periodically(self, disk_path):
+        pool = ConnectionPool(":memory:")
+        snapshot = MemorySnapshot(pool, disk_path, interval=0.01)
+        snapshot.load()
+        snapshot.start()
+
+        with transaction(pool):
+            pool.execute("INSERT INTO pilot (first_name, family_name) VALUES ('Andrea', 'Almond')")
+        for _ in range(500):
+            if snapshot.saved_count >= 2:
+                break
+            snapshot._MemorySnapshot__stopped.wait(0.01)
+
+        assert count_pilots(disk_path) == 11
+        snapshot.close()
+        pool.close()
+
+class TestSettings:
+
+    @patch("flightmanagement.db.db.atexit")
+    @patch("flightmanagement.db.db.settings")
+    def test_pool_from_hybrid_url(self, mock_settings, mock_atexit, disk_path):
+        mock_settings.db_url = f"sqlite:///{disk_path}?mode=memory&snapshot_interval=60"
+        mock_settings.db_pool_size = 4
+        mock_settings.db_busy_timeout = 5000
+        mock_settings.db_synchronous = "NORMAL"
+
+        pool = get_connection_pool()
+
+        assert pool.memory
+        assert pool.execute("SELECT COUNT(*) FROM pilot").fetchone()[0] == 10
+        mock_atexit.register.assert_called_once_with(pool.snapshot.close)
+        pool.close()
+
+    @patch("flightmanagement.db.db.settings")
+    def test_connection_from_file_url(self, mock_settings, disk_path):
+        mock_settings.db_url = f"sqlite:///{disk_path}"
+
+        with closing(get_connection()) as conn:
+            assert conn.execute("SELECT COUNT(*) FROM pilot").fetchone()[0] == 10
@@ -0,0 +1,120 @@
+import sqlite3
+from datetime import datetime
+import pytest
+from flightmanagement.db.migrations import migrate, convert_flight_times
+from flightmanagement.db.synthetic_data import generate_database_data
+
+NOW = datetime(2025, 3, 1)
+
+@pytest.fixture(params=["text", "epoch_minutes"])
+def db_conn(request):
+    conn = sqlite3.connect(":memory:")
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA foreign_keys = ON;")
+    migrate(conn)
+    convert_flight_times(conn, request.param)
+    yield conn
+    conn.close()
+
+def generate(conn, seed: int = 7) -> dict:
+    return generate_database_data(conn, flights=3000, airports=20, aircraft=15, pilots=60, seed=seed, start=datetime(2025, 1, 1), now=NOW)
+
+def overlapping_pairs(conn, column: str) -> int:
+    # Flights sharing the column's value whose scheduled times overlap
+    return conn.execute(f"""
+        SELECT COUNT(*)
+        FROM flight a
+        INNER JOIN flight b ON b.{column} = a.{column} AND b.id > a.id
+        WHERE a.departure_time_scheduled < b.arrival_time_scheduled
+        AND b.departure_time_scheduled < a.arrival_time_scheduled
+    """).fetchone()[0]
+
+class TestGenerate:
+
+    def test_counts(self, db_conn):
+        assert generate(db_conn) == {"airports": 20, "aircraft": 15, "pilots": 60, "flights": 3000}
+        assert db_conn.execute("SELECT COUNT(*) FROM flight").fetchone()[0] == 3000
+        assert not db_conn.in_transaction
+
+    def test_same_seed_is_reproducible(self, db_conn):
+        generate(db_conn)
+        first = [tuple(row) for row in db_conn.execute("SELECT * FROM flight ORDER BY id")]
+
+        other = sqlite3.connect(":memory:")
+        migrate(other)
+        convert_flight_times(other, "epoch_minutes" if isinstance(first[0][7], int) else "text")
+        generate(other)
+
+        assert [tuple(row) for row in other.execute("SELECT * FROM flight ORDER BY id")] == first
+
+    def test_different_seed_differs(self, db_conn):
+        generate(db_conn, seed=1)
+        other = sqlite3.connect(":memory:")
+        migrate(other)
+        generate(other, seed=2)
+
+        assert db_conn.execute("SELECT origin_id FROM flight ORDER BY id LIMIT 50").fetchall() != \
+            other.execute("SELECT origin_id FROM flight ORDER BY id LIMIT 50").fetchall()
+
+    def test_no_overlapping_assignments(self, db_conn):
+        generate(db_conn)
+
+        assert overlapping_pairs(db_conn, "aircraft_id") == 0
+        assert overlapping_pairs(db_conn, "pilot_id") == 0
+        assert overlapping_pairs(db_conn, "copilot_id") == 0
+        assert db_conn.execute("""
+            SELECT COUNT(*)
+            FROM flight a
+            INNER JOIN flight b ON b.copilot_id = a.pilot_id
+            WHERE a.departure_time_scheduled < b.arrival_time_scheduled
+            AND b.departure_time_scheduled < a.arrival_time_scheduled
+        """).fetchone()[0] == 0
+
+    def test_rotations_continue_from_last_destination(self, db_conn):
+        generate(db_conn)
+
+        broken = db_conn.execute("""
+            SELECT COUNT(*)
+            FROM (
+                SELECT origin_id, LAG(destination_id) OVER (PARTITION BY aircraft_id ORDER BY departure_time_scheduled) AS previous_destination
+                FROM flight
+            )
+            WHERE previous_destination IS NOT NULL AND previous_destination <> origin_id
+        """).fetchone()[0]
+        assert broken == 0
+
+    def test_status_follows_now(self, db_conn):
+        generate(db_conn)
+        statuses = dict(db_conn.execute("SELECT status, COUNT(*) FROM flight GROUP BY status").fetchall())
+
+        assert statuses["Arrived"] > 0 and statuses["Scheduled"] > 0
+        assert db_conn.execute("SELECT COUNT(*) FROM flight WHERE status = 'Arrived' AND arrival_time_actual IS NULL").fetchone()[0] == 0
+
+    def test_indexes_and_constraints_restored(self, db_conn):
+        indexes = db_conn.execute("SELECT COUNT(*) FROM sqlite_master WHERE type = 'index' AND tbl_name = 'flight'").fetchone()[0]
+
+        generate(db_conn)
+
+        assert db_conn.execute("SELECT COUNT(*) FROM sqlite_master WHERE type = 'index' AND tbl_name = 'flight'").fetchone()[0] == indexes
+        assert db_conn.execute("PRAGMA foreign_key_check").fetchall() == []
+
+    def test_rows_satisfy_constraints(self, db_conn):
+        generate(db_conn)
+
+        # integrity_check re-checks every row against the CHECK and NOT NULL constraints
+        assert [row[0] for row in db_conn.execute("PRAGMA integrity_check")] == ["ok"]
+        assert db_conn.execute("""
+            SELECT COUNT(*)
+            FROM flight
+            WHERE status NOT IN ('Scheduled', 'On time', 'Delayed', 'Boarding', 'Closed', 'Departed', 'Arrived')
+        """).fetchone()[0] == 0
+
+    @pytest.mark.parametrize("sizes, message", [
+        ({"airports": 1}, "two airports"),
+        ({"aircraft": 0}, "one aircraft"),
+        ({"pilots": -1}, "pilot count"),
+        ({"flights": -1}, "flight count")
+    ])
+    def test_invalid_sizes_raise_error(self, db_conn, sizes, message):
+        with pytest.raises(ValueError, match=message):
+            generate_database_data(db_conn, **{"flights": 10, **sizes})
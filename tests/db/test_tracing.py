@@ -0,0 +1,100 @@
+import pytest
+from flightmanagement.db.db import ConnectionPool, seed_database_data
+from flightmanagement.db.migrations import migrate
+from flightmanagement.db.tracing import QueryTracer, normalise_statement, percentile
+from flightmanagement.repositories.pilot_repository import PilotRepository
+
+@pytest.fixture
+def tracer(tmp_path):
+    return QueryTracer(slow_query_ms=None, slow_query_log=tmp_path / "slow.log")
+
+@pytest.fixture
+def pool(tmp_path, tracer):
+    pool = ConnectionPool(tmp_path / "test.db", pool_size=2, tracer=tracer)
+    migrate(pool)
+    seed_database_data(pool)
+    pool.commit()
+    tracer.reset()
+    yield pool
+    pool.close()
+
+class TestNormalise:
+
+    def test_literals_are_replaced(self):
+        assert normalise_statement("SELECT * FROM pilot WHERE id = 3 AND family_name = 'O''Brien'") == \
+            "SELECT * FROM pilot WHERE id = ? AND family_name = ?"
+
+    def test_whitespace_and_comments_are_collapsed(self):
+        assert normalise_statement("""
+            SELECT *  -- every column
+            FROM   pilot
+        """) == "SELECT * FROM pilot"
+
+    def test_in_lists_are_collapsed(self):
+        assert normalise_statement("SELECT * FROM flight WHERE id IN (?, ?, ?)") == \
+            normalise_statement("SELECT * FROM flight WHERE id IN (?,?)")
+
+    def test_identifiers_with_digits_are_kept(self):
+        assert normalise_statement("SELECT t1.id FROM vw_2 t1") == "SELECT t1.id FROM vw_2 t1"
+
+    def test_percentile(self):
+        values = [float(n) for n in range(1, 101)]
+
+        assert percentile(values, 0.50) == 50.0
+        assert percentile(values, 0.95) == 95.0
+        assert percentile([], 0.95) == 0.0
+
+class TestTracer:
+
+    def test_repository_statements_are_grouped(self, pool, tracer):
+        repository = PilotRepository(pool)
+        for pilot_id in range(1, 6):
+            repository.get_item_by_id(pilot_id)
+
+        top = tracer.top()
+
+        assert len(top) == 1
+        assert top[0]["statement"] == "SELECT * FROM pilot WHERE id = ?"
+        assert top[0]["count"] == 5
+        assert 0 <= top[0]["p50_ms"] <= top[0]["p95_ms"] <= top[0]["max_ms"]
+
+    def test_top_orders_by_total_time_and_limits(self, pool, tracer):
+        for _ in range(3):
+            pool.execute("SELECT * FROM flight").fetchall()
+        pool.execute("SELECT 1").fetchone()
+
+        top = tracer.top(1)
+
+        assert len(top) == 1
+        assert top[0]["statement"] == "SELECT * FROM flight"
+
+    def test_writes_are_traced(self, pool, tracer):
+        pool.executemany("INSERT INTO pilot (first_name, family_name) VALUES (?, ?)", [("A", "B"), ("C", "D")])
+        pool.commit()
+
+        assert tracer.top()[0]["statement"] == "INSERT INTO pilot (first_name, family_name) VALUES (?, ...)"
+
+    def test_cursor_behaves_like_a_cursor(self, pool):
+        cursor = pool.execute("SELECT id FROM pilot ORDER BY id")
+
+        assert cursor.fetchone()[0] == 1
+        assert [row[0] for row in cursor] == list(range(2, 11))
+        assert cursor.description[0][0] == "id"
+
+class TestSlowQueryLog:
+
+    def test_slow_statements_are_logged_with_values(self, pool, tracer):
+        tracer.slow_query_ms = 0
+
+        PilotRepository(pool).get_item_by_id(4)
+
+        lines = tracer.slow_query_log.read_text().splitlines()
+        assert len(lines) == 1
+        assert lines[0].endswith("SELECT * FROM pilot WHERE id = 4")
+
+    def test_fast_statements_are_not_logged(self, pool, tracer):
+        tracer.slow_query_ms = 10000
+
+        PilotRepository(pool).get_item_by_id(4)
+
+        assert not tracer.slow_query_log.exists()
@@ -1,5 +1,6 @@
 import sqlite3
 import pytest
+from dataclasses import replace
 from flightmanagement.models.aircraft import Aircraft
 from flightmanagement.repositories.aircraft_repository import AircraftRepository
 
@@ -186,3 +187,26 @@ class TestWriteOperations:
         row = db_conn.execute("SELECT * FROM aircraft WHERE id = 1").fetchone()
         assert row is None
 
+
+class TestUpsert:
+
+    def test_upsert_inserts_new_aircraft(self, aircraft_repository, sample_aircraft):
+        assert aircraft_repository.upsert(sample_aircraft)
+
+        assert aircraft_repository.get_item_by_registration("G-ABCD").model == "737"
+
+    def test_upsert_updates_by_registration(self, aircraft_repository, sample_aircraft):
+        aircraft_repository.upsert(sample_aircraft)
+        aircraft_repository.get_item_by_registration("G-ABCD")
+
+        assert aircraft_repository.upsert(replace(sample_aircraft, id=None, status="Inactive"))
+
+        assert aircraft_repository.get_item_by_registration("G-ABCD").status == "Inactive"
+        assert len(aircraft_repository.get_aircraft_list()) == 1
+
+    def test_upsert_skips_unchanged_aircraft(self, aircraft_repository, db_conn, sample_aircraft):
+        aircraft_repository.upsert(sample_aircraft)
+        changes = db_conn.total_changes
+
+        assert not aircraft_repository.upsert(replace(sample_aircraft, id=None))
+        assert db_conn.total_changes == changes
@@ -180,3 +180,31 @@ class TestWriteOperations:
         row = db_conn.execute("SELECT * FROM airport WHERE id = 1").fetchone()
         assert row is None
 
+
+    def test_update_many_reports_duplicates_and_refreshes_cache(self, airport_repository, db_conn):
+        db_conn.execute("""
+            INSERT INTO airport (code, name, city, country, region)
+            VALUES
+                ('AAA', 'Andonovia International Airport', 'Andonovia', 'Bankantistan', 'Asia'),
+                ('BBB', 'Boronia International Airport', 'Boronia', 'Bankantistan', 'Europe')
+        """)
+        first, second = airport_repository.get_airport_list()
+
+        results = airport_repository.update_many([
+            Airport(id=first.id, code="AAA", name=first.name, city="Zimfantown", country=first.country, region=first.region),
+            Airport(id=second.id, code="AAA", name=second.name, city=second.city, country=second.country, region=second.region)
+        ])
+
+        assert [result.ok for result in results] == [True, False]
+        assert airport_repository.get_item_by_id(first.id).city == "Zimfantown"
+        assert airport_repository.get_item_by_code("BBB").id == second.id
+
+    def test_upsert_many_matches_on_code(self, airport_repository, db_conn, sample_airport):
+        airport_repository.insert_item(sample_airport)
+        moved = Airport(code="AAA", name=sample_airport.name, city="Zimfantown", country="Yankovia", region="Europe")
+        new = Airport(code="BBB", name="Boronia International Airport", city="Boronia", country="Bankantistan", region="Europe")
+
+        results = airport_repository.upsert_many([moved, new])
+
+        assert all(result.ok for result in results)
+        assert [(airport.code, airport.city) for airport in airport_repository.get_airport_list()] == [("AAA", "Zimfantown"), ("BBB", "Boronia")]
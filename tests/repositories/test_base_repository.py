@@ -0,0 +1,278 @@
+import sqlite3
+from dataclasses import FrozenInstanceError, dataclass
+from datetime import datetime
+import pytest
+from flightmanagement.models.pilot import Pilot
+from flightmanagement.repositories import base_repository
+from flightmanagement.repositories.base_repository import BaseRepository, chunked, compile_row_mapper
+
+@dataclass(frozen=True)
+class Departure:
+    flight_number: str
+    departure_time: datetime
+    gate: str = "TBC"
+    id: int | None = None
+
+class DepartureRepository(BaseRepository):
+
+    model = Departure
+    table = "departure"
+
+    INSERT_SQL = "INSERT INTO departure (departure_time, flight_number) VALUES (?, ?)"
+    UPDATE_SQL = "UPDATE departure SET departure_time = ?, flight_number = ? WHERE id = ?"
+
+    def _insert_parameters(self, departure: Departure) -> tuple:
+        return (departure.departure_time.strftime("%Y-%m-%d %H:%M"), departure.flight_number)
+
+    def _update_parameters(self, departure: Departure) -> tuple:
+        return (*self._insert_parameters(departure), departure.id)
+
+    def _decoders(self) -> dict:
+        return {"departure_time": lambda value: datetime.fromisoformat(value) if value else None}
+
+    def _encoders(self) -> dict:
+        return {"departure_time": lambda value: value.strftime("%Y-%m-%d %H:%M")}
+
+    def get_departure_page(self, after=None, limit=2, direction="next", descending=True):
+        return self._fetch_page("departure", ("departure_time", "id"), after, limit, direction, descending)
+
+@pytest.fixture
+def db_conn():
+    conn = sqlite3.connect(":memory:")
+    conn.row_factory = sqlite3.Row
+    conn.execute("CREATE TABLE departure (id INTEGER PRIMARY KEY, departure_time TEXT, flight_number TEXT, remarks TEXT)")
+    conn.execute("INSERT INTO departure VALUES (1, '2026-01-01 15:30', 'ZMY123', 'On time')")
+    conn.execute("INSERT INTO departure VALUES (2, '2026-01-01 16:45', 'ZMY456', NULL)")
+    yield conn
+    conn.close()
+
+@pytest.fixture
+def repository(db_conn):
+    return DepartureRepository(db_conn)
+
+class TestRowMapper:
+
+    def test_maps_columns_by_position(self):
+        mapper = compile_row_mapper(Pilot, ("family_name", "id", "first_name"))
+
+        assert mapper(("Almond", 1, "Andrea")) == Pilot(id=1, first_name="Andrea", family_name="Almond")
+
+    def test_applies_decoders(self):
+        mapper = compile_row_mapper(Departure, ("flight_number", "departure_time"), {"departure_time": datetime.fromisoformat})
+
+        assert mapper(("ZMY123", "2026-01-01 15:30")).departure_time == datetime(2026, 1, 1, 15, 30)
+
+    def test_ignores_extra_columns_and_defaults_missing_fields(self):
+        mapper = compile_row_mapper(Departure, ("flight_number", "remarks", "departure_time"))
+        departure = mapper(("ZMY123", "On time", None))
+
+        assert departure == Departure(flight_number="ZMY123", departure_time=None)
+        assert not hasattr(departure, "remarks")
+
+    def test_missing_required_column_raises_error(self):
+        with pytest.raises(ValueError):
+            compile_row_mapper(Pilot, ("id", "first_name"))
+
+    def test_mapped_instances_stay_frozen(self):
+        pilot = compile_row_mapper(Pilot, ("id", "first_name", "family_name"))((1, "Andrea", "Almond"))
+
+        with pytest.raises(FrozenInstanceError):
+            pilot.first_name = "Alex"
+
+class TestBaseRepository:
+
+    def test_fetch_one_maps_row(self, repository):
+        departure = repository._fetch_one("SELECT * FROM departure WHERE id = ?", (1, ))
+
+        assert departure == Departure(id=1, flight_number="ZMY123", departure_time=datetime(2026, 1, 1, 15, 30))
+
+    def test_fetch_one_returns_none_when_no_row(self, repository):
+        assert repository._fetch_one("SELECT * FROM departure WHERE id = ?", (99, )) is None
+
+    def test_fetch_all_maps_rows_in_order(self, repository):
+        departures = repository._fetch_all("SELECT * FROM departure ORDER BY id DESC")
+
+        assert [departure.id for departure in departures] == [2, 1]
+
+    def test_fetch_all_returns_empty_list(self, repository):
+        assert repository._fetch_all("SELECT * FROM departure WHERE id > 10") == []
+
+    def test_fetch_all_maps_other_model(self, repository):
+        pilots = repository._fetch_all("SELECT id, 'Andrea' AS first_name, 'Almond' AS family_name FROM departure WHERE id = 1", model=Pilot)
+
+        assert pilots == [Pilot(id=1, first_name="Andrea", family_name="Almond")]
+
+    def test_map_rows_reads_column_names_from_rows(self, repository, db_conn):
+        rows = db_conn.execute("SELECT flight_number, departure_time FROM departure WHERE id = 2").fetchall()
+
+        assert repository._map_rows(rows) == [Departure(flight_number="ZMY456", departure_time=datetime(2026, 1, 1, 16, 45))]
+
+    def test_write_hooks_are_required(self, db_conn):
+        class ReadOnlyRepository(BaseRepository):
+            model = Departure
+            table = "departure"
+
+        with pytest.raises(TypeError):
+            ReadOnlyRepository(db_conn)
+
+    def test_insert_many_uses_hooks(self, repository):
+        results = repository.insert_many([Departure(flight_number="ZMY789", departure_time=datetime(2026, 1, 2, 9, 0))])
+
+        assert [result.error for result in results] == [None]
+        assert repository._fetch_one("SELECT * FROM departure WHERE id = 3").flight_number == "ZMY789"
+
+    def test_mapper_is_reused_for_same_columns(self, repository):
+        columns = ("id", "flight_number", "departure_time")
+
+        assert repository._mapper(columns) is repository._mapper(columns)
+        assert repository._mapper(columns) is not repository._mapper(columns[1:])
+
+class TestGetItemsByIds:
+
+    def test_returns_items_by_id(self, repository):
+        departures = repository.get_items_by_ids([2, 1])
+
+        assert set(departures) == {1, 2}
+        assert departures[2].flight_number == "ZMY456"
+
+    def test_leaves_out_missing_and_none_ids(self, repository):
+        assert set(repository.get_items_by_ids([1, None, 99])) == {1}
+
+    def test_empty_ids_runs_no_query(self, repository, db_conn):
+        statements = []
+        db_conn.set_trace_callback(statements.append)
+
+        assert repository.get_items_by_ids([]) == {}
+        assert statements == []
+
+    def test_queries_in_chunks_of_unique_ids(self, repository, db_conn, monkeypatch):
+        monkeypatch.setattr(base_repository, "MAX_BOUND_IDS", 1)
+        statements = []
+        db_conn.set_trace_callback(statements.append)
+
+        departures = repository.get_items_by_ids([1, 2, 1, 2])
+
+        assert set(departures) == {1, 2}
+        assert len(statements) == 2
+
+    def test_chunked_splits_values(self):
+        assert list(chunked([1, 2, 3, 4, 5], 2)) == [[1, 2], [3, 4], [5]]
+
+class StreamingConnection:
+
+    # Stands in for a connection pool, counting the batches read and whether the stream was closed
+    def __init__(self, conn):
+        self.conn = conn
+        self.batches = 0
+        self.closed = False
+
+    def stream(self, sql, parameters=(), batch_size=1000):
+        cursor = self.conn.execute(sql, parameters)
+        try:
+            while rows := cursor.fetchmany(batch_size):
+                self.batches += 1
+                yield rows
+        finally:
+            self.closed = True
+
+class TestIterAll:
+
+    SQL = "SELECT * FROM departure ORDER BY id"
+
+    def test_yields_same_items_as_fetch_all(self, repository):
+        assert list(repository._iter_all(self.SQL, batch_size=1)) == repository._fetch_all(self.SQL)
+
+    def test_yields_nothing_without_rows(self, repository):
+        assert list(repository._iter_all("SELECT * FROM departure WHERE id = ?", (99, ))) == []
+
+    def test_reads_one_batch_at_a_time(self, db_conn):
+        conn = StreamingConnection(db_conn)
+        departures = DepartureRepository(conn)._iter_all(self.SQL, batch_size=1)
+
+        assert conn.batches == 0
+        assert next(departures).id == 1
+        assert conn.batches == 1
+        assert next(departures).id == 2
+        assert conn.batches == 2
+
+    def test_stopping_early_closes_stream(self, db_conn):
+        conn = StreamingConnection(db_conn)
+        departures = DepartureRepository(conn)._iter_all(self.SQL, batch_size=1)
+
+        next(departures)
+        departures.close()
+
+        assert conn.closed
+
+    def test_invalid_batch_size_raises_error(self, repository):
+        with pytest.raises(ValueError):
+            next(repository._iter_all(self.SQL, batch_size=-1))
+
+class TestFetchPage:
+
+    @pytest.fixture
+    def repository(self, db_conn):
+        # Two rows share a departure time and two have none
+        db_conn.executemany(
+            "INSERT INTO departure (id, departure_time, flight_number) VALUES (?, ?, ?)",
+            [
+                (3, "2026-01-01 15:30", "ZMY789"),
+                (4, None, "ZMY111"),
+                (5, "2026-01-02 09:00", "ZMY222"),
+                (6, None, "ZMY333")
+            ]
+        )
+        return DepartureRepository(db_conn)
+
+    def walk(self, repository, direction, **options) -> list[list[int]]:
+        pages = []
+        page = repository.get_departure_page(direction=direction, **options)
+        while True:
+            pages.append([departure.id for departure in page.items])
+            if not (page.has_next if direction == "next" else page.has_previous):
+                return pages
+            key = page.last_key if direction == "next" else page.first_key
+            page = repository.get_departure_page(key, direction=direction, **options)
+
+    def test_pages_descending_with_nulls_last(self, repository):
+        assert self.walk(repository, "next") == [[5, 2], [3, 1], [6, 4]]
+
+    def test_pages_ascending_with_nulls_first(self, repository):
+        assert self.walk(repository, "next", descending=False) == [[4, 6], [1, 3], [2, 5]]
+
+    def test_pages_backwards_from_the_end(self, repository):
+        assert self.walk(repository, "previous") == [[6, 4], [3, 1], [5, 2]]
+
+    def test_pages_across_null_segment(self, repository):
+        page = repository.get_departure_page(limit=4)
+
+        assert [departure.id for departure in page.items] == [5, 2, 3, 1]
+        assert [departure.id for departure in repository.get_departure_page(page.last_key, limit=4).items] == [6, 4]
+        assert [departure.id for departure in repository.get_departure_page((None, 4), limit=4, direction="previous").items] == [2, 3, 1, 6]
+
+    def test_page_flags_and_keys(self, repository):
+        first = repository.get_departure_page()
+        second = repository.get_departure_page(first.last_key)
+
+        assert (first.has_previous, first.has_next) == (False, True)
+        assert (second.has_previous, second.has_next) == (True, True)
+        assert second.first_key == (datetime(2026, 1, 1, 15, 30), 3)
+        assert second.last_key == (datetime(2026, 1, 1, 15, 30), 1)
+
+    def test_last_page_has_no_next(self, repository):
+        page = repository.get_departure_page(limit=10)
+
+        assert len(page) == 6
+        assert (page.has_previous, page.has_next) == (False, False)
+
+    def test_empty_page(self, repository, db_conn):
+        db_conn.execute("DELETE FROM departure")
+        page = repository.get_departure_page()
+
+        assert page.items == []
+        assert page.first_key is None and page.last_key is None
+
+    @pytest.mark.parametrize("options", [{"limit": 0}, {"direction": "sideways"}, {"after": (None, )}])
+    def test_invalid_page_request_raises_error(self, repository, options):
+        with pytest.raises(ValueError):
+            repository.get_departure_page(**options)
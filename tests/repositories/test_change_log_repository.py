@@ -0,0 +1,132 @@
+import sqlite3
+import pytest
+from datetime import datetime, timedelta, timezone
+from flightmanagement.db.db import seed_database_data
+from flightmanagement.db.migrations import CHANGE_LOG_TABLES, migrate, convert_flight_times
+from flightmanagement.db.synthetic_data import generate_database_data
+from flightmanagement.repositories.change_log_repository import ChangeLogRepository
+from flightmanagement.repositories.flight_repository import FlightRepository
+
+@pytest.fixture
+def db_conn():
+    conn = sqlite3.connect(":memory:")
+    conn.row_factory = sqlite3.Row
+    migrate(conn)
+    seed_database_data(conn)
+    yield conn
+    conn.close()
+
+@pytest.fixture
+def repository(db_conn):
+    return ChangeLogRepository(db_conn)
+
+def log(repository, seq: int = 0) -> list[tuple]:
+    return [(change.table_name, change.row_id, change.operation) for change in repository.changes_since(seq, 10000)]
+
+class TestTriggers:
+
+    def test_seed_data_is_logged_as_inserts(self, db_conn, repository):
+        changes = repository.changes_since(0, 10000)
+
+        assert {change.table_name for change in changes} == set(CHANGE_LOG_TABLES)
+        assert all(change.operation == "insert" for change in changes)
+        assert [change.seq for change in changes] == list(range(1, len(changes) + 1))
+        assert len(changes) == sum(db_conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0] for table in CHANGE_LOG_TABLES)
+
+    @pytest.mark.parametrize("table", CHANGE_LOG_TABLES)
+    def test_updates_and_deletes_are_logged(self, db_conn, repository, table):
+        seq = repository.get_latest_seq()
+        db_conn.execute("PRAGMA foreign_keys = OFF")
+
+        db_conn.execute(f"UPDATE {table} SET id = id WHERE id = 2")
+        db_conn.execute(f"DELETE FROM {table} WHERE id = 3")
+
+        assert log(repository, seq) == [(table, 2, "update"), (table, 3, "delete")]
+
+    def test_changed_at_is_current(self, db_conn, repository):
+        db_conn.execute("UPDATE pilot SET first_name = 'Andrea' WHERE id = 1")
+
+        changed_at = repository.changes_since(repository.get_latest_seq() - 1)[0].changed_at
+        assert abs(changed_at - datetime.now(timezone.utc).replace(tzinfo=None)) < timedelta(minutes=1)
+
+    def test_unchanged_upsert_is_not_logged(self, db_conn, repository):
+        seq = repository.get_latest_seq()
+        aircraft = db_conn.execute("SELECT * FROM aircraft WHERE id = 1").fetchone()
+
+        db_conn.execute(
+            """
+            INSERT INTO aircraft (registration, manufacturer_serial_no, icao_hex, manufacturer, model, icao_type, status)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT (registration) DO UPDATE SET status = excluded.status WHERE status IS NOT excluded.status
+            """,
+            tuple(aircraft)[1:]
+        )
+
+        assert repository.get_latest_seq() == seq
+
+    def test_triggers_survive_flight_time_conversion(self, db_conn, repository):
+        convert_flight_times(db_conn, "epoch_minutes")
+        seq = repository.get_latest_seq()
+
+        db_conn.execute("DELETE FROM flight WHERE id = 1")
+
+        assert log(repository, seq) == [("flight", 1, "delete")]
+
+    def test_deferred_bulk_load_is_logged_in_id_order(self, db_conn, repository):
+        seq = repository.get_latest_seq()
+        last_id = db_conn.execute("SELECT MAX(id) FROM flight").fetchone()[0]
+
+        counts = generate_database_data(db_conn, flights=300, airports=5, aircraft=3, pilots=6)
+        flight_ids = [row_id for table, row_id, _ in log(repository, seq) if table == "flight"]
+
+        assert flight_ids == list(range(last_id + 1, last_id + counts["flights"] + 1))
+        assert db_conn.execute("SELECT COUNT(*) FROM sqlite_master WHERE name = 'trg_change_log_flight_insert'").fetchone()[0] == 1
+
+class TestChangesSince:
+
+    def test_polling_in_pages_reads_every_change_once(self, repository):
+        seq, pages = 0, []
+        while page := repository.changes_since(seq, 10):
+            pages.append(page)
+            seq = page[-1].seq
+
+        assert [change for page in pages for change in page] == repository.changes_since(0, 10000)
+        assert all(len(page) == 10 for page in pages[:-1])
+
+    def test_caught_up_consumer_gets_nothing(self, repository):
+        assert repository.changes_since(repository.get_latest_seq()) == []
+
+    def test_log_has_no_write_methods(self, repository):
+        # Only the triggers write the log
+        for name in ("insert_item", "insert_many", "update_many", "delete_many", "search_on_field", "find"):
+            assert not hasattr(repository, name)
+
+class TestCompact:
+
+    def test_keeps_latest_change_to_each_row(self, db_conn, repository):
+        db_conn.execute("UPDATE flight SET status = 'Delayed' WHERE id = 1")
+        db_conn.execute("UPDATE flight SET status = 'Boarding' WHERE id = 1")
+        db_conn.execute("DELETE FROM flight WHERE id = 2")
+        latest = {(change.table_name, change.row_id): change for change in repository.changes_since(0, 10000)}
+
+        removed = repository.compact()
+
+        assert removed == 3
+        assert repository.changes_since(0, 10000) == sorted(latest.values(), key=lambda change: change.seq)
+
+    def test_consumer_sees_same_rows_after_compaction(self, db_conn, repository):
+        seq = repository.get_latest_seq() - 5
+        db_conn.execute("UPDATE flight SET status = 'Delayed' WHERE id IN (1, 11, 12)")
+        before = {(table, row_id) for table, row_id, _ in log(repository, seq)}
+
+        repository.compact()
+
+        assert {(table, row_id) for table, row_id, _ in log(repository, seq)} == before
+
+    def test_later_changes_are_kept(self, db_conn, repository):
+        up_to = repository.get_latest_seq()
+        db_conn.execute("UPDATE flight SET status = 'Delayed' WHERE id = 1")
+        db_conn.execute("UPDATE flight SET status = 'Boarding' WHERE id = 1")
+
+        assert repository.compact(up_to) == 1
+        assert log(repository, up_to) == [("flight", 1, "update"), ("flight", 1, "update")]
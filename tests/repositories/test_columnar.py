@@ -0,0 +1,132 @@
+import sqlite3
+import numpy as np
+import pytest
+from datetime import datetime
+from flightmanagement.db.db import seed_database_data
+from flightmanagement.db.migrations import migrate, convert_flight_times
+from flightmanagement.models.flight import Flight
+from flightmanagement.repositories.aircraft_repository import AircraftRepository
+from flightmanagement.repositories.airport_repository import AirportRepository
+from flightmanagement.repositories.columnar import NO_ID, column_sql, lookup
+from flightmanagement.repositories.flight_repository import FLIGHT_COLUMNS, FlightRepository
+from flightmanagement.repositories.query import Query, equals
+
+@pytest.fixture(params=["text", "epoch_minutes"])
+def db_conn(request):
+    conn = sqlite3.connect(":memory:")
+    conn.row_factory = sqlite3.Row
+    migrate(conn)
+    seed_database_data(conn)
+    convert_flight_times(conn, request.param)
+    yield conn
+    conn.close()
+
+def as_value(value):
+    # The Python value of an array element, with NaT and NO_ID read back as None
+    if isinstance(value, np.datetime64):
+        return None if np.isnat(value) else value.astype(datetime)
+    if isinstance(value, np.integer):
+        return None if value == NO_ID else int(value)
+    return str(value)
+
+class TestColumnSql:
+
+    def test_invalid_kind_raises_error(self):
+        with pytest.raises(ValueError):
+            column_sql("status", "float")
+
+class TestLookup:
+
+    def test_values_are_indexed_by_id(self):
+        values = lookup([(1, "LHR"), (3, "JFK")], np.array([3, 1, 3]))
+
+        assert values.tolist() == ["JFK", "LHR", "JFK"]
+
+    def test_missing_ids_read_as_empty(self):
+        assert lookup([(1, "LHR")], np.array([NO_ID, 2])).tolist() == ["", ""]
+
+class TestGetFlightColumns:
+
+    def test_columns_match_flight_list(self, db_conn):
+        repository = FlightRepository(db_conn)
+        columns = repository.get_flight_columns()
+
+        flights = [
+            Flight(**{name: as_value(columns[name][index]) for name in FLIGHT_COLUMNS})
+            for index in range(len(columns["id"]))
+        ]
+        assert flights == repository.get_flight_list()
+
+    def test_column_types(self, db_conn):
+        columns = FlightRepository(db_conn).get_flight_columns()
+
+        assert columns["id"].dtype == np.int64
+        assert columns["departure_time_scheduled"].dtype == np.dtype("datetime64[m]")
+        assert columns["status"].dtype.kind == "U"
+
+    def test_missing_values(self, db_conn):
+        repository = FlightRepository(db_conn)
+        flight = repository.get_item_by_id(1)
+        repository.update_item(Flight(**{**vars(flight), "copilot_id": None, "departure_time_actual": None}))
+
+        columns = repository.get_flight_columns(Query(equals("id", 1)))
+
+        assert columns["copilot_id"].tolist() == [NO_ID]
+        assert np.isnat(columns["departure_time_actual"]).all()
+
+    def test_query_filters_and_orders(self, db_conn):
+        repository = FlightRepository(db_conn)
+        query = Query(equals("status", "Arrived"), order_by=("id", ))
+
+        columns = repository.get_flight_columns(query)
+
+        assert columns["id"].tolist() == [flight.id for flight in repository.find(query)]
+
+    def test_names_limit_columns(self, db_conn):
+        repository = FlightRepository(db_conn)
+
+        columns = repository.get_flight_columns(names=("id", "arrival_time_scheduled"))
+
+        assert list(columns) == ["id", "arrival_time_scheduled"]
+        assert columns["arrival_time_scheduled"].tolist() == repository.get_flight_columns()["arrival_time_scheduled"].tolist()
+
+    def test_invalid_names_raise_error(self, db_conn):
+        with pytest.raises(ValueError):
+            FlightRepository(db_conn).get_flight_columns(names=("id", "gate"))
+
+    def test_no_flights_gives_empty_columns(self, db_conn):
+        columns = FlightRepository(db_conn).get_flight_columns(Query(equals("status", "Unknown")), with_references=True)
+
+        assert all(len(values) == 0 for values in columns.values())
+        assert columns["departure_time_scheduled"].dtype == np.dtype("datetime64[m]")
+
+    def test_references(self, db_conn):
+        columns = FlightRepository(db_conn).get_flight_columns(with_references=True)
+        aircraft = {item.id: item for item in AircraftRepository(db_conn).get_aircraft_list()}
+        airports = {item.id: item.code for item in AirportRepository(db_conn).get_airport_list()}
+
+        assert columns["aircraft_registration"].tolist() == [aircraft[id_].registration for id_ in columns["aircraft_id"]]
+        assert columns["aircraft_type"].tolist() == [aircraft[id_].icao_type for id_ in columns["aircraft_id"]]
+        assert columns["origin_code"].tolist() == [airports[id_] for id_ in columns["origin_id"]]
+        assert columns["destination_code"].tolist() == [airports[id_] for id_ in columns["destination_id"]]
+
+    def test_history_includes_archived_flights(self, db_conn):
+        repository = FlightRepository(db_conn)
+
+        assert len(repository.get_flight_columns(include_history=True)["id"]) == len(repository.get_flight_list(include_history=True))
+
+class TestGetFlightFrame:
+
+    def test_frame_types(self, db_conn):
+        frame = FlightRepository(db_conn).get_flight_frame(with_references=True)
+
+        assert frame["id"].dtype == np.int64
+        assert frame["arrival_time_scheduled"].dtype.kind == "M"
+        assert frame["status"].dtype == "category"
+        assert frame["origin_code"].dtype == "category"
+        assert len(frame) == len(FlightRepository(db_conn).get_flight_list())
+
+    def test_frame_without_references(self, db_conn):
+        frame = FlightRepository(db_conn).get_flight_frame()
+
+        assert list(frame.columns) == list(FLIGHT_COLUMNS)
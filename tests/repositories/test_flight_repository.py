@@ -1,7 +1,10 @@
 import sqlite3
 import pytest
+from dataclasses import replace
 from datetime import datetime
+from flightmanagement.db.migrations import create_pilot_duty_ledger
 from flightmanagement.models.flight import Flight
+from flightmanagement.repositories import flight_repository as flight_repository_module
 from flightmanagement.repositories.flight_repository import FlightRepository
 
 @pytest.fixture
@@ -59,6 +62,7 @@ def db_conn():
             UNIQUE(flight_number, departure_time_scheduled)
         )
     """)
+    create_pilot_duty_ledger(conn)
     yield conn
     conn.close()
 
@@ -126,6 +130,19 @@ class TestReadOperations:
     def test_get_item_by_id_returns_none_when_missing(self, flight_repository):
         assert flight_repository.get_item_by_id(999) is None
 
+    def test_get_items_by_ids_returns_flights_by_id(self, flight_repository, db_conn):
+        db_conn.execute("""
+            INSERT INTO flight (flight_number, aircraft_id, origin_id, destination_id, departure_time_scheduled, arrival_time_scheduled, status)
+            VALUES ('ZMY123', 1, 1, 2, '2026-01-01 15:30', '2026-01-01 16:55', 'Scheduled'),
+                ('ZMY456', 1, 2, 1, '2026-01-01 18:00', '2026-01-01 19:25', 'Scheduled')
+        """)
+
+        flights = flight_repository.get_items_by_ids([2, 1, 999])
+
+        assert set(flights) == {1, 2}
+        assert flights[2].flight_number == "ZMY456"
+        assert flights[1].departure_time_scheduled == datetime(2026, 1, 1, 15, 30)
+
 class TestListOperations:
 
     def test_get_flight_list_returns_sorted_list(self, flight_repository, db_conn):
@@ -144,6 +161,35 @@ class TestListOperations:
     def test_get_flight_list_returns_none_when_empty(self, flight_repository):
         assert flight_repository.get_flight_list() == []
 
+    def test_get_flight_page_continues_after_key(self, flight_repository, db_conn):
+        db_conn.execute("""
+            INSERT INTO flight (flight_number, aircraft_id, origin_id, destination_id, pilot_id, copilot_id, departure_time_scheduled, arrival_time_scheduled, departure_time_actual, arrival_time_actual, status)
+            VALUES 
+                ('ZMY123', 1, 1, 2, 1, 2, '2026-01-01 15:30', '2026-01-01 16:55', NULL, NULL, 'Scheduled'),
+                ('ZMY234', 1, 1, 2, 1, 2, '2026-01-02 15:30', '2026-01-02 16:55', NULL, NULL, 'Scheduled'),
+                ('ZMY345', 1, 1, 2, 1, 2, '2026-01-03 15:30', '2026-01-03 16:55', NULL, NULL, 'Scheduled')
+        """)
+        first = flight_repository.get_flight_page(limit=2)
+        second = flight_repository.get_flight_page(first.last_key, limit=2)
+
+        assert [flight.flight_number for flight in first.items] == ["ZMY345", "ZMY234"]
+        assert first.last_key == (datetime(2026, 1, 2, 15, 30), 2)
+        assert [flight.flight_number for flight in second.items] == ["ZMY123"]
+        assert not second.has_next
+        assert [flight.flight_number for flight in flight_repository.get_flight_page(second.first_key, limit=2, direction="previous").items] == ["ZMY345", "ZMY234"]
+
+    def test_iter_flights_matches_flight_list(self, flight_repository, db_conn):
+        db_conn.execute("""
+            INSERT INTO flight (flight_number, aircraft_id, origin_id, destination_id, pilot_id, copilot_id, departure_time_scheduled, arrival_time_scheduled, departure_time_actual, arrival_time_actual, status)
+            VALUES 
+                ('ZMY123', 1, 1, 2, 1, 2, '2026-01-01 15:30', '2026-01-01 16:55', NULL, NULL, 'Scheduled'),
+                ('ZMY234', 1, 1, 2, 1, 2, '2026-01-02 15:30', '2026-01-02 16:55', NULL, NULL, 'Scheduled'),
+                ('ZMY345', 1, 1, 2, 1, 2, '2026-01-03 15:30', '2026-01-03 16:55', NULL, NULL, 'Scheduled')
+        """)
+
+        assert list(flight_repository.iter_flights(batch_size=2)) == flight_repository.get_flight_list()
+        assert [flight.flight_number for flight in flight_repository.iter_search_on_field("origin_id", 1, batch_size=2)] == ["ZMY345", "ZMY234", "ZMY123"]
+
 class TestSearchOperations:
 
     def test_search_on_field_returns_matches(self, flight_repository, db_conn):
@@ -256,3 +302,188 @@ class TestWriteOperations:
         row = db_conn.execute("SELECT * FROM flight WHERE id = 1").fetchone()
         assert row is None
 
+
+class TestBulkWrites:
+
+    def flights(self, sample_flight, count: int) -> list[Flight]:
+        return [
+            replace(sample_flight, id=None, flight_number=f"ZMY{n}", departure_time_scheduled=datetime(2026, 1, 1, 15, n))
+            for n in range(count)
+        ]
+
+    def count(self, db_conn) -> int:
+        return db_conn.execute("SELECT COUNT(*) FROM flight").fetchone()[0]
+
+    def test_insert_many_writes_all_rows(self, flight_repository, db_conn, sample_flight):
+        results = flight_repository.insert_many(self.flights(sample_flight, 5), chunk_size=2)
+
+        assert all(result.ok for result in results)
+        assert self.count(db_conn) == 5
+        assert db_conn.in_transaction
+
+    def test_insert_many_reports_rows_breaking_constraints(self, flight_repository, db_conn, sample_flight):
+        flights = self.flights(sample_flight, 5)
+        flights[3] = flights[2]
+
+        results = flight_repository.insert_many(flights, chunk_size=2)
+
+        assert [result.ok for result in results] == [True, True, True, False, True]
+        assert "UNIQUE" in results[3].error
+        assert results[3].item is flights[3]
+        assert self.count(db_conn) == 4
+
+    def test_insert_many_stays_in_callers_transaction(self, flight_repository, db_conn, sample_flight):
+        flight_repository.insert_many(self.flights(sample_flight, 3))
+        db_conn.rollback()
+
+        assert self.count(db_conn) == 0
+
+    def test_update_many_and_delete_many(self, flight_repository, db_conn, sample_flight):
+        flight_repository.insert_many(self.flights(sample_flight, 3))
+        flights = flight_repository.get_flight_list()
+
+        flight_repository.update_many([replace(flight, status="Delayed") for flight in flights], chunk_size=2)
+        assert {flight.status for flight in flight_repository.get_flight_list()} == {"Delayed"}
+
+        results = flight_repository.delete_many(flights[:2])
+        assert all(result.ok for result in results)
+        assert [flight.id for flight in flight_repository.get_flight_list()] == [flights[2].id]
+
+    def test_large_insert_still_reports_duplicates(self, flight_repository, db_conn, sample_flight, monkeypatch):
+        monkeypatch.setattr(flight_repository_module, "REINDEX_MIN_ROWS", 1)
+        db_conn.execute("CREATE INDEX idx_flight_status ON flight (status)")
+        flights = self.flights(sample_flight, 3)
+
+        results = flight_repository.insert_many(flights + flights[:1])
+
+        assert [result.ok for result in results] == [True, True, True, False]
+        assert db_conn.execute("SELECT COUNT(*) FROM sqlite_master WHERE name = 'idx_flight_status'").fetchone()[0] == 1
+
+    def test_upsert_many_updates_changed_flights_only(self, flight_repository, db_conn, sample_flight):
+        flights = self.flights(sample_flight, 4)
+        flight_repository.upsert_many(flights)
+        ids = [flight.id for flight in flight_repository.get_flight_list()]
+        changes = db_conn.total_changes
+
+        flights[1] = replace(flights[1], status="Delayed")
+        results = flight_repository.upsert_many(flights)
+
+        assert all(result.ok for result in results)
+        assert db_conn.total_changes == changes + 1
+        assert [flight.id for flight in flight_repository.get_flight_list()] == ids
+        assert flight_repository.search_on_field("status", "Delayed")[0].flight_number == flights[1].flight_number
+
+    def test_upsert_reports_whether_row_was_written(self, flight_repository, sample_flight):
+        assert flight_repository.upsert(sample_flight)
+        assert not flight_repository.upsert(sample_flight)
+        assert flight_repository.upsert(replace(sample_flight, arrival_time_actual=None))
+
+    def test_invalid_chunk_size_raises_error(self, flight_repository, sample_flight):
+        with pytest.raises(ValueError):
+            flight_repository.insert_many(self.flights(sample_flight, 1), chunk_size=0)
+
+class TestAvailability:
+
+    @pytest.fixture
+    def pilots(self, db_conn):
+        db_conn.execute("""
+            INSERT INTO pilot (first_name, family_name)
+            VALUES ('Andrea', 'Almond'), ('Bob', 'Brown'), ('Carla', 'Cole')
+        """)
+
+    def test_pilots_on_overlapping_flight_are_unavailable(self, flight_repository, db_conn, pilots):
+        db_conn.execute("""
+            INSERT INTO flight (flight_number, aircraft_id, origin_id, destination_id, pilot_id, copilot_id, departure_time_scheduled, arrival_time_scheduled, status)
+            VALUES ('ZMY123', 1, 1, 2, 1, 2, '2026-01-01 15:30', '2026-01-01 16:55', 'Scheduled')
+        """)
+
+        pilots = flight_repository.get_available_pilots(datetime(2026, 1, 1, 16, 0), datetime(2026, 1, 1, 18, 0), -1)
+
+        assert [pilot.id for pilot in pilots] == [3]
+
+    def test_flight_inside_window_makes_pilots_unavailable(self, flight_repository, db_conn, pilots):
+        db_conn.execute("""
+            INSERT INTO flight (flight_number, aircraft_id, origin_id, destination_id, pilot_id, copilot_id, departure_time_scheduled, arrival_time_scheduled, status)
+            VALUES ('ZMY123', 1, 1, 2, 1, 2, '2026-01-01 15:30', '2026-01-01 16:55', 'Scheduled')
+        """)
+
+        pilots = flight_repository.get_available_pilots(datetime(2026, 1, 1, 12, 0), datetime(2026, 1, 1, 20, 0), -1)
+
+        assert [pilot.id for pilot in pilots] == [3]
+
+    def test_flight_being_updated_is_ignored(self, flight_repository, db_conn, pilots):
+        db_conn.execute("""
+            INSERT INTO flight (flight_number, aircraft_id, origin_id, destination_id, pilot_id, copilot_id, departure_time_scheduled, arrival_time_scheduled, status)
+            VALUES ('ZMY123', 1, 1, 2, 1, 2, '2026-01-01 15:30', '2026-01-01 16:55', 'Scheduled')
+        """)
+
+        pilots = flight_repository.get_available_pilots(datetime(2026, 1, 1, 15, 30), datetime(2026, 1, 1, 16, 55), 1)
+
+        assert [pilot.id for pilot in pilots] == [1, 2, 3]
+
+    def test_back_to_back_flights_do_not_conflict(self, flight_repository, db_conn, pilots):
+        db_conn.execute("""
+            INSERT INTO flight (flight_number, aircraft_id, origin_id, destination_id, pilot_id, copilot_id, departure_time_scheduled, arrival_time_scheduled, status)
+            VALUES ('ZMY123', 1, 1, 2, 1, 2, '2026-01-01 15:30', '2026-01-01 16:55', 'Scheduled')
+        """)
+
+        pilots = flight_repository.get_available_pilots(datetime(2026, 1, 1, 16, 55), datetime(2026, 1, 1, 18, 0), -1)
+
+        assert [pilot.id for pilot in pilots] == [1, 2, 3]
+
+    def test_pilots_over_duty_limit_are_unavailable(self, flight_repository, db_conn, pilots):
+        # 96 hours flown by pilot 1 in the previous 28 days leaves no room for a 5 hour flight
+        db_conn.execute("""
+            INSERT INTO flight (flight_number, aircraft_id, origin_id, destination_id, pilot_id, copilot_id, departure_time_scheduled, arrival_time_scheduled, status)
+            VALUES ('ZMY123', 1, 1, 2, 1, NULL, '2026-01-10 00:00', '2026-01-14 00:00', 'Arrived')
+        """)
+
+        pilots = flight_repository.get_available_pilots(datetime(2026, 1, 20, 10, 0), datetime(2026, 1, 20, 15, 0), -1)
+
+        assert [pilot.id for pilot in pilots] == [2, 3]
+
+    def test_missing_times_return_no_pilots(self, flight_repository, pilots):
+        assert flight_repository.get_available_pilots(datetime(2026, 1, 20, 10, 0), None, -1) == []
+
+class TestAircraftAvailability:
+
+    @pytest.fixture
+    def aircraft(self, db_conn):
+        db_conn.execute("""
+            INSERT INTO aircraft (registration, manufacturer_serial_no, icao_hex, manufacturer, model, icao_type, status)
+            VALUES
+                ('G-AAAA', 1, '400001', 'Airbus', 'A320-214', 'A320', 'Active'),
+                ('G-BBBB', 2, '400002', 'Airbus', 'A320-214', 'A320', 'Active'),
+                ('G-CCCC', 3, '400003', 'Airbus', 'A320-214', 'A320', 'Inactive')
+        """)
+        db_conn.execute("""
+            INSERT INTO flight (flight_number, aircraft_id, origin_id, destination_id, departure_time_scheduled, arrival_time_scheduled, status)
+            VALUES ('ZMY123', 1, 1, 2, '2026-01-01 15:30', '2026-01-01 16:55', 'Scheduled')
+        """)
+
+    def test_aircraft_on_overlapping_flight_is_unavailable(self, flight_repository, aircraft):
+        available = flight_repository.get_available_aircraft(datetime(2026, 1, 1, 16, 0), datetime(2026, 1, 1, 18, 0), -1)
+
+        assert [aircraft.registration for aircraft in available] == ["G-BBBB"]
+
+    def test_turnaround_is_kept_between_flights(self, flight_repository, aircraft):
+        too_soon = flight_repository.get_available_aircraft(datetime(2026, 1, 1, 17, 15), datetime(2026, 1, 1, 18, 0), -1)
+        after_turnaround = flight_repository.get_available_aircraft(datetime(2026, 1, 1, 17, 25), datetime(2026, 1, 1, 18, 0), -1)
+        before_turnaround = flight_repository.get_available_aircraft(datetime(2026, 1, 1, 13, 0), datetime(2026, 1, 1, 15, 0), -1)
+
+        assert [aircraft.id for aircraft in too_soon] == [2]
+        assert [aircraft.id for aircraft in after_turnaround] == [1, 2]
+        assert [aircraft.id for aircraft in before_turnaround] == [1, 2]
+
+    def test_turnaround_can_be_changed(self, flight_repository, aircraft):
+        available = flight_repository.get_available_aircraft(datetime(2026, 1, 1, 17, 15), datetime(2026, 1, 1, 18, 0), -1, min_turnaround=0)
+
+        assert [aircraft.id for aircraft in available] == [1, 2]
+
+    def test_flight_being_updated_is_ignored(self, flight_repository, aircraft):
+        available = flight_repository.get_available_aircraft(datetime(2026, 1, 1, 15, 45), datetime(2026, 1, 1, 17, 10), 1)
+
+        assert [aircraft.id for aircraft in available] == [1, 2]
+
+    def test_missing_times_return_no_aircraft(self, flight_repository, aircraft):
+        assert flight_repository.get_available_aircraft(None, datetime(2026, 1, 1, 18, 0), -1) == []
@@ -0,0 +1,78 @@
+import copy
+import sqlite3
+import pytest
+from dataclasses import replace
+from flightmanagement.db.db import seed_database_data
+from flightmanagement.db.migrations import migrate
+from flightmanagement.repositories.aircraft_repository import AircraftRepository
+from flightmanagement.repositories.airport_repository import AirportRepository
+from flightmanagement.repositories.flight_repository import FlightRepository
+from flightmanagement.repositories.flight_view import get_flight_views
+from flightmanagement.repositories.pilot_repository import PilotRepository
+
+@pytest.fixture
+def db_conn():
+    conn = sqlite3.connect(":memory:")
+    conn.row_factory = sqlite3.Row
+    migrate(conn)
+    seed_database_data(conn)
+    yield conn
+    conn.close()
+
+@pytest.fixture
+def statements(db_conn):
+    # The SELECTs run once the flights have been read
+    statements = []
+    db_conn.set_trace_callback(lambda sql: statements.append(sql) if sql.lstrip().upper().startswith("SELECT") else None)
+    return statements
+
+@pytest.fixture
+def flights(db_conn):
+    return FlightRepository(db_conn).get_flight_list()[:20]
+
+class TestFlightView:
+
+    def test_relationships_match_repositories(self, db_conn, flights):
+        for view in get_flight_views(db_conn, flights):
+            assert view.aircraft == AircraftRepository(db_conn).get_item_by_id(view.aircraft_id)
+            assert view.origin == AirportRepository(db_conn).get_item_by_id(view.origin_id)
+            assert view.destination == AirportRepository(db_conn).get_item_by_id(view.destination_id)
+            assert view.pilot == (PilotRepository(db_conn).get_item_by_id(view.pilot_id) if view.pilot_id else None)
+            assert view.copilot == (PilotRepository(db_conn).get_item_by_id(view.copilot_id) if view.copilot_id else None)
+
+    def test_first_access_loads_relationship_for_all_flights(self, db_conn, flights, statements):
+        views = get_flight_views(db_conn, flights)
+        assert statements == []
+
+        views[-1].origin
+        assert len(statements) == 1
+
+        assert [view.destination.id for view in views] == [flight.destination_id for flight in flights]
+        assert [view.origin.id for view in views] == [flight.origin_id for flight in flights]
+        assert len(statements) == 1
+
+    def test_each_table_is_read_once(self, db_conn, flights, statements):
+        for view in get_flight_views(db_conn, flights):
+            view.aircraft, view.origin, view.destination, view.pilot, view.copilot
+
+        assert len(statements) == 3
+
+    def test_missing_ids_are_not_looked_up(self, db_conn, flights, statements):
+        views = get_flight_views(db_conn, [replace(flight, pilot_id=None, copilot_id=None) for flight in flights])
+
+        assert all(view.pilot is None and view.copilot is None for view in views)
+        assert statements == []
+
+    def test_flight_fields_are_read_through(self, db_conn, flights):
+        view = get_flight_views(db_conn, flights)[0]
+
+        assert view.flight is flights[0]
+        assert view.flight_number == flights[0].flight_number
+        assert str(view) == str(flights[0])
+        with pytest.raises(AttributeError):
+            view.gate
+
+    def test_view_can_be_copied(self, db_conn, flights):
+        view = copy.copy(get_flight_views(db_conn, flights)[0])
+
+        assert view.origin.id == flights[0].origin_id
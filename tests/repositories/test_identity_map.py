@@ -0,0 +1,204 @@
+import sqlite3
+import pytest
+from flightmanagement.db.db import ConnectionPool
+from flightmanagement.models.aircraft import Aircraft
+from flightmanagement.models.airport import Airport
+from flightmanagement.repositories.aircraft_repository import AircraftRepository
+from flightmanagement.repositories.airport_repository import AirportRepository
+from flightmanagement.repositories.flight_repository import FlightRepository
+from flightmanagement.repositories.identity_map import IdentityMap, clear_identity_maps, get_identity_map
+
+@pytest.fixture
+def pool():
+    pool = ConnectionPool(":memory:")
+    pool.execute("""
+        CREATE TABLE aircraft (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            registration VARCHAR(20) UNIQUE,
+            manufacturer_serial_no INTEGER UNIQUE,
+            icao_hex VARCHAR(20) UNIQUE,
+            manufacturer VARCHAR(20),
+            model VARCHAR(20),
+            icao_type VARCHAR(20),
+            status VARCHAR(20)
+        )
+    """)
+    pool.execute("""
+        INSERT INTO aircraft (registration, manufacturer_serial_no, icao_hex, manufacturer, model, icao_type, status)
+        VALUES ('G-TEST', 269785, 'ABC123', 'Airbus', 'A320', 'A320', 'Active'),
+            ('G-ABCD', 269786, 'ABC124', 'Boeing', '737', 'B737', 'Active')
+    """)
+    pool.commit()
+    yield pool
+    pool.close()
+
+@pytest.fixture
+def statements(pool):
+    statements = []
+    pool.writer.set_trace_callback(statements.append)
+    return statements
+
+def make_airport(airport_id: int, code: str) -> Airport:
+    return Airport(id=airport_id, code=code, name=f"{code} Airport", city="City", country="Country", region="Region")
+
+class TestIdentityMap:
+
+    def test_get_counts_hits_and_misses(self):
+        identity_map = IdentityMap()
+        identity_map.put(make_airport(1, "AAA"))
+
+        assert identity_map.get(1).code == "AAA"
+        assert identity_map.get(2) is None
+        assert (identity_map.hits, identity_map.misses) == (1, 1)
+
+    def test_get_by_natural_key(self):
+        identity_map = IdentityMap(("code", ))
+        identity_map.put(make_airport(1, "AAA"))
+
+        assert identity_map.get_by("code", "AAA").id == 1
+        assert identity_map.get_by("code", "BBB") is None
+
+    def test_evicts_least_recently_used_item(self):
+        identity_map = IdentityMap(("code", ), size=2)
+        identity_map.put(make_airport(1, "AAA"))
+        identity_map.put(make_airport(2, "BBB"))
+        identity_map.get(1)
+        identity_map.put(make_airport(3, "CCC"))
+
+        assert len(identity_map) == 2
+        assert identity_map.get(2) is None
+        assert identity_map.get_by("code", "BBB") is None
+        assert identity_map.get(1) is not None
+
+    def test_put_replaces_changed_natural_key(self):
+        identity_map = IdentityMap(("code", ))
+        identity_map.put(make_airport(1, "AAA"))
+        identity_map.put(make_airport(1, "AAB"))
+
+        assert identity_map.get_by("code", "AAA") is None
+        assert identity_map.get_by("code", "AAB").id == 1
+
+    def test_invalidate_by_id_and_natural_key(self):
+        identity_map = IdentityMap(("code", ))
+        identity_map.put(make_airport(1, "AAA"))
+        identity_map.put(make_airport(2, "BBB"))
+
+        identity_map.invalidate(make_airport(1, "ZZZ"))
+        identity_map.invalidate(make_airport(None, "BBB"))
+
+        assert len(identity_map) == 0
+
+    def test_stats(self):
+        identity_map = IdentityMap()
+        identity_map.put(make_airport(1, "AAA"))
+        identity_map.get(1)
+        identity_map.get(1)
+        identity_map.get(2)
+
+        assert identity_map.stats() == {"items": 1, "hits": 2, "misses": 1, "hit_rate": 2 / 3}
+
+class TestSharing:
+
+    def test_pool_shares_identity_map_between_repositories(self, pool):
+        assert AircraftRepository(pool).identity_map is AircraftRepository(pool).identity_map
+        assert pool.identity_maps["aircraft"] is AircraftRepository(pool).identity_map
+
+    def test_bare_connection_gets_unshared_identity_map(self):
+        conn = sqlite3.connect(":memory:")
+
+        assert get_identity_map(conn, "aircraft") is not get_identity_map(conn, "aircraft")
+        conn.close()
+
+    def test_flights_are_not_cached(self, pool):
+        pool.execute("CREATE TABLE flight (departure_time_scheduled TEXT)")
+
+        assert FlightRepository(pool).identity_map is None
+        assert "flight" not in pool.identity_maps
+
+    def test_clear_identity_maps(self, pool):
+        AircraftRepository(pool).get_item_by_id(1)
+
+        clear_identity_maps(pool)
+
+        assert len(pool.identity_maps["aircraft"]) == 0
+
+    def test_rollback_clears_identity_maps(self, pool):
+        repository = AircraftRepository(pool)
+        repository.get_item_by_id(1)
+
+        pool.rollback()
+
+        assert len(repository.identity_map) == 0
+
+class TestCachedRepository:
+
+    def test_repeated_lookup_by_id_runs_one_query(self, pool, statements):
+        repository = AircraftRepository(pool)
+
+        assert repository.get_item_by_id(1) is repository.get_item_by_id(1)
+        assert len(statements) == 1
+        assert repository.identity_map.hits == 1
+
+    def test_lookup_by_registration_is_cached(self, pool, statements):
+        repository = AircraftRepository(pool)
+        aircraft = repository.get_item_by_registration("G-TEST")
+
+        assert repository.get_item_by_id(aircraft.id) is aircraft
+        assert repository.get_item_by_registration("G-TEST") is aircraft
+        assert len(statements) == 1
+
+    def test_list_warms_identity_map(self, pool, statements):
+        repository = AircraftRepository(pool)
+        repository.get_aircraft_list()
+
+        assert set(repository.get_items_by_ids([1, 2])) == {1, 2}
+        assert len(statements) == 1
+
+    def test_get_items_by_ids_only_queries_uncached_ids(self, pool, statements):
+        repository = AircraftRepository(pool)
+        repository.get_item_by_id(1)
+
+        repository.get_items_by_ids([1, 2])
+
+        assert len(statements) == 2
+        assert statements[-1].endswith("(2)")
+
+    def test_update_through_another_repository_invalidates(self, pool):
+        reader = AircraftRepository(pool)
+        aircraft = reader.get_item_by_id(1)
+
+        updated = Aircraft(
+            id=aircraft.id,
+            registration="G-NEWR",
+            manufacturer_serial_no=aircraft.manufacturer_serial_no,
+            icao_hex=aircraft.icao_hex,
+            manufacturer=aircraft.manufacturer,
+            model=aircraft.model,
+            icao_type=aircraft.icao_type,
+            status="Inactive"
+        )
+        AircraftRepository(pool).update_item(updated)
+        pool.commit()
+
+        assert reader.get_item_by_id(1).status == "Inactive"
+        assert reader.get_item_by_registration("G-TEST") is None
+        assert reader.get_item_by_registration("G-NEWR").id == 1
+
+    def test_delete_invalidates(self, pool):
+        repository = AircraftRepository(pool)
+        aircraft = repository.get_item_by_id(2)
+
+        repository.delete_item(aircraft)
+        pool.commit()
+
+        assert repository.get_item_by_id(2) is None
+
+    def test_insert_invalidates_natural_key(self, pool):
+        pool.execute("CREATE TABLE airport (id INTEGER PRIMARY KEY, code TEXT UNIQUE, name TEXT, city TEXT, country TEXT, region TEXT)")
+        repository = AirportRepository(pool)
+        repository.identity_map.put(make_airport(7, "AAA"))
+
+        repository.insert_item(make_airport(None, "AAA"))
+        pool.commit()
+
+        assert repository.get_item_by_code("AAA").id == 1
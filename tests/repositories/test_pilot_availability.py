@@ -0,0 +1,164 @@
+import random
+import pytest
+from dataclasses import replace
+from datetime import datetime, timedelta
+from flightmanagement.db.db import ConnectionPool, transaction
+from flightmanagement.db.migrations import migrate, convert_flight_times
+from flightmanagement.db.synthetic_data import generate_database_data
+from flightmanagement.models.flight import Flight
+from flightmanagement.repositories.flight_repository import FlightRepository
+from flightmanagement.repositories.pilot_availability import PilotAvailability, get_pilot_availability
+
+START = datetime(2026, 1, 1)
+
+@pytest.fixture(params=["text", "epoch_minutes"])
+def pool(request):
+    pool = ConnectionPool(":memory:")
+    migrate(pool.writer)
+    convert_flight_times(pool.writer, request.param)
+    generate_database_data(pool.writer, flights=3000, airports=10, aircraft=10, pilots=300, start=START, now=START + timedelta(days=180))
+    pool.commit()
+    yield pool
+    pool.close()
+
+def random_windows(pool, count: int, seed: int = 0) -> list[tuple]:
+    # Windows across the schedule, some long enough to take pilots over the duty limit: random
+    # ones, ones for an existing flight as when editing it, and ones starting exactly when a flight
+    # arrives or 28 days after, to catch the edges of both checks
+    rng = random.Random(seed)
+    flights = FlightRepository(pool).get_flight_list()
+    windows = []
+    for _ in range(count):
+        flight = rng.choice(flights)
+        kind = rng.randrange(4)
+        if kind == 0:
+            departure = START + timedelta(minutes=rng.randrange(120 * 24 * 60))
+        elif kind == 1:
+            windows.append((flight.departure_time_scheduled, flight.arrival_time_scheduled, flight.id))
+            continue
+        elif kind == 2:
+            departure = flight.arrival_time_scheduled
+        else:
+            departure = flight.arrival_time_scheduled + timedelta(days=28)
+        arrival = departure + timedelta(minutes=rng.randrange(30, 80 * 60))
+        windows.append((departure, arrival, rng.choice(flights).id if rng.random() < 0.5 else -1))
+    return windows
+
+def assert_matches_sql(pool, windows):
+    # The writer is a bare connection, so reads availability with SQL
+    indexed, queried = FlightRepository(pool), FlightRepository(pool.writer)
+    for window in windows:
+        assert indexed.get_available_pilots(*window) == queried.get_available_pilots(*window)
+
+class TestPilotAvailability:
+
+    def test_overlapping_flight_makes_pilot_unavailable(self):
+        availability = PilotAvailability()
+        availability.put(1, 10, 11, 100, 200, 100)
+
+        assert not availability.is_available(10, 150, 250, -1, 0, 1, 6000)
+        assert not availability.is_available(11, 150, 250, -1, 0, 1, 6000)
+        assert availability.is_available(10, 200, 250, -1, 0, 1, 6000)
+
+    def test_flight_being_edited_is_skipped(self):
+        availability = PilotAvailability()
+        availability.put(1, 10, None, 100, 200, 100)
+        availability.put(2, 10, None, 120, 300, 180)
+
+        assert not availability.is_available(10, 150, 250, 1, 0, 1, 6000)
+        assert availability.is_available(10, 310, 400, 2, 0, 1, 6000)
+
+    def test_duty_counts_flights_arriving_on_window_days(self):
+        availability = PilotAvailability()
+        availability.put(1, 10, None, 1400, 1500, 100)
+        availability.put(2, 10, None, 3000, 3100, 100)
+        availability.put(3, 10, None, 4400, 4500, 100)
+
+        assert not availability.is_available(10, 5000, 5100, -1, 1, 3, 201)
+        assert availability.is_available(10, 5000, 5100, -1, 2, 3, 201)
+        assert availability.is_available(10, 5000, 5100, -1, 1, 2, 201)
+
+    def test_pilot_flying_both_seats_counts_flight_twice(self):
+        availability = PilotAvailability()
+        availability.put(1, 10, 10, 100, 200, 100)
+
+        assert not availability.is_available(10, 300, 400, -1, 0, 1, 200)
+        assert availability.is_available(10, 300, 400, -1, 0, 1, 201)
+
+    def test_removed_flight_no_longer_counts(self):
+        availability = PilotAvailability()
+        availability.put(1, 10, None, 100, 200, 100)
+        availability.is_available(10, 150, 250, -1, 0, 1, 6000)
+        availability.remove(1)
+
+        assert availability.is_available(10, 150, 250, -1, 0, 1, 6000)
+
+    def test_bare_connection_has_no_index(self, pool):
+        assert get_pilot_availability(pool.writer) is None
+        assert get_pilot_availability(pool) is get_pilot_availability(pool)
+
+class TestGetAvailablePilots:
+
+    def test_index_matches_sql(self, pool):
+        assert_matches_sql(pool, random_windows(pool, 300))
+
+    def test_index_follows_single_flight_writes(self, pool):
+        repository = FlightRepository(pool)
+        windows = random_windows(pool, 100, seed=1)
+        assert_matches_sql(pool, windows[:1])
+
+        rng = random.Random(1)
+        with transaction(pool):
+            for flight in rng.sample(repository.get_flight_list(), 60):
+                departure = flight.departure_time_scheduled + timedelta(minutes=rng.randrange(-600, 600))
+                repository.update_item(replace(
+                    flight,
+                    pilot_id=rng.choice([pilot_id for pilot_id in range(1, 301) if pilot_id != flight.copilot_id]),
+                    departure_time_scheduled=departure,
+                    arrival_time_scheduled=departure + timedelta(hours=rng.randrange(1, 30))
+                ))
+            for flight in rng.sample(repository.get_flight_list(), 20):
+                repository.delete_item(flight)
+            for _, flight in zip(range(20), repository.get_flight_list()):
+                repository.insert_item(replace(flight, id=None, flight_number="ZMY9999", copilot_id=None))
+
+        assert_matches_sql(pool, windows)
+        assert get_pilot_availability(pool).load_count == 1
+
+    def test_index_reloads_after_other_writes(self, pool):
+        repository = FlightRepository(pool)
+        window = (datetime(2026, 3, 1, 12, 0), datetime(2026, 3, 1, 14, 0), -1)
+        repository.get_available_pilots(*window)
+
+        pool.execute(
+            """
+            INSERT INTO flight (flight_number, aircraft_id, origin_id, destination_id, pilot_id, copilot_id, departure_time_scheduled, arrival_time_scheduled, status)
+            VALUES ('ZMY9999', 1, 1, 2, 1, 2, ?, ?, 'Scheduled')
+            """,
+            [FlightRepository(pool).flight_times.encode(time) for time in window[:2]]
+        )
+        pool.commit()
+
+        assert 1 not in [pilot.id for pilot in repository.get_available_pilots(*window)]
+        assert get_pilot_availability(pool).load_count == 2
+
+    def test_index_reloads_after_rollback(self, pool):
+        repository = FlightRepository(pool)
+        window = (datetime(2026, 3, 1, 12, 0), datetime(2026, 3, 1, 14, 0), -1)
+        expected = repository.get_available_pilots(*window)
+
+        with pytest.raises(RuntimeError):
+            with transaction(pool):
+                repository.insert_item(Flight(
+                    flight_number="ZMY9999",
+                    aircraft_id=1,
+                    origin_id=1,
+                    destination_id=2,
+                    pilot_id=expected[0].id,
+                    departure_time_scheduled=window[0],
+                    arrival_time_scheduled=window[1],
+                    status="Scheduled"
+                ))
+                raise RuntimeError("Cancelled")
+
+        assert repository.get_available_pilots(*window) == expected
@@ -1,7 +1,10 @@
 import sqlite3
 import pytest
+from datetime import datetime, timedelta
+from flightmanagement.db.db import seed_database_data
+from flightmanagement.db.migrations import migrate
 from flightmanagement.models.pilot import Pilot
-from flightmanagement.repositories.pilot_repository import PilotRepository
+from flightmanagement.repositories.pilot_repository import DUTY_WINDOW_DAYS, PilotRepository
 
 @pytest.fixture
 def db_conn():
@@ -134,3 +137,44 @@ class TestWriteOperations:
         row = db_conn.execute("SELECT * FROM pilot WHERE id = 1").fetchone()
         assert row is None
 
+    def test_has_no_upsert(self, pilot_repository):
+        # Pilots have no natural key to upsert on
+        assert not hasattr(pilot_repository, "upsert")
+        assert not hasattr(pilot_repository, "upsert_many")
+
+class TestDutyMinutes:
+
+    @pytest.fixture
+    def seeded_conn(self):
+        conn = sqlite3.connect(":memory:")
+        conn.row_factory = sqlite3.Row
+        migrate(conn)
+        seed_database_data(conn)
+        yield conn
+        conn.close()
+
+    def test_sums_flights_arriving_in_window(self, seeded_conn):
+        seeded_conn.execute("DELETE FROM flight")
+        seeded_conn.execute("""
+            INSERT INTO flight (flight_number, aircraft_id, origin_id, destination_id, pilot_id, copilot_id, departure_time_scheduled, arrival_time_scheduled, status)
+            VALUES
+                ('ZMY1', 1, 1, 2, 1, 2, '2026-01-01 10:00', '2026-01-01 12:00', 'Arrived'),
+                ('ZMY2', 1, 2, 1, 1, 3, '2026-01-28 10:00', '2026-01-28 11:30', 'Arrived'),
+                ('ZMY3', 1, 1, 2, 1, 3, '2026-01-29 10:00', '2026-01-29 11:00', 'Scheduled')
+        """)
+
+        minutes = PilotRepository(seeded_conn).get_duty_minutes([1, 2, 3, 4], datetime(2026, 1, 28, 23, 59))
+
+        assert minutes == {1: 210, 2: 120, 3: 90}
+
+    def test_window_covers_trailing_days(self, seeded_conn):
+        seeded_conn.execute("DELETE FROM flight")
+        seeded_conn.execute("""
+            INSERT INTO flight (flight_number, aircraft_id, origin_id, destination_id, pilot_id, copilot_id, departure_time_scheduled, arrival_time_scheduled, status)
+            VALUES ('ZMY1', 1, 1, 2, 1, NULL, '2026-01-01 10:00', '2026-01-01 12:00', 'Arrived')
+        """)
+        repository = PilotRepository(seeded_conn)
+
+        assert repository.get_duty_minutes([1], datetime(2026, 1, 1) + timedelta(days=DUTY_WINDOW_DAYS - 1)) == {1: 120}
+        assert repository.get_duty_minutes([1], datetime(2026, 1, 1) + timedelta(days=DUTY_WINDOW_DAYS)) == {}
+        assert repository.get_duty_minutes([1], datetime(2025, 12, 31)) == {}
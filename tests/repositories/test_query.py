@@ -0,0 +1,136 @@
+import sqlite3
+import pytest
+from datetime import datetime
+from flightmanagement.db.db import seed_database_data
+from flightmanagement.db.migrations import migrate, convert_flight_times
+from flightmanagement.repositories.airport_repository import AirportRepository
+from flightmanagement.repositories.flight_repository import FlightRepository
+from flightmanagement.repositories.query import (
+    Query, all_of, any_of, between, compile_query, equals, one_of, starts_with
+)
+
+FIELDS = {"id", "code", "city", "departure_time"}
+
+@pytest.fixture(params=["text", "epoch_minutes"])
+def db_conn(request):
+    conn = sqlite3.connect(":memory:")
+    conn.row_factory = sqlite3.Row
+    migrate(conn)
+    seed_database_data(conn)
+    convert_flight_times(conn, request.param)
+    yield conn
+    conn.close()
+
+class TestCompileQuery:
+
+    def test_query_without_predicates(self):
+        assert compile_query(Query(), "airport", FIELDS) == ("SELECT * FROM airport", [])
+
+    def test_equality_binds_value(self):
+        assert compile_query(Query(equals("code", "LHR")), "airport", FIELDS) == (
+            "SELECT * FROM airport WHERE code = ?", ["LHR"]
+        )
+
+    def test_equality_with_none_tests_for_null(self):
+        assert compile_query(Query(equals("city", None)), "airport", FIELDS)[0] == "SELECT * FROM airport WHERE city IS NULL"
+
+    def test_in_binds_each_value(self):
+        assert compile_query(Query(one_of("code", ["LHR", "JFK"])), "airport", FIELDS) == (
+            "SELECT * FROM airport WHERE code IN (?, ?)", ["LHR", "JFK"]
+        )
+
+    def test_empty_in_matches_nothing(self):
+        assert compile_query(Query(one_of("code", [])), "airport", FIELDS) == ("SELECT * FROM airport WHERE 0", [])
+
+    def test_open_ended_range(self):
+        assert compile_query(Query(between("id", high=10)), "airport", FIELDS) == (
+            "SELECT * FROM airport WHERE id <= ?", [10]
+        )
+
+    def test_range_needs_an_end(self):
+        with pytest.raises(ValueError):
+            between("id")
+
+    def test_prefix_is_a_range(self):
+        assert compile_query(Query(starts_with("code", "LH")), "airport", FIELDS) == (
+            "SELECT * FROM airport WHERE code >= ? AND code < ?", ["LH", "LI"]
+        )
+
+    def test_combinations_are_parenthesised(self):
+        query = Query(all_of(equals("city", "London"), any_of(equals("code", "LHR"), equals("code", "LGW"))))
+
+        assert compile_query(query, "airport", FIELDS) == (
+            "SELECT * FROM airport WHERE (city = ?) AND ((code = ?) OR (code = ?))", ["London", "LHR", "LGW"]
+        )
+
+    def test_filter_adds_to_existing_predicate(self):
+        query = Query(equals("city", "London")).filter(equals("code", "LHR"))
+
+        assert query.where == all_of(equals("city", "London"), equals("code", "LHR"))
+
+    def test_order_and_limit(self):
+        query = Query(order_by=("city", "-id"), limit=5)
+
+        assert compile_query(query, "airport", FIELDS) == ("SELECT * FROM airport ORDER BY city ASC, id DESC LIMIT ?", [5])
+
+    def test_default_order_applies_without_order(self):
+        assert compile_query(Query(), "airport", FIELDS, default_order=("code", ))[0] == "SELECT * FROM airport ORDER BY code ASC"
+
+    def test_values_are_encoded(self):
+        encoders = {"departure_time": lambda value: value.strftime("%Y-%m-%d %H:%M")}
+        query = Query(between("departure_time", datetime(2026, 1, 1), None))
+
+        assert compile_query(query, "flight", FIELDS, encoders)[1] == ["2026-01-01 00:00"]
+
+    @pytest.mark.parametrize("query", [
+        Query(equals("code; DROP TABLE airport", "LHR")),
+        Query(one_of("name", ["LHR"])),
+        Query(order_by=("-name", )),
+        Query(any_of(equals("code", "LHR"), starts_with("1=1 OR code", "L")))
+    ])
+    def test_fields_outside_whitelist_raise_error(self, query):
+        with pytest.raises(ValueError):
+            compile_query(query, "airport", FIELDS)
+
+    def test_invalid_limit_raises_error(self):
+        with pytest.raises(ValueError):
+            compile_query(Query(limit=0), "airport", FIELDS)
+
+class TestFind:
+
+    def test_finds_flights_by_origin_time_range_and_status(self, db_conn):
+        repository = FlightRepository(db_conn)
+        origin = AirportRepository(db_conn).get_item_by_code("LHR")
+        start, end = datetime(2026, 1, 1), datetime(2026, 3, 31)
+
+        flights = repository.find(Query(all_of(
+            equals("origin_id", origin.id),
+            between("departure_time_scheduled", start, end),
+            one_of("status", ["Scheduled", "Arrived"])
+        )))
+
+        expected = [
+            flight for flight in repository.get_flight_list()
+            if flight.origin_id == origin.id and start <= flight.departure_time_scheduled <= end
+            and flight.status in ("Scheduled", "Arrived")
+        ]
+        assert len(flights) > 0
+        assert flights == expected
+
+    def test_find_with_order_and_limit(self, db_conn):
+        flights = FlightRepository(db_conn).find(Query(order_by=("departure_time_scheduled", ), limit=3))
+
+        assert flights == sorted(FlightRepository(db_conn).get_flight_list(), key=lambda flight: flight.departure_time_scheduled)[:3]
+
+    def test_prefix_search(self, db_conn):
+        airports = AirportRepository(db_conn).find(Query(starts_with("code", "L")))
+
+        assert [airport.code for airport in airports] == sorted(
+            airport.code for airport in AirportRepository(db_conn).get_airport_list() if airport.code.startswith("L")
+        )
+
+    def test_iter_find_matches_find(self, db_conn):
+        repository = FlightRepository(db_conn)
+        query = Query(one_of("status", ["Scheduled", "Arrived"]))
+
+        assert list(repository.iter_find(query, batch_size=2)) == repository.find(query)
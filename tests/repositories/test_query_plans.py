@@ -0,0 +1,137 @@
+import re
+import sqlite3
+import pytest
+from datetime import datetime
+from flightmanagement.db.db import seed_database_data
+from flightmanagement.db.migrations import migrate, convert_flight_times
+from flightmanagement.repositories.aircraft_repository import AircraftRepository
+from flightmanagement.repositories.airport_repository import AirportRepository
+from flightmanagement.repositories.change_log_repository import ChangeLogRepository
+from flightmanagement.repositories.flight_repository import FlightRepository
+from flightmanagement.repositories.pilot_repository import PilotRepository
+from flightmanagement.repositories.query import Query, all_of, any_of, between, equals, starts_with
+
+class RecordingConnection:
+
+    # Passes statements through to SQLite while keeping a copy for EXPLAIN QUERY PLAN
+    def __init__(self, conn):
+        self.conn = conn
+        self.statements = []
+
+    def execute(self, sql, parameters=()):
+        self.statements.append((sql, parameters))
+        return self.conn.execute(sql, parameters)
+
+@pytest.fixture(params=["text", "epoch_minutes"])
+def db_conn(request):
+    conn = sqlite3.connect(":memory:")
+    conn.row_factory = sqlite3.Row
+    migrate(conn)
+    seed_database_data(conn)
+    convert_flight_times(conn, request.param)
+    yield conn
+    conn.close()
+
+@pytest.fixture
+def recorder(db_conn):
+    return RecordingConnection(db_conn)
+
+HOT_QUERIES = {
+    "flight by id": lambda conn: FlightRepository(conn).get_item_by_id(1),
+    "flight list": lambda conn: FlightRepository(conn).get_flight_list(),
+    "flight search by number": lambda conn: FlightRepository(conn).search_on_field("flight_number", "ZMY1423"),
+    "flight search by pilot": lambda conn: FlightRepository(conn).search_on_field("pilot_id", 1),
+    "flight search by copilot": lambda conn: FlightRepository(conn).search_on_field("copilot_id", 1),
+    "flight search by aircraft": lambda conn: FlightRepository(conn).search_on_field("aircraft_id", 1),
+    "flight search by origin": lambda conn: FlightRepository(conn).search_on_field("origin_id", 1),
+    "flight search by destination": lambda conn: FlightRepository(conn).search_on_field("destination_id", 1),
+    "flights by ids": lambda conn: FlightRepository(conn).get_items_by_ids([1, 2, 3]),
+    "flight query by origin, time and status": lambda conn: FlightRepository(conn).find(Query(all_of(
+        equals("origin_id", 1),
+        between("departure_time_scheduled", datetime(2026, 1, 1), datetime(2026, 2, 1)),
+        equals("status", "Delayed")
+    ))),
+    "flight query by pilot or copilot": lambda conn: FlightRepository(conn).find(Query(any_of(equals("pilot_id", 1), equals("copilot_id", 1)))),
+    "flight page": lambda conn: FlightRepository(conn).get_flight_page((datetime(2026, 10, 2, 4, 0), 11)),
+    "flight history page": lambda conn: FlightRepository(conn).get_flight_page((datetime(2026, 10, 2, 4, 0), 11), include_history=True),
+    "available pilots": lambda conn: FlightRepository(conn).get_available_pilots(datetime(2026, 10, 2, 4, 0), datetime(2026, 10, 2, 18, 0), 11),
+    "available aircraft": lambda conn: FlightRepository(conn).get_available_aircraft(datetime(2026, 10, 2, 4, 0), datetime(2026, 10, 2, 18, 0), 11),
+    "aircraft by id": lambda conn: AircraftRepository(conn).get_item_by_id(1),
+    "aircraft by ids": lambda conn: AircraftRepository(conn).get_items_by_ids([1, 2, 3]),
+    "aircraft by registration": lambda conn: AircraftRepository(conn).get_item_by_registration("G-EUUH"),
+    "aircraft list": lambda conn: AircraftRepository(conn).get_aircraft_list(),
+    "aircraft page": lambda conn: AircraftRepository(conn).get_aircraft_page(("G-EUUH", 1)),
+    "aircraft search by registration": lambda conn: AircraftRepository(conn).search_on_field("registration", "G-EUUH"),
+    "airport by id": lambda conn: AirportRepository(conn).get_item_by_id(1),
+    "airports by ids": lambda conn: AirportRepository(conn).get_items_by_ids([1, 2, 3]),
+    "airport by code": lambda conn: AirportRepository(conn).get_item_by_code("LHR"),
+    "airport list": lambda conn: AirportRepository(conn).get_airport_list(),
+    "airport page": lambda conn: AirportRepository(conn).get_airport_page(("LHR", 1)),
+    "airport search by code": lambda conn: AirportRepository(conn).search_on_field("code", "LHR"),
+    "airport query by code prefix": lambda conn: AirportRepository(conn).find(Query(starts_with("code", "L"))),
+    "pilot by id": lambda conn: PilotRepository(conn).get_item_by_id(1),
+    "pilots by ids": lambda conn: PilotRepository(conn).get_items_by_ids([1, 2, 3]),
+    "pilot list": lambda conn: PilotRepository(conn).get_pilot_list(),
+    "pilot page": lambda conn: PilotRepository(conn).get_pilot_page(("Alex", "Morrison", 1), direction="previous"),
+    "pilot search by family name": lambda conn: PilotRepository(conn).search_on_field("family_name", "Morrison"),
+    "changes since": lambda conn: ChangeLogRepository(conn).changes_since(10, 20),
+    "change log compaction": lambda conn: ChangeLogRepository(conn).compact(),
+}
+
+def full_scans(conn, sql: str, parameters) -> list[str]:
+    # Scans of CTEs and subqueries are fine; only a bare "SCAN <table>" means a full table scan
+    cte_names = set(re.findall(r"(\w+)\s+AS\s+\(", sql, flags=re.IGNORECASE))
+    plan = conn.execute(f"EXPLAIN QUERY PLAN {sql}", parameters).fetchall()
+
+    scans = []
+    for row in plan:
+        match = re.fullmatch(r"SCAN (\w+)", row["detail"])
+        if match and match.group(1) not in cte_names:
+            scans.append(row["detail"])
+    return scans
+
+class TestQueryPlans:
+
+    @pytest.mark.parametrize("name", HOT_QUERIES.keys())
+    def test_hot_query_avoids_full_table_scan(self, name, recorder, db_conn):
+        HOT_QUERIES[name](recorder)
+
+        assert len(recorder.statements) > 0
+        for sql, parameters in recorder.statements:
+            assert full_scans(db_conn, sql, parameters) == [], f"{name} falls back to a full table scan:\n{sql}"
+
+    def test_flight_list_is_ordered_by_index(self, recorder, db_conn):
+        FlightRepository(recorder).get_flight_list()
+
+        sql, parameters = recorder.statements[-1]
+        plan = [row["detail"] for row in db_conn.execute(f"EXPLAIN QUERY PLAN {sql}", parameters)]
+        assert not any("TEMP B-TREE FOR ORDER BY" in detail for detail in plan)
+
+    @pytest.mark.parametrize("name", [name for name in HOT_QUERIES if name.endswith(" page")])
+    def test_page_is_read_in_index_order(self, name, recorder, db_conn):
+        HOT_QUERIES[name](recorder)
+
+        for sql, parameters in recorder.statements:
+            plan = [row["detail"] for row in db_conn.execute(f"EXPLAIN QUERY PLAN {sql}", parameters)]
+            assert not any("TEMP B-TREE" in detail for detail in plan), f"{name} sorts its rows:\n{sql}"
+
+    def test_availability_only_reads_current_flights(self, recorder, db_conn):
+        FlightRepository(recorder).get_available_pilots(datetime(2026, 10, 2, 4, 0), datetime(2026, 10, 2, 18, 0), 11)
+
+        sql, parameters = recorder.statements[-1]
+        plan = [row["detail"] for row in db_conn.execute(f"EXPLAIN QUERY PLAN {sql}", parameters)]
+        flight_searches = [detail for detail in plan if detail.startswith("SEARCH flight")]
+        assert len(flight_searches) == 2
+        assert all("idx_flight_arrival_time_scheduled" in detail for detail in flight_searches)
+        assert any(detail.startswith("SEARCH d USING PRIMARY KEY (pilot_id=? AND day>? AND day<?)") for detail in plan)
+
+    def test_aircraft_availability_only_reads_current_flights(self, recorder, db_conn):
+        FlightRepository(recorder).get_available_aircraft(datetime(2026, 10, 2, 4, 0), datetime(2026, 10, 2, 18, 0), 11)
+
+        sql, parameters = recorder.statements[-1]
+        plan = [row["detail"] for row in db_conn.execute(f"EXPLAIN QUERY PLAN {sql}", parameters)]
+        flight_searches = [detail for detail in plan if detail.startswith("SEARCH f ")]
+        assert flight_searches == ["SEARCH f USING INDEX idx_flight_aircraft (aircraft_id=? AND arrival_time_scheduled>?)"]
+
+    def test_detects_full_table_scan(self, db_conn):
+        assert full_scans(db_conn, "SELECT * FROM flight WHERE status = ?", ("Arrived", )) == ["SCAN flight"]
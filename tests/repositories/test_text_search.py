@@ -0,0 +1,111 @@
+import sqlite3
+import pytest
+from flightmanagement.db.db import seed_database_data
+from flightmanagement.db.migrations import migrate
+from flightmanagement.repositories.aircraft_repository import AircraftRepository
+from flightmanagement.repositories.airport_repository import AirportRepository
+from flightmanagement.repositories.pilot_repository import PilotRepository
+from flightmanagement.repositories.text_search import build_match_queries, search_rows
+
+@pytest.fixture
+def db_conn():
+    conn = sqlite3.connect(":memory:")
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA foreign_keys = ON;")
+    migrate(conn)
+    seed_database_data(conn)
+    yield conn
+    conn.close()
+
+class TestMatchQueries:
+
+    def test_exact_then_fuzzy(self):
+        assert build_match_queries("Big Lake") == [
+            '"big" AND "lake"',
+            '"big" OR "lak" OR "ake"'
+        ]
+
+    def test_long_words_use_four_character_fragments(self):
+        assert build_match_queries("Morison")[1] == '"mori" OR "oris" OR "riso" OR "ison"'
+
+    def test_quotes_are_escaped(self):
+        assert build_match_queries('"abc')[0] == '"""abc"'
+
+    def test_short_words_are_ignored(self):
+        assert build_match_queries("to") == []
+        assert build_match_queries("  ") == []
+
+    def test_three_letter_word_has_single_query(self):
+        assert build_match_queries("LHR") == ['"lhr"']
+
+    def test_invalid_entity_raises(self, db_conn):
+        with pytest.raises(ValueError):
+            search_rows(db_conn, "flight", "ZMY", 10)
+
+class TestSearchText:
+
+    def test_airport_name(self, db_conn):
+        result = AirportRepository(db_conn).search_text("Heathrow")
+
+        assert [airport.code for airport in result] == ["LHR"]
+
+    def test_airport_code_and_country(self, db_conn):
+        repository = AirportRepository(db_conn)
+
+        assert repository.search_text("lhr")[0].code == "LHR"
+        assert {airport.code for airport in repository.search_text("United States")} == {"JFK", "LAX"}
+
+    def test_partial_registration(self, db_conn):
+        result = AircraftRepository(db_conn).search_text("EUU")
+
+        assert [aircraft.registration for aircraft in result] == ["G-EUUH"]
+
+    def test_aircraft_manufacturer(self, db_conn):
+        result = AircraftRepository(db_conn).search_text("boeing")
+
+        assert {aircraft.registration for aircraft in result} == {"EI-HAX", "N24974"}
+
+    def test_misspelt_family_name_ranks_closest_first(self, db_conn):
+        result = PilotRepository(db_conn).search_text("Morison")
+
+        assert result[0].family_name == "Morrison"
+
+    def test_limit(self, db_conn):
+        result = AirportRepository(db_conn).search_text("International", limit=2)
+
+        assert len(result) == 2
+
+    def test_no_match(self, db_conn):
+        assert PilotRepository(db_conn).search_text("zzzzzz") == []
+
+    def test_entities_are_kept_apart(self, db_conn):
+        # "Singapore" only appears in the airport table
+        assert PilotRepository(db_conn).search_text("Singapore") == []
+
+class TestIndexMaintenance:
+
+    def test_insert_is_indexed(self, db_conn):
+        db_conn.execute("INSERT INTO pilot (first_name, family_name) VALUES ('Oliver', 'Quartermaine')")
+
+        result = PilotRepository(db_conn).search_text("Quartermaine")
+
+        assert [pilot.first_name for pilot in result] == ["Oliver"]
+
+    def test_update_is_reindexed(self, db_conn):
+        db_conn.execute("UPDATE airport SET name = 'Heathrow Terminal' WHERE code = 'AMS'")
+        db_conn.execute("UPDATE airport SET name = 'London Gatwick' WHERE code = 'LHR'")
+
+        result = AirportRepository(db_conn).search_text("Heathrow")
+
+        assert [airport.code for airport in result] == ["AMS"]
+
+    def test_delete_is_removed(self, db_conn):
+        db_conn.execute("INSERT INTO aircraft (registration, manufacturer, model) VALUES ('G-ZZZQ', 'Embraer', 'E190')")
+        db_conn.execute("DELETE FROM aircraft WHERE registration = 'G-ZZZQ'")
+
+        assert AircraftRepository(db_conn).search_text("Embraer") == []
+
+    def test_index_matches_tables(self, db_conn):
+        counts = dict(db_conn.execute("SELECT entity, COUNT(*) FROM search_index GROUP BY entity").fetchall())
+
+        assert counts == {"aircraft": 5, "airport": 15, "pilot": 10}
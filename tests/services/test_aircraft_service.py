@@ -68,6 +68,11 @@ class TestUseRepository:
             "registration", "G-ABCD"
         )
 
+    def test_search_text_calls_repository(self, service):
+        service.search_text("G-AB", 5)
+
+        service._AircraftService__aircraft_repository.search_text.assert_called_once_with("G-AB", 5)
+
     def test_get_aircraft_table_uses_repository(self, service, sample_aircraft):
         service._AircraftService__aircraft_repository.get_aircraft_list.return_value = [
             sample_aircraft
@@ -77,6 +82,14 @@ class TestUseRepository:
 
         assert "G-ABCD" in result
 
+    @patch("flightmanagement.services.aircraft_service.settings")
+    def test_get_aircraft_page_uses_page_size(self, mock_settings, service):
+        mock_settings.page_size = 20
+
+        service.get_aircraft_page(("G-ABCD", 1), "previous")
+
+        service._AircraftService__aircraft_repository.get_aircraft_page.assert_called_once_with(("G-ABCD", 1), 20, "previous")
+
 class TestReturnData:
 
     def test_get_aircraft_by_id(self, service):
@@ -63,6 +63,11 @@ class TestUseRepository:
             "code", "AAA"
         )
 
+    def test_search_text_calls_repository(self, service):
+        service.search_text("Heathrow", 5)
+
+        service._AirportService__airport_repository.search_text.assert_called_once_with("Heathrow", 5)
+
     def test_get_airport_table_uses_repository(self, service, sample_airport):
         service._AirportService__airport_repository.get_airport_list.return_value = [
             sample_airport
@@ -72,6 +77,14 @@ class TestUseRepository:
 
         assert "AAA" in result
 
+    @patch("flightmanagement.services.airport_service.settings")
+    def test_get_airport_page_uses_page_size(self, mock_settings, service):
+        mock_settings.page_size = 20
+
+        service.get_airport_page(("LHR", 1), "previous")
+
+        service._AirportService__airport_repository.get_airport_page.assert_called_once_with(("LHR", 1), 20, "previous")
+
 class TestReturnData:
 
     def test_get_airport_by_id(self, service):
@@ -1,18 +1,32 @@
 import pytest
 from unittest.mock import MagicMock, patch
+from dataclasses import replace
 from datetime import datetime
 
 from flightmanagement.services.flight_service import FlightService
+from flightmanagement.models.aircraft import Aircraft
+from flightmanagement.models.airport import Airport
 from flightmanagement.models.flight import Flight
+from flightmanagement.repositories.query import Query, equals
 
 @pytest.fixture
 def mock_conn():
-    return MagicMock()
+    conn = MagicMock()
+
+    # No materialised flights table, unless a test patches is_materialised
+    conn.execute.return_value.fetchone.return_value = None
+    return conn
 
 @pytest.fixture
 def service(mock_conn):
     mock_repo = MagicMock()
-    return FlightService(mock_conn, flight_repository=mock_repo)
+    service = FlightService(mock_conn, flight_repository=mock_repo)
+
+    # The related repositories map real rows, so they are mocked rather than given a mock connection
+    service._FlightService__aircraft_repository = MagicMock()
+    service._FlightService__airport_repository = MagicMock()
+    service._FlightService__pilot_repository = MagicMock()
+    return service
 
 @pytest.fixture
 def sample_flight():
@@ -49,6 +63,20 @@ class TestAddData:
 
         service._FlightService__flight_repository.insert_item.assert_called_once()
 
+    @patch("flightmanagement.services.flight_service.transaction")
+    def test_add_flights_inserts_in_one_transaction(self, mock_transaction, service, sample_flight):
+        service.add_flights([sample_flight, sample_flight], 100)
+
+        mock_transaction.assert_called_once()
+        service._FlightService__flight_repository.insert_many.assert_called_once_with([sample_flight, sample_flight], 100)
+
+    @patch("flightmanagement.services.flight_service.transaction")
+    def test_upsert_flights_upserts_in_one_transaction(self, mock_transaction, service, sample_flight):
+        service.upsert_flights([sample_flight])
+
+        mock_transaction.assert_called_once()
+        service._FlightService__flight_repository.upsert_many.assert_called_once_with([sample_flight], None)
+
 class TestUpdateData:
 
     @patch("flightmanagement.services.flight_service.transaction")
@@ -64,13 +92,19 @@ class TestDeleteData:
 
         service._FlightService__flight_repository.delete_item.assert_called_once_with(sample_flight)
 
+    def test_delete_flights_without_id_raises_error(self, service, sample_flight):
+        with pytest.raises(ValueError):
+            service.delete_flights([sample_flight, replace(sample_flight, id=None)])
+
+        service._FlightService__flight_repository.delete_many.assert_not_called()
+
 class TestUseRepository:
 
     def test_search_flight_calls_repository(self, service):
         service.search_flights("flight_number", "ZMY123")
 
         service._FlightService__flight_repository.search_on_field.assert_called_once_with(
-            "flight_number", "ZMY123"
+            "flight_number", "ZMY123", include_history=False
         )
 
     def test_get_flight_table_uses_repository(self, service, sample_flight):
@@ -82,6 +116,19 @@ class TestUseRepository:
 
         assert "ZMY123" in result
 
+    @patch("flightmanagement.services.flight_service.settings")
+    def test_get_flight_page_uses_page_size(self, mock_settings, service):
+        mock_settings.page_size = 20
+
+        service.get_flight_page(include_history=True)
+
+        service._FlightService__flight_repository.get_flight_page.assert_called_once_with(None, 20, "next", include_history=True)
+
+    def test_iter_flights_calls_repository(self, service):
+        service.iter_flights(True, 100)
+
+        service._FlightService__flight_repository.iter_flights.assert_called_once_with(True, 100)
+
 class TestReturnData:
 
     def test_get_flight_by_id(self, service):
@@ -90,15 +137,59 @@ class TestReturnData:
         service._FlightService__flight_repository.get_item_by_id.assert_called_once_with(10)
 
     def test_get_flight_choices_returns_tuples(self, service, sample_flight):
-        pass # TODO
+        service._FlightService__flight_repository.find.return_value = [sample_flight]
+        service._FlightService__airport_repository.get_items_by_ids.return_value = {
+            1: Airport(id=1, code="AAA", name="Airport A", city="City A", country="Country A", region="Region A"),
+            2: Airport(id=2, code="BBB", name="Airport B", city="City B", country="Country B", region="Region B")
+        }
+
+        result = service.get_flight_choices()
+
+        assert len(result) == 1
+        assert result[0][0] == 1
+        assert "AAA to BBB" in result[0][1]
+
+    def test_get_flight_choices_looks_up_airports_once(self, service, sample_flight):
+        service._FlightService__flight_repository.find.return_value = [sample_flight, sample_flight]
+
+        service.get_flight_choices()
+
+        service._FlightService__airport_repository.get_items_by_ids.assert_called_once_with([1, 1, 2, 2])
+        service._FlightService__airport_repository.get_item_by_id.assert_not_called()
 
     def test_get_flight_choices_empty_list(self, service):
-        service._FlightService__flight_repository.get_flight_list.return_value = []
+        service._FlightService__flight_repository.find.return_value = []
 
         result = service.get_flight_choices()
 
         assert result == []
 
+    def test_get_flight_choices_filters_in_query(self, service):
+        service._FlightService__flight_repository.find.return_value = []
+
+        service.get_flight_choices("ZMY123")
+
+        service._FlightService__flight_repository.find.assert_called_once_with(Query(equals("flight_number", "ZMY123")))
+
+    def test_get_available_aircraft_choices_returns_tuples(self, service):
+        aircraft = MagicMock(id=2)
+        aircraft.__str__.return_value = "G-TEST2 (Airbus A320-214)"
+        service._FlightService__flight_repository.get_available_aircraft.return_value = [aircraft]
+
+        result = service.get_available_aircraft_choices(datetime(2026, 1, 1, 15, 30), datetime(2026, 1, 1, 16, 55))
+
+        assert result == [(2, "G-TEST2 (Airbus A320-214)")]
+        service._FlightService__flight_repository.get_available_aircraft.assert_called_once_with(
+            datetime(2026, 1, 1, 15, 30), datetime(2026, 1, 1, 16, 55), -1
+        )
+
+    @patch("flightmanagement.services.flight_service.ScheduleValidator")
+    def test_get_import_conflicts_validates_flights(self, mock_validator, service, sample_flight):
+        mock_validator.return_value.validate_flights.return_value = []
+
+        assert service.get_import_conflicts([sample_flight]) == []
+        mock_validator.return_value.validate_flights.assert_called_once_with([sample_flight])
+
     def test_get_results_view_empty_list(self, service):
         assert service.get_results_view([]) == ""
 
@@ -111,3 +202,91 @@ class TestReturnData:
         assert "ZMY123" in output
         assert "2026-01-01 16:55" in output
 
+    def test_get_results_view_batches_lookups(self, service, sample_flight):
+        service.get_results_view([sample_flight, sample_flight])
+
+        service._FlightService__aircraft_repository.get_items_by_ids.assert_called_once_with([1, 1])
+        service._FlightService__airport_repository.get_items_by_ids.assert_called_once_with([1, 1, 2, 2])
+        service._FlightService__pilot_repository.get_items_by_ids.assert_called_once_with([1, 1, 2, 2])
+        service._FlightService__aircraft_repository.get_item_by_id.assert_not_called()
+        service._FlightService__airport_repository.get_item_by_id.assert_not_called()
+        service._FlightService__pilot_repository.get_item_by_id.assert_not_called()
+
+
+class TestMaterialisedFlights:
+
+    @pytest.fixture
+    def denormalised_row(self):
+        return {
+            "flight_id": 1,
+            "flight_number": "ZMY123",
+            "aircraft_registration": "G-TEST",
+            "aircraft_type": "Airbus A320",
+            "origin": "AAA",
+            "destination": "BBB",
+            "departure_time_scheduled": "2026-01-01 15:30",
+            "arrival_time_scheduled": "2026-01-01 16:55",
+            "departure_time_actual": "",
+            "arrival_time_actual": "",
+            "pilot": "Andrea Almond",
+            "copilot": " ",
+            "status": "Scheduled"
+        }
+
+    @patch("flightmanagement.services.flight_service.is_materialised")
+    def test_get_flight_table_reads_materialised_rows(self, mock_is_materialised, service, denormalised_row):
+        mock_is_materialised.return_value = True
+        service._FlightService__flight_repository.get_denormalised_flight_list.return_value = [denormalised_row]
+
+        result = service.get_flight_table()
+
+        assert "G-TEST" in result
+        assert "Andrea Almond" in result
+        service._FlightService__flight_repository.get_flight_list.assert_not_called()
+
+    @patch("flightmanagement.services.flight_service.is_materialised")
+    def test_get_results_view_reads_materialised_rows(self, mock_is_materialised, service, sample_flight, denormalised_row):
+        mock_is_materialised.return_value = True
+        service._FlightService__flight_repository.get_denormalised_flights.return_value = {1: denormalised_row}
+
+        result = service.get_results_view([sample_flight])
+
+        assert "AAA" in result
+        service._FlightService__flight_repository.get_denormalised_flights.assert_called_once_with([1])
+
+    @patch("flightmanagement.services.flight_service.is_materialised")
+    def test_get_flight_table_with_history_reads_flights(self, mock_is_materialised, service, sample_flight):
+        mock_is_materialised.return_value = True
+        service._FlightService__flight_repository.get_flight_list.return_value = [sample_flight]
+        service._FlightService__flight_repository.get_denormalised_flights.return_value = {}
+
+        result = service.get_flight_table(include_history=True)
+
+        assert "ZMY123" in result
+        service._FlightService__flight_repository.get_flight_list.assert_called_once_with(include_history=True)
+        service._FlightService__flight_repository.get_denormalised_flight_list.assert_not_called()
+
+    @patch("flightmanagement.services.flight_service.is_materialised")
+    def test_get_results_view_falls_back_for_archived_flights(self, mock_is_materialised, service, sample_flight):
+        mock_is_materialised.return_value = True
+        service._FlightService__flight_repository.get_denormalised_flights.return_value = {}
+
+        result = service.get_results_view([sample_flight])
+
+        assert "ZMY123" in result
+
+    @patch("flightmanagement.services.flight_service.PrettyTable")
+    @patch("flightmanagement.services.flight_service.is_materialised")
+    def test_both_paths_render_aircraft_alike(self, mock_is_materialised, mock_table, service, sample_flight, denormalised_row):
+        service._FlightService__aircraft_repository.get_items_by_ids.return_value = {
+            1: Aircraft(id=1, registration="G-TEST", manufacturer="Airbus", model="A320")
+        }
+        service._FlightService__flight_repository.get_denormalised_flights.return_value = {1: denormalised_row}
+
+        mock_is_materialised.return_value = False
+        service.get_results_view([sample_flight])
+        mock_is_materialised.return_value = True
+        service.get_results_view([sample_flight])
+
+        view_row, materialised_row = (call.args[0] for call in mock_table.return_value.add_row.call_args_list)
+        assert view_row[2] == materialised_row[2] == "G-TEST\n(Airbus A320)"
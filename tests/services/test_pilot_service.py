@@ -1,4 +1,5 @@
 import pytest
+from datetime import datetime
 from unittest.mock import MagicMock, patch
 
 from flightmanagement.services.pilot_service import PilotService
@@ -58,6 +59,11 @@ class TestUseRepository:
             "family_name", "Almond"
         )
 
+    def test_search_text_calls_repository(self, service):
+        service.search_text("Almond", 5)
+
+        service._PilotService__pilot_repository.search_text.assert_called_once_with("Almond", 5)
+
     def test_get_pilot_table_uses_repository(self, service, sample_pilot):
         service._PilotService__pilot_repository.get_pilot_list.return_value = [
             sample_pilot
@@ -67,6 +73,14 @@ class TestUseRepository:
 
         assert "Almond" in result
 
+    @patch("flightmanagement.services.pilot_service.settings")
+    def test_get_pilot_page_uses_page_size(self, mock_settings, service):
+        mock_settings.page_size = 20
+
+        service.get_pilot_page(("Alex", "Morrison", 1), "previous")
+
+        service._PilotService__pilot_repository.get_pilot_page.assert_called_once_with(("Alex", "Morrison", 1), 20, "previous")
+
 class TestReturnData:
 
     def test_get_pilot_by_id(self, service):
@@ -74,6 +88,15 @@ class TestReturnData:
 
         service._PilotService__pilot_repository.get_item_by_id.assert_called_once_with(10)
 
+    def test_get_pilot_duty_hours_fills_pilots_without_duty(self, service):
+        as_of = datetime(2026, 3, 1, 12, 0)
+        service._PilotService__pilot_repository.get_duty_minutes.return_value = {1: 90}
+
+        result = service.get_pilot_duty_hours([1, 2], as_of)
+
+        assert result == {1: 1.5, 2: 0.0}
+        service._PilotService__pilot_repository.get_duty_minutes.assert_called_once_with([1, 2], as_of)
+
     def test_get_pilot_choices_returns_tuples(self, service, sample_pilot):
         service._PilotService__pilot_repository.get_pilot_list.return_value = [
             sample_pilot
@@ -0,0 +1,141 @@
+import random
+import sqlite3
+import numpy as np
+import pytest
+from dataclasses import replace
+from datetime import datetime, timedelta
+from flightmanagement.db.migrations import migrate, convert_flight_times
+from flightmanagement.db.synthetic_data import generate_database_data
+from flightmanagement.models.flight import Flight
+from flightmanagement.repositories.flight_repository import FlightRepository
+from flightmanagement.services.schedule_validator import ScheduleValidator, find_overlaps
+
+START = datetime(2026, 1, 1)
+
+@pytest.fixture(params=["text", "epoch_minutes"])
+def db_conn(request):
+    # Synthetic schedules never double book an aircraft or pilot
+    conn = sqlite3.connect(":memory:")
+    conn.row_factory = sqlite3.Row
+    migrate(conn)
+    convert_flight_times(conn, request.param)
+    generate_database_data(conn, flights=500, airports=10, aircraft=5, pilots=40, start=START, now=START + timedelta(days=30))
+    yield conn
+    conn.close()
+
+def new_flight(**values) -> Flight:
+    return Flight(**{
+        "flight_number": "ZMY9999",
+        "aircraft_id": 1,
+        "origin_id": 1,
+        "destination_id": 2,
+        "departure_time_scheduled": datetime(2027, 1, 1, 10, 0),
+        "arrival_time_scheduled": datetime(2027, 1, 1, 12, 0),
+        "status": "Scheduled"
+    } | values)
+
+class TestFindOverlaps:
+
+    def test_matches_pairwise_comparison(self):
+        rng = random.Random(0)
+        for _ in range(50):
+            count = rng.randrange(40)
+            resource_ids = np.array([rng.randrange(1, 4) for _ in range(count)], dtype=np.int64)
+            starts = np.array([rng.randrange(100) for _ in range(count)], dtype=np.int64)
+            ends = starts + np.array([rng.randrange(1, 30) for _ in range(count)], dtype=np.int64)
+
+            firsts, seconds = find_overlaps(resource_ids, starts, ends)
+
+            expected = {
+                (i, j) for i in range(count) for j in range(i + 1, count)
+                if resource_ids[i] == resource_ids[j] and starts[i] < ends[j] and starts[j] < ends[i]
+            }
+            assert {tuple(sorted(pair)) for pair in zip(firsts.tolist(), seconds.tolist())} == expected
+            assert len(firsts) == len(expected)
+
+    def test_back_to_back_intervals_do_not_overlap(self):
+        firsts, _ = find_overlaps(np.array([1, 1]), np.array([0, 10]), np.array([10, 20]))
+
+        assert len(firsts) == 0
+
+    def test_no_intervals(self):
+        firsts, seconds = find_overlaps(np.array([], dtype=np.int64), np.array([], dtype=np.int64), np.array([], dtype=np.int64))
+
+        assert len(firsts) == len(seconds) == 0
+
+class TestValidate:
+
+    def test_synthetic_schedule_has_no_conflicts(self, db_conn):
+        assert ScheduleValidator(db_conn).validate() == []
+
+    def test_reports_double_booked_aircraft_and_pilots(self, db_conn):
+        repository = FlightRepository(db_conn)
+        flight = repository.get_flight_list()[0]
+        other = next(other for other in repository.get_flight_list() if other.aircraft_id != flight.aircraft_id
+                     and flight.pilot_id not in (other.pilot_id, other.copilot_id))
+        repository.update_item(replace(
+            other,
+            pilot_id=flight.pilot_id,
+            departure_time_scheduled=flight.departure_time_scheduled + timedelta(minutes=10),
+            arrival_time_scheduled=flight.arrival_time_scheduled + timedelta(minutes=10)
+        ))
+        repository.insert_item(new_flight(
+            aircraft_id=flight.aircraft_id,
+            departure_time_scheduled=flight.departure_time_scheduled - timedelta(minutes=30),
+            arrival_time_scheduled=flight.departure_time_scheduled + timedelta(minutes=5)
+        ))
+
+        conflicts = ScheduleValidator(db_conn).validate()
+
+        assert [(conflict.resource, conflict.resource_id, conflict.start, conflict.end) for conflict in conflicts] == [
+            ("aircraft", flight.aircraft_id, flight.departure_time_scheduled, flight.departure_time_scheduled + timedelta(minutes=5)),
+            ("pilot", flight.pilot_id, flight.departure_time_scheduled + timedelta(minutes=10), flight.arrival_time_scheduled)
+        ]
+        assert conflicts[0].flight.id == flight.id or conflicts[0].other_flight.id == flight.id
+        assert {conflicts[1].flight.id, conflicts[1].other_flight.id} == {flight.id, other.id}
+
+    def test_pilot_in_either_seat_is_double_booked(self, db_conn):
+        repository = FlightRepository(db_conn)
+        flight = next(flight for flight in repository.get_flight_list() if flight.copilot_id is not None)
+        repository.insert_item(new_flight(
+            aircraft_id=flight.aircraft_id % 5 + 1,
+            pilot_id=flight.copilot_id,
+            departure_time_scheduled=flight.departure_time_scheduled,
+            arrival_time_scheduled=flight.arrival_time_scheduled
+        ))
+
+        conflicts = ScheduleValidator(db_conn).validate()
+
+        assert [(conflict.resource, conflict.resource_id) for conflict in conflicts] == [("pilot", flight.copilot_id)]
+
+class TestValidateFlights:
+
+    def test_reports_conflicts_with_schedule_and_each_other(self, db_conn):
+        flight = FlightRepository(db_conn).get_flight_list()[0]
+        imported = [
+            new_flight(aircraft_id=flight.aircraft_id, departure_time_scheduled=flight.departure_time_scheduled,
+                       arrival_time_scheduled=flight.arrival_time_scheduled),
+            new_flight(flight_number="ZMY9998", aircraft_id=5, pilot_id=1),
+            new_flight(flight_number="ZMY9997", aircraft_id=4, copilot_id=1)
+        ]
+
+        conflicts = ScheduleValidator(db_conn).validate_flights(imported)
+
+        assert [(conflict.resource, conflict.flight, conflict.other_flight) for conflict in conflicts] == [
+            ("aircraft", flight, imported[0]),
+            ("pilot", imported[1], imported[2])
+        ]
+
+    def test_existing_conflicts_are_not_reported(self, db_conn):
+        repository = FlightRepository(db_conn)
+        flight = repository.get_flight_list()[0]
+        repository.insert_item(replace(flight, id=None, flight_number="ZMY9999"))
+
+        assert ScheduleValidator(db_conn).validate_flights([new_flight()]) == []
+
+    def test_flights_replace_stored_flight_with_id_or_key(self, db_conn):
+        flights = FlightRepository(db_conn).get_flight_list()[:2]
+        imported = [replace(flight, pilot_id=flight.pilot_id) for flight in flights]
+        imported[1] = replace(imported[1], id=None)
+
+        assert ScheduleValidator(db_conn).validate_flights(imported) == []
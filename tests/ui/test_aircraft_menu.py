@@ -3,6 +3,7 @@ from unittest.mock import MagicMock, patch
 
 from flightmanagement.ui.aircraft_menu import AircraftMenu
 from flightmanagement.models.aircraft import Aircraft
+from flightmanagement.models.page import Page
 
 @pytest.fixture
 def mock_session():
@@ -18,6 +19,9 @@ def mock_aircraft_service():
     service.get_aircraft_table.return_value = "AIRCRAFT TABLE"
     service.get_aircraft_choices.return_value = [(1, "G-ABCD"), (2, "G-BCDE")]
     service.get_aircraft_by_id.side_effect = lambda x: Aircraft(id=x, registration="N123", manufacturer="Boeing", model="747")
+
+    # A single page, so listings return without asking which page to show next
+    service.get_aircraft_page.return_value = Page(items=[])
     return service
 
 @pytest.fixture
@@ -57,11 +61,29 @@ class TestLoad:
 class TestShow:
 
     def test_show_option_prints_table(self, menu, mocker):
-        menu._AircraftMenu__aircraft_service.get_aircraft_table.return_value = "TABLE"
+        menu._AircraftMenu__aircraft_service.get_aircraft_page.return_value = Page(items=["ITEM"])
+        menu._AircraftMenu__aircraft_service.get_results_view.return_value = "TABLE"
         mock_print = mocker.patch("builtins.print")
         menu._AircraftMenu__show_option()
 
         mock_print.assert_any_call("TABLE")
+        menu._AircraftMenu__aircraft_service.get_results_view.assert_called_once_with(["ITEM"])
+
+    def test_show_option_pages_forward_and_back(self, menu, mocker):
+        service = menu._AircraftMenu__aircraft_service
+        first = Page(items=["A"], has_next=True, first_key=("G-AAAA", 1), last_key=("G-AAAA", 1))
+        second = Page(items=["B"], has_previous=True, first_key=("G-BBBB", 2), last_key=("G-BBBB", 2))
+        service.get_aircraft_page.side_effect = [first, second, first]
+        mocker.patch("flightmanagement.ui.ui_utils.choice", side_effect=["next", "previous", "back"])
+        mocker.patch("builtins.print")
+
+        menu._AircraftMenu__show_option()
+
+        assert service.get_aircraft_page.call_args_list == [
+            mocker.call(),
+            mocker.call(("G-AAAA", 1), "next"),
+            mocker.call(("G-BBBB", 2), "previous")
+        ]
 
 class TestSearch:
 
@@ -74,15 +96,26 @@ class TestSearch:
 
         assert result is False
 
+    def test_search_option_prompt(self, menu, mocker):
+        mock_prompt = mocker.patch(
+            "flightmanagement.ui.aircraft_menu.UserPrompt",
+            return_value=FakePrompt(cancelled=True)
+        )
+        menu._AircraftMenu__search_option()
+
+        assert mock_prompt.call_args.kwargs["prompt"] == "Enter a registration, manufacturer or model: "
+
     def test_search_option_no_results(self, menu, mocker):
         mocker.patch(
             "flightmanagement.ui.aircraft_menu.UserPrompt",
             return_value=FakePrompt("G-TEST")
         )
-        menu._AircraftMenu__aircraft_service.search_aircraft.return_value = []
+        menu._AircraftMenu__aircraft_service.search_text.return_value = []
         result = menu._AircraftMenu__search_option()
 
         assert result is True
+        menu._AircraftMenu__aircraft_service.search_text.assert_called_once_with("G-TEST")
+        menu._AircraftMenu__aircraft_service.get_results_view.assert_not_called()
 
     def test_search_option_with_results(self, menu, mocker):
         mocker.patch(
@@ -100,11 +133,13 @@ class TestSearch:
             icao_type="B737",
             status="Active"
         )
-        menu._AircraftMenu__aircraft_service.search_aircraft.return_value = [aircraft]
+        menu._AircraftMenu__aircraft_service.search_text.return_value = [aircraft]
         menu._AircraftMenu__aircraft_service.get_results_view.return_value = "RESULTS"
         result = menu._AircraftMenu__search_option()
 
         assert result is True
+        menu._AircraftMenu__aircraft_service.search_text.assert_called_once_with("G-TEST")
+        menu._AircraftMenu__aircraft_service.get_results_view.assert_called_once_with([aircraft])
 
 class TestAdd:
 
@@ -133,6 +168,13 @@ class TestAdd:
         assert result is True
         mock_aircraft_service.add_aircraft.assert_called_once()
 
+    @patch("flightmanagement.ui.aircraft_menu.UserPrompt")
+    def test_add_aircraft_asks_for_registration(self, mock_prompt, menu):
+        mock_prompt.return_value = FakePrompt(cancelled=True)
+
+        menu._AircraftMenu__add_option()
+
+        assert mock_prompt.call_args_list[0].kwargs["prompt"] == "Enter the aircraft registration: "
 
 class TestUpdate:
 
@@ -184,6 +226,17 @@ class TestUpdate:
         assert updated_aircraft.registration == "N124"
         assert updated_aircraft.status == "Inactive"
 
+    @patch("flightmanagement.ui.aircraft_menu.UserPrompt")
+    def test_update_aircraft_asks_for_registration(self, mock_prompt, menu):
+        mock_prompt.side_effect = [
+            FakePrompt(value=1),            # aircraft selection
+            FakePrompt(cancelled=True),     # registration
+        ]
+
+        menu._AircraftMenu__update_option()
+
+        assert mock_prompt.call_args_list[1].kwargs["prompt"] == "Enter the aircraft registration: "
+
 class TestDelete:
 
     @patch("flightmanagement.ui.aircraft_menu.UserPrompt")
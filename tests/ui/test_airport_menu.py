@@ -3,6 +3,7 @@ from unittest.mock import MagicMock, patch
 
 from flightmanagement.ui.airport_menu import AirportMenu
 from flightmanagement.models.airport import Airport
+from flightmanagement.models.page import Page
 
 @pytest.fixture
 def mock_session():
@@ -18,6 +19,9 @@ def mock_airport_service():
     service.get_airport_table.return_value = "AIRPORT TABLE"
     service.get_airport_choices.return_value = [(1, "AAA"), (2, "BBB")]
     service.get_airport_by_id.side_effect = lambda x: Airport(id=x, code="AAA")
+
+    # A single page, so listings return without asking which page to show next
+    service.get_airport_page.return_value = Page(items=[])
     return service
 
 @pytest.fixture
@@ -57,11 +61,13 @@ class TestLoad:
 class TestShow:
 
     def test_show_option_prints_table(self, menu, mocker):
-        menu._AirportMenu__airport_service.get_airport_table.return_value = "TABLE"
+        menu._AirportMenu__airport_service.get_airport_page.return_value = Page(items=["ITEM"])
+        menu._AirportMenu__airport_service.get_results_view.return_value = "TABLE"
         mock_print = mocker.patch("builtins.print")
         menu._AirportMenu__show_option()
 
         mock_print.assert_any_call("TABLE")
+        menu._AirportMenu__airport_service.get_results_view.assert_called_once_with(["ITEM"])
 
 class TestSearch:
 
@@ -79,10 +85,12 @@ class TestSearch:
             "flightmanagement.ui.airport_menu.UserPrompt",
             return_value=FakePrompt("AAA")
         )
-        menu._AirportMenu__airport_service.search_airport.return_value = []
+        menu._AirportMenu__airport_service.search_text.return_value = []
         result = menu._AirportMenu__search_option()
 
         assert result is True
+        menu._AirportMenu__airport_service.search_text.assert_called_once_with("AAA")
+        menu._AirportMenu__airport_service.get_results_view.assert_not_called()
 
     def test_search_option_with_results(self, menu, mocker):
         mocker.patch(
@@ -98,11 +106,13 @@ class TestSearch:
             country="Test country",
             region="Test region"
         )
-        menu._AirportMenu__airport_service.search_airport.return_value = [airport]
+        menu._AirportMenu__airport_service.search_text.return_value = [airport]
         menu._AirportMenu__airport_service.get_results_view.return_value = "RESULTS"
         result = menu._AirportMenu__search_option()
 
         assert result is True
+        menu._AirportMenu__airport_service.search_text.assert_called_once_with("AAA")
+        menu._AirportMenu__airport_service.get_results_view.assert_called_once_with([airport])
 
 class TestAdd:
 
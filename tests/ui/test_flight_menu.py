@@ -4,6 +4,7 @@ from datetime import datetime
 
 from flightmanagement.ui.flight_menu import FlightMenu
 from flightmanagement.models.flight import Flight
+from flightmanagement.models.page import Page
 
 @pytest.fixture
 def mock_session():
@@ -18,7 +19,11 @@ def mock_flight_service():
     service = MagicMock()
     service.get_flight_table.return_value = "FLIGHT TABLE"
     service.get_flight_choices.return_value = [(1, "ZMY123"), (2, "ZMY234")]
+    service.get_available_aircraft_choices.return_value = [(1, "G-TEST1"), (2, "G-TEST2")]
     service.get_flight_by_id.side_effect = lambda x: Flight(id=x, flight_number="ZMY123", aircraft_id=1, origin_id=1, destination_id=2, departure_time_scheduled=datetime(2026, 1, 1, 15, 30))
+
+    # A single page, so listings return without asking which page to show next
+    service.get_flight_page.return_value = Page(items=[])
     return service
 
 @pytest.fixture
@@ -82,11 +87,21 @@ class TestLoad:
 class TestShow:
 
     def test_show_option_prints_table(self, menu, mocker):
-        menu._FlightMenu__flight_service.get_flight_table.return_value = "TABLE"
+        menu._FlightMenu__flight_service.get_flight_page.return_value = Page(items=["ITEM"])
+        menu._FlightMenu__flight_service.get_results_view.return_value = "TABLE"
         mock_print = mocker.patch("builtins.print")
         menu._FlightMenu__show_option()
 
         mock_print.assert_any_call("TABLE")
+        menu._FlightMenu__flight_service.get_results_view.assert_called_once_with(["ITEM"])
+
+    def test_history_option_pages_with_archive(self, menu, mocker):
+        menu._FlightMenu__flight_service.get_flight_page.return_value = Page(items=["ITEM"])
+        mocker.patch("builtins.print")
+
+        menu._FlightMenu__history_option()
+
+        menu._FlightMenu__flight_service.get_flight_page.assert_called_once_with(None, "next", include_history=True)
 
 class TestSearch:
 
@@ -104,10 +119,12 @@ class TestSearch:
             "flightmanagement.ui.flight_menu.UserPrompt",
             return_value=FakePrompt("G-TEST")
         )
-        menu._FlightMenu__flight_service.search_flight.return_value = []
+        menu._FlightMenu__flight_service.search_flights.return_value = []
         result = menu._FlightMenu__search_option()
 
         assert result is True
+        menu._FlightMenu__flight_service.search_flights.assert_called_once_with("flight_number", "G-TEST", include_history=True)
+        menu._FlightMenu__flight_service.get_results_view.assert_not_called()
 
     def test_search_option_with_results(self, menu, mocker):
         mocker.patch(
@@ -121,13 +138,16 @@ class TestSearch:
             aircraft_id=1,
             origin_id=1,
             destination_id=2,
-            departure_time_scheduled=datetime(2026, 1, 1, 15, 30)
+            departure_time_scheduled=datetime(2026, 1, 1, 15, 30),
+            arrival_time_scheduled=datetime(2026, 1, 1, 16, 55)
         )
-        menu._FlightMenu__flight_service.search_flight.return_value = [flight]
+        menu._FlightMenu__flight_service.search_flights.return_value = [flight]
         menu._FlightMenu__flight_service.get_results_view.return_value = "RESULTS"
         result = menu._FlightMenu__search_option()
 
         assert result is True
+        menu._FlightMenu__flight_service.search_flights.assert_called_once_with("flight_number", "ZMY123", include_history=True)
+        menu._FlightMenu__flight_service.get_results_view.assert_called_once_with([flight])
 
 class TestAdd:
 
@@ -143,7 +163,6 @@ class TestAdd:
     def test_add_flight_success(self, mock_prompt, menu, mock_flight_service):
         mock_prompt.side_effect = [
             FakePrompt("ZMY123"),       # flight_number
-            FakePrompt(1),              # aircraft_id
             FakePrompt(1),              # origin_id
             FakePrompt(2),              # destination_id
             FakePrompt(1),              # pilot_id
@@ -151,14 +170,38 @@ class TestAdd:
             FakePrompt("2026-01-01"),   # departure_date_scheduled
             FakePrompt("15:30"),        # departure_time_scheduled
             FakePrompt("2026-01-01"),   # arrival_date_scheduled
-            FakePrompt("16:55")         # arrival_time_scheduled
+            FakePrompt("16:55"),        # arrival_time_scheduled
+            FakePrompt(1)               # aircraft_id
         ]
 
         result = menu._FlightMenu__add_option()
 
         assert result is True
         mock_flight_service.add_flight.assert_called_once()
+        mock_flight_service.get_available_aircraft_choices.assert_called_once_with(
+            datetime(2026, 1, 1, 15, 30),
+            datetime(2026, 1, 1, 16, 55)
+        )
+
+    @patch("flightmanagement.ui.flight_menu.UserPrompt")
+    def test_add_flight_without_free_aircraft(self, mock_prompt, menu, mock_flight_service):
+        mock_flight_service.get_available_aircraft_choices.return_value = []
+        mock_prompt.side_effect = [
+            FakePrompt("ZMY123"),       # flight_number
+            FakePrompt(1),              # origin_id
+            FakePrompt(2),              # destination_id
+            FakePrompt(1),              # pilot_id
+            FakePrompt(2),              # copilot_id
+            FakePrompt("2026-01-01"),   # departure_date_scheduled
+            FakePrompt("15:30"),        # departure_time_scheduled
+            FakePrompt("2026-01-01"),   # arrival_date_scheduled
+            FakePrompt("16:55"),        # arrival_time_scheduled
+        ]
 
+        result = menu._FlightMenu__add_option()
+
+        assert result is False
+        mock_flight_service.add_flight.assert_not_called()
 
 class TestUpdate:
 
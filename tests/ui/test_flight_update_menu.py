@@ -0,0 +1,111 @@
+import pytest
+from unittest.mock import MagicMock, patch
+from datetime import datetime
+
+from flightmanagement.ui.flight_update_menu import FlightUpdateMenu
+from flightmanagement.models.flight import Flight
+
+@pytest.fixture
+def flight():
+    return Flight(
+        id=1,
+        flight_number="ZMY123",
+        aircraft_id=1,
+        origin_id=1,
+        destination_id=2,
+        pilot_id=1,
+        copilot_id=2,
+        departure_time_scheduled=datetime(2026, 1, 1, 15, 30),
+        arrival_time_scheduled=datetime(2026, 1, 1, 16, 55),
+        status="Scheduled"
+    )
+
+@pytest.fixture
+def mock_flight_service(flight):
+    service = MagicMock()
+    service.get_flight_by_id.return_value = flight
+    service.get_available_aircraft_choices.return_value = [(1, "G-TEST1"), (2, "G-TEST2")]
+    service.get_available_pilot_choices.return_value = [(1, "John Smith"), (2, "Sarah Jones")]
+    return service
+
+@pytest.fixture
+def mock_airport_service():
+    service = MagicMock()
+    service.get_airport_choices.return_value = [(1, "AAA"), (2, "BBB")]
+    return service
+
+@pytest.fixture
+def menu(mock_flight_service, mock_airport_service):
+    return FlightUpdateMenu(
+        session=MagicMock(),
+        bindings=MagicMock(),
+        flight_id=1,
+        flight_service=mock_flight_service,
+        aircraft_service=MagicMock(),
+        airport_service=mock_airport_service,
+        pilot_service=MagicMock()
+    )
+
+class FakePrompt:
+    def __init__(self, value=None, cancelled=False):
+        self.value = value
+        self.is_cancelled = cancelled
+
+SCHEDULE_PROMPTS = [
+    FakePrompt("ZMY123"),          # flight_number
+    FakePrompt(1),                 # origin
+    FakePrompt(2),                 # destination
+    FakePrompt("2026-02-01"),      # departure date
+    FakePrompt("09:00"),           # departure time
+    FakePrompt("2026-02-01"),      # arrival date
+    FakePrompt("10:30"),           # arrival time
+]
+
+class TestUpdateAll:
+
+    @patch("flightmanagement.ui.flight_update_menu.UserPrompt")
+    def test_aircraft_offered_for_changed_schedule(self, mock_prompt, menu, mock_flight_service):
+        mock_prompt.side_effect = SCHEDULE_PROMPTS + [
+            FakePrompt(2),              # aircraft
+            FakePrompt(1),              # pilot
+            FakePrompt(2),              # copilot
+            FakePrompt(None),           # actual departure date
+            FakePrompt(None),           # actual departure time
+            FakePrompt(None),           # actual arrival date
+            FakePrompt(None),           # actual arrival time
+            FakePrompt("Scheduled"),    # status
+        ]
+
+        result = menu._FlightUpdateMenu__update_all_option()
+
+        assert result is True
+        mock_flight_service.get_available_aircraft_choices.assert_called_once_with(
+            datetime(2026, 2, 1, 9, 0), datetime(2026, 2, 1, 10, 30), 1
+        )
+
+        updated_flight = mock_flight_service.update_flight.call_args[0][0]
+        assert updated_flight.aircraft_id == 2
+        assert updated_flight.departure_time_scheduled == datetime(2026, 2, 1, 9, 0)
+
+    @patch("flightmanagement.ui.flight_update_menu.UserPrompt")
+    def test_no_free_aircraft_cancels_update(self, mock_prompt, menu, mock_flight_service):
+        mock_flight_service.get_available_aircraft_choices.return_value = []
+        mock_prompt.side_effect = list(SCHEDULE_PROMPTS)
+
+        result = menu._FlightUpdateMenu__update_all_option()
+
+        assert result is False
+        assert mock_prompt.call_count == len(SCHEDULE_PROMPTS)
+        mock_flight_service.update_flight.assert_not_called()
+
+class TestUpdateAircraft:
+
+    @patch("flightmanagement.ui.flight_update_menu.UserPrompt")
+    def test_no_free_aircraft_cancels_update(self, mock_prompt, menu, mock_flight_service):
+        mock_flight_service.get_available_aircraft_choices.return_value = []
+
+        result = menu._FlightUpdateMenu__update_aircraft_option()
+
+        assert result is False
+        mock_prompt.assert_not_called()
+        mock_flight_service.update_flight.assert_not_called()
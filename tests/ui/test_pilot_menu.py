@@ -3,6 +3,7 @@ from unittest.mock import MagicMock, patch
 
 from flightmanagement.ui.pilot_menu import PilotMenu
 from flightmanagement.models.pilot import Pilot
+from flightmanagement.models.page import Page
 
 @pytest.fixture
 def mock_session():
@@ -18,6 +19,9 @@ def mock_pilot_service():
     service.get_pilot_table.return_value = "PILOT TABLE"
     service.get_pilot_choices.return_value = [(1, "John Smith"), (2, "Sarah Jones")]
     service.get_pilot_by_id.side_effect = lambda x: Pilot(id=x, first_name="John", family_name="Smith")
+
+    # A single page, so listings return without asking which page to show next
+    service.get_pilot_page.return_value = Page(items=[])
     return service
 
 @pytest.fixture
@@ -57,11 +61,32 @@ class TestLoad:
 class TestShow:
 
     def test_show_option_prints_table(self, menu, mocker):
-        menu._PilotMenu__pilot_service.get_pilot_table.return_value = "TABLE"
+        menu._PilotMenu__pilot_service.get_pilot_page.return_value = Page(items=["ITEM"])
+        menu._PilotMenu__pilot_service.get_results_view.return_value = "TABLE"
         mock_print = mocker.patch("builtins.print")
         menu._PilotMenu__show_option()
 
         mock_print.assert_any_call("TABLE")
+        menu._PilotMenu__pilot_service.get_results_view.assert_called_once_with(["ITEM"])
+
+    def test_show_option_steps_through_pages(self, menu, mocker):
+        service = menu._PilotMenu__pilot_service
+        first = Page(items=["A"], has_next=True, first_key=("Almond", 1), last_key=("Almond", 1))
+        second = Page(items=["B"], has_previous=True, first_key=("Brown", 2), last_key=("Brown", 2))
+        service.get_pilot_page.side_effect = [first, second, first]
+        service.get_results_view.side_effect = lambda items: f"TABLE {items[0]}"
+        mock_choice = mocker.patch("flightmanagement.ui.ui_utils.choice", side_effect=["next", "previous", "back"])
+        mock_print = mocker.patch("builtins.print")
+
+        menu._PilotMenu__show_option()
+
+        tables = [call.args[0] for call in mock_print.call_args_list if str(call.args[0]).startswith("TABLE")]
+        assert tables == ["TABLE A", "TABLE B", "TABLE A"]
+        assert [option for option, _ in mock_choice.call_args_list[1].kwargs["options"]] == ["previous", "back"]
+        assert service.get_pilot_page.call_args_list[1:] == [
+            mocker.call(("Almond", 1), "next"),
+            mocker.call(("Brown", 2), "previous")
+        ]
 
 class TestSearch:
 
@@ -74,15 +99,26 @@ class TestSearch:
 
         assert result is False
 
+    def test_search_option_prompt(self, menu, mocker):
+        mock_prompt = mocker.patch(
+            "flightmanagement.ui.pilot_menu.UserPrompt",
+            return_value=FakePrompt(cancelled=True)
+        )
+        menu._PilotMenu__search_option()
+
+        assert mock_prompt.call_args.kwargs["prompt"] == "Enter a pilot name: "
+
     def test_search_option_no_results(self, menu, mocker):
         mocker.patch(
             "flightmanagement.ui.pilot_menu.UserPrompt",
             return_value=FakePrompt("Smith")
         )
-        menu._PilotMenu__pilot_service.search_pilot.return_value = []
+        menu._PilotMenu__pilot_service.search_text.return_value = []
         result = menu._PilotMenu__search_option()
 
         assert result is True
+        menu._PilotMenu__pilot_service.search_text.assert_called_once_with("Smith")
+        menu._PilotMenu__pilot_service.get_results_view.assert_not_called()
 
     def test_search_option_with_results(self, menu, mocker):
         mocker.patch(
@@ -95,11 +131,13 @@ class TestSearch:
             first_name="John",
             family_name="Smith"
         )
-        menu._PilotMenu__pilot_service.search_pilot.return_value = [pilot]
+        menu._PilotMenu__pilot_service.search_text.return_value = [pilot]
         menu._PilotMenu__pilot_service.get_results_view.return_value = "RESULTS"
         result = menu._PilotMenu__search_option()
 
         assert result is True
+        menu._PilotMenu__pilot_service.search_text.assert_called_once_with("Smith")
+        menu._PilotMenu__pilot_service.get_results_view.assert_called_once_with([pilot])
 
 class TestAdd:
 
@@ -123,6 +161,15 @@ class TestAdd:
         assert result is True
         mock_pilot_service.add_pilot.assert_called_once()
 
+    @patch("flightmanagement.ui.pilot_menu.UserPrompt")
+    def test_add_pilot_prompts(self, mock_prompt, menu):
+        mock_prompt.side_effect = [FakePrompt("John"), FakePrompt("Smith")]
+
+        menu._PilotMenu__add_option()
+
+        prompts = [call.kwargs["prompt"] for call in mock_prompt.call_args_list]
+        assert prompts == ["Enter a first name: ", "Enter a family name: "]
+
 class TestUpdate:
 
     @patch("flightmanagement.ui.pilot_menu.UserPrompt")
@@ -161,6 +208,16 @@ class TestUpdate:
         assert updated_pilot.id == 1
         assert updated_pilot.first_name == "Sarah"
 
+    @patch("flightmanagement.ui.pilot_menu.UserPrompt")
+    def test_update_pilot_prompts(self, mock_prompt, menu, mock_pilot_service):
+        mock_pilot_service.get_pilot_by_id.return_value = Pilot(id=1, first_name="John", family_name="Smith")
+        mock_prompt.side_effect = [FakePrompt(value=1), FakePrompt("Sarah"), FakePrompt("Jones")]
+
+        menu._PilotMenu__update_option()
+
+        prompts = [call.kwargs["prompt"] for call in mock_prompt.call_args_list[1:]]
+        assert prompts == ["Enter a first name: ", "Enter a family name: "]
+
 class TestDelete:
 
     @patch("flightmanagement.ui.pilot_menu.UserPrompt")